@@ -1,4 +1,5 @@
 import os
+import re
 from logging.config import fileConfig
 
 import asyncio
@@ -41,6 +42,16 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = SQLModel.metadata
 
+# Monthly partitions of the transaction tables are created at runtime
+# (app/core/partitions.py), not by migrations: autogenerate ignores them
+PARTITION_NAME = re.compile(r"_(p\d{4}_\d{2}|default)$")
+
+
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return not PARTITION_NAME.search(name)
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -65,6 +76,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -85,7 +97,9 @@ async def run_migrations_online() -> None:
     )
 
     def do_run_migrations(connection):
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection, target_metadata=target_metadata, include_name=include_name
+        )
 
         with context.begin_transaction():
             context.run_migrations()
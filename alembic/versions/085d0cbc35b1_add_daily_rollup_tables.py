@@ -0,0 +1,96 @@
+"""add daily rollup tables
+
+Revision ID: 085d0cbc35b1
+Revises: c71b138971e6
+Create Date: 2026-10-19 11:03:27.514906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '085d0cbc35b1'
+down_revision: Union[str, Sequence[str], None] = 'c71b138971e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _measures(count_column: str, with_total: bool = True) -> list:
+    columns = [
+        sa.Column(count_column, sa.Integer(), nullable=False),
+        sa.Column('roll_count', sa.Float(), nullable=False),
+        sa.Column('weight_kg', sa.Float(), nullable=False),
+    ]
+    if with_total:
+        columns.append(sa.Column('total', sa.Float(), nullable=False))
+    return columns
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sales_daily',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('buyer_id', sa.Integer(), nullable=True),
+    sa.Column('inventory_id', sa.String(), nullable=True),
+    *_measures('transaction_count'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ux_sales_daily_key', 'sales_daily', ['day', 'buyer_id', 'inventory_id'], unique=True, postgresql_nulls_not_distinct=True)
+    op.create_table('purchase_daily',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('supplier_id', sa.Integer(), nullable=True),
+    sa.Column('inventory_id', sa.String(), nullable=True),
+    *_measures('transaction_count'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ux_purchase_daily_key', 'purchase_daily', ['day', 'supplier_id', 'inventory_id'], unique=True, postgresql_nulls_not_distinct=True)
+    op.create_table('production_daily',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('knit_formula_id', sa.Integer(), nullable=False),
+    sa.Column('machine_id', sa.Integer(), nullable=False),
+    *_measures('process_count', with_total=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ux_production_daily_key', 'production_daily', ['day', 'knit_formula_id', 'machine_id'], unique=True)
+
+    # Initial backfill (same aggregation as scripts/rebuild_rollups.py)
+    op.execute("""
+        INSERT INTO sales_daily (day, buyer_id, inventory_id, transaction_count, roll_count, weight_kg, total)
+        SELECT CAST(transaction_date AS DATE), buyer_id, inventory_id, count(*),
+               coalesce(sum(roll_count), 0), coalesce(sum(weight_kg), 0),
+               coalesce(sum(weight_kg * price_per_kg), 0)
+        FROM sales_transaction
+        GROUP BY CAST(transaction_date AS DATE), buyer_id, inventory_id
+    """)
+    op.execute("""
+        INSERT INTO purchase_daily (day, supplier_id, inventory_id, transaction_count, roll_count, weight_kg, total)
+        SELECT CAST(transaction_date AS DATE), supplier_id, inventory_id, count(*),
+               coalesce(sum(roll_count), 0), coalesce(sum(weight_kg), 0),
+               coalesce(sum(weight_kg * price_per_kg), 0)
+        FROM purchase_transaction
+        GROUP BY CAST(transaction_date AS DATE), supplier_id, inventory_id
+    """)
+    op.execute("""
+        INSERT INTO production_daily (day, knit_formula_id, machine_id, process_count, roll_count, weight_kg)
+        SELECT CAST(start_date AS DATE), knit_formula_id, machine_id, count(*),
+               coalesce(sum(roll_count), 0), coalesce(sum(weight_kg), 0)
+        FROM knitting_process
+        WHERE knit_status IS true
+        GROUP BY CAST(start_date AS DATE), knit_formula_id, machine_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_production_daily_key', table_name='production_daily')
+    op.drop_table('production_daily')
+    op.drop_index('ux_purchase_daily_key', table_name='purchase_daily')
+    op.drop_table('purchase_daily')
+    op.drop_index('ux_sales_daily_key', table_name='sales_daily')
+    op.drop_table('sales_daily')
@@ -0,0 +1,49 @@
+"""add materialized buyer risk
+
+Revision ID: 26b7d2aa679a
+Revises: 7e7b7c75c607
+Create Date: 2026-10-19 03:38:40.906426
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '26b7d2aa679a'
+down_revision: Union[str, Sequence[str], None] = '7e7b7c75c607'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('buyer', sa.Column('overdue_amount', sa.Float(), server_default=sa.text('0'), nullable=False))
+    op.add_column('buyer', sa.Column('is_risked', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+
+    # Initial backfill (same computation as refresh_buyer_risk in app/repository/account_receivable.py)
+    op.execute("""
+        UPDATE buyer
+        SET overdue_amount = overdue.amount, is_risked = overdue.risked
+        FROM (
+            SELECT DISTINCT ON (buyer_id)
+                buyer_id,
+                coalesce(age_over_90_days, 0) AS amount,
+                coalesce(bool_or(age_over_90_days > 0) OVER (PARTITION BY buyer_id), false) AS risked
+            FROM account_receivable
+            WHERE buyer_id IS NOT NULL
+            -- period_date does not exist yet at this revision; order by the parsed period
+            ORDER BY buyer_id, to_date(trim(period), 'Mon-YY') DESC, id DESC
+        ) AS overdue
+        WHERE overdue.buyer_id = buyer.id
+    """)
+    op.create_index('ix_buyer_risked', 'buyer', ['id'], unique=False, postgresql_where=sa.text('is_risked'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_buyer_risked', table_name='buyer', postgresql_where=sa.text('is_risked'))
+    op.drop_column('buyer', 'is_risked')
+    op.drop_column('buyer', 'overdue_amount')
@@ -0,0 +1,48 @@
+"""add production cost layers
+
+Revision ID: 3b8e1f6a9c27
+Revises: 819cf06dff5d
+Create Date: 2026-10-19 04:12:08.316254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e1f6a9c27'
+down_revision: Union[str, Sequence[str], None] = '819cf06dff5d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'cost_layer',
+        sa.Column('source_type', sqlmodel.sql.sqltypes.AutoString(), server_default='purchase', nullable=False),
+    )
+    op.alter_column('cost_layer', 'source_type', server_default=None)
+    op.alter_column('cost_layer', 'purchase_id', new_column_name='source_id')
+    op.drop_index('ux_cost_layer_purchase', table_name='cost_layer')
+    op.create_index('ux_cost_layer_source', 'cost_layer', ['source_type', 'source_id'], unique=True)
+
+    # Completed knitting and dyeing runs open layers from now on: every item is
+    # flagged from the beginning, so the next recompute replays the whole history
+    op.execute("""
+        INSERT INTO cost_activity (inventory_id, since)
+        SELECT id, timestamp '1970-01-01' FROM inventory
+        ON CONFLICT (inventory_id) DO UPDATE SET since = EXCLUDED.since
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM cost_layer WHERE source_type <> 'purchase'")
+    op.drop_index('ux_cost_layer_source', table_name='cost_layer')
+    op.alter_column('cost_layer', 'source_id', new_column_name='purchase_id')
+    op.create_index('ux_cost_layer_purchase', 'cost_layer', ['purchase_id'], unique=True)
+    op.drop_column('cost_layer', 'source_type')
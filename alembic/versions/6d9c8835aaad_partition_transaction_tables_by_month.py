@@ -0,0 +1,146 @@
+"""partition transaction tables by month
+
+Revision ID: 6d9c8835aaad
+Revises: fc9ea289e650
+Create Date: 2026-10-19 03:43:22.540895
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d9c8835aaad'
+down_revision: Union[str, Sequence[str], None] = 'fc9ea289e650'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = {
+    'sales_transaction': {
+        'foreign_keys': {'buyer_id': 'buyer', 'inventory_id': 'inventory'},
+        'indexes': ['buyer_id', 'inventory_id', 'transaction_date'],
+        'include': ['buyer_id', 'inventory_id', 'weight_kg', 'price_per_kg'],
+    },
+    'purchase_transaction': {
+        'foreign_keys': {'supplier_id': 'supplier', 'inventory_id': 'inventory'},
+        'indexes': ['inventory_id', 'supplier_id', 'transaction_date'],
+        'include': ['supplier_id', 'inventory_id', 'weight_kg', 'price_per_kg'],
+    },
+}
+
+# Creates the partition of `parent` for the month containing `month` (no-op when it
+# exists; returns its name, or NULL). Rows of that month already in the default
+# partition are moved into it, since Postgres refuses to create a partition whose
+# range the default partition has rows for. Called by app/core/partitions.py.
+ENSURE_MONTH_PARTITION = """
+CREATE OR REPLACE FUNCTION ensure_month_partition(parent regclass, month date)
+RETURNS text LANGUAGE plpgsql AS $$
+DECLARE
+    range_start date := date_trunc('month', month);
+    range_end date := range_start + interval '1 month';
+    partition_name text := format('%s_p%s', parent::text, to_char(range_start, 'YYYY_MM'));
+    default_name text := parent::text || '_default';
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_month_partition'));
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN NULL;
+    END IF;
+    IF to_regclass(default_name) IS NOT NULL THEN
+        EXECUTE format(
+            'CREATE TEMP TABLE partition_rows AS WITH moved AS ('
+            'DELETE FROM %I WHERE transaction_date >= %L AND transaction_date < %L RETURNING *'
+            ') SELECT * FROM moved',
+            default_name, range_start, range_end
+        );
+    END IF;
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+        partition_name, parent, range_start, range_end
+    );
+    IF to_regclass(default_name) IS NOT NULL THEN
+        EXECUTE format('INSERT INTO %s SELECT * FROM partition_rows', parent);
+        DROP TABLE partition_rows;
+    END IF;
+    RETURN partition_name;
+END;
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(ENSURE_MONTH_PARTITION)
+    for table, spec in TABLES.items():
+        old = f'{table}_unpartitioned'
+        # Free the names the partitioned table takes over
+        op.rename_table(table, old)
+        op.execute(f'ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey')
+        for column in spec['indexes']:
+            op.drop_index(f'ix_{table}_{column}', table_name=old)
+        op.drop_index(f'ix_{table}_analytics', table_name=old)
+
+        # Same columns, defaults (the id sequence) and NOT NULLs. The primary key has
+        # to include the partition key; the ORM keeps identifying rows by id alone
+        op.execute(
+            f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            f'PARTITION BY RANGE (transaction_date)'
+        )
+        op.create_primary_key(f'{table}_pkey', table, ['id', 'transaction_date'])
+        for column, target in spec['foreign_keys'].items():
+            op.create_foreign_key(f'{table}_{column}_fkey', table, target, [column], ['id'])
+        op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+
+        # A partition per month of existing data through three months ahead (the app
+        # keeps extending it), and a default partition for anything outside
+        op.execute(f"""
+            SELECT ensure_month_partition('{table}', CAST(month AS date))
+            FROM generate_series(
+                date_trunc('month', coalesce((SELECT min(transaction_date) FROM {old}), now())),
+                date_trunc('month', greatest((SELECT max(transaction_date) FROM {old}), now()))
+                    + interval '3 months',
+                interval '1 month'
+            ) AS month
+        """)
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+        op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+        op.drop_table(old)
+
+        # Indexes on the parent are created on every partition
+        for column in spec['indexes']:
+            op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+        op.create_index(
+            f'ix_{table}_analytics', table, ['transaction_date'],
+            postgresql_include=spec['include'],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, spec in TABLES.items():
+        partitioned = f'{table}_partitioned'
+        op.rename_table(table, partitioned)
+        op.execute(f'ALTER TABLE {partitioned} RENAME CONSTRAINT {table}_pkey TO {partitioned}_pkey')
+        for column in spec['indexes']:
+            op.drop_index(f'ix_{table}_{column}', table_name=partitioned)
+        op.drop_index(f'ix_{table}_analytics', table_name=partitioned)
+
+        op.execute(f'CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        op.create_primary_key(f'{table}_pkey', table, ['id'])
+        for column, target in spec['foreign_keys'].items():
+            op.create_foreign_key(f'{table}_{column}_fkey', table, target, [column], ['id'])
+        op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+        op.execute(f'INSERT INTO {table} SELECT * FROM {partitioned}')
+        # Drops the partitions with it
+        op.drop_table(partitioned)
+
+        for column in spec['indexes']:
+            op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+        op.create_index(
+            f'ix_{table}_analytics', table, ['transaction_date'],
+            postgresql_include=spec['include'],
+        )
+    op.execute('DROP FUNCTION ensure_month_partition(regclass, date)')
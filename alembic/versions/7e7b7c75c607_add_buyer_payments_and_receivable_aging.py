@@ -0,0 +1,54 @@
+"""add buyer payments and receivable aging
+
+Revision ID: 7e7b7c75c607
+Revises: 085d0cbc35b1
+Create Date: 2026-10-19 03:35:38.669810
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e7b7c75c607'
+down_revision: Union[str, Sequence[str], None] = '085d0cbc35b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('buyer_payment',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('buyer_id', sa.Integer(), nullable=False),
+    sa.Column('payment_date', sa.DateTime(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('note', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.ForeignKeyConstraint(['buyer_id'], ['buyer.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_buyer_payment_buyer_id'), 'buyer_payment', ['buyer_id'], unique=False)
+    op.create_index(op.f('ix_buyer_payment_payment_date'), 'buyer_payment', ['payment_date'], unique=False)
+    op.create_table('receivable_activity',
+    sa.Column('buyer_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('since_date', sa.Date(), nullable=False),
+    sa.PrimaryKeyConstraint('buyer_id')
+    )
+    op.create_table('receivable_aging_run',
+    sa.Column('period', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('as_of', sa.Date(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('period')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('receivable_aging_run')
+    op.drop_table('receivable_activity')
+    op.drop_index(op.f('ix_buyer_payment_payment_date'), table_name='buyer_payment')
+    op.drop_index(op.f('ix_buyer_payment_buyer_id'), table_name='buyer_payment')
+    op.drop_table('buyer_payment')
@@ -0,0 +1,31 @@
+"""add cost consumption margin index
+
+Revision ID: 819cf06dff5d
+Revises: f4fa8b8d40ed
+Create Date: 2026-10-19 04:04:30.024818
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '819cf06dff5d'
+down_revision: Union[str, Sequence[str], None] = 'f4fa8b8d40ed'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_cost_consumption_margin', 'cost_consumption', ['consumer_type', 'consumed_at'],
+        unique=False, postgresql_include=['consumer_id', 'inventory_id', 'quantity_kg', 'unit_cost'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cost_consumption_margin', table_name='cost_consumption')
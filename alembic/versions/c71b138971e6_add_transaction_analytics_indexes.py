@@ -0,0 +1,53 @@
+"""add transaction analytics indexes
+
+Revision ID: c71b138971e6
+Revises: 1827b6df991f
+Create Date: 2026-10-19 09:12:41.208315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71b138971e6'
+down_revision: Union[str, Sequence[str], None] = '1827b6df991f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Covering indexes for /analytics: a date-range aggregate reads only the index
+# (index-only scan), whatever the grouping column
+ANALYTICS_INDEXES = {
+    'sales_transaction': ['buyer_id', 'inventory_id', 'weight_kg', 'price_per_kg'],
+    'purchase_transaction': ['supplier_id', 'inventory_id', 'weight_kg', 'price_per_kg'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY so the transaction tables stay writable while the indexes build
+    with op.get_context().autocommit_block():
+        for table, include in ANALYTICS_INDEXES.items():
+            op.create_index(
+                f'ix_{table}_analytics',
+                table,
+                ['transaction_date'],
+                unique=False,
+                postgresql_include=include,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in ANALYTICS_INDEXES:
+            op.drop_index(
+                f'ix_{table}_analytics',
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
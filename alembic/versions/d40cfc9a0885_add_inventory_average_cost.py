@@ -0,0 +1,41 @@
+"""add inventory average cost
+
+Revision ID: d40cfc9a0885
+Revises: f3e0f0174b2b
+Create Date: 2026-10-19 03:52:39.553089
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd40cfc9a0885'
+down_revision: Union[str, Sequence[str], None] = 'f3e0f0174b2b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('inventory', sa.Column('average_cost', sa.Float(), server_default=sa.text('0'), nullable=False))
+
+    # Starting point: the weighted average of all purchases of the item. The daily
+    # rollup still holds archived months; from here on the purchase service moves it
+    op.execute("""
+        UPDATE inventory
+        SET average_cost = purchases.total / purchases.weight_kg
+        FROM (
+            SELECT inventory_id, sum(total) AS total, sum(weight_kg) AS weight_kg
+            FROM purchase_daily
+            GROUP BY inventory_id
+        ) AS purchases
+        WHERE purchases.inventory_id = inventory.id AND purchases.weight_kg > 0
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('inventory', 'average_cost')
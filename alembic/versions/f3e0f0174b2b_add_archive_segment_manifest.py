@@ -0,0 +1,41 @@
+"""add archive segment manifest
+
+Revision ID: f3e0f0174b2b
+Revises: 6d9c8835aaad
+Create Date: 2026-10-19 03:47:55.847131
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3e0f0174b2b'
+down_revision: Union[str, Sequence[str], None] = '6d9c8835aaad'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('archive_segment',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('table_name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('path', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('byte_size', sa.Integer(), nullable=False),
+    sa.Column('sha256', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ux_archive_segment_table_month', 'archive_segment', ['table_name', 'month'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_archive_segment_table_month', table_name='archive_segment')
+    op.drop_table('archive_segment')
@@ -0,0 +1,80 @@
+"""add fifo cost layers
+
+Revision ID: f4fa8b8d40ed
+Revises: d40cfc9a0885
+Create Date: 2026-10-19 04:00:00.427818
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4fa8b8d40ed'
+down_revision: Union[str, Sequence[str], None] = 'd40cfc9a0885'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('cost_layer',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('inventory_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('purchase_id', sa.Integer(), nullable=False),
+    sa.Column('layer_date', sa.DateTime(), nullable=False),
+    sa.Column('quantity_kg', sa.Float(), nullable=False),
+    sa.Column('unit_cost', sa.Float(), nullable=False),
+    sa.Column('remaining_kg', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['inventory_id'], ['inventory.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ux_cost_layer_purchase', 'cost_layer', ['purchase_id'], unique=True)
+    op.create_index('ix_cost_layer_inventory_date', 'cost_layer', ['inventory_id', 'layer_date'], unique=False)
+    op.create_index(
+        'ix_cost_layer_open', 'cost_layer', ['inventory_id', 'layer_date', 'id'],
+        unique=False, postgresql_where=sa.text('remaining_kg > 0'),
+    )
+    op.create_table('cost_consumption',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('inventory_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('layer_id', sa.Integer(), nullable=True),
+    sa.Column('consumer_type', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('consumer_id', sa.Integer(), nullable=False),
+    sa.Column('consumed_at', sa.DateTime(), nullable=False),
+    sa.Column('quantity_kg', sa.Float(), nullable=False),
+    sa.Column('unit_cost', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['inventory_id'], ['inventory.id'], ),
+    sa.ForeignKeyConstraint(['layer_id'], ['cost_layer.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_cost_consumption_inventory_date', 'cost_consumption', ['inventory_id', 'consumed_at'], unique=False)
+    op.create_index('ix_cost_consumption_consumer', 'cost_consumption', ['consumer_type', 'consumer_id'], unique=False)
+    op.create_index(op.f('ix_cost_consumption_layer_id'), 'cost_consumption', ['layer_id'], unique=False)
+    op.create_table('cost_activity',
+    sa.Column('inventory_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('since', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('inventory_id')
+    )
+
+    # Every item is flagged from the beginning: the first recompute (POST
+    # /costing/recompute or scripts/recompute_costs.py) opens the layers of all live
+    # purchases and allocates all live consumption. Months archived before this
+    # revision have no layers; their consumption is not replayed.
+    op.execute("INSERT INTO cost_activity (inventory_id, since) SELECT id, timestamp '1970-01-01' FROM inventory")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('cost_activity')
+    op.drop_index(op.f('ix_cost_consumption_layer_id'), table_name='cost_consumption')
+    op.drop_index('ix_cost_consumption_consumer', table_name='cost_consumption')
+    op.drop_index('ix_cost_consumption_inventory_date', table_name='cost_consumption')
+    op.drop_table('cost_consumption')
+    op.drop_index('ix_cost_layer_open', table_name='cost_layer', postgresql_where=sa.text('remaining_kg > 0'))
+    op.drop_index('ix_cost_layer_inventory_date', table_name='cost_layer')
+    op.drop_index('ux_cost_layer_purchase', table_name='cost_layer')
+    op.drop_table('cost_layer')
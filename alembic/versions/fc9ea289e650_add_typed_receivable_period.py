@@ -0,0 +1,41 @@
+"""add typed receivable period
+
+Revision ID: fc9ea289e650
+Revises: 26b7d2aa679a
+Create Date: 2026-10-19 03:41:13.330811
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fc9ea289e650'
+down_revision: Union[str, Sequence[str], None] = '26b7d2aa679a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('account_receivable', sa.Column('period_date', sa.Date(), nullable=True))
+    # 'Apr-25' -> 2025-04-01; labels are rewritten in canonical case ('apr-25' -> 'Apr-25').
+    # A label that is not a month fails here and has to be corrected first.
+    op.execute("""
+        UPDATE account_receivable
+        SET period_date = to_date(trim(period), 'Mon-YY'),
+            period = to_char(to_date(trim(period), 'Mon-YY'), 'Mon-YY')
+    """)
+    op.alter_column('account_receivable', 'period_date', nullable=False)
+    op.create_index(op.f('ix_account_receivable_period_date'), 'account_receivable', ['period_date'], unique=False)
+    # Fails if a buyer has several rows for one period; merge them before upgrading
+    op.create_index('ux_account_receivable_buyer_period', 'account_receivable', ['buyer_id', 'period_date'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_account_receivable_buyer_period', table_name='account_receivable')
+    op.drop_index(op.f('ix_account_receivable_period_date'), table_name='account_receivable')
+    op.drop_column('account_receivable', 'period_date')
@@ -0,0 +1,156 @@
+"""
+Dispatch of batched read requests (`POST /batch`).
+
+Each sub-request is matched against the application's GET routes and run through the
+route's own handler, so query validation, sparse fieldsets, response models and error
+formatting behave exactly as for a direct call. The batch request authenticates once
+and opens one session; both are handed to the sub-requests through `request.state`,
+where `get_current_user` and `get_db` pick them up instead of repeating the cookie
+check and the pool checkout. Sub-requests run one after another on that session, each
+inside its own savepoint, so an entry that fails is rolled back alone and the ones after
+it still run. Routes that do not answer JSON (the CSV exports) cannot be batched.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import orjson
+from fastapi import Request, status
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
+from starlette.routing import Match
+
+from app.core.config import settings
+from app.model.user import User
+from app.schema.batch.request import BatchItemRequest
+from app.schema.batch.response import BatchItemData
+
+
+NOT_JSON_MESSAGE = "Endpoint ini tidak mengembalikan JSON sehingga tidak dapat digabungkan."
+
+
+def _error_body(message: str) -> Dict[str, Any]:
+    return {"error": True, "message": message}
+
+
+def _sub_scope(request: Request, path: str, query: str, state: Dict[str, Any]) -> Dict[str, Any]:
+    scope = dict(request.scope)
+    scope.update(
+        method="GET",
+        path=path,
+        raw_path=path.encode(),
+        query_string=query.encode(),
+        state=state,
+    )
+    for key in ("route", "endpoint", "path_params"):
+        scope.pop(key, None)
+    return scope
+
+
+def _resolve(request: Request, scope: Dict[str, Any]) -> Tuple[Optional[APIRoute], int]:
+    """The GET route for the sub-request path, or the status to answer with."""
+    allowed_elsewhere = False
+    for route in request.app.router.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            scope.update(child_scope)
+            return route, status.HTTP_200_OK
+        if match == Match.PARTIAL:
+            allowed_elsewhere = True
+    return None, status.HTTP_405_METHOD_NOT_ALLOWED if allowed_elsewhere else status.HTTP_404_NOT_FOUND
+
+
+def _returns_json(route: APIRoute) -> bool:
+    response_class = route.response_class
+    if isinstance(response_class, DefaultPlaceholder):
+        response_class = response_class.value
+    return issubclass(response_class, JSONResponse)
+
+
+async def _call(route: APIRoute, scope: Dict[str, Any]) -> Tuple[int, Any]:
+    response: Dict[str, Any] = {"status": status.HTTP_500_INTERNAL_SERVER_ERROR, "json": True, "body": []}
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            headers = dict(message.get("headers", []))
+            response["json"] = headers.get(b"content-type", b"").startswith(b"application/json")
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    await route.handle(scope, receive, send)
+    body = b"".join(response["body"])
+    if not response["json"]:
+        return status.HTTP_406_NOT_ACCEPTABLE, _error_body(NOT_JSON_MESSAGE)
+    return response["status"], orjson.loads(body) if body else None
+
+
+async def _close_savepoint(session: AsyncSession, savepoint: AsyncSessionTransaction, failed: bool) -> None:
+    """
+    Releases the entry's savepoint, or rolls back to it when the entry failed: a failed
+    statement (including a retryable conflict answered with 409) aborts the transaction,
+    and rolling back to the savepoint makes it usable for the entries that follow.
+    """
+    try:
+        if savepoint.is_active:
+            if failed:
+                await savepoint.rollback()
+            else:
+                await savepoint.commit()
+    except Exception:
+        # The connection itself is gone; the remaining entries start a new transaction
+        await session.rollback()
+
+
+async def dispatch_reads(
+    request: Request,
+    items: List[BatchItemRequest],
+    session: AsyncSession,
+    user: User,
+) -> List[BatchItemData]:
+    state = {**request.scope.get("state", {}), "db_session": session, "current_user": user}
+    results: List[BatchItemData] = []
+    for item in items:
+        parts = urlsplit(item.path)
+        path = parts.path if parts.path.startswith("/") else f"/{parts.path}"
+        if not path.startswith(f"{settings.API_V1_STR}/"):
+            path = f"{settings.API_V1_STR}{path}"
+
+        scope = _sub_scope(request, path, parts.query, state)
+        route, route_status = _resolve(request, scope)
+        if route is None:
+            message = (
+                "Hanya permintaan GET yang dapat digabungkan."
+                if route_status == status.HTTP_405_METHOD_NOT_ALLOWED
+                else "Endpoint tidak ditemukan."
+            )
+            results.append(BatchItemData(id=item.id, path=item.path, status=route_status, body=_error_body(message)))
+            continue
+        if not _returns_json(route):
+            results.append(BatchItemData(
+                id=item.id, path=item.path, status=status.HTTP_406_NOT_ACCEPTABLE,
+                body=_error_body(NOT_JSON_MESSAGE),
+            ))
+            continue
+
+        # Every sub-request starts from an empty identity map, as it would with its own
+        # session, so partially loaded rows (sparse fieldsets) never leak into the next one
+        session.expunge_all()
+        savepoint = await session.begin_nested()
+        try:
+            sub_status, body = await _call(route, scope)
+        except Exception:
+            # Unhandled errors bypass the route's exception handlers (they are left to
+            # ServerErrorMiddleware); answer them for this entry only
+            sub_status = status.HTTP_500_INTERNAL_SERVER_ERROR
+            body = _error_body("Terjadi kesalahan. Mohon coba kembali.")
+        await _close_savepoint(session, savepoint, failed=sub_status >= status.HTTP_400_BAD_REQUEST)
+        results.append(BatchItemData(id=item.id, path=item.path, status=sub_status, body=body))
+    return results
@@ -1,17 +1,22 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, status, Query
+from app.api.route import FastJSONRoute
+from app.core.fieldsets import FIELDS_DESCRIPTION
 
 # --- Dependency Imports ---
 from app.service.account_receivable import AccountReceivableService
-from app.di.core import get_receivable_service
+from app.service.receivable_aging import ReceivableAgingService
+from app.di.core import get_receivable_aging_service, get_receivable_service
 
 # --- Pydantic Schema Imports ---
 from app.schema.account_receivable.request import (
     AccountReceivableCreateRequest,
     AccountReceivableUpdateRequest,
+    ReceivableAgingRunRequest,
 )
 from app.schema.account_receivable.response import (
     BulkAccountReceivableResponse,
+    ReceivableAgingResponse,
     SingleAccountReceivableResponse,
 )
 from app.schema.base_response import BaseSingleResponse
@@ -22,7 +27,8 @@ from app.di.deps import get_current_user
 router = APIRouter(
     prefix="/account-receivable",
     tags=["Account Receivables"],
-    dependencies=[Depends(get_current_user)]
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
 )
 
 # --- API Endpoints ---
@@ -37,7 +43,7 @@ async def create_account_receivable(
 
     This endpoint records a new accounts receivable entry for a specific buyer and period.
     - **buyer_id**: Must correspond to an existing buyer.
-    - **period**: The accounting period (e.g., 'Oct-25').
+    - **period**: The accounting period (e.g., 'Oct-25'); one record per buyer and period.
     - **age_..._days**: The receivable amounts for different aging buckets.
     """
     return await service.create(ar_create=request_data)
@@ -46,8 +52,11 @@ async def create_account_receivable(
 async def get_all_account_receivables(
     buyer_id: Optional[int] = Query(None, description="Filter by the buyer's unique ID"),
     period: Optional[str] = Query(None, description="Filter by period (e.g., 'Oct-25'). Case-insensitive search."),
+    period_from: Optional[str] = Query(None, description="First period to include (e.g., 'Jan-25')"),
+    period_to: Optional[str] = Query(None, description="Last period to include (e.g., 'Jun-25')"),
     page: int = Query(1, ge=1, description="Page number to retrieve"),
     limit: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: AccountReceivableService = Depends(get_receivable_service),
 ):
     """
@@ -56,12 +65,41 @@ async def get_all_account_receivables(
     This endpoint provides a paginated and filterable list of all account receivable records.
     - **buyer_id**: Filter records for a specific buyer.
     - **period**: Search for records within a specific accounting period.
+    - **period_from** / **period_to**: Inclusive range of periods, e.g. a buyer's trend
+      from 'Jan-25' to 'Jun-25'.
     """
-    return await service.get_all(buyer_id=buyer_id, period=period, page=page, limit=limit)
+    return await service.get_all(
+        buyer_id=buyer_id,
+        period=period,
+        period_from=period_from,
+        period_to=period_to,
+        page=page,
+        limit=limit,
+        fields=fields,
+    )
+
+@router.post("/aging", response_model=ReceivableAgingResponse)
+async def run_receivable_aging(
+    request_data: ReceivableAgingRunRequest,
+    service: ReceivableAgingService = Depends(get_receivable_aging_service),
+):
+    """
+    ### Compute the aging buckets of a period from sales and payments.
+
+    Each sale is an invoice of `weight_kg * price_per_kg`; a buyer's payments settle the
+    oldest invoices first, and what is left open is bucketed by age at the end of the
+    period (or today, for the current month). Rows of the period are updated, or created
+    for buyers with an open balance.
+    - **period**: The accounting period (e.g., 'Oct-25'); defaults to the current month.
+    - **full**: Recompute every buyer. By default a period that was already aged to the
+      same date only recomputes buyers with sales or payments recorded since.
+    """
+    return await service.run(period=request_data.period, full=request_data.full)
 
 @router.get("/{ar_id}", response_model=SingleAccountReceivableResponse)
 async def get_account_receivable_by_id(
     ar_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: AccountReceivableService = Depends(get_receivable_service),
 ):
     """
@@ -69,7 +107,7 @@ async def get_account_receivable_by_id(
 
     Retrieve the details of a specific account receivable record using its unique ID.
     """
-    return await service.get_by_id(ar_id=ar_id)
+    return await service.get_by_id(ar_id=ar_id, fields=fields)
 
 @router.put("/{ar_id}", response_model=SingleAccountReceivableResponse)
 async def update_account_receivable(
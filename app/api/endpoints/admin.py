@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, Query
+from app.api.route import FastJSONRoute
+
+# --- Dependency Imports ---
+from app.service.admin import AdminService
+from app.di.core import get_admin_service
+
+# --- Pydantic Schema Imports ---
+from app.schema.admin.response import BulkSlowQueryResponse
+from app.schema.base_response import BaseSingleResponse
+from app.di.deps import get_current_user
+
+# --- Router Initialization ---
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
+)
+
+# --- API Endpoints ---
+
+@router.get("/slow-queries", response_model=BulkSlowQueryResponse)
+async def get_slow_queries(
+    page: int = Query(1, ge=1, description="Page number to retrieve"),
+    limit: int = Query(20, ge=1, le=500, description="Number of items per page"),
+    service: AdminService = Depends(get_admin_service),
+):
+    """
+    ### Retrieve recorded slow queries.
+
+    Lists the most recent statements slower than `SLOW_QUERY_THRESHOLD_MS`, newest first.
+    - **statement**: The parameterized SQL.
+    - **parameter_shapes**: Types of the bind parameters (values are never stored).
+    - **plan**: `EXPLAIN (ANALYZE, BUFFERS)` output for sampled SELECT statements.
+    """
+    return await service.get_slow_queries(page=page, limit=limit)
+
+@router.delete("/slow-queries", response_model=BaseSingleResponse)
+async def clear_slow_queries(
+    service: AdminService = Depends(get_admin_service),
+):
+    """
+    ### Clear the slow-query log.
+
+    Empties the in-memory ring buffer of this worker process.
+    """
+    return await service.clear_slow_queries()
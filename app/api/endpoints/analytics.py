@@ -0,0 +1,170 @@
+from typing import Optional
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from app.api.route import FastJSONRoute
+
+# --- Dependency Imports ---
+from app.model.inventory import InventoryType
+from app.service.analytics import AnalyticsService
+from app.di.core import get_analytics_service
+
+# --- Pydantic Schema Imports ---
+from app.schema.analytics.request import MarginGroupBy, ProductionGroupBy, PurchaseGroupBy, SalesGroupBy
+from app.schema.analytics.response import AnalyticsResponse, BulkSaleMarginResponse, MarginResponse
+from app.di.deps import get_current_user
+
+# --- Router Initialization ---
+router = APIRouter(
+    prefix="/analytics",
+    tags=["Analytics"],
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
+)
+
+# --- API Endpoints ---
+
+@router.get("/sales", response_model=AnalyticsResponse)
+async def get_sales_revenue(
+    group_by: SalesGroupBy = Query(SalesGroupBy.MONTH, description="Group by 'day', 'month', 'buyer' or 'inventory'"),
+    buyer_id: Optional[int] = Query(None, description="Filter by Buyer ID"),
+    inventory_id: Optional[str] = Query(None, description="Filter by Inventory Item ID"),
+    start_date: Optional[date] = Query(None, description="Filter by start date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Filter by end date (YYYY-MM-DD)"),
+    service: AnalyticsService = Depends(get_analytics_service),
+):
+    """
+    ### Retrieve sales revenue per day, month, buyer or item.
+
+    Read from the daily sales rollup; filters match the sales transaction list.
+    - **total**: `sum(weight_kg * price_per_kg)` of the group.
+    - **key**: First day of the period (`YYYY-MM-DD`), or the buyer/item ID.
+    - **label**: Period label (`2025-04-01`, `Apr-25`), or the buyer/item name.
+
+    Results are cached for `ANALYTICS_CACHE_TTL_SECONDS`.
+    """
+    return await service.sales_revenue(
+        group_by=group_by,
+        buyer_id=buyer_id,
+        inventory_id=inventory_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+@router.get("/purchases", response_model=AnalyticsResponse)
+async def get_purchase_spend(
+    group_by: PurchaseGroupBy = Query(PurchaseGroupBy.SUPPLIER, description="Group by 'day', 'month', 'supplier' or 'inventory'"),
+    supplier_id: Optional[int] = Query(None, description="Filter by Supplier ID"),
+    inventory_id: Optional[str] = Query(None, description="Filter by Inventory Item ID"),
+    start_date: Optional[date] = Query(None, description="Filter by start date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Filter by end date (YYYY-MM-DD)"),
+    type: Optional[InventoryType] = Query(None, description="Filter by inventory type ('fabric' or 'thread')"),
+    service: AnalyticsService = Depends(get_analytics_service),
+):
+    """
+    ### Retrieve purchase spend per supplier, day, month or item.
+
+    Read from the daily purchase rollup; filters match the purchase transaction list.
+    - **total**: `sum(weight_kg * price_per_kg)` of the group.
+    - **key**: First day of the period (`YYYY-MM-DD`), or the supplier/item ID.
+    - **label**: Period label (`2025-04-01`, `Apr-25`), or the supplier/item name.
+
+    Results are cached for `ANALYTICS_CACHE_TTL_SECONDS`.
+    """
+    return await service.purchase_spend(
+        group_by=group_by,
+        supplier_id=supplier_id,
+        inventory_id=inventory_id,
+        start_date=start_date,
+        end_date=end_date,
+        inventory_type=type,
+    )
+
+@router.get("/production", response_model=AnalyticsResponse)
+async def get_production_output(
+    group_by: ProductionGroupBy = Query(ProductionGroupBy.MONTH, description="Group by 'day', 'month', 'formula' or 'machine'"),
+    knit_formula_id: Optional[int] = Query(None, description="Filter by Knit Formula ID"),
+    machine_id: Optional[int] = Query(None, description="Filter by Machine ID"),
+    start_date: Optional[date] = Query(None, description="Filter by start date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Filter by end date (YYYY-MM-DD)"),
+    service: AnalyticsService = Depends(get_analytics_service),
+):
+    """
+    ### Retrieve completed knitting output per day, month, formula or machine.
+
+    Read from the daily production rollup. Only completed runs are counted, dated by
+    their start date.
+    - **transaction_count**: Number of completed runs in the group.
+    - **key**: First day of the period (`YYYY-MM-DD`), or the formula/machine ID.
+    - **label**: Period label, the formula's product name or the machine name.
+
+    Results are cached for `ANALYTICS_CACHE_TTL_SECONDS`.
+    """
+    return await service.production_output(
+        group_by=group_by,
+        knit_formula_id=knit_formula_id,
+        machine_id=machine_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+@router.get("/margin", response_model=MarginResponse)
+async def get_sales_margin(
+    group_by: MarginGroupBy = Query(MarginGroupBy.MONTH, description="Group by 'month', 'buyer' or 'inventory'"),
+    buyer_id: Optional[int] = Query(None, description="Filter by Buyer ID"),
+    inventory_id: Optional[str] = Query(None, description="Filter by Inventory Item ID"),
+    start_date: Optional[date] = Query(None, description="Filter by start date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Filter by end date (YYYY-MM-DD)"),
+    service: AnalyticsService = Depends(get_analytics_service),
+):
+    """
+    ### Retrieve gross margin on sales per month, buyer or item.
+
+    Computed in one query from the sales and their FIFO cost of goods (`/costing`).
+    - **revenue**: `sum(weight_kg * price_per_kg)` of the group.
+    - **cost**: FIFO cost of the kilograms sold. Kilograms no cost layer covered, and
+      sales not yet costed by the last recompute, are valued at the item's average
+      cost; they are summed in **uncovered_kg**, and the sales with any of them are
+      counted in **estimated_count**.
+    - **margin** / **margin_pct**: `revenue - cost`, and as a percentage of revenue.
+
+    Archived months (before **archived_until**) are read from the daily sales rollup
+    and the consumption log: their totals per month and item are exact, while per
+    buyer their cost is apportioned by kilograms from each item's daily FIFO cost.
+    Results are cached for `ANALYTICS_CACHE_TTL_SECONDS`.
+    """
+    return await service.sales_margin(
+        group_by=group_by,
+        buyer_id=buyer_id,
+        inventory_id=inventory_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+@router.get("/margin/sales", response_model=BulkSaleMarginResponse)
+async def get_sale_margins(
+    buyer_id: Optional[int] = Query(None, description="Filter by Buyer ID"),
+    inventory_id: Optional[str] = Query(None, description="Filter by Inventory Item ID"),
+    start_date: Optional[date] = Query(None, description="Filter by start date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Filter by end date (YYYY-MM-DD)"),
+    page: int = Query(1, ge=1, description="Page number to retrieve"),
+    limit: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    service: AnalyticsService = Depends(get_analytics_service),
+):
+    """
+    ### Retrieve the margin of each sale.
+
+    Sales newest first with their revenue, FIFO cost and margin; filters match
+    `/analytics/margin`. **uncovered_kg** are the kilograms of a sale valued at its
+    item's average cost, because no cost layer covered them or the FIFO allocation has
+    not been recomputed since it was written; **estimated** marks a sale with any.
+    Archived sales (before **archived_until**) are no longer stored one by one and are
+    not listed; `/analytics/margin` still includes them.
+    """
+    return await service.sale_margins(
+        page=page,
+        limit=limit,
+        buyer_id=buyer_id,
+        inventory_id=inventory_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, status, Response, Request
+from app.api.route import FastJSONRoute
 
 # --- Dependency Imports ---
 from app.service.auth import AuthService
@@ -11,7 +12,7 @@ from app.schema.auth.response import SingleUserResponse
 from app.schema.base_response import BaseSingleResponse
 
 # --- Router Initialization ---
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=FastJSONRoute)
 from app.di.deps import get_current_user
 
 # --- API Endpoints ---
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.api.route import FastJSONRoute
+
+# --- Dependency Imports ---
+from app.api.batch import dispatch_reads
+from app.core.database import get_db
+from app.model.user import User
+
+# --- Pydantic Schema Imports ---
+from app.schema.batch.request import BatchRequest
+from app.schema.batch.response import BatchResponse
+from app.di.deps import get_current_user
+
+# --- Router Initialization ---
+router = APIRouter(
+    prefix="/batch",
+    tags=["Batch"],
+    route_class=FastJSONRoute
+)
+
+# --- API Endpoints ---
+
+@router.post("", response_model=BatchResponse)
+async def batch_read(
+    request: Request,
+    request_data: BatchRequest,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+):
+    """
+    ### Run several read requests in one call.
+
+    Each entry is a GET path relative to the API prefix, query string included, e.g.
+    `{"id": "stock", "path": "/inventory?type=thread&limit=50"}`. The entries run in order
+    through the regular endpoints with one authentication check and one database session,
+    and each response comes back under `data` with its own `status` and `body`.
+
+    - Only GET endpoints can be batched; other methods answer `405` for that entry.
+    - Endpoints that do not answer JSON (the `/export` downloads) answer `406` for that entry.
+    - An entry that fails (`404`, `422`, `500`, ...) does not fail the batch; its statements
+      are rolled back on their own and the following entries still run.
+    """
+    items = await dispatch_reads(request, request_data.requests, session, current_user)
+    return BatchResponse(data=items)
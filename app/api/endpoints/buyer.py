@@ -1,5 +1,7 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, status, Query
+from app.api.route import FastJSONRoute
+from app.core.fieldsets import FIELDS_DESCRIPTION
 
 # --- Dependency Imports ---
 from app.service.buyer import BuyerService
@@ -18,7 +20,8 @@ from app.di.deps import get_current_user
 router = APIRouter(
     prefix="/buyer",
     tags=["Buyers"],
-    dependencies=[Depends(get_current_user)]
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
 )
 
 # --- API Endpoints ---
@@ -42,8 +45,10 @@ async def create_buyer(
 @router.get("", response_model=BulkBuyerResponse)
 async def get_all_buyers(
     name: Optional[str] = Query(None, description="Filter by buyer name. Case-insensitive search."),
+    risked: Optional[bool] = Query(None, description="Only buyers with (true) or without (false) debt aged over 90 days"),
     page: int = Query(1, ge=1, description="Page number to retrieve"),
     limit: int = Query(10, ge=1, le=99999, description="Number of items per page"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: BuyerService = Depends(get_buyer_service),
 ):
     """
@@ -51,13 +56,17 @@ async def get_all_buyers(
 
     Provides a paginated and filterable list of all buyers.
     - The `is_risked` flag in the response will be `true` if the buyer has any
-      accounts receivable debt aged over 90 days.
+      accounts receivable debt aged over 90 days; `overdue_amount` is the debt aged
+      over 90 days in their latest receivable period.
+      Both are kept up to date whenever receivables change.
+    - **risked**: `true` lists only risky buyers.
     """
-    return await service.get_all(name=name, page=page, limit=limit)
+    return await service.get_all(name=name, risked=risked, page=page, limit=limit, fields=fields)
 
 @router.get("/{buyer_id}", response_model=SingleBuyerResponse)
 async def get_buyer_by_id(
     buyer_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: BuyerService = Depends(get_buyer_service),
 ):
     """
@@ -66,7 +75,7 @@ async def get_buyer_by_id(
     Retrieve the details of a specific buyer using their unique ID.
     - The `is_risked` flag in the response indicates if they have old debt.
     """
-    return await service.get_by_id(buyer_id=buyer_id)
+    return await service.get_by_id(buyer_id=buyer_id, fields=fields)
 
 @router.put("/{buyer_id}", response_model=SingleBuyerResponse)
 async def update_buyer(
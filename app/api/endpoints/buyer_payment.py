@@ -0,0 +1,83 @@
+from typing import Optional
+from datetime import date
+from fastapi import APIRouter, Depends, status, Query
+from app.api.route import FastJSONRoute
+
+# --- Dependency Imports ---
+from app.service.buyer_payment import BuyerPaymentService
+from app.di.core import get_buyer_payment_service
+
+# --- Pydantic Schema Imports ---
+from app.schema.buyer_payment.request import BuyerPaymentCreateRequest
+from app.schema.buyer_payment.response import (
+    BulkBuyerPaymentResponse,
+    SingleBuyerPaymentResponse,
+)
+from app.schema.base_response import BaseSingleResponse
+from app.di.deps import get_current_user
+
+# --- Router Initialization ---
+router = APIRouter(
+    prefix="/buyer-payments",
+    tags=["Buyer Payments"],
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
+)
+
+# --- API Endpoints ---
+
+@router.post("", status_code=status.HTTP_201_CREATED, response_model=SingleBuyerPaymentResponse)
+async def create_buyer_payment(
+    request_data: BuyerPaymentCreateRequest,
+    service: BuyerPaymentService = Depends(get_buyer_payment_service),
+):
+    """
+    ### Record a payment from a Buyer.
+
+    Payments are applied to the buyer's oldest open sales first when receivables are aged
+    (`POST /account-receivable/aging`).
+    - **buyer_id**: Must correspond to an existing buyer.
+    - **payment_date**: The date the payment was received.
+    - **amount**: The amount paid (must be greater than 0).
+    """
+    return await service.create(payment_create=request_data)
+
+@router.get("", response_model=BulkBuyerPaymentResponse)
+async def get_all_buyer_payments(
+    buyer_id: Optional[int] = Query(None, description="Filter by the buyer's unique ID"),
+    start_date: Optional[date] = Query(None, description="Filter payments from this date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Filter payments up to this date (YYYY-MM-DD)"),
+    page: int = Query(1, ge=1, description="Page number to retrieve"),
+    limit: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    service: BuyerPaymentService = Depends(get_buyer_payment_service),
+):
+    """
+    ### Retrieve all Buyer Payments.
+
+    Provides a paginated and filterable list of payments, newest first.
+    """
+    return await service.get_all(
+        buyer_id=buyer_id, start_date=start_date, end_date=end_date, page=page, limit=limit
+    )
+
+@router.get("/{payment_id}", response_model=SingleBuyerPaymentResponse)
+async def get_buyer_payment_by_id(
+    payment_id: int,
+    service: BuyerPaymentService = Depends(get_buyer_payment_service),
+):
+    """
+    ### Get a single Buyer Payment by ID.
+    """
+    return await service.get_by_id(payment_id=payment_id)
+
+@router.delete("/{payment_id}", response_model=BaseSingleResponse)
+async def delete_buyer_payment(
+    payment_id: int,
+    service: BuyerPaymentService = Depends(get_buyer_payment_service),
+):
+    """
+    ### Delete a Buyer Payment.
+
+    Removing a payment reopens the sales it covered on the next aging run.
+    """
+    return await service.delete(payment_id=payment_id)
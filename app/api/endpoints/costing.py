@@ -0,0 +1,59 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from app.api.route import FastJSONRoute
+
+# --- Dependency Imports ---
+from app.service.costing import CostingService
+from app.di.core import get_costing_service
+
+# --- Pydantic Schema Imports ---
+from app.schema.costing.request import CostRecomputeRequest
+from app.schema.costing.response import BulkCostLayerResponse, CostRecomputeResponse
+from app.di.deps import get_current_user
+
+
+# --- Router Initialization ---
+router = APIRouter(
+    prefix="/costing",
+    tags=["Costing"],
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
+)
+
+# --- API Endpoints ---
+
+@router.post("/recompute", response_model=CostRecomputeResponse)
+async def recompute_costs(
+    request_data: CostRecomputeRequest,
+    service: CostingService = Depends(get_costing_service),
+):
+    """
+    ### Bring the FIFO cost allocation up to date.
+
+    Every purchase opens a cost layer at its price. A completed knitting run opens one
+    for its fabric at the cost of the materials it consumed per output kg, and a
+    completed dyeing run one for the dyed output at the cost of the fabric it consumed;
+    both are dated at completion. Sales, completed knitting runs (their materials) and
+    dyeing runs consume the oldest open layers of their item dated on or before them,
+    and each draw is kept in the consumption log. Stock that no layer covers is valued
+    at the item's average cost. Threads are recomputed before fabric.
+    - **full**: Replay every item from the beginning. By default only items with stock
+      movements recorded since the last recompute are re-allocated, from the earliest
+      changed date on, so back-dated corrections do not replay the whole history.
+    """
+    return await service.recompute(full=request_data.full)
+
+@router.get("/layers", response_model=BulkCostLayerResponse)
+async def get_cost_layers(
+    inventory_id: Optional[str] = Query(None, description="Filter by inventory item"),
+    open_only: bool = Query(False, description="Only layers with stock remaining"),
+    page: int = Query(1, ge=1, description="Page number to retrieve"),
+    limit: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    service: CostingService = Depends(get_costing_service),
+):
+    """
+    ### Retrieve FIFO cost layers.
+
+    Layers in FIFO order per item, oldest first, with the kilograms still unconsumed.
+    """
+    return await service.get_layers(page=page, limit=limit, inventory_id=inventory_id, open_only=open_only)
@@ -1,6 +1,8 @@
 from typing import Optional
 from datetime import date
 from fastapi import APIRouter, Depends, status, Query
+from app.api.route import FastJSONRoute
+from app.core.fieldsets import FIELDS_DESCRIPTION
 
 # --- Dependency Imports ---
 from app.service.dyeing_process import DyeingProcessService
@@ -22,7 +24,8 @@ from app.di.deps import get_current_user
 router = APIRouter(
     prefix="/dyeing-process",
     tags=["Dyeing Processes"],
-    dependencies=[Depends(get_current_user)]
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
 )
 
 # --- API Endpoints ---
@@ -51,6 +54,7 @@ async def get_all_dyeing_processes(
     start_date: Optional[date] = Query(None, description="Filter by start date (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="Filter by end date (YYYY-MM-DD)"),
     dyeing_status: Optional[bool] = Query(None, description="Filter by status (True=complete, False=in-progress)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: DyeingProcessService = Depends(get_dyeing_process_service),
 ):
     """
@@ -64,11 +68,13 @@ async def get_all_dyeing_processes(
         start_date=start_date,
         end_date=end_date,
         dyeing_status=dyeing_status,
+        fields=fields,
     )
 
 @router.get("/{dp_id}", response_model=SingleDyeingProcessResponse)
 async def get_dyeing_process_by_id(
     dp_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: DyeingProcessService = Depends(get_dyeing_process_service),
 ):
     """
@@ -76,7 +82,7 @@ async def get_dyeing_process_by_id(
 
     Retrieve the details of a specific dyeing process using its unique ID.
     """
-    return await service.get_by_id(dp_id=dp_id)
+    return await service.get_by_id(dp_id=dp_id, fields=fields)
 
 @router.put("/{dp_id}", response_model=SingleDyeingProcessResponse)
 async def update_dyeing_process(
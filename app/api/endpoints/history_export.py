@@ -0,0 +1,46 @@
+from typing import Optional
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from app.api.route import FastJSONRoute
+
+# --- Dependency Imports ---
+from app.service.history_export import HistoryExportService
+from app.di.core import get_history_export_service
+
+# --- Pydantic Schema Imports ---
+from app.schema.history_export.request import ExportDataset
+from app.di.deps import get_current_user
+
+# --- Router Initialization ---
+router = APIRouter(
+    prefix="/export",
+    tags=["Export"],
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
+)
+
+# --- API Endpoints ---
+
+@router.get("/{dataset}", response_class=StreamingResponse)
+async def export_history(
+    dataset: ExportDataset,
+    start_date: Optional[date] = Query(None, description="Filter by start date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Filter by end date (YYYY-MM-DD)"),
+    service: HistoryExportService = Depends(get_history_export_service),
+):
+    """
+    ### Export sales, purchases, knitting or dyeing history as CSV.
+
+    Streams every column of the table, oldest first, for the date range (the
+    transaction date, or the start date of a process). Archived months are read
+    from their segment files and the rest from the database, so the result is the
+    same before and after `scripts/archive_history.py` moves a month out.
+    """
+    stream = await service.export_csv(dataset=dataset, start_date=start_date, end_date=end_date)
+    filename = f"{dataset.value}_{start_date or 'awal'}_{end_date or 'akhir'}.csv"
+    return StreamingResponse(
+        stream,
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
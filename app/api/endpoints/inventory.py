@@ -1,5 +1,7 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, status, Query
+from app.api.route import FastJSONRoute
+from app.core.fieldsets import FIELDS_DESCRIPTION
 
 # --- Dependency Imports ---
 from app.service.inventory import InventoryService
@@ -9,6 +11,7 @@ from app.di.core import get_inventory_service
 from app.schema.inventory.request import InventoryCreateRequest, InventoryUpdateRequest
 from app.schema.inventory.response import (
     BulkInventoryResponse,
+    InventoryValuationResponse,
     SingleInventoryResponse,
 )
 from app.schema.base_response import BaseSingleResponse
@@ -19,7 +22,8 @@ from app.di.deps import get_current_user
 router = APIRouter(
     prefix="/inventory",
     tags=["Inventories"],
-    dependencies=[Depends(get_current_user)]
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
 )
 
 # --- API Endpoints ---
@@ -48,6 +52,7 @@ async def get_all_inventories(
     name: Optional[str] = Query(None, description="Filter by item name. Case-insensitive search."),
     id: Optional[str] = Query(None, description="Filter by item ID. Case-insensitive search."),
     type: Optional[InventoryType] = Query(None, description="Filter by item type ('fabric' or 'thread')."),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: InventoryService = Depends(get_inventory_service),
 ):
     """
@@ -61,11 +66,28 @@ async def get_all_inventories(
         name=name,
         id=id,
         type=type,
+        fields=fields,
     )
 
+@router.get("/valuation", response_model=InventoryValuationResponse)
+async def get_inventory_valuation(
+    type: Optional[InventoryType] = Query(None, description="Filter by item type ('fabric' or 'thread')."),
+    service: InventoryService = Depends(get_inventory_service),
+):
+    """
+    ### Value the stock on hand.
+
+    Sums `weight_kg * average_cost` over all items in one query, per item type.
+    - **average_cost**: Moving weighted-average purchase cost per kg of the item,
+      updated on every purchase create, update and delete.
+    - Negative stock is valued at zero.
+    """
+    return await service.get_valuation(type=type)
+
 @router.get("/{inventory_id}", response_model=SingleInventoryResponse)
 async def get_inventory_by_id(
     inventory_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: InventoryService = Depends(get_inventory_service),
 ):
     """
@@ -74,7 +96,7 @@ async def get_inventory_by_id(
     Retrieve the details and current stock levels of a specific inventory item
     using its unique ID.
     """
-    return await service.get_by_id(inventory_id=inventory_id)
+    return await service.get_by_id(inventory_id=inventory_id, fields=fields)
 
 @router.put("/{inventory_id}", response_model=SingleInventoryResponse)
 async def update_inventory(
@@ -1,4 +1,7 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, status, Query
+from app.api.route import FastJSONRoute
+from app.core.fieldsets import FIELDS_DESCRIPTION
 
 # --- Dependency Imports ---
 from app.service.knit_formula import KnitFormulaService
@@ -20,7 +23,8 @@ from app.di.deps import get_current_user
 router = APIRouter(
     prefix="/knit-formula",
     tags=["Knit Formulas"],
-    dependencies=[Depends(get_current_user)]
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
 )
 
 # --- API Endpoints ---
@@ -55,6 +59,7 @@ async def create_knit_formula(
 async def get_all_knit_formulas(
     page: int = Query(1, ge=1, description="Page number to retrieve"),
     limit: int = Query(10, ge=1, le=9999, description="Number of items per page"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: KnitFormulaService = Depends(get_knit_formula_service),
 ):
     """
@@ -62,11 +67,12 @@ async def get_all_knit_formulas(
 
     Provides a paginated list of all knit formulas in the system.
     """
-    return await service.get_all(page=page, limit=limit)
+    return await service.get_all(page=page, limit=limit, fields=fields)
 
 @router.get("/{kf_id}", response_model=SingleKnitFormulaResponse)
 async def get_knit_formula_by_id(
     kf_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: KnitFormulaService = Depends(get_knit_formula_service),
 ):
     """
@@ -74,7 +80,7 @@ async def get_knit_formula_by_id(
 
     Retrieve the details of a specific knit formula using its unique ID.
     """
-    return await service.get_by_id(kf_id=kf_id)
+    return await service.get_by_id(kf_id=kf_id, fields=fields)
 
 @router.put("/{kf_id}", response_model=SingleKnitFormulaResponse)
 async def update_knit_formula(
@@ -1,6 +1,8 @@
 from typing import Optional
 from datetime import date
 from fastapi import APIRouter, Depends, status, Query
+from app.api.route import FastJSONRoute
+from app.core.fieldsets import FIELDS_DESCRIPTION
 
 # --- Dependency Imports ---
 from app.service.knitting_process import KnittingProcessService
@@ -22,7 +24,8 @@ from app.di.deps import get_current_user
 router = APIRouter(
     prefix="/knitting-process",
     tags=["Knitting Processes"],
-    dependencies=[Depends(get_current_user)]
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
 )
 
 # --- API Endpoints ---
@@ -57,6 +60,7 @@ async def get_all_knitting_processes(
     knit_formula_id: Optional[int] = Query(None, description="Filter by Knit Formula ID"),
     start_date: Optional[date] = Query(None, description="Filter by start date (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="Filter by end date (YYYY-MM-DD)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: KnittingProcessService = Depends(get_knitting_process_service),
 ):
     """
@@ -70,11 +74,13 @@ async def get_all_knitting_processes(
         knit_formula_id=knit_formula_id,
         start_date=start_date,
         end_date=end_date,
+        fields=fields,
     )
 
 @router.get("/{kp_id}", response_model=SingleKnittingProcessResponse)
 async def get_knitting_process_by_id(
     kp_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: KnittingProcessService = Depends(get_knitting_process_service),
 ):
     """
@@ -82,7 +88,7 @@ async def get_knitting_process_by_id(
 
     Retrieve the details of a specific knitting process using its unique ID.
     """
-    return await service.get_by_id(kp_id=kp_id)
+    return await service.get_by_id(kp_id=kp_id, fields=fields)
 
 @router.put("/{kp_id}", response_model=SingleKnittingProcessResponse)
 async def update_knitting_process(
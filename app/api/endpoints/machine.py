@@ -1,5 +1,6 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, status, Query
+from app.api.route import FastJSONRoute
 
 # --- Dependency Imports ---
 from app.service.machine import MachineService
@@ -18,7 +19,8 @@ from app.di.deps import get_current_user
 router = APIRouter(
     prefix="/machine",
     tags=["Machines"],
-    dependencies=[Depends(get_current_user)]
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
 )
 
 # --- API Endpoints ---
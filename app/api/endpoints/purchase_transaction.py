@@ -1,6 +1,8 @@
 from typing import Optional
 from datetime import date
 from fastapi import APIRouter, Depends, status, Query
+from app.api.route import FastJSONRoute
+from app.core.fieldsets import FIELDS_DESCRIPTION
 
 # --- Dependency Imports ---
 from app.model.inventory import InventoryType
@@ -23,7 +25,8 @@ from app.di.deps import get_current_user
 router = APIRouter(
     prefix="/purchase-transaction",
     tags=["Purchase Transactions"],
-    dependencies=[Depends(get_current_user)]
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
 )
 
 # --- API Endpoints ---
@@ -54,6 +57,7 @@ async def get_all_purchase_transactions(
     start_date: Optional[date] = Query(None, description="Filter by start date (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="Filter by end date (YYYY-MM-DD)"),
     type: Optional[InventoryType] = Query(None, description="Filter by inventory type ('fabric' or 'thread')"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: PurchaseTransactionService = Depends(get_purchase_transaction_service),
 ):
     """
@@ -69,11 +73,13 @@ async def get_all_purchase_transactions(
         start_date=start_date,
         end_date=end_date,
         inventory_type=type,
+        fields=fields,
     )
 
 @router.get("/{pt_id}", response_model=SinglePurchaseTransactionResponse)
 async def get_purchase_transaction_by_id(
     pt_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: PurchaseTransactionService = Depends(get_purchase_transaction_service),
 ):
     """
@@ -81,7 +87,7 @@ async def get_purchase_transaction_by_id(
 
     Retrieve the details of a specific purchase transaction using its unique ID.
     """
-    return await service.get_by_id(pt_id=pt_id)
+    return await service.get_by_id(pt_id=pt_id, fields=fields)
 
 @router.put("/{pt_id}", response_model=SinglePurchaseTransactionResponse)
 async def update_purchase_transaction(
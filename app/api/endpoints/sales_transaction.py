@@ -1,6 +1,8 @@
 from typing import Optional
 from datetime import date
 from fastapi import APIRouter, Depends, status, Query
+from app.api.route import FastJSONRoute
+from app.core.fieldsets import FIELDS_DESCRIPTION
 
 # --- Dependency Imports ---
 from app.service.sales_transaction import SalesTransactionService
@@ -22,7 +24,8 @@ from app.di.deps import get_current_user
 router = APIRouter(
     prefix="/sales-transaction",
     tags=["Sales Transactions"],
-    dependencies=[Depends(get_current_user)]
+    dependencies=[Depends(get_current_user)],
+    route_class=FastJSONRoute
 )
 
 # --- API Endpoints ---
@@ -53,6 +56,7 @@ async def get_all_sales_transactions(
     inventory_id: Optional[str] = Query(None, description="Filter by Inventory Item ID"),
     start_date: Optional[date] = Query(None, description="Filter by start date (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="Filter by end date (YYYY-MM-DD)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: SalesTransactionService = Depends(get_sales_transaction_service),
 ):
     """
@@ -67,11 +71,13 @@ async def get_all_sales_transactions(
         inventory_id=inventory_id,
         start_date=start_date,
         end_date=end_date,
+        fields=fields,
     )
 
 @router.get("/{st_id}", response_model=SingleSalesTransactionResponse)
 async def get_sales_transaction_by_id(
     st_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: SalesTransactionService = Depends(get_sales_transaction_service),
 ):
     """
@@ -79,7 +85,7 @@ async def get_sales_transaction_by_id(
 
     Retrieve the details of a specific sales transaction using its unique ID.
     """
-    return await service.get_by_id(st_id=st_id)
+    return await service.get_by_id(st_id=st_id, fields=fields)
 
 @router.put("/{st_id}", response_model=SingleSalesTransactionResponse)
 async def update_sales_transaction(
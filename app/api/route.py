@@ -0,0 +1,79 @@
+import asyncio
+from typing import Any, Callable
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.tracing import span
+
+
+class TracedRoute(APIRoute):
+    """
+    API route that wraps the whole handler (dependency resolution, endpoint
+    call and response serialization) in its own span.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        name = f"handler {self.name}"
+
+        async def traced_handler(request: Request) -> Response:
+            with span(name, layer="endpoint", route=self.path):
+                return await handler(request)
+
+        return traced_handler
+
+
+class FastJSONRoute(TracedRoute):
+    """
+    Traced route with a serialization fast path.
+
+    When the endpoint returns an instance of exactly its `response_model`, the model
+    was already validated when the service built it, so it is serialized straight to
+    JSON bytes by pydantic-core instead of FastAPI's dump, re-validate and
+    `jsonable_encoder` round trip. Anything else (dicts, subclasses, routes that set
+    cookies or headers through a `Response` parameter, or that use the
+    `response_model_*` filters) takes the regular path.
+
+    Sparse-fieldset responses (`app.core.fieldsets.sparse_response`) are subclasses
+    of the response model that leave fields out; they always take the direct path,
+    since re-validating them against the full model would reject them.
+    """
+
+    def _fast_path_eligible(self) -> bool:
+        return (
+            asyncio.iscoroutinefunction(self.dependant.call)
+            and isinstance(self.response_model, type)
+            and issubclass(self.response_model, BaseModel)
+            and self.dependant.response_param_name is None
+            and self.response_model_include is None
+            and self.response_model_exclude is None
+            and not self.response_model_exclude_unset
+            and not self.response_model_exclude_defaults
+            and not self.response_model_exclude_none
+        )
+
+    def get_route_handler(self) -> Callable:
+        call = self.dependant.call
+        if getattr(call, "__fast_json__", None) is None and self._fast_path_eligible():
+            model = self.response_model
+            status_code = self.status_code or 200
+            fast = settings.FAST_JSON_RESPONSES
+
+            async def endpoint(**values: Any) -> Any:
+                content = await call(**values)
+                content_type = type(content)
+                if (fast and content_type is model) or (
+                    getattr(content_type, "__sparse__", False) and isinstance(content, model)
+                ):
+                    return Response(
+                        content.model_dump_json(),
+                        status_code=status_code,
+                        media_type="application/json",
+                    )
+                return content
+
+            endpoint.__fast_json__ = call
+            self.dependant.call = endpoint
+        return super().get_route_handler()
@@ -2,8 +2,12 @@ from fastapi import APIRouter
 
 # Import all the endpoint routers we have created
 from app.api.endpoints.account_receivable import router as account_receivable_router
+from app.api.endpoints.analytics import router as analytics_router
 from app.api.endpoints.buyer import router as buyer_router
+from app.api.endpoints.buyer_payment import router as buyer_payment_router
+from app.api.endpoints.costing import router as costing_router
 from app.api.endpoints.dyeing_process import router as dyeing_process_router
+from app.api.endpoints.history_export import router as history_export_router
 from app.api.endpoints.inventory import router as inventory_router
 from app.api.endpoints.knit_formula import router as knit_formula_router
 from app.api.endpoints.knitting_process import router as knitting_process_router
@@ -13,6 +17,8 @@ from app.api.endpoints.purchase_transaction import router as purchase_transactio
 from app.api.endpoints.sales_transaction import router as sales_transaction_router
 from app.api.endpoints.supplier import router as supplier_router
 from app.api.endpoints.auth import router as auth_router
+from app.api.endpoints.admin import router as admin_router
+from app.api.endpoints.batch import router as batch_router
 
 
 # Create main API router
@@ -39,6 +45,10 @@ api_router.include_router(
     buyer_router,
     responses=common_responses,
 )
+api_router.include_router(
+    buyer_payment_router,
+    responses=common_responses,
+)
 api_router.include_router(
     dyeing_process_router,
     responses=common_responses,
@@ -75,6 +85,26 @@ api_router.include_router(
     supplier_router,
     responses=common_responses,
 )
+api_router.include_router(
+    admin_router,
+    responses=common_responses,
+)
+api_router.include_router(
+    batch_router,
+    responses=common_responses,
+)
+api_router.include_router(
+    analytics_router,
+    responses=common_responses,
+)
+api_router.include_router(
+    history_export_router,
+    responses=common_responses,
+)
+api_router.include_router(
+    costing_router,
+    responses=common_responses,
+)
 
 def get_api_router():
     """Get the configured API router with all endpoints included."""
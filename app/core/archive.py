@@ -0,0 +1,253 @@
+"""
+Segment files of archived history.
+
+`scripts/archive_history.py` moves whole past months of the history tables out of
+the database, one file per table and month under `ARCHIVE_DIR`
+(`<table>/<table>_YYYY_MM.seg`), and records each file in the `archive_segment`
+manifest. The export endpoints (`/export`) read archived months back from the files
+and the rest from the database.
+
+A segment is columnar and self-describing:
+
+    b"SEG1\\n"
+    u32 length + JSON header  {"table", "month", "columns": [[name, kind], ...]}
+    blocks, each:
+        u32 length + JSON block header  {"rows": n, "sizes": [compressed size per column]}
+        one zlib-compressed column after another
+
+Every column of a block is stored as a null mask (one byte per row) followed by the
+values: little-endian int64 / float64 arrays for numbers and timestamps (microseconds
+since 1970-01-01, naive like the columns), one byte per boolean, and int32 lengths
+plus UTF-8 bytes for strings and JSON. Blocks hold up to ARCHIVE_BLOCK_ROWS rows, so
+writing and reading stream in bounded memory.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import JSON, Boolean, Date, DateTime, Float, Integer, String, TypeDecorator
+from sqlalchemy.sql.schema import Table
+
+from app.core.config import settings
+
+MAGIC = b"SEG1\n"
+EPOCH = datetime(1970, 1, 1)
+
+# Archivable tables and the date column their months are cut on
+ARCHIVED_TABLES: Dict[str, str] = {
+    "sales_transaction": "transaction_date",
+    "purchase_transaction": "transaction_date",
+    "knitting_process": "start_date",
+    "dyeing_process": "start_date",
+}
+
+_LENGTH = struct.Struct("<I")
+_SWAP = sys.byteorder == "big"
+
+Columns = List[Tuple[str, str]]
+
+
+def archive_root() -> Path:
+    return Path(settings.ARCHIVE_DIR)
+
+
+def segment_path(table: str, month: date) -> str:
+    """Path of a month's segment, relative to ARCHIVE_DIR."""
+    return f"{table}/{table}_{month:%Y_%m}.seg"
+
+
+def column_kinds(table: Table) -> Columns:
+    """(name, kind) of every column of a table, in table order."""
+    columns = []
+    for column in table.columns:
+        type_ = column.type.impl_instance if isinstance(column.type, TypeDecorator) else column.type
+        if isinstance(type_, Boolean):
+            kind = "bool"
+        elif isinstance(type_, Integer):
+            kind = "int"
+        elif isinstance(type_, Float):
+            kind = "float"
+        elif isinstance(type_, DateTime):
+            kind = "datetime"
+        elif isinstance(type_, Date):
+            kind = "date"
+        elif isinstance(type_, JSON):
+            kind = "json"
+        elif isinstance(type_, String):
+            kind = "str"
+        else:
+            raise TypeError(f"Unsupported column type for archiving: {table.name}.{column.name}")
+        columns.append((column.name, kind))
+    return columns
+
+
+# --- Column encoding ---
+
+def _to_bytes(values: array) -> bytes:
+    if _SWAP:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if _SWAP:
+        values.byteswap()
+    return values
+
+
+def _encode(kind: str, values: Sequence[Any]) -> bytes:
+    mask = bytes(value is None for value in values)
+    if kind in ("str", "json"):
+        if kind == "json":
+            # Typed reads return the decoded value, raw ones the JSON text
+            values = [value if value is None or isinstance(value, str) else json.dumps(value) for value in values]
+        encoded = [b"" if value is None else value.encode() for value in values]
+        payload = _to_bytes(array("i", (len(data) for data in encoded))) + b"".join(encoded)
+    elif kind == "float":
+        payload = _to_bytes(array("d", (0.0 if value is None else value for value in values)))
+    elif kind == "bool":
+        payload = bytes(bool(value) for value in values)
+    else:
+        if kind == "datetime":
+            values = [None if value is None else (value - EPOCH) // timedelta(microseconds=1) for value in values]
+        elif kind == "date":
+            values = [None if value is None else value.toordinal() for value in values]
+        payload = _to_bytes(array("q", (0 if value is None else value for value in values)))
+    return zlib.compress(mask + payload, 6)
+
+
+def _decode(kind: str, rows: int, blob: bytes) -> List[Any]:
+    data = zlib.decompress(blob)
+    mask, payload = data[:rows], data[rows:]
+    if kind in ("str", "json"):
+        lengths = _from_bytes("i", payload[: rows * 4])
+        values, offset = [], rows * 4
+        for length in lengths:
+            values.append(payload[offset:offset + length].decode())
+            offset += length
+        if kind == "json":
+            values = [json.loads(value) if value else None for value in values]
+    elif kind == "float":
+        values = list(_from_bytes("d", payload))
+    elif kind == "bool":
+        values = [bool(value) for value in payload]
+    else:
+        values = list(_from_bytes("q", payload))
+        if kind == "datetime":
+            values = [EPOCH + timedelta(microseconds=value) for value in values]
+        elif kind == "date":
+            values = [date.fromordinal(value) for value in values]
+    return [None if null else value for null, value in zip(mask, values)]
+
+
+def _read_chunk(file: BinaryIO) -> Optional[bytes]:
+    prefix = file.read(_LENGTH.size)
+    if not prefix:
+        return None
+    (length,) = _LENGTH.unpack(prefix)
+    return file.read(length)
+
+
+# --- Files ---
+
+class SegmentWriter:
+    """
+    Writes a segment to `<path>.tmp`; `close()` fsyncs it, moves it into place and
+    returns its (size, sha256). `abort()` discards the segment, also after `close()`
+    when the transaction that records it fails.
+    """
+
+    def __init__(self, path: Path, *, table: str, month: date, columns: Columns):
+        self.path = path
+        self.columns = columns
+        self.rows = 0
+        self._digest = hashlib.sha256()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = path.with_name(path.name + ".tmp")
+        self._file = open(self._tmp, "wb")
+        header = json.dumps({"table": table, "month": month.isoformat(), "columns": columns}).encode()
+        self._write(MAGIC)
+        self._write(_LENGTH.pack(len(header)) + header)
+
+    def _write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._digest.update(data)
+
+    def write_block(self, rows: Sequence[Sequence[Any]]) -> None:
+        """Appends rows (tuples in column order) as one block."""
+        if not rows:
+            return
+        blobs = [_encode(kind, [row[index] for row in rows]) for index, (_, kind) in enumerate(self.columns)]
+        header = json.dumps({"rows": len(rows), "sizes": [len(blob) for blob in blobs]}).encode()
+        self._write(_LENGTH.pack(len(header)) + header)
+        for blob in blobs:
+            self._write(blob)
+        self.rows += len(rows)
+
+    def close(self) -> Tuple[int, str]:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._tmp, self.path)
+        return self.path.stat().st_size, self._digest.hexdigest()
+
+    def abort(self) -> None:
+        self._file.close()
+        self._tmp.unlink(missing_ok=True)
+        self.path.unlink(missing_ok=True)
+
+
+def read_header(file: BinaryIO) -> dict:
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"Not a segment file: {getattr(file, 'name', file)}")
+    return json.loads(_read_chunk(file))
+
+
+def read_blocks(path: Path) -> Iterator[List[Dict[str, Any]]]:
+    """Yields the rows of a segment as dicts, one block at a time."""
+    with open(path, "rb") as file:
+        columns = read_header(file)["columns"]
+        while True:
+            header = _read_chunk(file)
+            if header is None:
+                return
+            block = json.loads(header)
+            values = [
+                _decode(kind, block["rows"], file.read(size))
+                for (_, kind), size in zip(columns, block["sizes"])
+            ]
+            names = [name for name, _ in columns]
+            yield [dict(zip(names, row)) for row in zip(*values)]
+
+
+async def stream_segment(path: Path) -> AsyncIterator[List[Dict[str, Any]]]:
+    """`read_blocks` off the event loop: each block is read and decoded in a thread."""
+    blocks = read_blocks(path)
+    try:
+        while True:
+            block = await asyncio.to_thread(next, blocks, None)
+            if block is None:
+                return
+            yield block
+    finally:
+        blocks.close()
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,54 @@
+"""In-process TTL cache for read-mostly query results (dashboard aggregates)."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    Thread-safe mapping whose entries expire `ttl_seconds` after they are stored; the
+    least recently used entry is evicted beyond `max_entries`. A TTL of 0 disables it.
+    Entries are per worker process, so the TTL bounds how stale another worker's
+    writes can appear; writes in this process call `clear()`.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+analytics_cache = TTLCache(
+    ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS,
+    max_entries=settings.ANALYTICS_CACHE_MAX_ENTRIES,
+)
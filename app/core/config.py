@@ -1,6 +1,10 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import PostgresDsn, field_validator
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Literal
+
+# Stock row locking on write paths. "none" reads stock rows without a lock and can lose
+# concurrent stock updates; it only exists as the baseline of benchmarks/contention.py.
+InventoryLockStrategy = Literal["none", "for_update", "nowait"]
 
 class Settings(BaseSettings):
     """Application settings with environment variable loading."""
@@ -36,6 +40,65 @@ class Settings(BaseSettings):
     # Database connection pool settings
     DB_POOL_SIZE: int = 10
     DB_MAX_OVERFLOW: int = 20
+    DB_POOL_PREWARM: int = 2
+    READINESS_TIMEOUT_SECONDS: float = 2.0
+    
+    # Statement caching: SQLAlchemy compiled cache entries per engine and asyncpg
+    # prepared statements per connection (set the latter to 0 behind pgbouncer
+    # in transaction pooling mode)
+    SQL_COMPILED_CACHE_SIZE: int = 1000
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    
+    # Serialize response models straight to JSON, skipping FastAPI's response_model round trip
+    FAST_JSON_RESPONSES: bool = True
+    
+    # Many-to-one loading on list and detail reads: "joined" (same query) or "selectin"
+    # (one extra IN query per relation); collections are always selectin. Overrides are
+    # keyed by query shape (root table), e.g. '{"knitting_process": "selectin"}'
+    RELATIONSHIP_LOADING: str = "joined"
+    RELATIONSHIP_LOADING_OVERRIDES: Dict[str, str] = {}
+    
+    # Maximum sub-requests accepted by POST /batch
+    BATCH_MAX_REQUESTS: int = 20
+    
+    # Dashboard aggregates (/analytics) are cached per worker for this long; 0 disables.
+    # Sales and purchase writes in the same worker clear the cache immediately
+    ANALYTICS_CACHE_TTL_SECONDS: float = 300.0
+    ANALYTICS_CACHE_MAX_ENTRIES: int = 256
+    
+    # Monthly transaction partitions (app/core/partitions.py): the app creates them this
+    # many months ahead, checking every PARTITION_MAINTENANCE_INTERVAL_HOURS; 0 disables
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_MAINTENANCE_INTERVAL_HOURS: float = 24.0
+    
+    # Cold history (app/core/archive.py): segment files written by
+    # scripts/archive_history.py, relative to the working directory unless absolute
+    ARCHIVE_DIR: str = "archive"
+    ARCHIVE_BLOCK_ROWS: int = 50_000
+    
+    # FIFO costing (app/repository/cost_layer.py): open layers are read into an
+    # item's queue this many at a time
+    COST_LAYER_BATCH_ROWS: int = 5_000
+    
+    # Stock row locking on write paths (see InventoryLockStrategy; "none" is for benchmarks only)
+    INVENTORY_LOCK_STRATEGY: InventoryLockStrategy = "for_update"
+    
+    # Observability
+    LOG_LEVEL: str = "INFO"
+    METRICS_ENABLED: bool = True
+    QUERY_STATS_ENABLED: bool = True
+    SQL_QUERY_WARN_THRESHOLD: int = 20
+    SQL_REPEATED_QUERY_THRESHOLD: int = 5
+    SLOW_QUERY_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1
+    SLOW_QUERY_BUFFER_SIZE: int = 200
+    TRACING_ENABLED: bool = False
+    TRACE_SAMPLE_RATE: float = 0.05
+    TRACE_MIN_DURATION_MS: float = 0.0
+    TRACE_EXPORTER: str = "file"  # "file", "otlp" or "none"
+    TRACE_FILE_PATH: str = "traces.jsonl"
+    TRACE_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
     
     # Rate Limiting Settings (Step 2)
     RATE_LIMIT_CALLS: int = 100
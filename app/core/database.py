@@ -1,11 +1,15 @@
 """Database setup and session management."""
 
 from typing import AsyncGenerator
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel
 
 from app.core.config import settings
+from app.core.metrics import InstrumentedAsyncAdaptedQueuePool, instrument_pool
+from app.core.query_stats import instrument_query_stats
+from app.core.slow_query import instrument_slow_queries
+from app.core.tracing import instrument_tracing
 
 # Create async database engine
 ASYNC_DATABASE_URI = str(settings.DATABASE_URI).replace("postgresql://", "postgresql+asyncpg://")
@@ -15,9 +19,26 @@ engine = create_async_engine(
     echo=settings.SQL_ECHO,
     pool_pre_ping=True,
     pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    query_cache_size=settings.SQL_COMPILED_CACHE_SIZE,
+    connect_args={"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE},
 )
 
+# Record checkout wait, overflow usage and connection lifetime
+instrument_pool(engine.sync_engine)
+
+# Count statements and database time per request
+instrument_query_stats(engine.sync_engine)
+
+# Keep a sampled log of slow statements with their plans
+if settings.SLOW_QUERY_ENABLED:
+    instrument_slow_queries(engine.sync_engine)
+
+# Give every SQL statement and commit a span in sampled traces
+if settings.TRACING_ENABLED:
+    instrument_tracing(engine.sync_engine)
+
 # Create async session factory
 async_session = sessionmaker(
     engine, 
@@ -26,8 +47,17 @@ async_session = sessionmaker(
 )
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency for getting an async database session."""
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for getting an async database session.
+
+    Sub-requests of a batch (`app/api/batch.py`) reuse the batch's session, which the
+    batch request opens and commits itself.
+    """
+    shared = getattr(request.state, "db_session", None)
+    if shared is not None:
+        yield shared
+        return
     async with async_session() as session:
         try:
             yield session
@@ -36,13 +66,3 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()
             raise
 
-
-async def create_db_and_tables() -> None:
-    """Create database tables from SQLModel models."""
-    async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
-
-
-async def init_db() -> None:
-    """Initialize the database with required tables."""
-    await create_db_and_tables()
@@ -0,0 +1,215 @@
+"""
+Sparse fieldsets (`?fields=id,weight_kg,buyer.name`).
+
+A request's field list is parsed against the endpoint's response schema into a
+`FieldSet` tree. The tree drives both ends of the request:
+
+- `loader_options` turns it into `load_only` for the requested columns and eager
+  loading for the requested relationships only (the rest get `noload`), so the SQL
+  fetches just those columns and joins;
+- `sparse_response` builds (and caches) a response model containing only those
+  fields, which the route serializes as-is.
+
+`id` is always returned. A relationship named without sub-fields (`buyer`) returns
+the whole nested object; `buyer.name` returns the buyer's `id` and `name`.
+Computed fields declare the columns they are derived from in the schema's
+`sparse_dependencies`; those columns are loaded but left out of the output.
+"""
+
+import typing
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ConfigDict, computed_field, create_model
+from pydantic.fields import FieldInfo
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import load_only, noload
+
+from app.core.loading import loader_for
+
+FIELDS_DESCRIPTION = (
+    "Comma-separated fields to return, e.g. `id,weight_kg,buyer.name`. "
+    "Only the requested columns and relations are loaded."
+)
+
+
+@dataclass(frozen=True)
+class FieldSet:
+    schema: Type[BaseModel]
+    fields: FrozenSet[str]
+    nested: Tuple[Tuple[str, "FieldSet"], ...] = ()
+
+    def child(self, name: str) -> Optional["FieldSet"]:
+        return dict(self.nested).get(name)
+
+    def dependencies(self) -> FrozenSet[str]:
+        """Fields that are not returned but are needed to compute requested computed fields."""
+        declared: Dict[str, Sequence[str]] = getattr(self.schema, "sparse_dependencies", {})
+        needed = {dep for name in self.fields for dep in declared.get(name, ())}
+        return frozenset(needed - self.fields)
+
+
+def _nested_schema(annotation: Any) -> Optional[Type[BaseModel]]:
+    """The pydantic model inside `X`, `Optional[X]` or `List[X]`, if any."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        found = _nested_schema(arg)
+        if found is not None:
+            return found
+    return None
+
+
+def _replace_schema(annotation: Any, old: Type[BaseModel], new: Type[BaseModel]) -> Any:
+    if annotation is old:
+        return new
+    args = typing.get_args(annotation)
+    if not args:
+        return annotation
+    origin = typing.get_origin(annotation)
+    replaced = tuple(_replace_schema(arg, old, new) for arg in args)
+    return typing.Union[replaced] if origin is typing.Union else origin[replaced]
+
+
+@lru_cache(maxsize=None)
+def full_fieldset(schema: Type[BaseModel]) -> FieldSet:
+    names = set(schema.model_fields) | set(schema.model_computed_fields)
+    nested = []
+    for name, field in schema.model_fields.items():
+        nested_schema = _nested_schema(field.annotation)
+        if nested_schema is not None:
+            nested.append((name, full_fieldset(nested_schema)))
+    return FieldSet(schema, frozenset(names), tuple(sorted(nested, key=lambda item: item[0])))
+
+
+def _build(schema: Type[BaseModel], paths: List[List[str]], prefix: str) -> FieldSet:
+    names = set()
+    sub_paths: Dict[str, List[Optional[List[str]]]] = defaultdict(list)
+    for parts in paths:
+        name = parts[0]
+        if name not in schema.model_fields and name not in schema.model_computed_fields:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Field '{prefix}{name}' tidak dikenal.",
+            )
+        field = schema.model_fields.get(name)
+        nested_schema = _nested_schema(field.annotation) if field else None
+        names.add(name)
+        if len(parts) > 1:
+            if nested_schema is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Field '{prefix}{name}' tidak memiliki sub-field.",
+                )
+            sub_paths[name].append(parts[1:])
+        elif nested_schema is not None:
+            sub_paths[name].append(None)
+    if "id" in schema.model_fields:
+        names.add("id")
+
+    nested = []
+    for name, subs in sub_paths.items():
+        nested_schema = _nested_schema(schema.model_fields[name].annotation)
+        if any(sub is None for sub in subs):
+            nested.append((name, full_fieldset(nested_schema)))
+        else:
+            nested.append((name, _build(nested_schema, subs, f"{prefix}{name}.")))
+    return FieldSet(schema, frozenset(names), tuple(sorted(nested, key=lambda item: item[0])))
+
+
+def parse_fields(raw: Optional[str], schema: Type[BaseModel]) -> Optional[FieldSet]:
+    """Parses `?fields=`; None (no filtering) when the parameter is absent or empty."""
+    if raw is None:
+        return None
+    paths = [part.strip().split(".") for part in raw.split(",") if part.strip()]
+    if not paths:
+        return None
+    fieldset = _build(schema, paths, prefix="")
+    return None if fieldset == full_fieldset(schema) else fieldset
+
+
+# --- Response side ---
+
+@lru_cache(maxsize=512)
+def partial_model(fieldset: FieldSet) -> Type[BaseModel]:
+    """A model with only the requested fields (plus hidden computed-field inputs)."""
+    schema = fieldset.schema
+    annotations: Dict[str, Any] = {}
+    namespace: Dict[str, Any] = {
+        "__module__": schema.__module__,
+        "model_config": ConfigDict(from_attributes=True),
+    }
+    hidden = fieldset.dependencies()
+    for name, field in schema.model_fields.items():
+        if name not in fieldset.fields and name not in hidden:
+            continue
+        annotation = field.annotation
+        child = fieldset.child(name)
+        if child is not None:
+            annotation = _replace_schema(annotation, child.schema, partial_model(child))
+        annotations[name] = annotation
+        namespace[name] = FieldInfo.merge_field_infos(field, exclude=True) if name in hidden else field
+    for name, decorator in schema.__pydantic_decorators__.computed_fields.items():
+        if name in fieldset.fields:
+            namespace[name] = computed_field(decorator.info.wrapped_property)
+    namespace["__annotations__"] = annotations
+    return type(f"{schema.__name__}Sparse", (BaseModel,), namespace)
+
+
+@lru_cache(maxsize=512)
+def _sparse_response(response_cls: Type[BaseModel], fieldset: FieldSet) -> Type[BaseModel]:
+    item = partial_model(fieldset)
+    if "items" in response_cls.model_fields:
+        overrides = {"items": (List[item], ...)}
+    else:
+        overrides = {"data": (item, ...)}
+    model = create_model(f"{response_cls.__name__}Sparse", __base__=response_cls, **overrides)
+    model.__sparse__ = True
+    return model
+
+
+def sparse_response(response_cls: Type[BaseModel], fieldset: Optional[FieldSet]) -> Type[BaseModel]:
+    """`response_cls` narrowed to the fieldset; the class itself when no fieldset was requested."""
+    return response_cls if fieldset is None else _sparse_response(response_cls, fieldset)
+
+
+# --- Query side ---
+
+def selected_columns(model: type, fieldset: FieldSet) -> List[Any]:
+    """Column attributes of `model` needed for the fieldset, primary key and FKs included."""
+    mapper = sa_inspect(model)
+    column_keys = {attr.key for attr in mapper.column_attrs}
+    wanted = set(fieldset.fields | fieldset.dependencies())
+    wanted.update(mapper.get_property_by_column(col).key for col in mapper.primary_key)
+    for name, _ in fieldset.nested:
+        relationship = mapper.relationships.get(name)
+        if relationship is not None:
+            wanted.update(
+                mapper.get_property_by_column(col).key for col in relationship.local_columns
+            )
+    return [getattr(model, key) for key in sorted(wanted & column_keys)]
+
+
+@lru_cache(maxsize=512)
+def loader_options(model: type, fieldset: FieldSet, shape: Optional[str] = None) -> tuple:
+    """
+    `load_only` for the requested columns, the shape's loading strategy for requested
+    relationships (`app.core.loading`) and `noload` for the rest.
+    """
+    shape = shape or model.__tablename__
+    mapper = sa_inspect(model)
+    options: List[Any] = [load_only(*selected_columns(model, fieldset))]
+    for relationship in mapper.relationships:
+        attribute = getattr(model, relationship.key)
+        child = fieldset.child(relationship.key)
+        if child is None:
+            options.append(noload(attribute))
+        else:
+            loader = loader_for(shape, relationship.uselist)
+            options.append(
+                loader(attribute).options(*loader_options(relationship.mapper.class_, child, shape))
+            )
+    return tuple(options)
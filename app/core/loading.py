@@ -0,0 +1,52 @@
+"""
+Relationship loading strategy for list and detail reads.
+
+Every list shape eager-loads many-to-one relations only (buyer, inventory, supplier,
+formula and product, operator, machine). Joining them into the page query keeps a list
+endpoint at two round trips (count and page) whatever the number of relations; with
+`selectin` each relation costs one more `WHERE id IN (...)` query. Collections are always
+loaded with `selectin`, since joining them would multiply the page rows.
+
+The strategy is read from `RELATIONSHIP_LOADING`, overridable per query shape (the root
+table name) through `RELATIONSHIP_LOADING_OVERRIDES`. `benchmarks/relationship_loading.py`
+compares both strategies on the seeded dataset.
+"""
+
+from typing import Any, Callable, Dict
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.core.config import settings
+
+STRATEGIES: Dict[str, Callable[..., Any]] = {
+    "joined": joinedload,
+    "selectin": selectinload,
+}
+
+
+def strategy_for(shape: str) -> str:
+    strategy = settings.RELATIONSHIP_LOADING_OVERRIDES.get(shape, settings.RELATIONSHIP_LOADING).lower()
+    if strategy not in STRATEGIES:
+        raise ValueError(
+            f"Unknown relationship loading strategy {strategy!r} for {shape!r}; "
+            f"expected one of {sorted(STRATEGIES)}"
+        )
+    return strategy
+
+
+def is_joined(shape: str) -> bool:
+    return strategy_for(shape) == "joined"
+
+
+def relation_loader(shape: str, *path: Any):
+    """Loader option for a chain of many-to-one relations, e.g. `(KnittingProcess.knit_formula, KnitFormula.product)`."""
+    loader = STRATEGIES[strategy_for(shape)]
+    option = loader(path[0])
+    for attribute in path[1:]:
+        option = getattr(option, loader.__name__)(attribute)
+    return option
+
+
+def loader_for(shape: str, uselist: bool) -> Callable[..., Any]:
+    """Loader function for one relation of `shape`: the configured strategy for many-to-one, selectin for collections."""
+    return selectinload if uselist else STRATEGIES[strategy_for(shape)]
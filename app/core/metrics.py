@@ -0,0 +1,250 @@
+"""In-process metrics registry rendered in the Prometheus text format."""
+
+import time
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric(ABC):
+    """Base class holding the metadata shared by every metric type."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """The sample lines of this metric, one per label set."""
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, optionally read from a callback at scrape time."""
+
+    type_name = "gauge"
+
+    def __init__(self, *args, callback: Optional[Callable[[], float]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def set_callback(self, callback: Optional[Callable[[], float]]) -> None:
+        self._callback = callback
+
+    def samples(self) -> List[str]:
+        if self._callback is not None:
+            return [f"{self.name} {float(self._callback())}"]
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed upper bounds."""
+
+    type_name = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(counts), total[0]) for key, (counts, total) in self._values.items()]
+
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += counts[-1]
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on the `/metrics` endpoint."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = MetricsRegistry()
+
+# --- HTTP Metrics ---
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    labelnames=("method", "route", "status"),
+))
+
+# --- Connection Pool Metrics ---
+pool_checkout_wait = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool.",
+))
+pool_connection_lifetime = registry.register(Histogram(
+    "db_pool_connection_lifetime_seconds",
+    "Lifetime of DBAPI connections from connect until close.",
+    buckets=(1, 10, 60, 300, 900, 1800, 3600, 7200, 21600, 86400),
+))
+pool_checkouts = registry.register(Counter(
+    "db_pool_checkouts_total",
+    "Number of connection checkouts.",
+))
+pool_overflow_checkouts = registry.register(Counter(
+    "db_pool_overflow_checkouts_total",
+    "Number of checkouts served while the pool was beyond DB_POOL_SIZE.",
+))
+pool_checked_out = registry.register(Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+))
+pool_overflow = registry.register(Gauge(
+    "db_pool_overflow",
+    "Connections currently open beyond DB_POOL_SIZE (negative while the pool is filling).",
+))
+pool_size = registry.register(Gauge(
+    "db_pool_size",
+    "Configured pool size.",
+))
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waited for a connection,
+    including the time needed to open a new one.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_checkout_wait.observe(time.perf_counter() - start)
+
+
+def instrument_pool(engine: Engine) -> None:
+    """
+    Attaches pool event listeners to a (sync) engine and binds the pool
+    gauges to it so they are read live at scrape time.
+    """
+    pool = engine.pool
+
+    if hasattr(pool, "checkedout"):
+        pool_checked_out.set_callback(pool.checkedout)
+    if hasattr(pool, "overflow"):
+        pool_overflow.set_callback(pool.overflow)
+    if hasattr(pool, "size"):
+        pool_size.set_callback(pool.size)
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connection_record.info["connected_at"] = time.monotonic()
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_checkouts.inc()
+        if hasattr(pool, "overflow") and pool.overflow() > 0:
+            pool_overflow_checkouts.inc()
+
+    def _observe_lifetime(connection_record) -> None:
+        connected_at = connection_record.info.pop("connected_at", None) if connection_record else None
+        if connected_at is not None:
+            pool_connection_lifetime.observe(time.monotonic() - connected_at)
+
+    @event.listens_for(pool, "close")
+    def _on_close(dbapi_connection, connection_record):
+        _observe_lifetime(connection_record)
+
+    @event.listens_for(pool, "detach")
+    def _on_detach(dbapi_connection, connection_record):
+        _observe_lifetime(connection_record)
+
+
+def render_metrics() -> str:
+    """Renders all registered metrics in the Prometheus text exposition format."""
+    return registry.render()
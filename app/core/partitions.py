@@ -0,0 +1,97 @@
+"""
+Monthly range partitions of the transaction tables.
+
+`sales_transaction` and `purchase_transaction` are partitioned by `transaction_date`
+(migration 6d9c8835aaad): one partition per month, named `<table>_pYYYY_MM`, plus a
+`<table>_default` partition that catches rows outside every month created so far.
+Date-filtered reads then only scan the months in range.
+
+Partitions are created by the `ensure_month_partition(parent, month)` SQL function
+installed by the migration. It is idempotent, serialized with an advisory lock, and
+moves rows that already landed in the default partition for that month. This module
+calls it for the coming months (`ensure_partitions`, run periodically by the app and
+by `scripts/manage_partitions.py`).
+
+Old months are only removed by `scripts/archive_history.py`, which records each one in
+the `archive_segment` manifest before dropping its partition. Receivable aging and the
+margin report read the rollups below the archived boundary, and FIFO costing keeps the
+consumption rows of archived months; a month that was merely detached would silently
+drop out of all three.
+"""
+
+import asyncio
+import logging
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("sales_transaction", "purchase_transaction")
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    start: Optional[date] = None,
+    months_ahead: Optional[int] = None,
+) -> List[str]:
+    """
+    Creates the monthly partitions from `start` (default: this month) through
+    `months_ahead` months after the current one; returns the names created.
+    """
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = month_start(date.today())
+    month = month_start(start or current)
+    last = add_months(current, months_ahead)
+    created = []
+    while month <= last:
+        for table in PARTITIONED_TABLES:
+            result = await conn.execute(
+                text("SELECT ensure_month_partition(CAST(:parent AS regclass), :month)"),
+                {"parent": table, "month": month},
+            )
+            name = result.scalar()
+            if name:
+                created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+async def list_partitions(conn: AsyncConnection, table: str) -> List[str]:
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = CAST(:parent AS regclass) ORDER BY child.relname"
+        ),
+        {"parent": table},
+    )
+    return list(result.scalars().all())
+
+
+async def run_partition_maintenance(engine: AsyncEngine, interval_hours: float) -> None:
+    """Background loop of the app: keeps the coming months' partitions in place."""
+    while True:
+        try:
+            async with engine.begin() as conn:
+                created = await ensure_partitions(conn)
+            if created:
+                logger.info("Created partitions: %s", ", ".join(created))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Partition maintenance failed")
+        await asyncio.sleep(interval_hours * 3600)
@@ -0,0 +1,97 @@
+"""Per-request SQL statement accounting driven by engine events."""
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class QueryStats:
+    """Statements executed and time spent in the database within one scope."""
+
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    parent: Optional["QueryStats"] = field(default=None, repr=False)
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Returns statements that were executed at least `threshold` times,
+        which is the usual signature of an N+1 access pattern.
+        """
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Returns the stats collector of the active scope, if any."""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Collects every statement executed by the current task while the block is active.
+    Scopes nest: an inner scope also feeds the counts of the outer one.
+    """
+    stats = QueryStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """
+    Test helper that fails when the wrapped block issues more than `limit` statements.
+
+    Usage in a pytest test::
+
+        with assert_max_queries(3):
+            await service.create(kp_create=payload)
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        executed = "\n".join(f"  {n}x {sql}" for sql, n in stats.statements.most_common())
+        raise AssertionError(
+            f"Expected at most {limit} queries, {stats.count} were executed:\n{executed}"
+        )
+
+
+def instrument_query_stats(engine: Engine) -> None:
+    """Attaches cursor execution listeners that feed the active QueryStats scope."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        stats = _current_stats.get()
+        while stats is not None:
+            stats.count += 1
+            stats.duration += elapsed
+            stats.statements[statement] += 1
+            stats = stats.parent
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
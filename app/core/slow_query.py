@@ -0,0 +1,142 @@
+"""Engine-level slow-query recorder with sampled EXPLAIN capture."""
+
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Deque, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+
+
+@dataclass
+class SlowQueryRecord:
+    """A statement that ran longer than SLOW_QUERY_THRESHOLD_MS."""
+
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameter_shapes: List[str]
+    executemany: bool
+    plan: Optional[Any] = None
+    plan_error: Optional[str] = None
+
+
+class SlowQueryLog:
+    """Thread-safe ring buffer holding the most recent slow queries."""
+
+    def __init__(self, maxlen: int):
+        self._records: Deque[SlowQueryRecord] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def append(self, record: SlowQueryRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    def snapshot(self) -> List[SlowQueryRecord]:
+        """Returns the buffered records, newest first."""
+        with self._lock:
+            return list(reversed(self._records))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+slow_query_log = SlowQueryLog(maxlen=settings.SLOW_QUERY_BUFFER_SIZE)
+
+
+def _shape(value: Any) -> str:
+    """Describes a bind parameter by type (and length for collections), never by value."""
+    if isinstance(value, (list, tuple, set)):
+        inner = type(next(iter(value))).__name__ if value else "empty"
+        return f"{type(value).__name__}[{inner}](len={len(value)})"
+    return type(value).__name__
+
+
+def parameter_shapes(parameters: Any, executemany: bool) -> List[str]:
+    if executemany and parameters:
+        return [f"{len(parameters)} rows of ({', '.join(parameter_shapes(parameters[0], False))})"]
+    if isinstance(parameters, dict):
+        return [f"{key}: {_shape(value)}" for key, value in parameters.items()]
+    if isinstance(parameters, (list, tuple)):
+        return [_shape(value) for value in parameters]
+    return []
+
+
+def _capture_plan(conn, statement: str, parameters: Any) -> Any:
+    """
+    Re-runs a SELECT under EXPLAIN ANALYZE on the same DBAPI connection. The call is
+    wrapped in a savepoint so a failing EXPLAIN never aborts the caller's transaction.
+    Raw cursor calls bypass engine events, so the EXPLAIN itself is not recorded.
+    """
+    explain_cursor = conn.connection.cursor()
+    explain_cursor.execute("SAVEPOINT slow_query_explain")
+    try:
+        explain_cursor.execute(EXPLAIN_PREFIX + statement, parameters)
+        plan = explain_cursor.fetchall()[0][0]
+    except Exception:
+        explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+        raise
+    finally:
+        explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        explain_cursor.close()
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+def _should_explain(statement: str, executemany: bool) -> bool:
+    if executemany or settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE <= 0:
+        return False
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return False
+    return random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+
+
+def instrument_slow_queries(engine: Engine) -> None:
+    """Attaches listeners that record statements slower than SLOW_QUERY_THRESHOLD_MS."""
+
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._slow_query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_slow_query_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        if elapsed < threshold:
+            return
+
+        record = SlowQueryRecord(
+            recorded_at=datetime.now(),
+            duration_ms=round(elapsed * 1000, 3),
+            statement=statement,
+            parameter_shapes=parameter_shapes(parameters, executemany),
+            executemany=executemany,
+        )
+        if _should_explain(statement, executemany):
+            try:
+                record.plan = _capture_plan(conn, statement, parameters)
+            except Exception as exc:
+                record.plan_error = str(exc)
+
+        slow_query_log.append(record)
+        logger.warning(
+            "slow_query %s",
+            json.dumps({"event": "slow_query", **asdict(record)}, default=str),
+        )
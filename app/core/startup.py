@@ -0,0 +1,146 @@
+"""
+Startup checks and readiness state.
+
+The schema is owned by Alembic (`alembic upgrade head`), so boot only verifies that the
+database is at the head revision shipped with this build instead of running
+`create_all`. The check runs once in the lifespan; afterwards the readiness probe only
+re-reads `alembic_version`, which is a single-row lookup.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, ProgrammingError
+
+from app.core.config import settings
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+@dataclass
+class StartupState:
+    expected_heads: FrozenSet[str] = frozenset()
+    database_heads: FrozenSet[str] = frozenset()
+    database_reachable: bool = False
+    completed: bool = False
+    error: Optional[str] = None
+    phases_ms: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def schema_matches(self) -> bool:
+        return bool(self.expected_heads) and self.database_heads == self.expected_heads
+
+    @property
+    def ready(self) -> bool:
+        return self.completed and self.database_reachable and self.schema_matches
+
+
+startup_state = StartupState()
+
+
+def resolve_expected_heads() -> FrozenSet[str]:
+    """Head revision(s) of the migration scripts bundled with this build."""
+    script = ScriptDirectory.from_config(Config(str(ALEMBIC_INI)))
+    return frozenset(script.get_heads())
+
+
+async def read_database_heads(conn) -> FrozenSet[str]:
+    """Revision(s) stamped in `alembic_version`; empty when the table does not exist yet."""
+    try:
+        result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+    except ProgrammingError:
+        await conn.rollback()
+        return frozenset()
+    return frozenset(result.scalars().all())
+
+
+async def prewarm_pool(size: int) -> int:
+    """
+    Opens `size` pool connections at once and returns them to the pool, so the first
+    requests after boot do not pay for TCP, TLS and authentication handshakes.
+    """
+    size = max(0, min(size, settings.DB_POOL_SIZE))
+    if size == 0:
+        return 0
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(*(stack.enter_async_context(engine.connect()) for _ in range(size)))
+    return size
+
+
+async def run_startup_checks(state: StartupState = startup_state) -> StartupState:
+    """Resolves the expected head, checks the database revision and pre-warms the pool."""
+    boot_started = time.perf_counter()
+
+    async def phase(name: str, coro):
+        started = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            state.phases_ms[name] = round((time.perf_counter() - started) * 1000, 1)
+            logger.info("Startup phase %s took %.1f ms", name, state.phases_ms[name])
+
+    try:
+        state.expected_heads = await phase(
+            "resolve_head", asyncio.to_thread(resolve_expected_heads)
+        )
+
+        async def check_revision():
+            async with engine.connect() as conn:
+                state.database_reachable = True
+                return await read_database_heads(conn)
+
+        state.database_heads = await phase("check_revision", check_revision())
+        if not state.schema_matches:
+            state.error = (
+                f"Database schema at {sorted(state.database_heads) or 'no revision'}, "
+                f"expected {sorted(state.expected_heads)}; run `alembic upgrade head`"
+            )
+            logger.error(state.error)
+
+        warmed = await phase("prewarm_pool", prewarm_pool(settings.DB_POOL_PREWARM))
+        logger.info("Pre-warmed %d database connection(s)", warmed)
+    except (OSError, DBAPIError) as exc:
+        state.database_reachable = False
+        state.error = f"Database unreachable during startup: {exc}"
+        logger.error(state.error)
+    finally:
+        state.completed = True
+        state.phases_ms["total"] = round((time.perf_counter() - boot_started) * 1000, 1)
+        logger.info("Startup finished in %.1f ms (ready=%s)", state.phases_ms["total"], state.ready)
+
+    return state
+
+
+async def check_readiness(state: StartupState = startup_state) -> StartupState:
+    """Re-reads the database revision with a short timeout; the expected head is not re-resolved."""
+    if not state.completed:
+        return state
+
+    async def probe():
+        async with engine.connect() as conn:
+            return await read_database_heads(conn)
+
+    try:
+        state.database_heads = await asyncio.wait_for(
+            probe(), timeout=settings.READINESS_TIMEOUT_SECONDS
+        )
+        state.database_reachable = True
+        state.error = None if state.schema_matches else (
+            f"Database schema at {sorted(state.database_heads) or 'no revision'}, "
+            f"expected {sorted(state.expected_heads)}"
+        )
+    except (OSError, DBAPIError, asyncio.TimeoutError) as exc:
+        state.database_reachable = False
+        state.error = f"Database unreachable: {exc!r}"
+    return state
@@ -0,0 +1,333 @@
+"""Lightweight request tracing with nested spans and OTLP/JSON export."""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    """A timed operation inside a trace."""
+
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    kind: str = "internal"
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1_000_000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+
+
+@dataclass
+class Trace:
+    """Spans collected for one sampled request."""
+
+    trace_id: str
+    spans: List[Span] = field(default_factory=list)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def _new_id(n_bytes: int) -> str:
+    return os.urandom(n_bytes).hex()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+# --- Exporters ---
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+_SPAN_KIND = {"internal": 1, "server": 2, "client": 3}
+
+
+def to_otlp_json(spans: List[Span]) -> Dict[str, Any]:
+    """Encodes spans as an OTLP/JSON `ExportTraceServiceRequest` payload."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": settings.PROJECT_NAME}},
+                {"key": "service.version", "value": {"stringValue": settings.VERSION}},
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": __name__},
+                "spans": [
+                    {
+                        "traceId": span.trace_id,
+                        "spanId": span.span_id,
+                        "parentSpanId": span.parent_id or "",
+                        "name": span.name,
+                        "kind": _SPAN_KIND.get(span.kind, 1),
+                        "startTimeUnixNano": str(span.start_ns),
+                        "endTimeUnixNano": str(span.end_ns or span.start_ns),
+                        "attributes": [
+                            {"key": key, "value": _otlp_value(value)}
+                            for key, value in span.attributes.items()
+                        ],
+                        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+                    }
+                    for span in spans
+                ],
+            }],
+        }]
+    }
+
+
+class FileSpanExporter:
+    """Appends one OTLP/JSON payload per trace to a local file (JSON lines)."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(to_otlp_json(spans)) + "\n")
+
+
+class OTLPHttpSpanExporter:
+    """Posts OTLP/JSON payloads to a collector's `/v1/traces` endpoint."""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.client = httpx.Client(timeout=5.0)
+
+    def export(self, spans: List[Span]) -> None:
+        self.client.post(self.endpoint, json=to_otlp_json(spans))
+
+
+class BackgroundExportQueue:
+    """Hands finished traces to an exporter on a daemon thread, off the event loop."""
+
+    def __init__(self, exporter, maxsize: int = 1000):
+        self.exporter = exporter
+        self._queue: "queue.Queue[List[Span]]" = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, spans: List[Span]) -> None:
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            logger.warning("Trace export queue is full, dropping trace")
+
+    def _run(self) -> None:
+        while True:
+            spans = self._queue.get()
+            try:
+                self.exporter.export(spans)
+            except Exception as exc:
+                logger.warning("Trace export failed: %s", exc)
+
+
+def _build_export_queue() -> Optional[BackgroundExportQueue]:
+    exporter_name = settings.TRACE_EXPORTER.lower()
+    if exporter_name == "file":
+        return BackgroundExportQueue(FileSpanExporter(settings.TRACE_FILE_PATH))
+    if exporter_name == "otlp":
+        return BackgroundExportQueue(OTLPHttpSpanExporter(settings.TRACE_OTLP_ENDPOINT))
+    return None
+
+
+_export_queue: Optional[BackgroundExportQueue] = None
+
+
+def _export(trace: Trace) -> None:
+    global _export_queue
+    if _export_queue is None:
+        _export_queue = _build_export_queue()
+    if _export_queue is not None:
+        _export_queue.submit(trace.spans)
+
+
+# --- Span API ---
+
+def _start_span(name: str, kind: str, attributes: Dict[str, Any]) -> Optional[Span]:
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    parent = _current_span.get()
+    span = Span(
+        trace_id=trace.trace_id,
+        span_id=_new_id(8),
+        parent_id=parent.span_id if parent else None,
+        name=name,
+        kind=kind,
+        attributes=dict(attributes),
+    )
+    trace.spans.append(span)
+    return span
+
+
+@contextmanager
+def start_trace(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Opens the root span of a trace, subject to TRACE_SAMPLE_RATE. Yields None when the
+    request is not sampled, in which case every nested `span()` is a no-op.
+    """
+    if not settings.TRACING_ENABLED or random.random() >= settings.TRACE_SAMPLE_RATE:
+        yield None
+        return
+
+    trace = Trace(trace_id=_new_id(16))
+    trace_token = _current_trace.set(trace)
+    root = _start_span(name, "server", attributes)
+    span_token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException as exc:
+        root.error = repr(exc)
+        raise
+    finally:
+        root.end()
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        if root.duration_ms >= settings.TRACE_MIN_DURATION_MS:
+            for pending in trace.spans:
+                pending.end()
+            _export(trace)
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes: Any) -> Iterator[Optional[Span]]:
+    """Opens a child span of the current span. No-op outside a sampled trace."""
+    child = _start_span(name, kind, attributes)
+    if child is None:
+        yield None
+        return
+
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.error = repr(exc)
+        raise
+    finally:
+        child.end()
+        _current_span.reset(token)
+
+
+def _wrap(func: Callable, name: str, layer: str) -> Callable:
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return await func(*args, **kwargs)
+            with span(name, layer=layer):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def sync_wrapper(*args, **kwargs):
+        if _current_trace.get() is None:
+            return func(*args, **kwargs)
+        with span(name, layer=layer):
+            return func(*args, **kwargs)
+    return sync_wrapper
+
+
+def trace_methods(layer: str) -> Callable[[type], type]:
+    """
+    Class decorator that gives every method defined on the class (dunder methods
+    excluded) a span named `ClassName.method`, tagged with the given layer.
+    """
+    def decorator(cls: type) -> type:
+        for attr_name, attr in list(vars(cls).items()):
+            if attr_name.startswith("__") or not inspect.isfunction(attr):
+                continue
+            setattr(cls, attr_name, _wrap(attr, f"{cls.__name__}.{attr_name}", layer))
+        return cls
+    return decorator
+
+
+# --- SQLAlchemy Instrumentation ---
+
+def instrument_tracing(engine: Engine) -> None:
+    """Adds a span per SQL statement and per session commit."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is None or _current_trace.get() is None:
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        sql_span = _start_span(f"db.{operation.lower()}", "client", {
+            "db.system": "postgresql",
+            "db.statement": statement,
+        })
+        context._trace_span = sql_span
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        sql_span = getattr(context, "_trace_span", None)
+        if sql_span is not None:
+            sql_span.set_attribute("db.rowcount", cursor.rowcount)
+            sql_span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        sql_span = getattr(exception_context.execution_context, "_trace_span", None)
+        if sql_span is not None:
+            sql_span.error = repr(exception_context.original_exception)
+            sql_span.end()
+
+    @event.listens_for(Session, "before_commit")
+    def _before_commit(session):
+        commit_span = _start_span("db.commit", "internal", {})
+        if commit_span is not None:
+            session.info["trace_commit_span"] = commit_span
+
+    @event.listens_for(Session, "after_commit")
+    def _after_commit(session):
+        commit_span = session.info.pop("trace_commit_span", None)
+        if commit_span is not None:
+            commit_span.end()
+
+    @event.listens_for(Session, "after_rollback")
+    def _after_rollback(session):
+        commit_span = session.info.pop("trace_commit_span", None)
+        if commit_span is not None:
+            commit_span.error = "rolled back"
+            commit_span.end()
@@ -1,11 +1,15 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import async_session, get_db
 
 # Import all repositories
 from app.repository.account_receivable import AccountReceivableRepository
+from app.repository.analytics import AnalyticsRepository
+from app.repository.archive import ArchiveRepository
 from app.repository.buyer import BuyerRepository
+from app.repository.buyer_payment import BuyerPaymentRepository
+from app.repository.cost_layer import CostLayerRepository
 from app.repository.dyeing_process import DyeingProcessRepository
 from app.repository.inventory import InventoryRepository
 from app.repository.knit_formula import KnitFormulaRepository
@@ -13,22 +17,34 @@ from app.repository.knitting_process import KnittingProcessRepository
 from app.repository.machine import MachineRepository
 from app.repository.operator import OperatorRepository
 from app.repository.purchase_transaction import PurchaseTransactionRepository
+from app.repository.receivable_aging import ReceivableAgingRepository
+from app.repository.reference import ReferenceRepository
+from app.repository.rollup import RollupRepository
 from app.repository.sales_transaction import SalesTransactionRepository
 from app.repository.supplier import SupplierRepository
 
 # Import all services
 from app.service.account_receivable import AccountReceivableService
+from app.service.analytics import AnalyticsService
 from app.service.buyer import BuyerService
+from app.service.buyer_payment import BuyerPaymentService
+from app.service.costing import CostingService
 from app.service.dyeing_process import DyeingProcessService
+from app.service.history_export import HistoryExportService
 from app.service.inventory import InventoryService
 from app.service.knit_formula import KnitFormulaService
 from app.service.knitting_process import KnittingProcessService
 from app.service.machine import MachineService
 from app.service.operator import OperatorService
 from app.service.purchase_transaction import PurchaseTransactionService
+from app.service.receivable_aging import ReceivableAgingService
 from app.service.sales_transaction import SalesTransactionService
 from app.service.supplier import SupplierService
 
+from app.core.cache import analytics_cache
+from app.core.slow_query import slow_query_log
+from app.service.admin import AdminService
+
 from app.repository.user import UserRepository
 from app.repository.refresh_token import RefreshTokenRepository
 from app.service.auth import AuthService
@@ -55,6 +71,18 @@ def get_operator_repo(session: AsyncSession = Depends(get_db)) -> OperatorReposi
 def get_knit_formula_repo(session: AsyncSession = Depends(get_db)) -> KnitFormulaRepository:
     return KnitFormulaRepository(session)
 
+def get_reference_repo(session: AsyncSession = Depends(get_db)) -> ReferenceRepository:
+    return ReferenceRepository(session)
+
+def get_rollup_repo(session: AsyncSession = Depends(get_db)) -> RollupRepository:
+    return RollupRepository(session)
+
+def get_receivable_aging_repo(session: AsyncSession = Depends(get_db)) -> ReceivableAgingRepository:
+    return ReceivableAgingRepository(session)
+
+def get_cost_layer_repo(session: AsyncSession = Depends(get_db)) -> CostLayerRepository:
+    return CostLayerRepository(session)
+
 # --- Service Dependencies ---
 
 def get_inventory_service(repo: InventoryRepository = Depends(get_inventory_repo)) -> InventoryService:
@@ -77,19 +105,44 @@ def get_receivable_repo(session: AsyncSession = Depends(get_db)) -> AccountRecei
 
 def get_receivable_service(
     repo: AccountReceivableRepository = Depends(get_receivable_repo),
-    buyer_repo: BuyerRepository = Depends(get_buyer_repo),
+    reference_repo: ReferenceRepository = Depends(get_reference_repo),
 ) -> AccountReceivableService:
-    return AccountReceivableService(receivable_repo=repo, buyer_repo=buyer_repo)
+    return AccountReceivableService(receivable_repo=repo, reference_repo=reference_repo)
+
+def get_receivable_aging_service(
+    aging_repo: ReceivableAgingRepository = Depends(get_receivable_aging_repo),
+) -> ReceivableAgingService:
+    return ReceivableAgingService(aging_repo=aging_repo)
+
+def get_buyer_payment_repo(session: AsyncSession = Depends(get_db)) -> BuyerPaymentRepository:
+    return BuyerPaymentRepository(session)
+
+def get_buyer_payment_service(
+    payment_repo: BuyerPaymentRepository = Depends(get_buyer_payment_repo),
+    reference_repo: ReferenceRepository = Depends(get_reference_repo),
+    aging_repo: ReceivableAgingRepository = Depends(get_receivable_aging_repo),
+) -> BuyerPaymentService:
+    return BuyerPaymentService(payment_repo=payment_repo, reference_repo=reference_repo, aging_repo=aging_repo)
 
 def get_sales_transaction_repo(session: AsyncSession = Depends(get_db)) -> SalesTransactionRepository:
     return SalesTransactionRepository(session)
 
 def get_sales_transaction_service(
     repo: SalesTransactionRepository = Depends(get_sales_transaction_repo),
-    buyer_repo: BuyerRepository = Depends(get_buyer_repo),
+    reference_repo: ReferenceRepository = Depends(get_reference_repo),
     inventory_repo: InventoryRepository = Depends(get_inventory_repo),
+    rollup_repo: RollupRepository = Depends(get_rollup_repo),
+    aging_repo: ReceivableAgingRepository = Depends(get_receivable_aging_repo),
+    cost_repo: CostLayerRepository = Depends(get_cost_layer_repo),
 ) -> SalesTransactionService:
-    return SalesTransactionService(st_repo=repo, buyer_repo=buyer_repo, inventory_repo=inventory_repo)
+    return SalesTransactionService(
+        st_repo=repo,
+        reference_repo=reference_repo,
+        inventory_repo=inventory_repo,
+        rollup_repo=rollup_repo,
+        aging_repo=aging_repo,
+        cost_repo=cost_repo,
+    )
 
 def get_purchase_transaction_repo(session: AsyncSession = Depends(get_db)) -> PurchaseTransactionRepository:
     return PurchaseTransactionRepository(session)
@@ -99,11 +152,20 @@ def get_knitting_process_repo(session: AsyncSession = Depends(get_db)) -> Knitti
 
 def get_purchase_transaction_service(
     repo: PurchaseTransactionRepository = Depends(get_purchase_transaction_repo),
-    supplier_repo: SupplierRepository = Depends(get_supplier_repo),
+    reference_repo: ReferenceRepository = Depends(get_reference_repo),
     inventory_repo: InventoryRepository = Depends(get_inventory_repo),
-    kp_repo: KnittingProcessRepository = Depends(get_knitting_process_repo)
+    kp_repo: KnittingProcessRepository = Depends(get_knitting_process_repo),
+    rollup_repo: RollupRepository = Depends(get_rollup_repo),
+    cost_repo: CostLayerRepository = Depends(get_cost_layer_repo),
 ) -> PurchaseTransactionService:
-    return PurchaseTransactionService(pt_repo=repo, supplier_repo=supplier_repo, inventory_repo=inventory_repo, kp_repo=kp_repo)
+    return PurchaseTransactionService(
+        pt_repo=repo,
+        reference_repo=reference_repo,
+        inventory_repo=inventory_repo,
+        kp_repo=kp_repo,
+        rollup_repo=rollup_repo,
+        cost_repo=cost_repo,
+    )
 
 def get_knit_formula_service(
     formula_repo: KnitFormulaRepository = Depends(get_knit_formula_repo),
@@ -117,24 +179,48 @@ def get_dyeing_process_repo(session: AsyncSession = Depends(get_db)) -> DyeingPr
 def get_dyeing_process_service(
     dyeing_repo: DyeingProcessRepository = Depends(get_dyeing_process_repo),
     inventory_repo: InventoryRepository = Depends(get_inventory_repo),
+    cost_repo: CostLayerRepository = Depends(get_cost_layer_repo),
 ) -> DyeingProcessService:
-    return DyeingProcessService(dyeing_repo=dyeing_repo, inventory_repo=inventory_repo)
+    return DyeingProcessService(dyeing_repo=dyeing_repo, inventory_repo=inventory_repo, cost_repo=cost_repo)
 
 def get_knitting_process_service(
     process_repo: KnittingProcessRepository = Depends(get_knitting_process_repo),
     formula_repo: KnitFormulaRepository = Depends(get_knit_formula_repo),
-    operator_repo: OperatorRepository = Depends(get_operator_repo),
-    machine_repo: MachineRepository = Depends(get_machine_repo),
+    reference_repo: ReferenceRepository = Depends(get_reference_repo),
     inventory_repo: InventoryRepository = Depends(get_inventory_repo),
+    rollup_repo: RollupRepository = Depends(get_rollup_repo),
+    cost_repo: CostLayerRepository = Depends(get_cost_layer_repo),
 ) -> KnittingProcessService:
     return KnittingProcessService(
         process_repo=process_repo,
         formula_repo=formula_repo,
-        operator_repo=operator_repo,
-        machine_repo=machine_repo,
+        reference_repo=reference_repo,
         inventory_repo=inventory_repo,
+        rollup_repo=rollup_repo,
+        cost_repo=cost_repo,
     )
     
+def get_analytics_repo(session: AsyncSession = Depends(get_db)) -> AnalyticsRepository:
+    return AnalyticsRepository(session)
+
+def get_archive_repo(session: AsyncSession = Depends(get_db)) -> ArchiveRepository:
+    return ArchiveRepository(session)
+
+def get_analytics_service(
+    analytics_repo: AnalyticsRepository = Depends(get_analytics_repo),
+    archive_repo: ArchiveRepository = Depends(get_archive_repo),
+) -> AnalyticsService:
+    return AnalyticsService(analytics_repo=analytics_repo, archive_repo=archive_repo, cache=analytics_cache)
+
+def get_costing_service(
+    cost_repo: CostLayerRepository = Depends(get_cost_layer_repo),
+) -> CostingService:
+    return CostingService(cost_repo=cost_repo)
+
+def get_history_export_service() -> HistoryExportService:
+    # Streams outlive the request session; the export opens its own
+    return HistoryExportService(session_factory=async_session)
+
 def get_user_repo(session: AsyncSession = Depends(get_db)) -> UserRepository:
     return UserRepository(session)
 
@@ -145,4 +231,7 @@ def get_auth_service(
     user_repo: UserRepository = Depends(get_user_repo),
     rt_repo: RefreshTokenRepository = Depends(get_refresh_token_repo)
 ) -> AuthService:
-    return AuthService(user_repo=user_repo, rt_repo=rt_repo)
\ No newline at end of file
+    return AuthService(user_repo=user_repo, rt_repo=rt_repo)
+
+def get_admin_service() -> AdminService:
+    return AdminService(slow_query_log=slow_query_log)
@@ -9,6 +9,11 @@ from app.model.user import User
 from app.repository.user import UserRepository
 
 async def get_current_user(request: Request, db: AsyncSession = Depends(get_db)) -> User:
+    # Batch sub-requests carry the user already authenticated by the batch request
+    user = getattr(request.state, "current_user", None)
+    if user is not None:
+        return user
+
     token = request.cookies.get("access_token")
     if not token:
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Not authenticated")
@@ -1,7 +1,10 @@
 from fastapi import FastAPI, Request, status, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import SQLAlchemyError, DBAPIError
+
+# lock_not_available, deadlock_detected, serialization_failure
+RETRYABLE_SQLSTATES = {"55P03", "40P01", "40001"}
 
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -36,6 +39,15 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     
     
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
+    if isinstance(exc, DBAPIError) and getattr(exc.orig, "sqlstate", None) in RETRYABLE_SQLSTATES:
+        # Concurrent stock updates on the same rows; the client can safely retry.
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={
+                "error": True,
+                "message": "Data sedang diproses oleh transaksi lain. Silahkan coba kembali.",
+            }
+        )
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
@@ -0,0 +1,44 @@
+import time
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import http_request_duration
+
+
+class MetricsMiddleware:
+    """
+    Records per-route request latency. The route template (e.g. `/v1/buyer/{buyer_id}`)
+    is used as the label so that path parameters do not explode label cardinality.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code),
+            )
+
+
+def add_metrics_middleware(app: FastAPI):
+    app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,63 @@
+import logging
+import time
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.query_stats import track_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """
+    Counts SQL statements and database time for every request, reports them in
+    a `Server-Timing` header and logs a warning when a request crosses
+    SQL_QUERY_WARN_THRESHOLD or repeats one statement SQL_REPEATED_QUERY_THRESHOLD times.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        with track_queries() as stats:
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    total_ms = (time.perf_counter() - start) * 1000
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.duration_ms:.2f};desc="{stats.count} queries", '
+                        f"app;dur={total_ms:.2f}",
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        route = getattr(scope.get("route"), "path", scope["path"])
+        logger.debug(
+            "%s %s: %d queries, %.2f ms in database",
+            scope["method"], route, stats.count, stats.duration_ms,
+        )
+        if stats.count > settings.SQL_QUERY_WARN_THRESHOLD:
+            logger.warning(
+                "%s %s issued %d queries (threshold %d), %.2f ms in database",
+                scope["method"], route, stats.count,
+                settings.SQL_QUERY_WARN_THRESHOLD, stats.duration_ms,
+            )
+        for statement, count in stats.repeated_statements(settings.SQL_REPEATED_QUERY_THRESHOLD):
+            logger.warning(
+                "%s %s repeated one statement %d times (possible N+1): %s",
+                scope["method"], route, count, statement,
+            )
+
+
+def add_query_stats_middleware(app: FastAPI):
+    app.add_middleware(QueryStatsMiddleware)
@@ -0,0 +1,44 @@
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.tracing import start_trace
+
+
+class TracingMiddleware:
+    """
+    Opens the root span of every sampled request. The span is renamed to the
+    matched route template once routing has happened.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with start_trace(f"{scope['method']} {scope['path']}", **{
+            "http.method": scope["method"],
+            "http.target": scope["path"],
+        }) as root:
+            if root is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    root.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    root.name = f"{scope['method']} {route.path}"
+                    root.set_attribute("http.route", route.path)
+
+
+def add_tracing_middleware(app: FastAPI):
+    app.add_middleware(TracingMiddleware)
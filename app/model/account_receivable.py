@@ -1,4 +1,6 @@
+from datetime import date
 from typing import Optional, TYPE_CHECKING
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 
 # Forward reference for the Buyer model
@@ -10,6 +12,10 @@ class AccountReceivable(SQLModel, table=True):
     SQLModel for accounts receivable.
     """
     __tablename__ = "account_receivable"
+    __table_args__ = (
+        # One row per buyer and month; also serves per-buyer period range scans
+        Index("ux_account_receivable_buyer_period", "buyer_id", "period_date", unique=True),
+    )
 
     # Primary Key
     id: Optional[int] = Field(
@@ -32,6 +38,10 @@ class AccountReceivable(SQLModel, table=True):
         index=True,
         description="The period for the receivable, e.g., 'Apr-25'"
     )
+    period_date: date = Field(
+        index=True,
+        description="First day of the period's month, for sorting and range filters"
+    )
 
     # Aging buckets for the receivable amount
     age_0_30_days: Optional[float] = Field(
@@ -0,0 +1,25 @@
+from datetime import date, datetime
+from typing import Optional
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class ArchiveSegment(SQLModel, table=True):
+    """
+    Manifest of archived history: one row per table and month moved out of the
+    database into a segment file (app/core/archive.py). The archived months of a
+    table always form a prefix of its history.
+    """
+    __tablename__ = "archive_segment"
+    __table_args__ = (
+        Index("ux_archive_segment_table_month", "table_name", "month", unique=True),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    table_name: str = Field(description="Source table, e.g. 'sales_transaction'")
+    month: date = Field(description="First day of the archived month")
+    path: str = Field(description="Segment file, relative to ARCHIVE_DIR")
+    row_count: int
+    byte_size: int
+    sha256: str = Field(description="Checksum of the segment file")
+    archived_at: datetime
@@ -1,9 +1,11 @@
 from typing import Optional, List, TYPE_CHECKING
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel, Relationship
 from .sales_transaction import SalesTransaction
 
 if TYPE_CHECKING:
     from .account_receivable import AccountReceivable
+    from .buyer_payment import BuyerPayment
 
 
 class Buyer(SQLModel, table=True):
@@ -11,6 +13,10 @@ class Buyer(SQLModel, table=True):
     SQLModel for the customer/buyer (buyer).
     """
     __tablename__ = "buyer"
+    __table_args__ = (
+        # Only the few risky buyers are indexed (`?risked=true`, in id order)
+        Index("ix_buyer_risked", "id", postgresql_where=text("is_risked")),
+    )
 
     # Primary Key
     id: Optional[int] = Field(
@@ -32,7 +38,20 @@ class Buyer(SQLModel, table=True):
     )
     address: Optional[str] = Field(default=None)
     note: Optional[str] = Field(default=None)
-    
+
+    # Maintained from account_receivable whenever receivables change
+    # (app/repository/account_receivable.py, `refresh_buyer_risk`)
+    overdue_amount: float = Field(
+        default=0.0,
+        sa_column_kwargs={"server_default": text("0")},
+        description="Receivables aged over 90 days in the buyer's latest period"
+    )
+    is_risked: bool = Field(
+        default=False,
+        sa_column_kwargs={"server_default": text("false")},
+        description="True when the buyer has receivables aged over 90 days"
+    )
+
     sales: List["SalesTransaction"] = Relationship(
         back_populates="buyer",
         sa_relationship_kwargs={"cascade": "all, delete-orphan"}
@@ -41,3 +60,7 @@ class Buyer(SQLModel, table=True):
         back_populates="buyer",
         sa_relationship_kwargs={"cascade": "all, delete-orphan"}
     )
+    payments: List["BuyerPayment"] = Relationship(
+        back_populates="buyer",
+        sa_relationship_kwargs={"cascade": "all, delete-orphan"}
+    )
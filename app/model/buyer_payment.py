@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Optional, TYPE_CHECKING
+from sqlmodel import Field, SQLModel, Relationship
+
+if TYPE_CHECKING:
+    from .buyer import Buyer
+
+
+class BuyerPayment(SQLModel, table=True):
+    """
+    SQLModel for payments received from a buyer. Payments are applied to the buyer's
+    oldest open sales first (FIFO) by the receivable aging engine.
+    """
+    __tablename__ = "buyer_payment"
+
+    id: Optional[int] = Field(
+        default=None,
+        primary_key=True,
+        description="Auto-incrementing primary key for the payment"
+    )
+
+    buyer_id: int = Field(
+        foreign_key="buyer.id",
+        index=True,
+        description="Foreign key to the Buyer (customer) table"
+    )
+
+    payment_date: datetime = Field(
+        index=True,
+        description="Date the payment was received"
+    )
+    amount: float = Field(description="Amount paid")
+    note: Optional[str] = Field(default=None)
+
+    buyer: "Buyer" = Relationship(back_populates="payments")
@@ -0,0 +1,95 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from sqlalchemy import BigInteger, Column, ForeignKey, Index, Integer, text
+from sqlmodel import Field, SQLModel
+
+
+class CostConsumer(str, Enum):
+    """Stock movements that consume FIFO cost layers."""
+    SALE = "sale"
+    KNITTING = "knitting"
+    DYEING = "dyeing"
+
+
+class CostSource(str, Enum):
+    """Stock movements that open FIFO cost layers."""
+    PURCHASE = "purchase"
+    KNITTING = "knitting"
+    DYEING = "dyeing"
+
+
+class CostLayer(SQLModel, table=True):
+    """
+    A FIFO cost layer: the kilograms one stock movement brought into stock at its
+    cost. A purchase opens one at its price, a completed knitting run one for its
+    fabric at the cost of the materials it consumed, and a completed dyeing run one
+    for the dyed output at the cost of the fabric it consumed. `remaining_kg` is what
+    consumption has not taken yet; open layers of an item form its FIFO queue,
+    ordered by (layer_date, id).
+    """
+    __tablename__ = "cost_layer"
+    __table_args__ = (
+        Index("ux_cost_layer_source", "source_type", "source_id", unique=True),
+        # The FIFO queue of an item: only open layers, most of history is used up
+        Index(
+            "ix_cost_layer_open",
+            "inventory_id", "layer_date", "id",
+            postgresql_where=text("remaining_kg > 0"),
+        ),
+        Index("ix_cost_layer_inventory_date", "inventory_id", "layer_date"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    inventory_id: str = Field(foreign_key="inventory.id")
+    source_type: str = Field(description="A CostSource value")
+    source_id: int = Field(description="Id of the purchase or run (no foreign key: the tables are partitioned or archived)")
+    layer_date: datetime = Field(description="Purchase or completion date; consumption before it cannot draw on the layer")
+    quantity_kg: float
+    unit_cost: float = Field(description="Purchase price, or consumed cost per output kg, per kg")
+    remaining_kg: float
+
+
+class CostConsumption(SQLModel, table=True):
+    """
+    The consumption log: kilograms a sale, a completed knitting run or a dyeing run
+    took from a layer, at the layer's cost. A consumer has one row per layer it drew
+    on; a row without `layer_id` is stock no layer covered, valued at the item's
+    average cost. Recomputation only replaces an item's rows from a date on.
+    """
+    __tablename__ = "cost_consumption"
+    __table_args__ = (
+        Index("ix_cost_consumption_inventory_date", "inventory_id", "consumed_at"),
+        Index("ix_cost_consumption_consumer", "consumer_type", "consumer_id"),
+        # Covering index for the margin report (/analytics/margin): cost per sale, and
+        # per item and day for archived months, in a date range
+        Index(
+            "ix_cost_consumption_margin",
+            "consumer_type", "consumed_at",
+            postgresql_include=["consumer_id", "inventory_id", "quantity_kg", "unit_cost"],
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, sa_column=Column(BigInteger, primary_key=True))
+    inventory_id: str = Field(foreign_key="inventory.id")
+    layer_id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(Integer, ForeignKey("cost_layer.id", ondelete="SET NULL"), index=True),
+    )
+    consumer_type: str = Field(description="A CostConsumer value")
+    consumer_id: int
+    consumed_at: datetime
+    quantity_kg: float
+    unit_cost: float
+
+
+class CostActivity(SQLModel, table=True):
+    """
+    Items whose FIFO allocation is stale: stock moved since the last recompute.
+    `since` is the earliest movement affected; the next recompute re-allocates the
+    item's consumption from there on and removes the row.
+    """
+    __tablename__ = "cost_activity"
+
+    inventory_id: str = Field(primary_key=True)
+    since: datetime
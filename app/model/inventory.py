@@ -1,6 +1,6 @@
 from typing import Optional, List, TYPE_CHECKING
 from sqlmodel import Field, SQLModel, Relationship
-from sqlalchemy import Column, Enum as SQLAlchemyEnum
+from sqlalchemy import Column, Enum as SQLAlchemyEnum, text
 from .sales_transaction import SalesTransaction
 from .purchase_transaction import PurchaseTransaction
 from enum import Enum
@@ -52,6 +52,13 @@ class Inventory(SQLModel, table=True):
         default=0,
         description="Stock level in bales"
     )
+
+    # Valuation
+    average_cost: float = Field(
+        default=0.0,
+        sa_column_kwargs={"server_default": text("0")},
+        description="Moving weighted-average purchase cost per kg, kept by the purchase service"
+    )
     
     sales: List["SalesTransaction"] = Relationship(
         back_populates="inventory",
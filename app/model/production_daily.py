@@ -0,0 +1,30 @@
+from datetime import date
+from typing import Optional
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class ProductionDaily(SQLModel, table=True):
+    """
+    Daily rollup of completed knitting runs per formula and machine, keyed on the run's
+    start date. Maintained by the knitting service when a run is completed or a
+    completed run is deleted (see app/repository/rollup.py).
+    """
+    __tablename__ = "production_daily"
+    __table_args__ = (
+        Index(
+            "ux_production_daily_key",
+            "day", "knit_formula_id", "machine_id",
+            unique=True,
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    day: date = Field(description="Start date of the knitting runs")
+    knit_formula_id: int = Field(description="Formula of the grouped runs")
+    machine_id: int = Field(description="Machine of the grouped runs")
+
+    process_count: int = Field(default=0)
+    roll_count: float = Field(default=0.0)
+    weight_kg: float = Field(default=0.0)
@@ -0,0 +1,32 @@
+from datetime import date
+from typing import Optional
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class PurchaseDaily(SQLModel, table=True):
+    """
+    Daily purchase rollup per supplier and item, maintained by the purchase service in
+    the same transaction as the purchase (see app/repository/rollup.py).
+    """
+    __tablename__ = "purchase_daily"
+    __table_args__ = (
+        # Upsert target; NULL supplier/item ids (nullable FKs on the purchase) form one group
+        Index(
+            "ux_purchase_daily_key",
+            "day", "supplier_id", "inventory_id",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    day: date = Field(description="Transaction date")
+    supplier_id: Optional[int] = Field(default=None, description="Supplier of the grouped purchases")
+    inventory_id: Optional[str] = Field(default=None, description="Item of the grouped purchases")
+
+    transaction_count: int = Field(default=0)
+    roll_count: float = Field(default=0.0)
+    weight_kg: float = Field(default=0.0)
+    total: float = Field(default=0.0, description="sum(weight_kg * price_per_kg)")
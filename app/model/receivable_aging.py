@@ -0,0 +1,23 @@
+from datetime import date, datetime
+from sqlmodel import Field, SQLModel
+
+
+class ReceivableActivity(SQLModel, table=True):
+    """
+    Buyers whose receivable aging is stale: a sale or payment was written since the
+    last aging run. `since_date` is the earliest transaction date affected, so runs
+    only recompute periods ending on or after it. Rows are consumed by the next run.
+    """
+    __tablename__ = "receivable_activity"
+
+    buyer_id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    since_date: date
+
+
+class ReceivableAgingRun(SQLModel, table=True):
+    """The aging date each computed period was last run for."""
+    __tablename__ = "receivable_aging_run"
+
+    period: str = Field(primary_key=True, description="Period label, e.g. 'Apr-25'")
+    as_of: date = Field(description="Date the buckets were aged to")
+    computed_at: datetime
@@ -0,0 +1,32 @@
+from datetime import date
+from typing import Optional
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class SalesDaily(SQLModel, table=True):
+    """
+    Daily sales rollup per buyer and item, maintained by the sales service in the
+    same transaction as the sale (see app/repository/rollup.py).
+    """
+    __tablename__ = "sales_daily"
+    __table_args__ = (
+        # Upsert target; NULL buyer/item ids (nullable FKs on the sale) form one group
+        Index(
+            "ux_sales_daily_key",
+            "day", "buyer_id", "inventory_id",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    day: date = Field(description="Transaction date")
+    buyer_id: Optional[int] = Field(default=None, description="Buyer of the grouped sales")
+    inventory_id: Optional[str] = Field(default=None, description="Item of the grouped sales")
+
+    transaction_count: int = Field(default=0)
+    roll_count: float = Field(default=0.0)
+    weight_kg: float = Field(default=0.0)
+    total: float = Field(default=0.0, description="sum(weight_kg * price_per_kg)")
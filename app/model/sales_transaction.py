@@ -1,5 +1,6 @@
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 
 if TYPE_CHECKING:
@@ -12,16 +13,31 @@ class SalesTransaction(SQLModel, table=True):
     SQLModel for sales transactions.
     """
     __tablename__ = "sales_transaction"
+    __table_args__ = (
+        # Covering index for date-range aggregates (/analytics)
+        Index(
+            "ix_sales_transaction_analytics",
+            "transaction_date",
+            postgresql_include=["buyer_id", "inventory_id", "weight_kg", "price_per_kg"],
+        ),
+        # Monthly partitions (migration 6d9c8835aaad, app/core/partitions.py)
+        {"postgresql_partition_by": "RANGE (transaction_date)"},
+    )
+    # The table's primary key must include the partition key; rows are still
+    # identified by id alone
+    __mapper_args__ = {"primary_key": ["id"]}
 
     # Primary Key
     id: Optional[int] = Field(
         default=None, 
         primary_key=True,
-        description="Auto-incrementing primary key for the transaction"
+        description="Auto-incrementing primary key for the transaction",
+        sa_column_kwargs={"autoincrement": True}
     )
 
     # Auto-generated datetime
     transaction_date: datetime = Field(
+        primary_key=True,
         index=True,
         description="Transaction timestamp (automatically set to current time on creation)"
     )
@@ -1,14 +1,74 @@
-from typing import Optional, List, Tuple
+from typing import Optional, List, Sequence, Tuple
+from datetime import date
 from sqlmodel import select, func
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy import and_, false, or_, update
+from sqlalchemy.orm import aliased
 
 from app.model.account_receivable import AccountReceivable
+from app.model.buyer import Buyer
+from app.core.fieldsets import FieldSet, loader_options
+from app.repository.statements import select_by_pk, statements, with_options
 from app.schema.account_receivable.request import (
     AccountReceivableCreateRequest,
     AccountReceivableUpdateRequest,
+    period_start,
 )
+from app.core.tracing import trace_methods
 
+def refresh_buyer_risk(buyer_ids: Optional[Sequence[int]] = None):
+    """
+    UPDATE recomputing `Buyer.overdue_amount` and `Buyer.is_risked` for the given
+    buyers, or all buyers when None, from one grouped pass over their receivables.
+    Each receivable row is a snapshot of one period that carries unpaid debt forward,
+    so the amount is `age_over_90_days` of the buyer's latest period; the flag is set
+    when any period has debt aged over 90 days. Rows that are unchanged are not written.
+    """
+    scope = aliased(Buyer)
+    latest = (
+        select(
+            AccountReceivable.buyer_id,
+            func.max(AccountReceivable.period_date).label("period_date"),
+            func.bool_or(AccountReceivable.age_over_90_days > 0).label("risked"),
+        )
+        .group_by(AccountReceivable.buyer_id)
+    )
+    if buyer_ids is not None:
+        latest = latest.where(AccountReceivable.buyer_id.in_(buyer_ids))
+    latest = latest.subquery("latest")
+    overdue = (
+        select(
+            scope.id.label("buyer_id"),
+            func.coalesce(AccountReceivable.age_over_90_days, 0.0).label("amount"),
+            func.coalesce(latest.c.risked, false()).label("risked"),
+        )
+        .select_from(scope)
+        .outerjoin(latest, latest.c.buyer_id == scope.id)
+        .outerjoin(
+            AccountReceivable,
+            and_(
+                AccountReceivable.buyer_id == latest.c.buyer_id,
+                AccountReceivable.period_date == latest.c.period_date,
+            ),
+        )
+    )
+    if buyer_ids is not None:
+        overdue = overdue.where(scope.id.in_(buyer_ids))
+    overdue = overdue.subquery("overdue")
+    return (
+        update(Buyer)
+        .where(
+            Buyer.id == overdue.c.buyer_id,
+            or_(
+                Buyer.overdue_amount.is_distinct_from(overdue.c.amount),
+                Buyer.is_risked.is_distinct_from(overdue.c.risked),
+            ),
+        )
+        .values(overdue_amount=overdue.c.amount, is_risked=overdue.c.risked)
+    )
+
+
+@trace_methods("repository")
 class AccountReceivableRepository:
     """
     Handles asynchronous database operations for the AccountReceivable model.
@@ -23,6 +83,20 @@ class AccountReceivableRepository:
         """
         self.session = session
 
+    async def _refresh_risk(self, *buyer_ids: Optional[int]) -> None:
+        """Brings the buyers' risk columns up to date before the caller commits."""
+        buyer_ids = sorted({buyer_id for buyer_id in buyer_ids if buyer_id is not None})
+        if not buyer_ids:
+            return
+        await self.session.flush()
+        # The RETURNING rows refresh Buyer objects already loaded in the session
+        # (e.g. `db_ar.buyer`) once they are fetched
+        statement = refresh_buyer_risk(buyer_ids).returning(Buyer).execution_options(
+            synchronize_session=False, populate_existing=True
+        )
+        result = await self.session.execute(statement)
+        result.scalars().all()
+
     async def create(
         self, *, ar_create: AccountReceivableCreateRequest
     ) -> AccountReceivable:
@@ -35,18 +109,32 @@ class AccountReceivableRepository:
         Returns:
             The newly created AccountReceivable entity.
         """
-        db_ar = AccountReceivable.model_validate(ar_create)
+        db_ar = AccountReceivable.model_validate(
+            ar_create, update={"period_date": period_start(ar_create.period)}
+        )
         self.session.add(db_ar)
+        await self._refresh_risk(db_ar.buyer_id)
         await self.session.commit()
         await self.session.refresh(db_ar)
         return db_ar
 
-    async def get_by_id(self, *, ar_id: int) -> Optional[AccountReceivable]:
-        # UPDATE THIS METHOD
-        statement = (
-            select(AccountReceivable)
-            .where(AccountReceivable.id == ar_id)
-            .options(selectinload(AccountReceivable.buyer))
+    async def get_by_id(
+        self, *, ar_id: int, fieldset: Optional[FieldSet] = None
+    ) -> Optional[AccountReceivable]:
+        if fieldset is None:
+            result = await self.session.execute(
+                statements.get("account_receivable.by_id"), {"ar_id": ar_id}
+            )
+        else:
+            statement = select_by_pk(AccountReceivable).options(*loader_options(AccountReceivable, fieldset))
+            result = await self.session.execute(statement, {"pk": ar_id})
+        return result.scalars().one_or_none()
+
+    async def get_by_period(self, *, buyer_id: int, period_date: date) -> Optional[AccountReceivable]:
+        """The buyer's row for a period (unique on `(buyer_id, period_date)`), if any."""
+        statement = select(AccountReceivable).where(
+            AccountReceivable.buyer_id == buyer_id,
+            AccountReceivable.period_date == period_date,
         )
         result = await self.session.execute(statement)
         return result.scalars().one_or_none()
@@ -56,23 +144,39 @@ class AccountReceivableRepository:
         *,
         buyer_id: Optional[int] = None,
         period: Optional[str] = None,
+        period_from: Optional[date] = None,
+        period_to: Optional[date] = None,
         page: int = 1,
         limit: int = 10,
+        fieldset: Optional[FieldSet] = None,
     ) -> Tuple[List[AccountReceivable], int]:
-        # UPDATE THIS LINE
-        statement = select(AccountReceivable).options(selectinload(AccountReceivable.buyer))
-
-        if buyer_id is not None:
-            statement = statement.where(AccountReceivable.buyer_id == buyer_id)
-        if period:
-            statement = statement.where(AccountReceivable.period.ilike(f"%{period}%"))
-
-        count_statement = select(func.count()).select_from(statement.subquery())
+        period_pattern = f"%{period}%"
+
+        def filtered(statement):
+            if buyer_id is not None:
+                statement += lambda s: s.where(AccountReceivable.buyer_id == buyer_id)
+            if period:
+                statement += lambda s: s.where(AccountReceivable.period.ilike(period_pattern))
+            # Range scans on period_date (with buyer_id: ux_account_receivable_buyer_period)
+            if period_from:
+                statement += lambda s: s.where(AccountReceivable.period_date >= period_from)
+            if period_to:
+                statement += lambda s: s.where(AccountReceivable.period_date <= period_to)
+            return statement
+
+        count_statement = filtered(statements.get("account_receivable.count"))
         count_result = await self.session.execute(count_statement)
         total_count = count_result.scalar_one()
 
         offset = (page - 1) * limit
-        paginated_statement = statement.order_by(AccountReceivable.id).offset(offset).limit(limit)
+        options = (
+            statements.get("account_receivable.load") if fieldset is None
+            else loader_options(AccountReceivable, fieldset)
+        )
+        list_statement = with_options(filtered(statements.get("account_receivable.list")), options)
+        paginated_statement = list_statement + (
+            lambda s: s.order_by(AccountReceivable.id).offset(offset).limit(limit)
+        )
 
         items_result = await self.session.execute(paginated_statement)
         items = items_result.scalars().all()
@@ -95,11 +199,15 @@ class AccountReceivableRepository:
         Returns:
             The updated AccountReceivable entity.
         """
+        previous_buyer_id = db_ar.buyer_id
         update_data = ar_update.model_dump(exclude_unset=True)
+        if update_data.get("period"):
+            update_data["period_date"] = period_start(update_data["period"])
         for key, value in update_data.items():
             setattr(db_ar, key, value)
 
         self.session.add(db_ar)
+        await self._refresh_risk(previous_buyer_id, db_ar.buyer_id)
         await self.session.commit()
         await self.session.refresh(db_ar)
         return db_ar
@@ -112,4 +220,5 @@ class AccountReceivableRepository:
             db_ar: The AccountReceivable entity to delete.
         """
         await self.session.delete(db_ar)
+        await self._refresh_risk(db_ar.buyer_id)
         await self.session.commit()
\ No newline at end of file
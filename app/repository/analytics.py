@@ -0,0 +1,441 @@
+from typing import Any, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import Date, DateTime, Float, and_, case, cast, literal, literal_column, union_all
+from sqlalchemy.engine import RowMapping
+from sqlmodel import SQLModel, select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.model.buyer import Buyer
+from app.model.cost_layer import CostConsumer, CostConsumption
+from app.model.inventory import Inventory
+from app.model.knit_formula import KnitFormula
+from app.model.machine import Machine
+from app.model.production_daily import ProductionDaily
+from app.model.purchase_daily import PurchaseDaily
+from app.model.sales_daily import SalesDaily
+from app.model.sales_transaction import SalesTransaction
+from app.model.supplier import Supplier
+from app.core.tracing import trace_methods
+
+PERIODS = ("day", "month")
+
+
+def date_range(column, start_date: Optional[date], end_date: Optional[date]) -> List[Any]:
+    """
+    Inclusive date filter as a half-open timestamp range, which can use the column's
+    index (`func.date(column)` cannot).
+    """
+    clauses = []
+    if start_date:
+        clauses.append(column >= datetime.combine(start_date, time.min))
+    if end_date:
+        clauses.append(column < datetime.combine(end_date + timedelta(days=1), time.min))
+    return clauses
+
+
+def margin_query(
+    buyer_id: Optional[int] = None,
+    inventory_id: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    archived_until: Optional[date] = None,
+):
+    """
+    One row per sale with its revenue (`weight_kg * price_per_kg`) and the cost of
+    the goods sold, set-based over a join of sales with their FIFO consumption.
+
+    A sale's cost is the sum of its cost_consumption rows (app/repository/cost_layer.py),
+    aggregated once for the whole range. Its `uncovered_kg` are the kilograms no layer
+    covered, which the recompute values at the item's average cost; a sale without
+    rows, written since the last FIFO recompute, is valued at the average cost as a
+    whole. A sale with any uncovered kilograms is flagged `estimated`.
+    Only sales still in sales_transaction are covered; with `archived_until`, days
+    before it are left to `archived_margin_query`.
+    """
+    if archived_until is not None and (start_date is None or start_date < archived_until):
+        start_date = archived_until
+    consumed = [
+        CostConsumption.consumer_type == CostConsumer.SALE.value,
+        # A sale consumes on its transaction date
+        *date_range(CostConsumption.consumed_at, start_date, end_date),
+    ]
+    conditions = date_range(SalesTransaction.transaction_date, start_date, end_date)
+    if inventory_id:
+        consumed.append(CostConsumption.inventory_id == inventory_id)
+    uncovered = case((CostConsumption.layer_id.is_(None), CostConsumption.quantity_kg), else_=0.0)
+    costs = (
+        select(
+            CostConsumption.consumer_id,
+            func.sum(CostConsumption.quantity_kg * CostConsumption.unit_cost).label("cost"),
+            func.sum(uncovered).label("uncovered_kg"),
+        )
+        .where(*consumed)
+        .group_by(CostConsumption.consumer_id)
+        .subquery("costs")
+    )
+
+    weight = func.coalesce(SalesTransaction.weight_kg, 0.0)
+    revenue = weight * SalesTransaction.price_per_kg
+    cost = func.coalesce(costs.c.cost, weight * Inventory.average_cost, 0.0)
+    uncovered_kg = func.coalesce(costs.c.uncovered_kg, weight)
+    if buyer_id is not None:
+        conditions.append(SalesTransaction.buyer_id == buyer_id)
+    if inventory_id:
+        conditions.append(SalesTransaction.inventory_id == inventory_id)
+    return (
+        select(
+            SalesTransaction.id,
+            SalesTransaction.transaction_date,
+            SalesTransaction.buyer_id,
+            SalesTransaction.inventory_id,
+            weight.label("weight_kg"),
+            SalesTransaction.price_per_kg,
+            revenue.label("revenue"),
+            cost.label("cost"),
+            uncovered_kg.label("uncovered_kg"),
+            (uncovered_kg > 0).label("estimated"),
+        )
+        .select_from(SalesTransaction)
+        .outerjoin(costs, costs.c.consumer_id == SalesTransaction.id)
+        .outerjoin(Inventory, Inventory.id == SalesTransaction.inventory_id)
+        .where(*conditions)
+    )
+
+
+def archived_margin_query(
+    archived_until: date,
+    buyer_id: Optional[int] = None,
+    inventory_id: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """
+    Revenue and cost of the sales before `archived_until`, whose rows have been moved
+    out of sales_transaction (app/repository/archive.py): one row per sales_daily row.
+
+    Revenue is the rollup's total. The consumption log keeps the archived sales' cost,
+    but not their buyer, so the cost per kilogram is taken per item and day and applied
+    to each buyer's kilograms; totals per month and item are exact. The uncovered share
+    of a day's kilograms is apportioned the same way, and days without consumption are
+    valued at the item's average cost as a whole. A row with uncovered kilograms counts
+    its sales as estimated.
+    """
+    day = cast(CostConsumption.consumed_at, Date)
+    consumed = [
+        CostConsumption.consumer_type == CostConsumer.SALE.value,
+        CostConsumption.consumed_at < datetime.combine(archived_until, time.min),
+        *date_range(CostConsumption.consumed_at, start_date, end_date),
+    ]
+    if inventory_id:
+        consumed.append(CostConsumption.inventory_id == inventory_id)
+    unit_costs = (
+        select(
+            CostConsumption.inventory_id,
+            day.label("day"),
+            (
+                func.sum(CostConsumption.quantity_kg * CostConsumption.unit_cost)
+                / func.nullif(func.sum(CostConsumption.quantity_kg), 0.0, type_=Float)
+            ).label("unit_cost"),
+            (
+                func.sum(case((CostConsumption.layer_id.is_(None), CostConsumption.quantity_kg), else_=0.0))
+                / func.nullif(func.sum(CostConsumption.quantity_kg), 0.0, type_=Float)
+            ).label("uncovered_share"),
+        )
+        .where(*consumed)
+        .group_by(CostConsumption.inventory_id, day)
+        .subquery("unit_costs")
+    )
+
+    conditions = [SalesDaily.day < archived_until]
+    if start_date:
+        conditions.append(SalesDaily.day >= start_date)
+    if end_date:
+        conditions.append(SalesDaily.day <= end_date)
+    if buyer_id is not None:
+        conditions.append(SalesDaily.buyer_id == buyer_id)
+    if inventory_id:
+        conditions.append(SalesDaily.inventory_id == inventory_id)
+    cost = func.coalesce(
+        SalesDaily.weight_kg * unit_costs.c.unit_cost,
+        SalesDaily.weight_kg * Inventory.average_cost,
+        0.0,
+    )
+    uncovered_kg = SalesDaily.weight_kg * func.coalesce(unit_costs.c.uncovered_share, 1.0)
+    return (
+        select(
+            cast(SalesDaily.day, DateTime).label("transaction_date"),
+            SalesDaily.buyer_id,
+            SalesDaily.inventory_id,
+            SalesDaily.transaction_count,
+            SalesDaily.weight_kg,
+            SalesDaily.total.label("revenue"),
+            cost.label("cost"),
+            uncovered_kg.label("uncovered_kg"),
+            case((uncovered_kg > 0, SalesDaily.transaction_count), else_=0).label("estimated_count"),
+        )
+        .select_from(SalesDaily)
+        .outerjoin(
+            unit_costs,
+            and_(unit_costs.c.inventory_id == SalesDaily.inventory_id, unit_costs.c.day == SalesDaily.day),
+        )
+        .outerjoin(Inventory, Inventory.id == SalesDaily.inventory_id)
+        .where(*conditions)
+    )
+
+
+@trace_methods("repository")
+class AnalyticsRepository:
+    """
+    Dashboard aggregates, read from the daily rollup tables (app/repository/rollup.py):
+    the cost depends on the number of days and groups in the range, not on the number
+    of transactions. Gross margin needs the cost of each sale and is computed from
+    the sales and the FIFO consumption log instead, in one query; archived days are
+    merged in from the rollup.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _aggregate(
+        self,
+        *,
+        rollup: type[SQLModel],
+        group_by: str,
+        groups: dict,
+        conditions: List[Any],
+        start_date: Optional[date],
+        end_date: Optional[date],
+        count_column: Any,
+        total_column: Any = None,
+        join: Optional[tuple] = None,
+    ) -> List[RowMapping]:
+        if start_date:
+            conditions.append(rollup.day >= start_date)
+        if end_date:
+            conditions.append(rollup.day <= end_date)
+
+        count = func.sum(count_column)
+        measures = [
+            count.label("transaction_count"),
+            func.coalesce(func.sum(rollup.roll_count), 0.0).label("roll_count"),
+            func.coalesce(func.sum(rollup.weight_kg), 0.0).label("weight_kg"),
+        ]
+        if total_column is not None:
+            measures.append(func.coalesce(func.sum(total_column), 0.0).label("total"))
+        source = rollup if join is None else rollup.__table__.join(*join)
+
+        if group_by in PERIODS:
+            # The unit is a literal: as a bound parameter the SELECT and GROUP BY
+            # expressions would differ and Postgres would reject the query. The cast keeps
+            # date_trunc on timestamp (a bare date resolves to timestamptz)
+            bucket = (
+                rollup.day if group_by == "day"
+                else func.date_trunc(
+                    literal_column(f"'{group_by}'"), cast(rollup.day, DateTime), type_=DateTime
+                )
+            )
+            statement = (
+                select(bucket.label("key"), *measures)
+                .select_from(source)
+                .where(*conditions)
+                .group_by(bucket)
+                .having(count > 0)
+                .order_by(bucket)
+            )
+        else:
+            # Aggregate first, then look up names for the (few) resulting groups
+            group_column, id_column, name_column = groups[group_by]
+            grouped = (
+                select(group_column.label("key"), *measures)
+                .select_from(source)
+                .where(*conditions)
+                .group_by(group_column)
+                .having(count > 0)
+                .subquery()
+            )
+            order = (grouped.c.total if total_column is not None else grouped.c.weight_kg).desc()
+            statement = (
+                select(grouped, name_column.label("label"))
+                .select_from(grouped.outerjoin(id_column.table, id_column == grouped.c.key))
+                .order_by(order, grouped.c.key)
+            )
+            if name_column.table is not id_column.table:
+                statement = statement.outerjoin(name_column.table)
+        result = await self.session.execute(statement)
+        return list(result.mappings().all())
+
+    async def sales_revenue(
+        self,
+        *,
+        group_by: str,
+        buyer_id: Optional[int] = None,
+        inventory_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[RowMapping]:
+        """Revenue (`sum(weight_kg * price_per_kg)`) per day, month, buyer or item."""
+        conditions = []
+        if buyer_id is not None:
+            conditions.append(SalesDaily.buyer_id == buyer_id)
+        if inventory_id:
+            conditions.append(SalesDaily.inventory_id == inventory_id)
+        return await self._aggregate(
+            rollup=SalesDaily,
+            group_by=group_by,
+            groups={
+                "buyer": (SalesDaily.buyer_id, Buyer.id, Buyer.name),
+                "inventory": (SalesDaily.inventory_id, Inventory.id, Inventory.name),
+            },
+            conditions=conditions,
+            start_date=start_date,
+            end_date=end_date,
+            count_column=SalesDaily.transaction_count,
+            total_column=SalesDaily.total,
+        )
+
+    async def purchase_spend(
+        self,
+        *,
+        group_by: str,
+        supplier_id: Optional[int] = None,
+        inventory_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        inventory_type: Optional[str] = None,
+    ) -> List[RowMapping]:
+        """Purchase spend (`sum(weight_kg * price_per_kg)`) per day, month, supplier or item."""
+        conditions = []
+        join = None
+        if supplier_id is not None:
+            conditions.append(PurchaseDaily.supplier_id == supplier_id)
+        if inventory_id:
+            conditions.append(PurchaseDaily.inventory_id == inventory_id)
+        if inventory_type:
+            # Same filter as the purchase list endpoint; only then is Inventory joined
+            join = (Inventory, Inventory.id == PurchaseDaily.inventory_id)
+            conditions.append(Inventory.type == inventory_type)
+        return await self._aggregate(
+            rollup=PurchaseDaily,
+            group_by=group_by,
+            groups={
+                "supplier": (PurchaseDaily.supplier_id, Supplier.id, Supplier.name),
+                "inventory": (PurchaseDaily.inventory_id, Inventory.id, Inventory.name),
+            },
+            conditions=conditions,
+            start_date=start_date,
+            end_date=end_date,
+            count_column=PurchaseDaily.transaction_count,
+            total_column=PurchaseDaily.total,
+            join=join,
+        )
+
+    async def production_output(
+        self,
+        *,
+        group_by: str,
+        knit_formula_id: Optional[int] = None,
+        machine_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[RowMapping]:
+        """Completed knitting output per day, month, formula or machine."""
+        conditions = []
+        if knit_formula_id is not None:
+            conditions.append(ProductionDaily.knit_formula_id == knit_formula_id)
+        if machine_id is not None:
+            conditions.append(ProductionDaily.machine_id == machine_id)
+        return await self._aggregate(
+            rollup=ProductionDaily,
+            group_by=group_by,
+            groups={
+                # A formula is labelled with the name of the product it makes
+                "formula": (ProductionDaily.knit_formula_id, KnitFormula.id, Inventory.name),
+                "machine": (ProductionDaily.machine_id, Machine.id, Machine.name),
+            },
+            conditions=conditions,
+            start_date=start_date,
+            end_date=end_date,
+            count_column=ProductionDaily.process_count,
+        )
+
+    async def sales_margin(
+        self,
+        *,
+        group_by: str,
+        buyer_id: Optional[int] = None,
+        inventory_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        archived_until: Optional[date] = None,
+    ) -> List[RowMapping]:
+        """
+        Revenue, cost of goods sold and margin per month, buyer or item. Days before
+        `archived_until` come from the daily rollup (`archived_margin_query`).
+        """
+        live = margin_query(buyer_id, inventory_id, start_date, end_date, archived_until).subquery("live")
+        sales = select(
+            live.c.transaction_date,
+            live.c.buyer_id,
+            live.c.inventory_id,
+            literal(1).label("transaction_count"),
+            live.c.weight_kg,
+            live.c.revenue,
+            live.c.cost,
+            live.c.uncovered_kg,
+            case((live.c.estimated, 1), else_=0).label("estimated_count"),
+        )
+        if archived_until is not None and (start_date is None or start_date < archived_until):
+            sales = union_all(
+                archived_margin_query(archived_until, buyer_id, inventory_id, start_date, end_date),
+                sales,
+            )
+        sales = sales.subquery("sales")
+        measures = [
+            func.coalesce(func.sum(sales.c.transaction_count), 0).label("transaction_count"),
+            func.coalesce(func.sum(sales.c.weight_kg), 0.0).label("weight_kg"),
+            func.coalesce(func.sum(sales.c.revenue), 0.0).label("revenue"),
+            func.coalesce(func.sum(sales.c.cost), 0.0).label("cost"),
+            func.coalesce(func.sum(sales.c.uncovered_kg), 0.0).label("uncovered_kg"),
+            func.coalesce(func.sum(sales.c.estimated_count), 0).label("estimated_count"),
+        ]
+        if group_by == "month":
+            # Literal unit, as in _aggregate
+            bucket = func.date_trunc(literal_column("'month'"), sales.c.transaction_date, type_=DateTime)
+            statement = select(bucket.label("key"), *measures).group_by(bucket).order_by(bucket)
+        else:
+            group_column, id_column, name_column = {
+                "buyer": (sales.c.buyer_id, Buyer.id, Buyer.name),
+                "inventory": (sales.c.inventory_id, Inventory.id, Inventory.name),
+            }[group_by]
+            grouped = select(group_column.label("key"), *measures).group_by(group_column).subquery()
+            statement = (
+                select(grouped, name_column.label("label"))
+                .select_from(grouped.outerjoin(id_column.table, id_column == grouped.c.key))
+                .order_by((grouped.c.revenue - grouped.c.cost).desc(), grouped.c.key)
+            )
+        result = await self.session.execute(statement)
+        return list(result.mappings().all())
+
+    async def sale_margins(
+        self,
+        *,
+        page: int,
+        limit: int,
+        buyer_id: Optional[int] = None,
+        inventory_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Tuple[List[RowMapping], int]:
+        """
+        A page of per-sale margins, newest first, and the number of sales in the filter.
+        Archived sales no longer exist as rows and are not listed.
+        """
+        sales = margin_query(buyer_id, inventory_id, start_date, end_date).subquery("sales")
+        count = await self.session.execute(select(func.count()).select_from(sales))
+        result = await self.session.execute(
+            select(sales, (sales.c.revenue - sales.c.cost).label("margin"))
+            .order_by(sales.c.transaction_date.desc(), sales.c.id.desc())
+            .offset((page - 1) * limit)
+            .limit(limit)
+        )
+        return list(result.mappings().all()), count.scalar_one()
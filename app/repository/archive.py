@@ -0,0 +1,208 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+from datetime import date, datetime
+from sqlalchemy import column, delete, table as table_clause, text, tuple_
+from sqlmodel import SQLModel, select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.model.archive_segment import ArchiveSegment
+from app.model.dyeing_process import DyeingProcess
+from app.model.knitting_process import KnittingProcess
+from app.model.purchase_transaction import PurchaseTransaction
+from app.model.sales_transaction import SalesTransaction
+from app.core.archive import ARCHIVED_TABLES
+from app.core.config import settings
+from app.core.partitions import add_months, month_start
+from app.repository.analytics import date_range
+from app.core.tracing import trace_methods
+
+MODELS: Dict[str, type[SQLModel]] = {
+    "sales_transaction": SalesTransaction,
+    "purchase_transaction": PurchaseTransaction,
+    "knitting_process": KnittingProcess,
+    "dyeing_process": DyeingProcess,
+}
+
+# Process tables: a month is only closed once all of its runs are finished
+STATUS_COLUMNS = {
+    "knitting_process": KnittingProcess.knit_status,
+    "dyeing_process": DyeingProcess.dyeing_status,
+}
+
+
+async def archived_until(session: AsyncSession, table: str) -> Optional[date]:
+    """First day after the last archived month of `table` (None when nothing is archived)."""
+    result = await session.execute(
+        select(func.max(ArchiveSegment.month)).where(ArchiveSegment.table_name == table)
+    )
+    last = result.scalar()
+    return add_months(last, 1) if last else None
+
+
+@trace_methods("repository")
+class ArchiveRepository:
+    """
+    Moves months of history between the database and the `archive_segment` manifest,
+    and streams the live rows of the history tables. Writes do not commit: the archive
+    command commits each month once its file is in place.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_segments(
+        self, *, table: str, start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> List[ArchiveSegment]:
+        """Segments of `table` overlapping the date range, oldest first."""
+        statement = select(ArchiveSegment).where(ArchiveSegment.table_name == table)
+        if start_date:
+            statement = statement.where(ArchiveSegment.month >= month_start(start_date))
+        if end_date:
+            statement = statement.where(ArchiveSegment.month <= end_date)
+        result = await self.session.execute(statement.order_by(ArchiveSegment.month))
+        return list(result.scalars().all())
+
+    async def archived_until(self, *, table: str) -> Optional[date]:
+        return await archived_until(self.session, table)
+
+    async def lock(self) -> None:
+        """Serializes archive runs (transaction-scoped advisory lock)."""
+        await self.session.execute(text("SELECT pg_advisory_xact_lock(hashtext('archive_history'))"))
+
+    async def _partition(self, table: str, month: date) -> Optional[bool]:
+        """Whether the month's partition is attached; None when there is no such table."""
+        result = await self.session.execute(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_inherits WHERE inhrelid = relid) "
+                "FROM (SELECT to_regclass(:name) AS relid) AS partition WHERE relid IS NOT NULL"
+            ),
+            {"name": f"{table}_p{month:%Y_%m}"},
+        )
+        return result.scalar()
+
+    async def _detached_months(self, table: str) -> List[date]:
+        """Months of partitions detached from `table` by hand, which still hold their rows."""
+        result = await self.session.execute(
+            text(
+                "SELECT child.relname FROM pg_class child "
+                "WHERE child.relkind = 'r' AND child.relname ~ :pattern "
+                "AND NOT EXISTS (SELECT 1 FROM pg_inherits WHERE inhrelid = child.oid)"
+            ),
+            {"pattern": f"^{table}_p[0-9]{{4}}_[0-9]{{2}}$"},
+        )
+        return [datetime.strptime(name[-7:], "%Y_%m").date() for name in result.scalars().all()]
+
+    async def pending_months(self, *, table: str, before: date) -> List[date]:
+        """
+        Months of `table` before `before` that are not archived yet, oldest first. For
+        process tables the list stops at the first month with an unfinished run.
+        """
+        model = MODELS[table]
+        date_column = getattr(model, ARCHIVED_TABLES[table])
+        start = await archived_until(self.session, table)
+        end = month_start(before)
+
+        status = STATUS_COLUMNS.get(table)
+        if status is not None:
+            result = await self.session.execute(
+                select(func.min(date_column)).where(status.is_(False), date_column < end)
+            )
+            unfinished = result.scalar()
+            if unfinished:
+                end = min(end, month_start(unfinished.date()))
+
+        result = await self.session.execute(select(func.min(date_column)).where(date_column < end))
+        first = result.scalar()
+        candidates = [month_start(first.date())] if first else []
+        candidates += [month for month in await self._detached_months(table) if month < end]
+        if not candidates:
+            return []
+        month, months = min(candidates), []
+        if start:
+            month = max(month, start)
+        while month < end:
+            months.append(month)
+            month = add_months(month, 1)
+        return months
+
+    async def stream_month(self, *, table: str, month: date) -> AsyncIterator[List[tuple]]:
+        """
+        Yields the rows of a month in column order, in blocks of ARCHIVE_BLOCK_ROWS.
+        Reads the month's partition table when there is one (attached or detached),
+        else the table itself.
+
+        Blocks are fetched with keyset pagination on (date, id) rather than a
+        server-side cursor: the cursor's portal stays open until the transaction ends,
+        and the open portal makes remove_month's DROP of the partition fail.
+        """
+        source = MODELS[table].__table__
+        if await self._partition(table, month) is not None:
+            source = table_clause(
+                f"{table}_p{month:%Y_%m}", *(column(c.name, c.type) for c in source.columns)
+            )
+        date_column = source.c[ARCHIVED_TABLES[table]]
+        statement = (
+            select(*source.c)
+            .where(date_column >= month, date_column < add_months(month, 1))
+            .order_by(date_column, source.c.id)
+            .limit(settings.ARCHIVE_BLOCK_ROWS)
+        )
+        date_index = list(source.c.keys()).index(date_column.name)
+        id_index = list(source.c.keys()).index("id")
+        after = None
+        while True:
+            page = statement
+            if after is not None:
+                page = page.where(tuple_(date_column, source.c.id) > after)
+            result = await self.session.execute(page)
+            rows = [tuple(row) for row in result.all()]
+            if not rows:
+                return
+            yield rows
+            if len(rows) < settings.ARCHIVE_BLOCK_ROWS:
+                return
+            after = tuple_(rows[-1][date_index], rows[-1][id_index])
+
+    async def remove_month(self, *, table: str, month: date) -> None:
+        """Drops the month's partition if it has one, else deletes its rows."""
+        attached = await self._partition(table, month)
+        name = f"{table}_p{month:%Y_%m}"
+        if attached is not None:
+            if attached:
+                await self.session.execute(text(f'ALTER TABLE {table} DETACH PARTITION "{name}"'))
+            await self.session.execute(text(f'DROP TABLE "{name}"'))
+            return
+        model = MODELS[table]
+        date_column = getattr(model, ARCHIVED_TABLES[table])
+        await self.session.execute(
+            delete(model).where(date_column >= month, date_column < add_months(month, 1))
+        )
+
+    async def add_segment(
+        self, *, table: str, month: date, path: str, row_count: int, byte_size: int, sha256: str
+    ) -> None:
+        self.session.add(ArchiveSegment(
+            table_name=table,
+            month=month,
+            path=path,
+            row_count=row_count,
+            byte_size=byte_size,
+            sha256=sha256,
+            archived_at=datetime.now(),
+        ))
+        await self.session.flush()
+
+    async def stream_live(
+        self, *, table: str, start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yields the table's rows in the date range as mappings, oldest first, in blocks."""
+        source = MODELS[table].__table__
+        date_column = source.c[ARCHIVED_TABLES[table]]
+        statement = (
+            select(*source.c)
+            .where(*date_range(date_column, start_date, end_date))
+            .order_by(date_column, source.c.id)
+            .execution_options(yield_per=settings.ARCHIVE_BLOCK_ROWS)
+        )
+        result = await self.session.stream(statement)
+        async for rows in result.mappings().partitions():
+            yield [dict(row) for row in rows]
@@ -1,12 +1,16 @@
 from typing import Optional, List, Tuple
-from sqlmodel import select, func
+from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy import lambda_stmt
+from sqlalchemy.engine import RowMapping
 
 from app.model.buyer import Buyer
-from app.model.account_receivable import AccountReceivable # Import AccountReceivable
+from app.core.fieldsets import FieldSet, selected_columns
+from app.repository.statements import statements
 from app.schema.buyer.request import BuyerCreateRequest, BuyerUpdateRequest
+from app.core.tracing import trace_methods
 
+@trace_methods("repository")
 class BuyerRepository:
     """
     Handles asynchronous database operations for the Buyer model.
@@ -22,52 +26,56 @@ class BuyerRepository:
         await self.session.refresh(db_buyer)
         return db_buyer
 
-    async def get_by_id(self, *, buyer_id: int) -> Optional[Tuple[Buyer, bool]]:
-        is_risked_subquery = (
-            select(AccountReceivable)
-            .where(
-                AccountReceivable.buyer_id == Buyer.id,
-                AccountReceivable.age_over_90_days > 0,
-            )
-            .exists()
-            .label("is_risked")
+    async def get_by_id(self, *, buyer_id: int) -> Optional[Buyer]:
+        result = await self.session.execute(
+            statements.get("buyer.by_id"), {"buyer_id": buyer_id}
         )
-        
-        statement = select(Buyer, is_risked_subquery).where(Buyer.id == buyer_id)
-        result = await self.session.execute(statement) # CORRECTED LINE
-        return result.one_or_none()
+        return result.scalars().one_or_none()
+
+    async def get_fields_by_id(self, *, buyer_id: int, fieldset: FieldSet) -> Optional[RowMapping]:
+        """Only the fieldset's columns of one buyer."""
+        statement = select(*selected_columns(Buyer, fieldset)).where(Buyer.id == buyer_id)
+        result = await self.session.execute(statement)
+        return result.mappings().one_or_none()
 
     async def get_all(
         self,
         *,
         name: Optional[str] = None,
+        risked: Optional[bool] = None,
         page: int = 1,
-        limit: int = 10
-    ) -> Tuple[List[Tuple[Buyer, bool]], int]:
-        is_risked_subquery = (
-            select(AccountReceivable)
-            .where(
-                AccountReceivable.buyer_id == Buyer.id,
-                AccountReceivable.age_over_90_days > 0,
-            )
-            .exists()
-            .label("is_risked")
-        )
+        limit: int = 10,
+        fieldset: Optional[FieldSet] = None,
+    ) -> Tuple[List[RowMapping], int]:
+        """Returns buyer columns as row mappings, and the total count."""
+        name_pattern = f"%{name}%"
 
-        statement = select(Buyer, is_risked_subquery)
-        
-        if name:
-            statement = statement.where(Buyer.name.ilike(f"%{name}%"))
+        def filtered(statement):
+            if name:
+                statement += lambda s: s.where(Buyer.name.ilike(name_pattern))
+            if risked:
+                # Matches the partial index ix_buyer_risked
+                statement += lambda s: s.where(Buyer.is_risked)
+            elif risked is not None:
+                statement += lambda s: s.where(Buyer.is_risked.is_(False))
+            return statement
 
-        count_statement = select(func.count()).select_from(statement.subquery())
+        count_statement = filtered(statements.get("buyer.count"))
         count_result = await self.session.execute(count_statement) # CORRECTED LINE
         total_count = count_result.one()[0]
 
         offset = (page - 1) * limit
-        paginated_statement = statement.order_by(Buyer.id).offset(offset).limit(limit)
+        if fieldset is None:
+            list_statement = statements.get("buyer.list")
+        else:
+            columns = tuple(selected_columns(Buyer, fieldset))
+            list_statement = lambda_stmt(lambda: select(*columns), track_on=[columns])
+        paginated_statement = filtered(list_statement) + (
+            lambda s: s.order_by(Buyer.id).offset(offset).limit(limit)
+        )
         
         items_result = await self.session.execute(paginated_statement) # CORRECTED LINE
-        items = items_result.all()
+        items = items_result.mappings().all()
         
         return items, total_count
 
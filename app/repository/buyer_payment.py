@@ -0,0 +1,89 @@
+from typing import Optional, List, Tuple
+from datetime import date
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.model.buyer_payment import BuyerPayment
+from app.repository.analytics import date_range
+from app.schema.buyer_payment.request import BuyerPaymentCreateRequest
+from app.core.tracing import trace_methods
+
+@trace_methods("repository")
+class BuyerPaymentRepository:
+    """
+    Handles asynchronous database operations for the BuyerPayment model.
+    """
+    def __init__(self, session: AsyncSession):
+        """
+        Initializes the repository with an asynchronous database session.
+
+        Args:
+            session: The SQLModel AsyncSession object.
+        """
+        self.session = session
+
+    async def create(self, *, payment_create: BuyerPaymentCreateRequest) -> BuyerPayment:
+        """
+        Asynchronously records a new payment.
+
+        Args:
+            payment_create: The Pydantic schema with data for the new payment.
+
+        Returns:
+            The newly created BuyerPayment entity.
+        """
+        db_payment = BuyerPayment.model_validate(payment_create)
+        self.session.add(db_payment)
+        await self.session.commit()
+        await self.session.refresh(db_payment)
+        return db_payment
+
+    async def get_by_id(self, *, payment_id: int) -> Optional[BuyerPayment]:
+        """
+        Asynchronously fetches a payment by its primary key (ID).
+
+        Args:
+            payment_id: The ID of the payment to fetch.
+
+        Returns:
+            The BuyerPayment entity if found, otherwise None.
+        """
+        return await self.session.get(BuyerPayment, payment_id)
+
+    async def get_all(
+        self,
+        *,
+        buyer_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        page: int = 1,
+        limit: int = 10
+    ) -> Tuple[List[BuyerPayment], int]:
+        statement = select(BuyerPayment).where(*date_range(BuyerPayment.payment_date, start_date, end_date))
+
+        if buyer_id is not None:
+            statement = statement.where(BuyerPayment.buyer_id == buyer_id)
+
+        count_statement = select(func.count()).select_from(statement.subquery())
+        count_result = await self.session.execute(count_statement)
+        total_count = count_result.one()[0]
+
+        offset = (page - 1) * limit
+        paginated_statement = (
+            statement.order_by(BuyerPayment.payment_date.desc(), BuyerPayment.id.desc()).offset(offset).limit(limit)
+        )
+
+        items_result = await self.session.execute(paginated_statement)
+        items = items_result.scalars().all()
+
+        return list(items), total_count
+
+    async def delete(self, *, db_payment: BuyerPayment) -> None:
+        """
+        Asynchronously deletes a payment from the database.
+
+        Args:
+            db_payment: The BuyerPayment entity to delete.
+        """
+        await self.session.delete(db_payment)
+        await self.session.commit()
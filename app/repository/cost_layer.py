@@ -0,0 +1,515 @@
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime
+from sqlalchemy import cast, delete, insert, literal, text, tuple_, update
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.model.cost_layer import CostActivity, CostConsumer, CostConsumption, CostLayer, CostSource
+from app.model.dyeing_process import DyeingProcess
+from app.model.inventory import Inventory, InventoryType
+from app.model.knit_formula import KnitFormula
+from app.model.knitting_process import KnittingProcess
+from app.model.purchase_transaction import PurchaseTransaction
+from app.model.sales_transaction import SalesTransaction
+from app.core.config import settings
+from app.core.tracing import trace_methods
+
+EPOCH = datetime(1970, 1, 1)
+# Kilograms below this are rounding left-overs, not stock
+EPSILON = 1e-6
+# Consumers of the same instant are served in this order
+CONSUMER_ORDER = {CostConsumer.SALE: 0, CostConsumer.KNITTING: 1, CostConsumer.DYEING: 2}
+# Items are recomputed in this order: knitting layers of fabric are priced from the
+# allocation of their thread materials, so threads go first
+RECOMPUTE_ORDER = (InventoryType.THREAD, InventoryType.FABRIC)
+
+# Materials leave stock, and the knitted fabric enters it, when a run is completed
+KNITTING_COMPLETED_AT = func.coalesce(KnittingProcess.end_date, KnittingProcess.start_date)
+# Dyed output enters stock when a run is completed, never before the run drew its fabric
+DYEING_COMPLETED_AT = func.greatest(DyeingProcess.start_date, DyeingProcess.end_date)
+
+# (consumed_at, consumer, consumer_id, quantity_kg)
+Demand = Tuple[datetime, CostConsumer, int, float]
+
+
+def _as_datetime(value: Optional[date]) -> datetime:
+    if value is None:
+        return datetime.now()
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, datetime.min.time())
+
+
+class _Layer:
+    __slots__ = ("id", "layer_date", "remaining_kg", "unit_cost")
+
+    def __init__(self, id: int, layer_date: datetime, remaining_kg: float, unit_cost: float):
+        self.id = id
+        self.layer_date = layer_date
+        self.remaining_kg = remaining_kg
+        self.unit_cost = unit_cost
+
+
+@trace_methods("repository")
+class CostLayerRepository:
+    """
+    FIFO cost layers and their consumption log.
+
+    Write paths only flag what moved (`mark_activity`) and drop the allocations a
+    change invalidates (`release`, `drop_layer`), in the caller's transaction.
+    `recompute` then re-allocates one item from a date on: layers are synced from
+    its purchases and the knitting and dyeing runs that produced it, consumption is
+    re-derived from sales, completed knitting runs and dyeing runs, and each
+    consumer draws on the oldest open layers dated on or before it. Nothing before
+    that date is touched.
+
+    Production layers carry the cost their run consumed, so items are recomputed
+    in RECOMPUTE_ORDER, and a thread's recompute flags the fabric knitted from it.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def mark_activity(self, *, changes: Iterable[Tuple[Optional[str], Optional[date]]]) -> None:
+        """
+        Flags items whose allocation is stale from a date on; called by the stock
+        write paths before their commit. `changes` holds (inventory_id, date) pairs,
+        a missing date meaning now.
+        """
+        earliest: Dict[str, datetime] = {}
+        for inventory_id, moment in changes:
+            if inventory_id is None:
+                continue
+            moment = _as_datetime(moment)
+            earliest[inventory_id] = min(moment, earliest.get(inventory_id, moment))
+        if not earliest:
+            return
+        statement = pg_insert(CostActivity).values(
+            [{"inventory_id": inventory_id, "since": since} for inventory_id, since in sorted(earliest.items())]
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["inventory_id"],
+            set_={"since": func.least(CostActivity.since, statement.excluded.since)},
+        )
+        await self.session.execute(statement)
+
+    async def mark_all(self) -> None:
+        """Flags every item from the beginning: the next recompute is a full replay."""
+        statement = pg_insert(CostActivity).from_select(
+            ["inventory_id", "since"], select(Inventory.id, literal(EPOCH))
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["inventory_id"], set_={"since": statement.excluded.since}
+        )
+        await self.session.execute(statement)
+
+    async def release(self, *, consumer: CostConsumer, consumer_id: int) -> None:
+        """
+        Removes a consumer's allocation, puts the kilograms back on their layers and
+        flags its items; for updates and deletes of sales and production runs.
+        """
+        result = await self.session.execute(
+            delete(CostConsumption)
+            .where(CostConsumption.consumer_type == consumer.value, CostConsumption.consumer_id == consumer_id)
+            .returning(
+                CostConsumption.inventory_id,
+                CostConsumption.layer_id,
+                CostConsumption.consumed_at,
+                CostConsumption.quantity_kg,
+            )
+        )
+        rows = result.all()
+        restored: Dict[int, float] = {}
+        for _, layer_id, _, quantity_kg in rows:
+            if layer_id is not None:
+                restored[layer_id] = restored.get(layer_id, 0.0) + quantity_kg
+        for layer_id, quantity_kg in restored.items():
+            await self.session.execute(
+                update(CostLayer)
+                .where(CostLayer.id == layer_id)
+                .values(remaining_kg=func.least(CostLayer.remaining_kg + quantity_kg, CostLayer.quantity_kg))
+            )
+        await self.mark_activity(changes=[(inventory_id, consumed_at) for inventory_id, _, consumed_at, _ in rows])
+
+    async def drop_layer(self, *, source: CostSource, source_id: int) -> None:
+        """
+        Removes the layer of a purchase or run; the next recompute opens it again from
+        the live row, if any. Consumption drawn from it is re-allocated from its date on.
+        """
+        result = await self.session.execute(
+            delete(CostLayer)
+            .where(CostLayer.source_type == source.value, CostLayer.source_id == source_id)
+            .returning(CostLayer.inventory_id, CostLayer.layer_date)
+        )
+        await self.mark_activity(changes=result.all())
+
+    async def lock(self) -> None:
+        """Serializes recomputes (transaction-scoped advisory lock)."""
+        await self.session.execute(text("SELECT pg_advisory_xact_lock(hashtext('cost_layer'))"))
+
+    async def claim_activity(
+        self, *, inventory_id: Optional[str] = None, item_type: Optional[InventoryType] = None
+    ) -> Dict[str, datetime]:
+        """
+        Removes and returns the pending activity (of one item, or of the items of one
+        type, when given); rolled back with the recompute if it fails.
+        """
+        statement = delete(CostActivity)
+        if inventory_id is not None:
+            statement = statement.where(CostActivity.inventory_id == inventory_id)
+        if item_type is not None:
+            statement = statement.where(
+                CostActivity.inventory_id.in_(select(Inventory.id).where(Inventory.type == item_type))
+            )
+        result = await self.session.execute(statement.returning(CostActivity.inventory_id, CostActivity.since))
+        return {inventory_id: since for inventory_id, since in result.all()}
+
+    async def get_pending(self, *, item_type: Optional[InventoryType] = None) -> List[str]:
+        statement = select(CostActivity.inventory_id)
+        if item_type is not None:
+            statement = statement.join(Inventory, Inventory.id == CostActivity.inventory_id).where(
+                Inventory.type == item_type
+            )
+        result = await self.session.execute(statement.order_by(CostActivity.inventory_id))
+        return list(result.scalars().all())
+
+    async def get_layers(
+        self, *, page: int, limit: int, inventory_id: Optional[str] = None, open_only: bool = False
+    ) -> Tuple[List[CostLayer], int]:
+        """Layers in FIFO order (per item: oldest first)."""
+        statement = select(CostLayer)
+        if inventory_id:
+            statement = statement.where(CostLayer.inventory_id == inventory_id)
+        if open_only:
+            statement = statement.where(CostLayer.remaining_kg > 0)
+        count = await self.session.execute(select(func.count()).select_from(statement.subquery()))
+        result = await self.session.execute(
+            statement.order_by(CostLayer.inventory_id, CostLayer.layer_date, CostLayer.id)
+            .offset((page - 1) * limit)
+            .limit(limit)
+        )
+        return list(result.scalars().all()), count.scalar_one()
+
+    # --- Recompute ---
+
+    async def _sync_layers(self, inventory_id: str, since: datetime) -> None:
+        """
+        Opens layers for the item's purchases from `since` on that have none yet, and
+        (re)opens those of the knitting runs completed since then that produced it, at
+        the cost their materials were allocated (logged by the materials' recompute).
+        """
+        purchases = select(
+            PurchaseTransaction.inventory_id,
+            literal(CostSource.PURCHASE.value),
+            PurchaseTransaction.id,
+            PurchaseTransaction.transaction_date,
+            PurchaseTransaction.weight_kg,
+            func.coalesce(PurchaseTransaction.price_per_kg, 0.0),
+            PurchaseTransaction.weight_kg,
+        ).where(
+            PurchaseTransaction.inventory_id == inventory_id,
+            PurchaseTransaction.transaction_date >= since,
+            PurchaseTransaction.weight_kg > 0,
+        )
+        columns = ["inventory_id", "source_type", "source_id", "layer_date", "quantity_kg", "unit_cost", "remaining_kg"]
+        statement = pg_insert(CostLayer).from_select(columns, purchases)
+        await self.session.execute(
+            statement.on_conflict_do_nothing(index_elements=["source_type", "source_id"])
+        )
+
+        material_cost = (
+            select(func.coalesce(func.sum(CostConsumption.quantity_kg * CostConsumption.unit_cost), 0.0))
+            .where(
+                CostConsumption.consumer_type == CostConsumer.KNITTING.value,
+                CostConsumption.consumer_id == KnittingProcess.id,
+            )
+            .scalar_subquery()
+        )
+        runs = (
+            select(
+                literal(inventory_id),
+                literal(CostSource.KNITTING.value),
+                KnittingProcess.id,
+                KNITTING_COMPLETED_AT,
+                KnittingProcess.weight_kg,
+                material_cost / KnittingProcess.weight_kg,
+                KnittingProcess.weight_kg,
+            )
+            .join(KnitFormula, KnitFormula.id == KnittingProcess.knit_formula_id)
+            .where(
+                KnitFormula.product_id == inventory_id,
+                KnittingProcess.knit_status.is_(True),
+                KNITTING_COMPLETED_AT >= since,
+                KnittingProcess.weight_kg > 0,
+            )
+        )
+        await self.session.execute(self._upsert_layers(columns, runs))
+
+    @staticmethod
+    def _upsert_layers(columns: List[str], rows):
+        """
+        Inserts production layers, or resets existing ones to the run's current
+        output and cost. Only layers dated from `since` on are synced, and their
+        consumption has just been cleared, so nothing remains drawn from them.
+        """
+        statement = pg_insert(CostLayer).from_select(columns, rows)
+        return statement.on_conflict_do_update(
+            index_elements=["source_type", "source_id"],
+            set_={
+                "layer_date": statement.excluded.layer_date,
+                "quantity_kg": statement.excluded.quantity_kg,
+                "unit_cost": statement.excluded.unit_cost,
+                "remaining_kg": statement.excluded.remaining_kg,
+            },
+        )
+
+    async def _sync_dyeing_layers(self, inventory_id: str, since: datetime) -> Dict[int, Tuple[int, float]]:
+        """
+        (Re)opens the layers of dyeing runs on the item completed from `since` on, and
+        returns them as {layer_id: (run id, output kg)}. Their cost is what the run
+        draws from the item itself, so `recompute` prices them during allocation.
+        """
+        runs = select(
+            literal(inventory_id),
+            literal(CostSource.DYEING.value),
+            DyeingProcess.id,
+            DYEING_COMPLETED_AT,
+            DyeingProcess.dyeing_final_weight,
+            literal(0.0),
+            DyeingProcess.dyeing_final_weight,
+        ).where(
+            DyeingProcess.product_id == inventory_id,
+            DyeingProcess.dyeing_status.is_(True),
+            DYEING_COMPLETED_AT >= since,
+            DyeingProcess.dyeing_final_weight > 0,
+        )
+        columns = ["inventory_id", "source_type", "source_id", "layer_date", "quantity_kg", "unit_cost", "remaining_kg"]
+        result = await self.session.execute(
+            self._upsert_layers(columns, runs).returning(CostLayer.id, CostLayer.source_id, CostLayer.quantity_kg)
+        )
+        return {layer_id: (run_id, quantity_kg) for layer_id, run_id, quantity_kg in result.all()}
+
+    async def _logged_cost(self, consumer: CostConsumer, consumer_ids: Iterable[int]) -> Dict[int, float]:
+        """Cost logged so far per consumer."""
+        consumer_ids = list(consumer_ids)
+        if not consumer_ids:
+            return {}
+        result = await self.session.execute(
+            select(
+                CostConsumption.consumer_id,
+                func.sum(CostConsumption.quantity_kg * CostConsumption.unit_cost),
+            )
+            .where(
+                CostConsumption.consumer_type == consumer.value,
+                CostConsumption.consumer_id.in_(consumer_ids),
+            )
+            .group_by(CostConsumption.consumer_id)
+        )
+        return {consumer_id: cost or 0.0 for consumer_id, cost in result.all()}
+
+    async def _mark_outputs(self, inventory_id: str, since: datetime) -> None:
+        """
+        Flags the fabric knitted from the item since `since`: its knitting layers are
+        priced from the allocation just rewritten.
+        """
+        result = await self.session.execute(
+            select(KnitFormula.product_id, func.min(KNITTING_COMPLETED_AT))
+            .join(KnitFormula, KnitFormula.id == KnittingProcess.knit_formula_id)
+            .where(
+                KnittingProcess.knit_status.is_(True),
+                KNITTING_COMPLETED_AT >= since,
+                cast(KnittingProcess.materials, JSONB).contains([{"inventory_id": inventory_id}]),
+                KnitFormula.product_id != inventory_id,
+            )
+            .group_by(KnitFormula.product_id)
+        )
+        await self.mark_activity(changes=result.all())
+
+    async def _live_demands(self, inventory_id: str, since: datetime) -> List[Demand]:
+        """Consumption of the item from `since` on, read from the stock movements themselves."""
+        demands: List[Demand] = []
+        result = await self.session.execute(
+            select(SalesTransaction.transaction_date, SalesTransaction.id, SalesTransaction.weight_kg).where(
+                SalesTransaction.inventory_id == inventory_id,
+                SalesTransaction.transaction_date >= since,
+                SalesTransaction.weight_kg > 0,
+            )
+        )
+        demands += [(at, CostConsumer.SALE, id, weight) for at, id, weight in result.all()]
+
+        result = await self.session.execute(
+            select(DyeingProcess.start_date, DyeingProcess.id, DyeingProcess.dyeing_weight).where(
+                DyeingProcess.product_id == inventory_id,
+                DyeingProcess.start_date >= since,
+                DyeingProcess.dyeing_weight > 0,
+            )
+        )
+        demands += [(at, CostConsumer.DYEING, id, weight) for at, id, weight in result.all()]
+
+        result = await self.session.execute(
+            select(KNITTING_COMPLETED_AT, KnittingProcess.id, KnittingProcess.materials).where(
+                KnittingProcess.knit_status.is_(True),
+                KNITTING_COMPLETED_AT >= since,
+                cast(KnittingProcess.materials, JSONB).contains([{"inventory_id": inventory_id}]),
+            )
+        )
+        for at, id, materials in result.all():
+            weight = sum(m.get("amount_kg") or 0 for m in materials if m.get("inventory_id") == inventory_id)
+            if weight > 0:
+                demands.append((at, CostConsumer.KNITTING, id, weight))
+        return demands
+
+    async def _logged_demands(self, inventory_id: str, since: datetime) -> Dict[Tuple[str, int], Demand]:
+        """The item's logged consumption from `since` on, one entry per consumer."""
+        result = await self.session.execute(
+            select(
+                CostConsumption.consumer_type,
+                CostConsumption.consumer_id,
+                func.min(CostConsumption.consumed_at),
+                func.sum(CostConsumption.quantity_kg),
+            )
+            .where(CostConsumption.inventory_id == inventory_id, CostConsumption.consumed_at >= since)
+            .group_by(CostConsumption.consumer_type, CostConsumption.consumer_id)
+        )
+        return {
+            (consumer_type, consumer_id): (at, CostConsumer(consumer_type), consumer_id, weight)
+            for consumer_type, consumer_id, at, weight in result.all()
+        }
+
+    async def _clear_log(self, inventory_id: str, since: datetime) -> None:
+        """Deletes the item's consumption from `since` on and puts it back on its layers, in one statement."""
+        removed = (
+            delete(CostConsumption)
+            .where(CostConsumption.inventory_id == inventory_id, CostConsumption.consumed_at >= since)
+            .returning(CostConsumption.layer_id, CostConsumption.quantity_kg)
+            .cte("removed")
+        )
+        restored = (
+            select(removed.c.layer_id, func.sum(removed.c.quantity_kg).label("quantity_kg"))
+            .where(removed.c.layer_id.is_not(None))
+            .group_by(removed.c.layer_id)
+            .subquery("restored")
+        )
+        await self.session.execute(
+            update(CostLayer)
+            .where(CostLayer.id == restored.c.layer_id)
+            .values(remaining_kg=func.least(CostLayer.remaining_kg + restored.c.quantity_kg, CostLayer.quantity_kg))
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _open_layers(self, inventory_id: str) -> AsyncIterator[_Layer]:
+        """The item's open layers in FIFO order, read in batches off the partial index."""
+        after: Optional[Tuple[datetime, int]] = None
+        while True:
+            statement = select(
+                CostLayer.id, CostLayer.layer_date, CostLayer.remaining_kg, CostLayer.unit_cost
+            ).where(CostLayer.inventory_id == inventory_id, CostLayer.remaining_kg > 0)
+            if after is not None:
+                statement = statement.where(tuple_(CostLayer.layer_date, CostLayer.id) > tuple_(*after))
+            result = await self.session.execute(
+                statement.order_by(CostLayer.layer_date, CostLayer.id).limit(settings.COST_LAYER_BATCH_ROWS)
+            )
+            rows = result.all()
+            for row in rows:
+                yield _Layer(*row)
+            if len(rows) < settings.COST_LAYER_BATCH_ROWS:
+                return
+            after = (rows[-1].layer_date, rows[-1].id)
+
+    async def recompute(self, *, inventory_id: str, since: datetime) -> Tuple[int, int, float]:
+        """
+        Re-allocates the item's consumption from `since` on. Logged consumers that are
+        no longer in their tables (archived months) keep their quantities, and so do
+        the layers of archived runs. Returns the (consumers, log rows, kilograms no
+        layer covered) written.
+        """
+        await self._sync_layers(inventory_id, since)
+        demands = await self._live_demands(inventory_id, since)
+        live = {(consumer.value, consumer_id) for _, consumer, consumer_id, _ in demands}
+        logged = await self._logged_demands(inventory_id, since)
+        demands += [demand for key, demand in logged.items() if key not in live]
+        demands.sort(key=lambda demand: (demand[0], CONSUMER_ORDER[demand[1]], demand[2]))
+        await self._clear_log(inventory_id, since)
+
+        # Dyed output is priced at what its run drew from this item: the part logged
+        # before `since` plus what the allocation below draws
+        dyed = await self._sync_dyeing_layers(inventory_id, since)
+        dyeing_cost = await self._logged_cost(CostConsumer.DYEING, (run_id for run_id, _ in dyed.values()))
+        # Runs still to draw below; their output cannot be drawn before they are priced
+        unpriced = {
+            consumer_id for _, consumer, consumer_id, _ in demands if consumer == CostConsumer.DYEING
+        } & {run_id for run_id, _ in dyed.values()}
+
+        def dyed_unit_cost(layer_id: int) -> float:
+            run_id, quantity_kg = dyed[layer_id]
+            return dyeing_cost.get(run_id, 0.0) / quantity_kg
+
+        result = await self.session.execute(
+            select(func.coalesce(Inventory.average_cost, 0.0)).where(Inventory.id == inventory_id)
+        )
+        fallback_cost = result.scalar() or 0.0
+
+        queue: Deque[_Layer] = deque()
+        upcoming = self._open_layers(inventory_id)
+        next_layer = await anext(upcoming, None)
+        touched: Dict[int, _Layer] = {}
+        rows: List[dict] = []
+        written, uncovered = 0, 0.0
+
+        for consumed_at, consumer, consumer_id, quantity_kg in demands:
+            while next_layer is not None and next_layer.layer_date <= consumed_at:
+                if next_layer.id in dyed:
+                    if dyed[next_layer.id][0] in unpriced:
+                        break
+                    next_layer.unit_cost = dyed_unit_cost(next_layer.id)
+                queue.append(next_layer)
+                next_layer = await anext(upcoming, None)
+            need = quantity_kg
+            cost = 0.0
+            base = {
+                "inventory_id": inventory_id,
+                "consumer_type": consumer.value,
+                "consumer_id": consumer_id,
+                "consumed_at": consumed_at,
+            }
+            while need > EPSILON and queue:
+                layer = queue[0]
+                take = min(need, layer.remaining_kg)
+                rows.append({**base, "layer_id": layer.id, "quantity_kg": round(take, 6), "unit_cost": layer.unit_cost})
+                cost += take * layer.unit_cost
+                layer.remaining_kg -= take
+                need -= take
+                touched[layer.id] = layer
+                if layer.remaining_kg <= EPSILON:
+                    layer.remaining_kg = 0.0
+                    queue.popleft()
+            if need > EPSILON:
+                rows.append({**base, "layer_id": None, "quantity_kg": round(need, 6), "unit_cost": fallback_cost})
+                cost += need * fallback_cost
+                uncovered += need
+            if consumer == CostConsumer.DYEING:
+                dyeing_cost[consumer_id] = dyeing_cost.get(consumer_id, 0.0) + cost
+                unpriced.discard(consumer_id)
+            if len(rows) >= settings.COST_LAYER_BATCH_ROWS:
+                await self.session.execute(insert(CostConsumption), rows)
+                written += len(rows)
+                rows = []
+        await upcoming.aclose()
+
+        if rows:
+            await self.session.execute(insert(CostConsumption), rows)
+            written += len(rows)
+        if touched:
+            await self.session.execute(
+                update(CostLayer),
+                [{"id": layer.id, "remaining_kg": round(layer.remaining_kg, 6)} for layer in touched.values()],
+            )
+        if dyed:
+            await self.session.execute(
+                update(CostLayer),
+                [{"id": layer_id, "unit_cost": dyed_unit_cost(layer_id)} for layer_id in dyed],
+            )
+        await self._mark_outputs(inventory_id, since)
+        return len(demands), written, round(uncovered, 6)
@@ -1,15 +1,18 @@
 from typing import Optional, List, Tuple, Dict, Any
 from datetime import datetime, date
-from sqlmodel import select, func
+from sqlmodel import func
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.model.dyeing_process import DyeingProcess
+from app.core.fieldsets import FieldSet, loader_options
+from app.repository.statements import select_by_pk, statements, with_options
 from app.schema.dyeing_process.request import (
     DyeingProcessCreateRequest,
     DyeingProcessUpdateRequest,
 )
+from app.core.tracing import trace_methods
 
+@trace_methods("repository")
 class DyeingProcessRepository:
     """
     Handles asynchronous database operations for the DyeingProcess model.
@@ -34,14 +37,16 @@ class DyeingProcessRepository:
         await self.session.refresh(db_dp)
         return db_dp
 
-    async def get_by_id(self, *, dp_id: int) -> Optional[DyeingProcess]:
-        # UPDATE THIS METHOD
-        statement = (
-            select(DyeingProcess)
-            .where(DyeingProcess.id == dp_id)
-            .options(selectinload(DyeingProcess.product))
-        )
-        result = await self.session.execute(statement)
+    async def get_by_id(
+        self, *, dp_id: int, fieldset: Optional[FieldSet] = None
+    ) -> Optional[DyeingProcess]:
+        if fieldset is None:
+            result = await self.session.execute(
+                statements.get("dyeing_process.by_id"), {"dp_id": dp_id}
+            )
+        else:
+            statement = select_by_pk(DyeingProcess).options(*loader_options(DyeingProcess, fieldset))
+            result = await self.session.execute(statement, {"pk": dp_id})
         return result.scalars().one_or_none()
 
     async def get_all(
@@ -52,22 +57,30 @@ class DyeingProcessRepository:
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         dyeing_status: Optional[bool] = None,
+        fieldset: Optional[FieldSet] = None,
     ) -> Tuple[List[DyeingProcess], int]:
-        statement = select(DyeingProcess).options(selectinload(DyeingProcess.product))
-
-        if start_date:
-            statement = statement.where(func.date(DyeingProcess.start_date) >= start_date)
-        if end_date:
-            statement = statement.where(func.date(DyeingProcess.start_date) <= end_date)
-        if dyeing_status is not None:
-            statement = statement.where(DyeingProcess.dyeing_status == dyeing_status)
-
-        count_statement = select(func.count()).select_from(statement.subquery())
+        def filtered(statement):
+            if start_date:
+                statement += lambda s: s.where(func.date(DyeingProcess.start_date) >= start_date)
+            if end_date:
+                statement += lambda s: s.where(func.date(DyeingProcess.start_date) <= end_date)
+            if dyeing_status is not None:
+                statement += lambda s: s.where(DyeingProcess.dyeing_status == dyeing_status)
+            return statement
+
+        count_statement = filtered(statements.get("dyeing_process.count"))
         count_result = await self.session.execute(count_statement) # CORRECTED LINE
         total_count = count_result.one()[0]
 
         offset = (page - 1) * limit
-        paginated_statement = statement.order_by(DyeingProcess.id.desc()).offset(offset).limit(limit)
+        options = (
+            statements.get("dyeing_process.load") if fieldset is None
+            else loader_options(DyeingProcess, fieldset)
+        )
+        list_statement = with_options(filtered(statements.get("dyeing_process.list")), options)
+        paginated_statement = list_statement + (
+            lambda s: s.order_by(DyeingProcess.id.desc()).offset(offset).limit(limit)
+        )
 
         items_result = await self.session.execute(paginated_statement) # CORRECTED LINE
         items = items_result.scalars().all()
@@ -1,15 +1,21 @@
 # app/repository/inventory.py
 
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
+from sqlalchemy.engine import RowMapping
 from sqlmodel import select, func
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.model.inventory import Inventory, InventoryType
+from app.core.fieldsets import FieldSet, loader_options
+from app.repository.statements import select_by_pk, statements, with_options
 from app.schema.inventory.request import InventoryUpdateRequest
+from app.core.config import settings
+from app.core.tracing import trace_methods
 
 # Definisikan konstanta rasio di sini agar bisa diakses
 BALE_TO_KG_RATIO = 181.44
 
+@trace_methods("repository")
 class InventoryRepository:
     # ... (metode __init__, create, get_by_id, dll. tidak berubah) ...
     def __init__(self, session: AsyncSession):
@@ -21,11 +27,45 @@ class InventoryRepository:
         await self.session.refresh(db_inventory)
         return db_inventory
 
-    async def get_by_id(self, *, inventory_id: str) -> Optional[Inventory]:
-        return await self.session.get(Inventory, inventory_id)
+    def _lock_options(self) -> Optional[Dict[str, bool]]:
+        """
+        Row-lock arguments for stock updates according to INVENTORY_LOCK_STRATEGY,
+        or None when rows are read without locking.
+        """
+        strategy = settings.INVENTORY_LOCK_STRATEGY
+        if strategy == "none":
+            return None
+        return {"nowait": strategy == "nowait"}
+
+    async def get_by_id(
+        self,
+        *,
+        inventory_id: str,
+        for_update: bool = False,
+        fieldset: Optional[FieldSet] = None,
+    ) -> Optional[Inventory]:
+        if fieldset is not None:
+            statement = select_by_pk(Inventory).options(*loader_options(Inventory, fieldset))
+            result = await self.session.execute(statement, {"pk": inventory_id})
+            return result.scalars().one_or_none()
+        lock = self._lock_options() if for_update else None
+        if lock is None:
+            return await self.session.get(Inventory, inventory_id)
+        # populate_existing: the row may already sit in the identity map with stale stock.
+        return await self.session.get(
+            Inventory, inventory_id, with_for_update=lock, populate_existing=True
+        )
         
-    async def get_by_ids(self, *, inventory_ids: List[str]) -> List[Inventory]:
+    async def get_by_ids(self, *, inventory_ids: List[str], for_update: bool = False) -> List[Inventory]:
         statement = select(Inventory).where(Inventory.id.in_(inventory_ids))
+        lock = self._lock_options() if for_update else None
+        if lock is not None:
+            # Lock in primary-key order so concurrent multi-row updates cannot deadlock.
+            statement = (
+                statement.order_by(Inventory.id)
+                .with_for_update(**lock)
+                .execution_options(populate_existing=True)
+            )
         result = await self.session.execute(statement)
         return list(result.scalars().all())
 
@@ -36,29 +76,55 @@ class InventoryRepository:
         id: Optional[str] = None,
         type: Optional[str] = None,
         page: int = 1,
-        limit: int = 10
+        limit: int = 10,
+        fieldset: Optional[FieldSet] = None,
     ) -> Tuple[List[Inventory], int]:
-        statement = select(Inventory)
-        
-        if name:
-            statement = statement.where(Inventory.name.ilike(f"%{name}%"))
-        if id:
-            statement = statement.where(Inventory.id.ilike(f"%{id}%"))
-        if type:
-            statement = statement.where(Inventory.type == type)
+        name_pattern, id_pattern = f"%{name}%", f"%{id}%"
+
+        def filtered(statement):
+            if name:
+                statement += lambda s: s.where(Inventory.name.ilike(name_pattern))
+            if id:
+                statement += lambda s: s.where(Inventory.id.ilike(id_pattern))
+            if type:
+                statement += lambda s: s.where(Inventory.type == type)
+            return statement
 
-        count_statement = select(func.count()).select_from(statement.subquery())
+        count_statement = filtered(statements.get("inventory.count"))
         count_result = await self.session.execute(count_statement)
         total_count = count_result.scalar_one()
 
         offset = (page - 1) * limit
-        paginated_statement = statement.offset(offset).limit(limit)
+        list_statement = filtered(statements.get("inventory.list"))
+        if fieldset is not None:
+            list_statement = with_options(list_statement, loader_options(Inventory, fieldset))
+        paginated_statement = list_statement + (
+            lambda s: s.offset(offset).limit(limit)
+        )
         
         items_result = await self.session.execute(paginated_statement)
         items = items_result.scalars().all()
         
         return list(items), total_count
 
+    async def get_valuation(self, *, type: Optional[str] = None) -> List[RowMapping]:
+        """Stock on hand and its value at average cost, per item type, in one aggregate."""
+        stock = func.greatest(func.coalesce(Inventory.weight_kg, 0.0), 0.0)
+        statement = (
+            select(
+                Inventory.type,
+                func.count().label("item_count"),
+                func.coalesce(func.sum(stock), 0.0).label("weight_kg"),
+                func.coalesce(func.sum(stock * Inventory.average_cost), 0.0).label("value"),
+            )
+            .group_by(Inventory.type)
+            .order_by(Inventory.type)
+        )
+        if type:
+            statement = statement.where(Inventory.type == type)
+        result = await self.session.execute(statement)
+        return list(result.mappings().all())
+
     async def update(
         self,
         *, 
@@ -1,14 +1,16 @@
 from typing import Optional, List, Tuple, Dict, Any
-from sqlmodel import select, func
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.model.knit_formula import KnitFormula
+from app.core.fieldsets import FieldSet, loader_options
+from app.repository.statements import select_by_pk, statements, with_options
 from app.schema.knit_formula.request import (
     KnitFormulaCreateRequest,
     KnitFormulaUpdateRequest,
 )
+from app.core.tracing import trace_methods
 
+@trace_methods("repository")
 class KnitFormulaRepository:
     """
     Handles asynchronous database operations for the KnitFormula model.
@@ -33,36 +35,39 @@ class KnitFormulaRepository:
         await self.session.refresh(db_kf)
         return db_kf
 
-    async def get_by_id(self, *, kf_id: int) -> Optional[KnitFormula]:
-        # UPDATE THIS METHOD
-        statement = (
-            select(KnitFormula)
-            .where(KnitFormula.id == kf_id)
-            .options(selectinload(KnitFormula.product))
-        )
-        result = await self.session.execute(statement)
+    async def get_by_id(
+        self, *, kf_id: int, fieldset: Optional[FieldSet] = None
+    ) -> Optional[KnitFormula]:
+        if fieldset is None:
+            result = await self.session.execute(
+                statements.get("knit_formula.by_id"), {"kf_id": kf_id}
+            )
+        else:
+            statement = select_by_pk(KnitFormula).options(*loader_options(KnitFormula, fieldset))
+            result = await self.session.execute(statement, {"pk": kf_id})
         return result.scalars().one_or_none()
 
     async def get_by_product_id(self, *, product_id: str) -> Optional[KnitFormula]:
-        statement = (
-            select(KnitFormula)
-            .where(KnitFormula.product_id == product_id)
-            .options(selectinload(KnitFormula.product))
+        result = await self.session.execute(
+            statements.get("knit_formula.by_product_id"), {"product_id": product_id}
         )
-        result = await self.session.execute(statement)
         return result.scalars().one_or_none()
 
     async def get_all(
-        self, *, page: int, limit: int
+        self, *, page: int, limit: int, fieldset: Optional[FieldSet] = None
     ) -> Tuple[List[KnitFormula], int]:
-        statement = select(KnitFormula).options(selectinload(KnitFormula.product))
-
-        count_statement = select(func.count()).select_from(statement.subquery())
-        count_result = await self.session.execute(count_statement) # CORRECTED LINE
+        count_result = await self.session.execute(statements.get("knit_formula.count"))
         total_count = count_result.one()[0]
 
         offset = (page - 1) * limit
-        paginated_statement = statement.order_by(KnitFormula.id).offset(offset).limit(limit)
+        options = (
+            statements.get("knit_formula.load") if fieldset is None
+            else loader_options(KnitFormula, fieldset)
+        )
+        list_statement = with_options(statements.get("knit_formula.list"), options)
+        paginated_statement = list_statement + (
+            lambda s: s.order_by(KnitFormula.id).offset(offset).limit(limit)
+        )
 
         items_result = await self.session.execute(paginated_statement) # CORRECTED LINE
         items = items_result.scalars().all()
@@ -2,12 +2,14 @@ from typing import Optional, List, Tuple, Dict, Any
 from datetime import date
 from sqlmodel import select, func
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.model.knit_formula import KnitFormula
 from app.model.knitting_process import KnittingProcess
+from app.core.fieldsets import FieldSet, loader_options
+from app.repository.statements import select_by_pk, statements, with_options
 from app.schema.knitting_process.request import KnittingProcessUpdateRequest
+from app.core.tracing import trace_methods
 
+@trace_methods("repository")
 class KnittingProcessRepository:
     """
     Handles asynchronous database operations for the KnittingProcess model.
@@ -40,19 +42,16 @@ class KnittingProcessRepository:
         await self.session.refresh(db_kp)
         return db_kp
 
-    async def get_by_id(self, *, kp_id: int) -> Optional[KnittingProcess]:
-        # UPDATE THIS METHOD
-        statement = (
-            select(KnittingProcess)
-            .where(KnittingProcess.id == kp_id)
-            .options(
-                # Chain selectinload to get the product inside the formula
-                selectinload(KnittingProcess.knit_formula).selectinload(KnitFormula.product),
-                selectinload(KnittingProcess.operator),
-                selectinload(KnittingProcess.machine),
+    async def get_by_id(
+        self, *, kp_id: int, fieldset: Optional[FieldSet] = None
+    ) -> Optional[KnittingProcess]:
+        if fieldset is None:
+            result = await self.session.execute(
+                statements.get("knitting_process.by_id"), {"kp_id": kp_id}
             )
-        )
-        result = await self.session.execute(statement)
+        else:
+            statement = select_by_pk(KnittingProcess).options(*loader_options(KnittingProcess, fieldset))
+            result = await self.session.execute(statement, {"pk": kp_id})
         return result.scalars().one_or_none()
 
     async def get_all(
@@ -63,29 +62,30 @@ class KnittingProcessRepository:
         knit_formula_id: Optional[int] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
+        fieldset: Optional[FieldSet] = None,
     ) -> Tuple[List[KnittingProcess], int]:
-        # UPDATE THIS METHOD
-        statement = select(KnittingProcess).options(
-            # Chain selectinload to get the product inside the formula
-            selectinload(KnittingProcess.knit_formula).selectinload(KnitFormula.product),
-            selectinload(KnittingProcess.operator),
-            selectinload(KnittingProcess.machine),
-        )
-
-        # ... rest of the method remains the same ...
-        if knit_formula_id is not None:
-            statement = statement.where(KnittingProcess.knit_formula_id == knit_formula_id)
-        if start_date:
-            statement = statement.where(func.date(KnittingProcess.start_date) >= start_date)
-        if end_date:
-            statement = statement.where(func.date(KnittingProcess.start_date) <= end_date)
-
-        count_statement = select(func.count()).select_from(statement.subquery())
+        def filtered(statement):
+            if knit_formula_id is not None:
+                statement += lambda s: s.where(KnittingProcess.knit_formula_id == knit_formula_id)
+            if start_date:
+                statement += lambda s: s.where(func.date(KnittingProcess.start_date) >= start_date)
+            if end_date:
+                statement += lambda s: s.where(func.date(KnittingProcess.start_date) <= end_date)
+            return statement
+
+        count_statement = filtered(statements.get("knitting_process.count"))
         count_result = await self.session.execute(count_statement)
         total_count = count_result.scalar_one()
 
         offset = (page - 1) * limit
-        paginated_statement = statement.order_by(KnittingProcess.id.desc()).offset(offset).limit(limit)
+        options = (
+            statements.get("knitting_process.load") if fieldset is None
+            else loader_options(KnittingProcess, fieldset)
+        )
+        list_statement = with_options(filtered(statements.get("knitting_process.list")), options)
+        paginated_statement = list_statement + (
+            lambda s: s.order_by(KnittingProcess.id.desc()).offset(offset).limit(limit)
+        )
 
         items_result = await self.session.execute(paginated_statement)
         items = items_result.scalars().all()
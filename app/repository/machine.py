@@ -4,7 +4,9 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.model.machine import Machine
 from app.schema.machine.request import MachineCreateRequest, MachineUpdateRequest
+from app.core.tracing import trace_methods
 
+@trace_methods("repository")
 class MachineRepository:
     """
     Handles asynchronous database operations for the Machine model.
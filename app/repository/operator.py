@@ -4,7 +4,9 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.model.operator import Operator
 from app.schema.operator.request import OperatorCreateRequest, OperatorUpdateRequest
+from app.core.tracing import trace_methods
 
+@trace_methods("repository")
 class OperatorRepository:
     """
     Handles asynchronous database operations for the Operator model.
@@ -1,16 +1,18 @@
 from typing import Optional, List, Tuple, Dict, Any
-from datetime import datetime, date
-from sqlmodel import select, func
+from datetime import datetime, date, time, timedelta
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.model.inventory import Inventory
 from app.model.purchase_transaction import PurchaseTransaction
+from app.core.fieldsets import FieldSet, loader_options
+from app.repository.statements import select_by_pk, statements, with_options
 from app.schema.purchase_transaction.request import (
     PurchaseTransactionCreateRequest,
     PurchaseTransactionUpdateRequest,
 )
+from app.core.tracing import trace_methods
 
+@trace_methods("repository")
 class PurchaseTransactionRepository:
     """
     Handles asynchronous database operations for the PurchaseTransaction model.
@@ -30,7 +32,8 @@ class PurchaseTransactionRepository:
     ) -> PurchaseTransaction:
         """
         Asynchronously creates a new purchase transaction from a dictionary.
-        The service layer is responsible for providing all necessary data.
+        The service layer is responsible for providing all necessary data, and
+        re-reads the new row with its relationships.
         """
         # Ensure transaction_date is set if not provided by the service
         if 'transaction_date' not in pt_create_data or not pt_create_data.get('transaction_date'):
@@ -40,20 +43,18 @@ class PurchaseTransactionRepository:
         db_pt = PurchaseTransaction(**pt_create_data)
         self.session.add(db_pt)
         await self.session.commit()
-        await self.session.refresh(db_pt)
         return db_pt
 
-    async def get_by_id(self, *, pt_id: int) -> Optional[PurchaseTransaction]:
-        # UPDATE THIS METHOD
-        statement = (
-            select(PurchaseTransaction)
-            .where(PurchaseTransaction.id == pt_id)
-            .options(
-                selectinload(PurchaseTransaction.supplier),
-                selectinload(PurchaseTransaction.inventory),
+    async def get_by_id(
+        self, *, pt_id: int, fieldset: Optional[FieldSet] = None
+    ) -> Optional[PurchaseTransaction]:
+        if fieldset is None:
+            result = await self.session.execute(
+                statements.get("purchase_transaction.by_id"), {"pt_id": pt_id}
             )
-        )
-        result = await self.session.execute(statement)
+        else:
+            statement = select_by_pk(PurchaseTransaction).options(*loader_options(PurchaseTransaction, fieldset))
+            result = await self.session.execute(statement, {"pk": pt_id})
         return result.scalars().one_or_none()
 
     async def get_all(
@@ -66,34 +67,38 @@ class PurchaseTransactionRepository:
         page: int = 1,
         limit: int = 10,
         inventory_type: Optional[str] = None,
+        fieldset: Optional[FieldSet] = None,
     ) -> Tuple[List[PurchaseTransaction], int]:
-        statement = (
-            select(PurchaseTransaction)
-            .join(Inventory) # <-- TAMBAHKAN JOIN DI SINI
-            .options(
-                selectinload(PurchaseTransaction.supplier),
-                selectinload(PurchaseTransaction.inventory),
-            )
-        )
-
-        if supplier_id is not None:
-            statement = statement.where(PurchaseTransaction.supplier_id == supplier_id)
-        if inventory_id:
-            statement = statement.where(PurchaseTransaction.inventory_id == inventory_id)
-        if start_date:
-            statement = statement.where(func.date(PurchaseTransaction.transaction_date) >= start_date)
-        if end_date:
-            statement = statement.where(func.date(PurchaseTransaction.transaction_date) <= end_date)
-        if inventory_type:
-            statement = statement.where(Inventory.type == inventory_type)
-
-        count_statement = select(func.count()).select_from(statement.subquery())
+        # Both bases join Inventory so the inventory_type filter applies
+        def filtered(statement):
+            if supplier_id is not None:
+                statement += lambda s: s.where(PurchaseTransaction.supplier_id == supplier_id)
+            if inventory_id:
+                statement += lambda s: s.where(PurchaseTransaction.inventory_id == inventory_id)
+            # Half-open timestamp range on the bare column: uses its index and lets
+            # Postgres prune the monthly partitions (func.date(column) allows neither)
+            if start_date:
+                start_at = datetime.combine(start_date, time.min)
+                statement += lambda s: s.where(PurchaseTransaction.transaction_date >= start_at)
+            if end_date:
+                end_before = datetime.combine(end_date + timedelta(days=1), time.min)
+                statement += lambda s: s.where(PurchaseTransaction.transaction_date < end_before)
+            if inventory_type:
+                statement += lambda s: s.where(Inventory.type == inventory_type)
+            return statement
+
+        count_statement = filtered(statements.get("purchase_transaction.count"))
         count_result = await self.session.execute(count_statement) # CORRECTED LINE
         total_count = count_result.one()[0]
 
         offset = (page - 1) * limit
-        paginated_statement = (
-            statement.order_by(PurchaseTransaction.id.desc()).offset(offset).limit(limit)
+        options = (
+            statements.get("purchase_transaction.list.load") if fieldset is None
+            else loader_options(PurchaseTransaction, fieldset)
+        )
+        list_statement = with_options(filtered(statements.get("purchase_transaction.list")), options)
+        paginated_statement = list_statement + (
+            lambda s: s.order_by(PurchaseTransaction.id.desc()).offset(offset).limit(limit)
         )
 
         items_result = await self.session.execute(paginated_statement) # CORRECTED LINE
@@ -0,0 +1,242 @@
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+from datetime import date, datetime, timedelta
+from sqlalchemy import Date, DateTime, Integer, and_, cast, delete, literal, literal_column, or_, text, union_all, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.model.account_receivable import AccountReceivable
+from app.model.buyer_payment import BuyerPayment
+from app.model.receivable_aging import ReceivableActivity, ReceivableAgingRun
+from app.model.sales_daily import SalesDaily
+from app.model.sales_transaction import SalesTransaction
+from app.repository.account_receivable import refresh_buyer_risk
+from app.repository.archive import archived_until
+from app.schema.account_receivable.request import period_start
+from app.core.tracing import trace_methods
+
+BUCKETS = ("age_0_30_days", "age_31_60_days", "age_61_90_days", "age_over_90_days")
+
+
+def aging_query(
+    as_of: date,
+    buyer_ids: Optional[Sequence[int]] = None,
+    archived_until: Optional[date] = None,
+):
+    """
+    Aging buckets per buyer as of `as_of`, in one pass over sales and payments.
+
+    Each sale is an invoice of `weight_kg * price_per_kg`. A buyer's payments up to
+    `as_of` are applied to the oldest invoices first: with `cumulative` the running
+    total of the buyer's invoices in date order, an invoice's open amount is
+    `least(amount, greatest(cumulative - paid, 0))`. Open amounts are then bucketed
+    by their age in days.
+
+    Days before `archived_until` have been moved out of sales_transaction
+    (app/repository/archive.py); their sales are read from the daily rollup instead,
+    one invoice per buyer and day. Invoices of the same day share an age, so the
+    buckets come out the same.
+    """
+    next_day = datetime.combine(as_of + timedelta(days=1), datetime.min.time())
+    amount = func.coalesce(SalesTransaction.weight_kg, 0.0) * SalesTransaction.price_per_kg
+
+    sales = select(
+        SalesTransaction.buyer_id,
+        SalesTransaction.transaction_date.label("transaction_date"),
+        SalesTransaction.id.label("id"),
+        amount.label("amount"),
+    ).where(
+        SalesTransaction.buyer_id.is_not(None),
+        SalesTransaction.transaction_date < next_day,
+    )
+    if buyer_ids is not None:
+        sales = sales.where(SalesTransaction.buyer_id.in_(buyer_ids))
+    if archived_until is not None:
+        sales = sales.where(
+            SalesTransaction.transaction_date >= datetime.combine(archived_until, datetime.min.time())
+        )
+        archived = select(
+            SalesDaily.buyer_id,
+            cast(SalesDaily.day, DateTime).label("transaction_date"),
+            literal(0).label("id"),
+            func.sum(SalesDaily.total).label("amount"),
+        ).where(
+            SalesDaily.buyer_id.is_not(None),
+            SalesDaily.day < archived_until,
+            SalesDaily.day <= as_of,
+        ).group_by(SalesDaily.buyer_id, SalesDaily.day)
+        if buyer_ids is not None:
+            archived = archived.where(SalesDaily.buyer_id.in_(buyer_ids))
+        sales = union_all(archived, sales)
+    sales = sales.subquery("sales")
+
+    invoices = select(
+        sales.c.buyer_id,
+        cast(literal(as_of, Date) - cast(sales.c.transaction_date, Date), Integer).label("age"),
+        sales.c.amount,
+        func.sum(sales.c.amount).over(
+            partition_by=sales.c.buyer_id,
+            order_by=(sales.c.transaction_date, sales.c.id),
+        ).label("cumulative"),
+    )
+    paid = (
+        select(BuyerPayment.buyer_id, func.sum(BuyerPayment.amount).label("paid"))
+        .where(BuyerPayment.payment_date < next_day)
+        .group_by(BuyerPayment.buyer_id)
+    )
+    if buyer_ids is not None:
+        paid = paid.where(BuyerPayment.buyer_id.in_(buyer_ids))
+    invoices = invoices.cte("invoices")
+    paid = paid.cte("paid")
+
+    open_amount = func.least(
+        invoices.c.amount,
+        func.greatest(invoices.c.cumulative - func.coalesce(paid.c.paid, 0.0), 0.0),
+    )
+    ranges = {
+        "age_0_30_days": invoices.c.age <= 30,
+        "age_31_60_days": invoices.c.age.between(31, 60),
+        "age_61_90_days": invoices.c.age.between(61, 90),
+        "age_over_90_days": invoices.c.age > 90,
+    }
+    return (
+        select(
+            invoices.c.buyer_id,
+            *(
+                func.coalesce(func.sum(open_amount).filter(condition), 0.0).label(name)
+                for name, condition in ranges.items()
+            ),
+        )
+        .select_from(invoices.outerjoin(paid, paid.c.buyer_id == invoices.c.buyer_id))
+        .group_by(invoices.c.buyer_id)
+    )
+
+
+@trace_methods("repository")
+class ReceivableAgingRepository:
+    """
+    Computes `account_receivable` rows from sales and payments, and tracks which
+    buyers have changed since the last run. Apart from `save_run`, which commits the
+    whole run, methods run in the caller's transaction.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def mark_activity(self, *, changes: Iterable[Tuple[Optional[int], date]]) -> None:
+        """
+        Flags buyers as changed from a date on; called by the sales and payment write
+        paths before their commit. `changes` holds (buyer_id, transaction date) pairs.
+        """
+        earliest: Dict[int, date] = {}
+        for buyer_id, day in changes:
+            if buyer_id is None:
+                continue
+            day = day.date() if isinstance(day, datetime) else day
+            earliest[buyer_id] = min(day, earliest.get(buyer_id, day))
+        if not earliest:
+            return
+        statement = insert(ReceivableActivity).values(
+            [{"buyer_id": buyer_id, "since_date": day} for buyer_id, day in sorted(earliest.items())]
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["buyer_id"],
+            set_={"since_date": func.least(ReceivableActivity.since_date, statement.excluded.since_date)},
+        )
+        await self.session.execute(statement)
+
+    async def lock(self) -> None:
+        """Serializes aging runs (transaction-scoped advisory lock)."""
+        await self.session.execute(text("SELECT pg_advisory_xact_lock(hashtext('receivable_aging'))"))
+
+    async def claim_activity(self) -> Dict[int, date]:
+        """Removes and returns the pending activity; rolled back with the run if it fails."""
+        result = await self.session.execute(
+            delete(ReceivableActivity).returning(ReceivableActivity.buyer_id, ReceivableActivity.since_date)
+        )
+        return {buyer_id: since_date for buyer_id, since_date in result.all()}
+
+    async def get_runs(self) -> Dict[str, date]:
+        result = await self.session.execute(select(ReceivableAgingRun.period, ReceivableAgingRun.as_of))
+        return {period: as_of for period, as_of in result.all()}
+
+    async def compute(
+        self, *, period: str, as_of: date, buyer_ids: Optional[Sequence[int]] = None
+    ) -> Tuple[int, int, int]:
+        """
+        Writes the aging of `period` for the given buyers (all buyers when None) in one
+        statement:
+
+        - buyers with open sales are upserted on `(buyer_id, period_date)`; a new row
+          is only inserted for a non-zero balance,
+        - existing rows of buyers in scope without open sales are zeroed.
+
+        The buyers' risk columns are then refreshed from the new rows. Returns the
+        (updated, zeroed, inserted) row counts.
+        """
+        period_date = period_start(period)
+        boundary = await archived_until(self.session, "sales_transaction")
+        aging = aging_query(as_of, buyer_ids, boundary).cte("aging")
+
+        stale = and_(
+            AccountReceivable.period_date == period_date,
+            AccountReceivable.buyer_id.not_in(select(aging.c.buyer_id)),
+        )
+        if buyer_ids is not None:
+            stale = and_(stale, AccountReceivable.buyer_id.in_(buyer_ids))
+        zeroed = (
+            update(AccountReceivable)
+            .where(stale)
+            .values({name: 0.0 for name in BUCKETS})
+            .returning(AccountReceivable.buyer_id)
+            .cte("zeroed")
+        )
+
+        balance = sum((aging.c[name] for name in BUCKETS[1:]), aging.c[BUCKETS[0]])
+        has_row = (
+            select(AccountReceivable.id)
+            .where(
+                AccountReceivable.buyer_id == aging.c.buyer_id,
+                AccountReceivable.period_date == period_date,
+            )
+            .exists()
+        )
+        upsert = insert(AccountReceivable).from_select(
+            ["buyer_id", "period", "period_date", *BUCKETS],
+            select(
+                aging.c.buyer_id, literal(period), literal(period_date, Date),
+                *(aging.c[name] for name in BUCKETS),
+            ).where(or_(balance > 0, has_row)),
+        )
+        upserted = (
+            upsert.on_conflict_do_update(
+                index_elements=["buyer_id", "period_date"],
+                set_={name: upsert.excluded[name] for name in BUCKETS},
+            )
+            # xmax is 0 for freshly inserted rows
+            .returning(literal_column("xmax = 0").label("inserted"))
+            .cte("upserted")
+        )
+
+        statement = select(
+            select(func.count()).select_from(upserted).where(~upserted.c.inserted).scalar_subquery(),
+            select(func.count()).select_from(zeroed).scalar_subquery(),
+            select(func.count()).select_from(upserted).where(upserted.c.inserted).scalar_subquery(),
+        )
+        result = await self.session.execute(statement)
+        counts = tuple(result.one())
+        # A separate statement: CTEs of one statement do not see each other's writes
+        await self.session.execute(
+            refresh_buyer_risk(buyer_ids).execution_options(synchronize_session=False)
+        )
+        return counts
+
+    async def save_run(self, *, period: str, as_of: date) -> None:
+        """Records the run and commits it together with the rows it wrote."""
+        statement = insert(ReceivableAgingRun).values(period=period, as_of=as_of, computed_at=datetime.now())
+        statement = statement.on_conflict_do_update(
+            index_elements=["period"],
+            set_={"as_of": statement.excluded.as_of, "computed_at": statement.excluded.computed_at},
+        )
+        await self.session.execute(statement)
+        await self.session.commit()
@@ -0,0 +1,39 @@
+from typing import Any, List, NamedTuple, Sequence, Type
+
+from sqlmodel import SQLModel, exists, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.tracing import trace_methods
+
+
+class Reference(NamedTuple):
+    """A foreign key value to check, with the message shown when it does not exist."""
+    model: Type[SQLModel]
+    id: Any
+    not_found: str
+
+
+@trace_methods("repository")
+class ReferenceRepository:
+    """
+    Checks foreign key references for create and update paths.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def find_missing(self, *, references: Sequence[Reference]) -> List[Reference]:
+        """
+        Returns the references whose row does not exist, checked in one statement
+        (`SELECT EXISTS (...) AS ref_0, EXISTS (...) AS ref_1, ...`). References without
+        an id (fields left out of an update) are skipped; no query runs if none remain.
+        """
+        checks = [reference for reference in references if reference.id is not None]
+        if not checks:
+            return []
+        statement = select(*(
+            exists().where(reference.model.id == reference.id).label(f"ref_{index}")
+            for index, reference in enumerate(checks)
+        ))
+        row = (await self.session.execute(statement)).one()
+        return [reference for reference, found in zip(checks, row) if not found]
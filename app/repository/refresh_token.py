@@ -6,7 +6,9 @@ from datetime import datetime
 import uuid
 
 from app.model.refresh_token import RefreshToken
+from app.core.tracing import trace_methods
 
+@trace_methods("repository")
 class RefreshTokenRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
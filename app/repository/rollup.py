@@ -0,0 +1,240 @@
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Sequence, Tuple
+from datetime import date, datetime
+from sqlalchemy import Date, cast, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import SQLModel, select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.model.knitting_process import KnittingProcess
+from app.model.production_daily import ProductionDaily
+from app.model.purchase_daily import PurchaseDaily
+from app.model.purchase_transaction import PurchaseTransaction
+from app.model.sales_daily import SalesDaily
+from app.model.sales_transaction import SalesTransaction
+from app.repository.analytics import date_range
+from app.repository.archive import archived_until
+from app.core.tracing import trace_methods
+
+Contribution = Tuple[Tuple[Any, ...], Dict[str, float]]
+
+
+def _day(value: Any) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _sales(row: Mapping[str, Any]) -> Contribution:
+    weight = row.get("weight_kg") or 0.0
+    key = (_day(row["transaction_date"]), row.get("buyer_id"), row.get("inventory_id"))
+    return key, {
+        "transaction_count": 1,
+        "roll_count": row.get("roll_count") or 0.0,
+        "weight_kg": weight,
+        "total": weight * (row.get("price_per_kg") or 0.0),
+    }
+
+
+def _purchase(row: Mapping[str, Any]) -> Contribution:
+    weight = row.get("weight_kg") or 0.0
+    key = (_day(row["transaction_date"]), row.get("supplier_id"), row.get("inventory_id"))
+    return key, {
+        "transaction_count": 1,
+        "roll_count": row.get("roll_count") or 0.0,
+        "weight_kg": weight,
+        "total": weight * (row.get("price_per_kg") or 0.0),
+    }
+
+
+def _production(row: Mapping[str, Any]) -> Contribution:
+    key = (_day(row["start_date"]), row["knit_formula_id"], row["machine_id"])
+    return key, {
+        "process_count": 1,
+        "roll_count": row.get("roll_count") or 0.0,
+        "weight_kg": row.get("weight_kg") or 0.0,
+    }
+
+
+def _sort_key(key: Tuple[Any, ...]) -> Tuple[str, ...]:
+    return tuple("" if value is None else str(value) for value in key)
+
+
+@trace_methods("repository")
+class RollupRepository:
+    """
+    Maintains the daily rollup tables (sales_daily, purchase_daily, production_daily).
+
+    The `apply_*` methods take rows as mappings (a create payload, or a model dumped
+    before and after an update) and upsert the net difference with
+    `INSERT ... ON CONFLICT DO UPDATE SET x = x + excluded.x`. They do not commit: the
+    service calls them before its own write, whose commit makes the rollup change
+    atomic with the transaction row. `rebuild_*` recomputes a date range from the raw
+    tables and commits.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _apply(
+        self,
+        model: type[SQLModel],
+        keys: Sequence[str],
+        contribution: Callable[[Mapping[str, Any]], Contribution],
+        added: Iterable[Mapping[str, Any]],
+        removed: Iterable[Mapping[str, Any]],
+    ) -> None:
+        net: Dict[Tuple[Any, ...], Dict[str, float]] = {}
+        for sign, rows in ((1, added), (-1, removed)):
+            for row in rows:
+                key, measures = contribution(row)
+                totals = net.setdefault(key, dict.fromkeys(measures, 0))
+                for name, value in measures.items():
+                    totals[name] += sign * value
+
+        # Sorted keys so concurrent writers lock rollup rows in the same order
+        values = [
+            {**dict(zip(keys, key)), **totals}
+            for key, totals in sorted(net.items(), key=lambda item: _sort_key(item[0]))
+            if any(totals.values())
+        ]
+        if not values:
+            return
+
+        statement = insert(model).values(values)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={
+                name: getattr(model, name) + getattr(statement.excluded, name)
+                for name in values[0]
+                if name not in keys
+            },
+        )
+        await self.session.execute(statement)
+
+    async def apply_sales(
+        self,
+        *,
+        added: Sequence[Mapping[str, Any]] = (),
+        removed: Sequence[Mapping[str, Any]] = (),
+    ) -> None:
+        await self._apply(SalesDaily, ("day", "buyer_id", "inventory_id"), _sales, added, removed)
+
+    async def apply_purchases(
+        self,
+        *,
+        added: Sequence[Mapping[str, Any]] = (),
+        removed: Sequence[Mapping[str, Any]] = (),
+    ) -> None:
+        await self._apply(PurchaseDaily, ("day", "supplier_id", "inventory_id"), _purchase, added, removed)
+
+    async def apply_production(
+        self,
+        *,
+        added: Sequence[Mapping[str, Any]] = (),
+        removed: Sequence[Mapping[str, Any]] = (),
+    ) -> None:
+        await self._apply(ProductionDaily, ("day", "knit_formula_id", "machine_id"), _production, added, removed)
+
+    async def _live_range(
+        self, table: str, start_date: Optional[date], end_date: Optional[date]
+    ) -> Optional[Tuple[Optional[date], Optional[date]]]:
+        """
+        The part of the range whose raw rows are still in `table`: archived months
+        (app/repository/archive.py) only live on in the rollups, so rebuilds skip
+        them. None when nothing of the range is left.
+        """
+        boundary = await archived_until(self.session, table)
+        if boundary and (start_date is None or start_date < boundary):
+            start_date = boundary
+        if start_date and end_date and start_date > end_date:
+            return None
+        return start_date, end_date
+
+    async def _rebuild(
+        self,
+        model: type[SQLModel],
+        source: Any,
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> int:
+        clauses = []
+        if start_date:
+            clauses.append(model.day >= start_date)
+        if end_date:
+            clauses.append(model.day <= end_date)
+        await self.session.execute(delete(model).where(*clauses))
+        result = await self.session.execute(
+            insert(model).from_select([column.name for column in source.selected_columns], source)
+        )
+        await self.session.commit()
+        return result.rowcount
+
+    async def rebuild_sales(self, *, start_date: Optional[date] = None, end_date: Optional[date] = None) -> int:
+        """Recomputes sales_daily for the date range (everything when open); returns the row count."""
+        live = await self._live_range("sales_transaction", start_date, end_date)
+        if live is None:
+            return 0
+        start_date, end_date = live
+        day = cast(SalesTransaction.transaction_date, Date)
+        source = (
+            select(
+                day.label("day"),
+                SalesTransaction.buyer_id,
+                SalesTransaction.inventory_id,
+                func.count().label("transaction_count"),
+                func.coalesce(func.sum(SalesTransaction.roll_count), 0.0).label("roll_count"),
+                func.coalesce(func.sum(SalesTransaction.weight_kg), 0.0).label("weight_kg"),
+                func.coalesce(
+                    func.sum(SalesTransaction.weight_kg * SalesTransaction.price_per_kg), 0.0
+                ).label("total"),
+            )
+            .where(*date_range(SalesTransaction.transaction_date, start_date, end_date))
+            .group_by(day, SalesTransaction.buyer_id, SalesTransaction.inventory_id)
+        )
+        return await self._rebuild(SalesDaily, source, start_date, end_date)
+
+    async def rebuild_purchases(self, *, start_date: Optional[date] = None, end_date: Optional[date] = None) -> int:
+        """Recomputes purchase_daily for the date range (everything when open); returns the row count."""
+        live = await self._live_range("purchase_transaction", start_date, end_date)
+        if live is None:
+            return 0
+        start_date, end_date = live
+        day = cast(PurchaseTransaction.transaction_date, Date)
+        source = (
+            select(
+                day.label("day"),
+                PurchaseTransaction.supplier_id,
+                PurchaseTransaction.inventory_id,
+                func.count().label("transaction_count"),
+                func.coalesce(func.sum(PurchaseTransaction.roll_count), 0.0).label("roll_count"),
+                func.coalesce(func.sum(PurchaseTransaction.weight_kg), 0.0).label("weight_kg"),
+                func.coalesce(
+                    func.sum(PurchaseTransaction.weight_kg * PurchaseTransaction.price_per_kg), 0.0
+                ).label("total"),
+            )
+            .where(*date_range(PurchaseTransaction.transaction_date, start_date, end_date))
+            .group_by(day, PurchaseTransaction.supplier_id, PurchaseTransaction.inventory_id)
+        )
+        return await self._rebuild(PurchaseDaily, source, start_date, end_date)
+
+    async def rebuild_production(self, *, start_date: Optional[date] = None, end_date: Optional[date] = None) -> int:
+        """Recomputes production_daily (completed runs) for the date range; returns the row count."""
+        live = await self._live_range("knitting_process", start_date, end_date)
+        if live is None:
+            return 0
+        start_date, end_date = live
+        day = cast(KnittingProcess.start_date, Date)
+        source = (
+            select(
+                day.label("day"),
+                KnittingProcess.knit_formula_id,
+                KnittingProcess.machine_id,
+                func.count().label("process_count"),
+                func.coalesce(func.sum(KnittingProcess.roll_count), 0.0).label("roll_count"),
+                func.coalesce(func.sum(KnittingProcess.weight_kg), 0.0).label("weight_kg"),
+            )
+            .where(
+                KnittingProcess.knit_status.is_(True),
+                *date_range(KnittingProcess.start_date, start_date, end_date),
+            )
+            .group_by(day, KnittingProcess.knit_formula_id, KnittingProcess.machine_id)
+        )
+        return await self._rebuild(ProductionDaily, source, start_date, end_date)
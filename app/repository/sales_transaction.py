@@ -1,15 +1,17 @@
 from typing import Optional, List, Tuple
-from datetime import datetime, date
-from sqlmodel import select, func
+from datetime import datetime, date, time, timedelta
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.model.sales_transaction import SalesTransaction
+from app.core.fieldsets import FieldSet, loader_options
+from app.repository.statements import select_by_pk, statements, with_options
 from app.schema.sales_transaction.request import (
     SalesTransactionCreateRequest,
     SalesTransactionUpdateRequest,
 )
+from app.core.tracing import trace_methods
 
+@trace_methods("repository")
 class SalesTransactionRepository:
     """
     Handles asynchronous database operations for the SalesTransaction model.
@@ -35,7 +37,8 @@ class SalesTransactionRepository:
             st_create: The Pydantic schema with data for the new transaction.
 
         Returns:
-            The newly created SalesTransaction entity.
+            The newly created SalesTransaction entity, without its relationships
+            loaded; the service re-reads it with them.
         """
         create_data = st_create.model_dump()
         if 'transaction_date' not in create_data:
@@ -47,20 +50,18 @@ class SalesTransactionRepository:
         db_st = SalesTransaction(**create_data)
         self.session.add(db_st)
         await self.session.commit()
-        await self.session.refresh(db_st)
         return db_st
 
-    async def get_by_id(self, *, st_id: int) -> Optional[SalesTransaction]:
-        # UPDATE THIS METHOD
-        statement = (
-            select(SalesTransaction)
-            .where(SalesTransaction.id == st_id)
-            .options(
-                selectinload(SalesTransaction.buyer),
-                selectinload(SalesTransaction.inventory),
+    async def get_by_id(
+        self, *, st_id: int, fieldset: Optional[FieldSet] = None
+    ) -> Optional[SalesTransaction]:
+        if fieldset is None:
+            result = await self.session.execute(
+                statements.get("sales_transaction.by_id"), {"st_id": st_id}
             )
-        )
-        result = await self.session.execute(statement)
+        else:
+            statement = select_by_pk(SalesTransaction).options(*loader_options(SalesTransaction, fieldset))
+            result = await self.session.execute(statement, {"pk": st_id})
         return result.scalars().one_or_none()
 
     async def get_all(
@@ -72,28 +73,35 @@ class SalesTransactionRepository:
         end_date: Optional[date] = None,
         page: int = 1,
         limit: int = 10,
+        fieldset: Optional[FieldSet] = None,
     ) -> Tuple[List[SalesTransaction], int]:
-        statement = select(SalesTransaction).options(
-            selectinload(SalesTransaction.buyer),
-            selectinload(SalesTransaction.inventory),
-        )
-
-        if buyer_id is not None:
-            statement = statement.where(SalesTransaction.buyer_id == buyer_id)
-        if inventory_id:
-            statement = statement.where(SalesTransaction.inventory_id == inventory_id)
-        if start_date:
-            statement = statement.where(func.date(SalesTransaction.transaction_date) >= start_date)
-        if end_date:
-            statement = statement.where(func.date(SalesTransaction.transaction_date) <= end_date)
-
-        count_statement = select(func.count()).select_from(statement.subquery())
+        def filtered(statement):
+            if buyer_id is not None:
+                statement += lambda s: s.where(SalesTransaction.buyer_id == buyer_id)
+            if inventory_id:
+                statement += lambda s: s.where(SalesTransaction.inventory_id == inventory_id)
+            # Half-open timestamp range on the bare column: uses its index and lets
+            # Postgres prune the monthly partitions (func.date(column) allows neither)
+            if start_date:
+                start_at = datetime.combine(start_date, time.min)
+                statement += lambda s: s.where(SalesTransaction.transaction_date >= start_at)
+            if end_date:
+                end_before = datetime.combine(end_date + timedelta(days=1), time.min)
+                statement += lambda s: s.where(SalesTransaction.transaction_date < end_before)
+            return statement
+
+        count_statement = filtered(statements.get("sales_transaction.count"))
         count_result = await self.session.execute(count_statement) # CORRECTED LINE
         total_count = count_result.one()[0]
 
         offset = (page - 1) * limit
-        paginated_statement = (
-            statement.order_by(SalesTransaction.id.desc()).offset(offset).limit(limit)
+        options = (
+            statements.get("sales_transaction.load") if fieldset is None
+            else loader_options(SalesTransaction, fieldset)
+        )
+        list_statement = with_options(filtered(statements.get("sales_transaction.list")), options)
+        paginated_statement = list_statement + (
+            lambda s: s.order_by(SalesTransaction.id.desc()).offset(offset).limit(limit)
         )
 
         items_result = await self.session.execute(paginated_statement) # CORRECTED LINE
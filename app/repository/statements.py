@@ -0,0 +1,290 @@
+"""
+Registry of pre-built statements for the hot repository read paths.
+
+Fixed-shape lookups are built once with named bound parameters, so a call skips
+statement construction and cache-key generation and goes straight to SQLAlchemy's
+compiled cache; the identical SQL text then hits asyncpg's prepared statement cache.
+List queries are registered as `lambda_stmt` bases: repositories append their optional
+filters as lambdas, whose cache keys come from the code location and whose closure
+values become bound parameters. Relationship loading is registered separately
+(`<name>.load`) and appended with `with_options`, so a sparse fieldset can swap it.
+
+Statements are built lazily on first use, once every model has been imported and the
+mappers can be configured.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Sequence
+
+from sqlalchemy import bindparam, lambda_stmt
+from sqlalchemy.orm import contains_eager
+from sqlalchemy.sql import Executable
+from sqlmodel import select, func
+
+from app.core.loading import is_joined, relation_loader
+from app.model.account_receivable import AccountReceivable
+from app.model.buyer import Buyer
+from app.model.dyeing_process import DyeingProcess
+from app.model.inventory import Inventory
+from app.model.knit_formula import KnitFormula
+from app.model.knitting_process import KnittingProcess
+from app.model.purchase_transaction import PurchaseTransaction
+from app.model.sales_transaction import SalesTransaction
+
+
+class StatementRegistry:
+    """Named statements (and loader option tuples) built once on first use."""
+
+    def __init__(self):
+        self._builders: Dict[str, Callable[[], Any]] = {}
+        self._statements: Dict[str, Any] = {}
+
+    def register(self, name: str):
+        def decorator(builder: Callable[[], Any]):
+            if name in self._builders:
+                raise ValueError(f"Statement {name!r} is already registered")
+            self._builders[name] = builder
+            return builder
+        return decorator
+
+    def get(self, name: str) -> Any:
+        statement = self._statements.get(name)
+        if statement is None:
+            statement = self._statements[name] = self._builders[name]()
+        return statement
+
+    def names(self) -> List[str]:
+        return sorted(self._builders)
+
+    def clear(self) -> None:
+        """Drops the built statements so they are rebuilt from the current settings."""
+        self._statements.clear()
+
+
+statements = StatementRegistry()
+
+
+def with_options(statement, options: Sequence[Any]):
+    """Appends loader options to a lambda statement, keyed on the options themselves."""
+    if not options:
+        return statement
+    return statement.add_criteria(lambda s: s.options(*options), track_on=[tuple(options)])
+
+
+@lru_cache(maxsize=None)
+def select_by_pk(model: type) -> Executable:
+    """Bare primary-key lookup with a `pk` bound parameter; callers add loader options."""
+    return select(model).where(model.id == bindparam("pk"))
+
+
+# --- Default relationship loading (strategy per shape, see app/core/loading.py) ---
+
+@statements.register("account_receivable.load")
+def _account_receivable_load():
+    return (relation_loader("account_receivable", AccountReceivable.buyer),)
+
+
+@statements.register("sales_transaction.load")
+def _sales_transaction_load():
+    return (
+        relation_loader("sales_transaction", SalesTransaction.buyer),
+        relation_loader("sales_transaction", SalesTransaction.inventory),
+    )
+
+
+@statements.register("purchase_transaction.load")
+def _purchase_transaction_load():
+    return (
+        relation_loader("purchase_transaction", PurchaseTransaction.supplier),
+        relation_loader("purchase_transaction", PurchaseTransaction.inventory),
+    )
+
+
+@statements.register("purchase_transaction.list.load")
+def _purchase_transaction_list_load():
+    # The list base already joins Inventory for its filters; populate the relation from it
+    if not is_joined("purchase_transaction"):
+        return statements.get("purchase_transaction.load")
+    return (
+        relation_loader("purchase_transaction", PurchaseTransaction.supplier),
+        contains_eager(PurchaseTransaction.inventory),
+    )
+
+
+@statements.register("knitting_process.load")
+def _knitting_process_load():
+    return (
+        relation_loader("knitting_process", KnittingProcess.knit_formula, KnitFormula.product),
+        relation_loader("knitting_process", KnittingProcess.operator),
+        relation_loader("knitting_process", KnittingProcess.machine),
+    )
+
+
+@statements.register("dyeing_process.load")
+def _dyeing_process_load():
+    return (relation_loader("dyeing_process", DyeingProcess.product),)
+
+
+@statements.register("knit_formula.load")
+def _knit_formula_load():
+    return (relation_loader("knit_formula", KnitFormula.product),)
+
+
+# --- Lookups by primary key ---
+
+@statements.register("buyer.by_id")
+def _buyer_by_id():
+    return select(Buyer).where(Buyer.id == bindparam("buyer_id"))
+
+
+@statements.register("account_receivable.by_id")
+def _account_receivable_by_id():
+    return (
+        select(AccountReceivable)
+        .where(AccountReceivable.id == bindparam("ar_id"))
+        .options(*statements.get("account_receivable.load"))
+    )
+
+
+@statements.register("sales_transaction.by_id")
+def _sales_transaction_by_id():
+    return (
+        select(SalesTransaction)
+        .where(SalesTransaction.id == bindparam("st_id"))
+        .options(*statements.get("sales_transaction.load"))
+    )
+
+
+@statements.register("purchase_transaction.by_id")
+def _purchase_transaction_by_id():
+    return (
+        select(PurchaseTransaction)
+        .where(PurchaseTransaction.id == bindparam("pt_id"))
+        .options(*statements.get("purchase_transaction.load"))
+    )
+
+
+@statements.register("knitting_process.by_id")
+def _knitting_process_by_id():
+    return (
+        select(KnittingProcess)
+        .where(KnittingProcess.id == bindparam("kp_id"))
+        .options(*statements.get("knitting_process.load"))
+    )
+
+
+@statements.register("dyeing_process.by_id")
+def _dyeing_process_by_id():
+    return (
+        select(DyeingProcess)
+        .where(DyeingProcess.id == bindparam("dp_id"))
+        .options(*statements.get("dyeing_process.load"))
+    )
+
+
+@statements.register("knit_formula.by_id")
+def _knit_formula_by_id():
+    return (
+        select(KnitFormula)
+        .where(KnitFormula.id == bindparam("kf_id"))
+        .options(*statements.get("knit_formula.load"))
+    )
+
+
+@statements.register("knit_formula.by_product_id")
+def _knit_formula_by_product_id():
+    return (
+        select(KnitFormula)
+        .where(KnitFormula.product_id == bindparam("product_id"))
+        .options(*statements.get("knit_formula.load"))
+    )
+
+
+# --- List bases (filters, loading, ordering and pagination are appended by the repositories) ---
+
+@statements.register("buyer.list")
+def _buyer_list():
+    # Plain columns rather than entities: list rows are validated straight into BuyerData
+    return lambda_stmt(
+        lambda: select(
+            Buyer.id, Buyer.name, Buyer.phone_num, Buyer.address, Buyer.note,
+            Buyer.overdue_amount, Buyer.is_risked,
+        )
+    )
+
+
+@statements.register("buyer.count")
+def _buyer_count():
+    return lambda_stmt(lambda: select(func.count()).select_from(Buyer))
+
+
+@statements.register("account_receivable.list")
+def _account_receivable_list():
+    return lambda_stmt(lambda: select(AccountReceivable))
+
+
+@statements.register("account_receivable.count")
+def _account_receivable_count():
+    return lambda_stmt(lambda: select(func.count()).select_from(AccountReceivable))
+
+
+@statements.register("inventory.list")
+def _inventory_list():
+    return lambda_stmt(lambda: select(Inventory))
+
+
+@statements.register("inventory.count")
+def _inventory_count():
+    return lambda_stmt(lambda: select(func.count()).select_from(Inventory))
+
+
+@statements.register("sales_transaction.list")
+def _sales_transaction_list():
+    return lambda_stmt(lambda: select(SalesTransaction))
+
+
+@statements.register("sales_transaction.count")
+def _sales_transaction_count():
+    return lambda_stmt(lambda: select(func.count()).select_from(SalesTransaction))
+
+
+@statements.register("purchase_transaction.list")
+def _purchase_transaction_list():
+    return lambda_stmt(lambda: select(PurchaseTransaction).join(Inventory))
+
+
+@statements.register("purchase_transaction.count")
+def _purchase_transaction_count():
+    return lambda_stmt(
+        lambda: select(func.count()).select_from(PurchaseTransaction).join(Inventory)
+    )
+
+
+@statements.register("knitting_process.list")
+def _knitting_process_list():
+    return lambda_stmt(lambda: select(KnittingProcess))
+
+
+@statements.register("knitting_process.count")
+def _knitting_process_count():
+    return lambda_stmt(lambda: select(func.count()).select_from(KnittingProcess))
+
+
+@statements.register("dyeing_process.list")
+def _dyeing_process_list():
+    return lambda_stmt(lambda: select(DyeingProcess))
+
+
+@statements.register("dyeing_process.count")
+def _dyeing_process_count():
+    return lambda_stmt(lambda: select(func.count()).select_from(DyeingProcess))
+
+
+@statements.register("knit_formula.list")
+def _knit_formula_list():
+    return lambda_stmt(lambda: select(KnitFormula))
+
+
+@statements.register("knit_formula.count")
+def _knit_formula_count():
+    return lambda_stmt(lambda: select(func.count()).select_from(KnitFormula))
@@ -4,7 +4,9 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.model.supplier import Supplier
 from app.schema.supplier.request import SupplierCreateRequest, SupplierUpdateRequest
+from app.core.tracing import trace_methods
 
+@trace_methods("repository")
 class SupplierRepository:
     """
     Handles asynchronous database operations for the Supplier model.
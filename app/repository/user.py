@@ -4,7 +4,9 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.model.user import User
+from app.core.tracing import trace_methods
 
+@trace_methods("repository")
 class UserRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
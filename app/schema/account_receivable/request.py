@@ -1,5 +1,23 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional
+from datetime import date, datetime
+
+# Period labels, e.g. 'Apr-25'
+PERIOD_FORMAT = "%b-%y"
+
+
+def normalize_period(value: str) -> str:
+    """Canonical label of a period ('apr-25' -> 'Apr-25'); ValueError when malformed."""
+    try:
+        return datetime.strptime(value.strip(), PERIOD_FORMAT).strftime(PERIOD_FORMAT)
+    except ValueError:
+        raise ValueError("Format periode harus seperti 'Apr-25'.")
+
+
+def period_start(period: str) -> date:
+    """First day of the period's month, stored as `AccountReceivable.period_date`."""
+    return datetime.strptime(period, PERIOD_FORMAT).date()
+
 
 class AccountReceivableCreateRequest(BaseModel):
     buyer_id: int
@@ -9,10 +27,29 @@ class AccountReceivableCreateRequest(BaseModel):
     age_61_90_days: Optional[float] = Field(0, ge=0)
     age_over_90_days: Optional[float] = Field(0, ge=0)
 
+    @field_validator("period")
+    @classmethod
+    def validate_period(cls, value: str) -> str:
+        return normalize_period(value)
+
 class AccountReceivableUpdateRequest(BaseModel):
     buyer_id: Optional[int] = None
     period: Optional[str] = None
     age_0_30_days: Optional[float] = Field(None, ge=0)
     age_31_60_days: Optional[float] = Field(None, ge=0)
     age_61_90_days: Optional[float] = Field(None, ge=0)
-    age_over_90_days: Optional[float] = Field(None, ge=0)
\ No newline at end of file
+    age_over_90_days: Optional[float] = Field(None, ge=0)
+
+    @field_validator("period")
+    @classmethod
+    def validate_period(cls, value: Optional[str]) -> Optional[str]:
+        return value if value is None else normalize_period(value)
+
+class ReceivableAgingRunRequest(BaseModel):
+    period: Optional[str] = Field(None, description="Period to age, e.g. 'Apr-25'; defaults to the current month")
+    full: bool = Field(False, description="Recompute every buyer instead of only those with new activity")
+
+    @field_validator("period")
+    @classmethod
+    def validate_period(cls, value: Optional[str]) -> Optional[str]:
+        return value if value is None else normalize_period(value)
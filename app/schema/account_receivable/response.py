@@ -1,6 +1,7 @@
 from __future__ import annotations
 from pydantic import BaseModel, computed_field
-from typing import Optional
+from typing import ClassVar, Dict, List, Optional, Tuple
+from datetime import date
 from app.schema.base_response import BaseSingleResponse, BaseListResponse
 from app.schema.buyer.response import BuyerData
 
@@ -8,12 +9,18 @@ from app.schema.buyer.response import BuyerData
 class AccountReceivableData(BaseModel):
     id: int
     period: str
+    period_date: Optional[date] = None
     age_0_30_days: Optional[float] = 0
     age_31_60_days: Optional[float] = 0
     age_61_90_days: Optional[float] = 0
     age_over_90_days: Optional[float] = 0
     buyer: Optional[BuyerData] = None
 
+    # Columns `?fields=total` has to load without returning them
+    sparse_dependencies: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "total": ("age_0_30_days", "age_31_60_days", "age_61_90_days", "age_over_90_days"),
+    }
+
     @computed_field
     @property
     def total(self) -> float:
@@ -32,4 +39,15 @@ class SingleAccountReceivableResponse(BaseSingleResponse):
     data: AccountReceivableData
 
 class BulkAccountReceivableResponse(BaseListResponse[AccountReceivableData]):
-    pass
\ No newline at end of file
+    pass
+class ReceivableAgingData(BaseModel):
+    period: str
+    as_of: date
+    full: bool
+    updated: int
+    zeroed: int
+    inserted: int
+    refreshed_periods: List[str] = []
+
+class ReceivableAgingResponse(BaseSingleResponse):
+    data: ReceivableAgingData
@@ -0,0 +1,22 @@
+from __future__ import annotations
+from pydantic import BaseModel
+from typing import Any, List, Optional
+from datetime import datetime
+from app.schema.base_response import BaseListResponse
+
+# Data Transfer Object
+class SlowQueryData(BaseModel):
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameter_shapes: List[str]
+    executemany: bool
+    plan: Optional[Any] = None
+    plan_error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+# Response Schemas
+class BulkSlowQueryResponse(BaseListResponse[SlowQueryData]):
+    pass
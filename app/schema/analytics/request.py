@@ -0,0 +1,28 @@
+from enum import Enum
+
+
+class SalesGroupBy(str, Enum):
+    DAY = "day"
+    MONTH = "month"
+    BUYER = "buyer"
+    INVENTORY = "inventory"
+
+
+class PurchaseGroupBy(str, Enum):
+    DAY = "day"
+    MONTH = "month"
+    SUPPLIER = "supplier"
+    INVENTORY = "inventory"
+
+
+class ProductionGroupBy(str, Enum):
+    DAY = "day"
+    MONTH = "month"
+    FORMULA = "formula"
+    MACHINE = "machine"
+
+
+class MarginGroupBy(str, Enum):
+    MONTH = "month"
+    BUYER = "buyer"
+    INVENTORY = "inventory"
@@ -0,0 +1,79 @@
+from __future__ import annotations
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+from app.schema.base_response import BaseListResponse, BaseSingleResponse
+
+# Data Transfer Object
+class AnalyticsBucket(BaseModel):
+    """One group: a day/month (`key` is its first day) or a buyer, supplier, item, formula or machine."""
+    key: Optional[str] = None
+    label: Optional[str] = None
+    transaction_count: int
+    roll_count: float
+    weight_kg: float
+    total: Optional[float] = None
+
+class AnalyticsData(BaseModel):
+    group_by: str
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    transaction_count: int
+    roll_count: float
+    weight_kg: float
+    total: Optional[float] = None
+    items: List[AnalyticsBucket]
+
+# Response Schemas
+class AnalyticsResponse(BaseSingleResponse):
+    data: AnalyticsData
+
+class MarginBucket(BaseModel):
+    """One month (`key` is its first day), buyer or item of the margin report."""
+    key: Optional[str] = None
+    label: Optional[str] = None
+    transaction_count: int
+    weight_kg: float
+    revenue: float
+    cost: float
+    margin: float
+    margin_pct: Optional[float] = None
+    # Kilograms no cost layer covered, valued at the item's average cost
+    uncovered_kg: float = 0.0
+    estimated_count: int = 0
+
+class MarginData(BaseModel):
+    group_by: str
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    transaction_count: int
+    weight_kg: float
+    revenue: float
+    cost: float
+    margin: float
+    margin_pct: Optional[float] = None
+    uncovered_kg: float = 0.0
+    estimated_count: int = 0
+    # Days before this date are archived and read from the daily rollup
+    archived_until: Optional[date] = None
+    items: List[MarginBucket]
+
+class MarginResponse(BaseSingleResponse):
+    data: MarginData
+
+class SaleMarginData(BaseModel):
+    id: int
+    transaction_date: datetime
+    buyer_id: Optional[int] = None
+    inventory_id: Optional[str] = None
+    weight_kg: float
+    price_per_kg: float
+    revenue: float
+    cost: float
+    margin: float
+    uncovered_kg: float
+    estimated: bool
+
+class BulkSaleMarginResponse(BaseListResponse[SaleMarginData]):
+    # Sales before this date are archived and not listed
+    archived_until: Optional[date] = None
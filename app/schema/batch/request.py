@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from app.core.config import settings
+
+
+class BatchItemRequest(BaseModel):
+    id: Optional[str] = Field(None, description="Client key echoed back in the matching response")
+    path: str = Field(
+        ...,
+        description="GET path relative to the API prefix, query string included, e.g. `/inventory?limit=50`",
+    )
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItemRequest] = Field(..., min_length=1, max_length=settings.BATCH_MAX_REQUESTS)
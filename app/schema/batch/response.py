@@ -0,0 +1,15 @@
+from __future__ import annotations
+from pydantic import BaseModel
+from typing import Any, List, Optional
+from app.schema.base_response import BaseSingleResponse
+
+# Data Transfer Object
+class BatchItemData(BaseModel):
+    id: Optional[str] = None
+    path: str
+    status: int
+    body: Any = None
+
+# Response Schemas
+class BatchResponse(BaseSingleResponse):
+    data: List[BatchItemData]
@@ -10,6 +10,7 @@ class BuyerData(BaseModel):
     phone_num: Optional[str] = None
     address: Optional[str] = None
     note: Optional[str] = None
+    overdue_amount: float = 0.0
     is_risked: bool = False
 
     class Config:
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import date
+
+class BuyerPaymentCreateRequest(BaseModel):
+    buyer_id: int
+    payment_date: date
+    amount: float = Field(..., gt=0)
+    note: Optional[str] = None
@@ -0,0 +1,23 @@
+from __future__ import annotations
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from app.schema.base_response import BaseSingleResponse, BaseListResponse
+
+# Data Transfer Object
+class BuyerPaymentData(BaseModel):
+    id: int
+    buyer_id: int
+    payment_date: datetime
+    amount: float
+    note: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+# Response Schemas
+class SingleBuyerPaymentResponse(BaseSingleResponse):
+    data: BuyerPaymentData
+
+class BulkBuyerPaymentResponse(BaseListResponse[BuyerPaymentData]):
+    pass
@@ -0,0 +1,5 @@
+from pydantic import BaseModel, Field
+
+
+class CostRecomputeRequest(BaseModel):
+    full: bool = Field(False, description="Replay every item from the beginning instead of only those with new activity")
@@ -0,0 +1,30 @@
+from datetime import datetime
+from pydantic import BaseModel
+from app.schema.base_response import BaseSingleResponse, BaseListResponse
+
+
+class CostLayerData(BaseModel):
+    id: int
+    inventory_id: str
+    source_type: str
+    source_id: int
+    layer_date: datetime
+    quantity_kg: float
+    unit_cost: float
+    remaining_kg: float
+
+    class Config:
+        from_attributes = True
+
+class BulkCostLayerResponse(BaseListResponse[CostLayerData]):
+    pass
+
+class CostRecomputeData(BaseModel):
+    full: bool
+    item_count: int
+    consumer_count: int
+    row_count: int
+    uncovered_kg: float
+
+class CostRecomputeResponse(BaseSingleResponse):
+    data: CostRecomputeData
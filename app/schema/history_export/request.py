@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class ExportDataset(str, Enum):
+    SALES = "sales"
+    PURCHASES = "purchases"
+    KNITTING = "knitting"
+    DYEING = "dyeing"
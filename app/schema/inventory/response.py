@@ -1,6 +1,6 @@
 from __future__ import annotations
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from app.model.inventory import InventoryType
 from app.schema.base_response import BaseSingleResponse, BaseListResponse
 
@@ -13,6 +13,7 @@ class InventoryData(BaseModel):
     weight_kg: Optional[float] = 0.0
     bale_count: Optional[float] = 0.0
     bale_ratio: Optional[float] = 0.0
+    average_cost: float = 0.0
 
     class Config:
         from_attributes = True
@@ -22,4 +23,18 @@ class SingleInventoryResponse(BaseSingleResponse):
     data: InventoryData
 
 class BulkInventoryResponse(BaseListResponse[InventoryData]):
-    pass
\ No newline at end of file
+    pass
+
+class InventoryValuationGroup(BaseModel):
+    type: Optional[InventoryType] = None
+    item_count: int
+    weight_kg: float
+    value: float
+
+class InventoryValuationData(BaseModel):
+    total_weight_kg: float
+    total_value: float
+    by_type: List[InventoryValuationGroup]
+
+class InventoryValuationResponse(BaseSingleResponse):
+    data: InventoryValuationData
\ No newline at end of file
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from pydantic import BaseModel, computed_field
-from typing import Optional
+from typing import ClassVar, Dict, Optional, Tuple
 from datetime import datetime
 from app.schema.base_response import BaseSingleResponse, BaseListResponse
 from app.schema.supplier.response import SupplierData
@@ -17,6 +17,9 @@ class PurchaseTransactionData(BaseModel):
     supplier: Optional[SupplierData] = None
     inventory: Optional[InventoryData] = None
 
+    # Columns `?fields=total` has to load without returning them
+    sparse_dependencies: ClassVar[Dict[str, Tuple[str, ...]]] = {"total": ("weight_kg", "price_per_kg")}
+
     @computed_field
     @property
     def total(self) -> float:
@@ -1,35 +1,86 @@
 from typing import Optional
+from datetime import date
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 
+from app.core.fieldsets import parse_fields, sparse_response
 from app.repository.account_receivable import AccountReceivableRepository
-from app.repository.buyer import BuyerRepository
+from app.repository.reference import Reference, ReferenceRepository
+from app.model.buyer import Buyer
 from app.schema.account_receivable.request import (
     AccountReceivableCreateRequest,
     AccountReceivableUpdateRequest,
+    normalize_period,
+    period_start,
 )
 from app.schema.account_receivable.response import (
+    AccountReceivableData,
     BulkAccountReceivableResponse,
     SingleAccountReceivableResponse,
 )
 from app.schema.base_response import BaseSingleResponse
+from app.service.reference import require_references
+from app.core.tracing import trace_methods
 
+# unique_violation on the one-row-per-buyer-and-period index
+UNIQUE_VIOLATION = "23505"
+PERIOD_INDEX = "ux_account_receivable_buyer_period"
+
+
+def _period_conflict(period: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Data piutang pembeli ini untuk periode {period} sudah ada.",
+    )
+
+
+def _is_period_conflict(exc: IntegrityError) -> bool:
+    """Whether the insert or update lost a race on the buyer/period unique index."""
+    orig = exc.orig
+    # asyncpg's own exception, which names the constraint, is the adapted error's cause
+    constraint = getattr(getattr(orig, "__cause__", None), "constraint_name", None)
+    return getattr(orig, "sqlstate", None) == UNIQUE_VIOLATION and constraint == PERIOD_INDEX
+
+@trace_methods("service")
 class AccountReceivableService:
     """Service class for account receivable-related business logic."""
 
     def __init__(
         self,
         receivable_repo: AccountReceivableRepository,
-        buyer_repo: BuyerRepository,
+        reference_repo: ReferenceRepository,
     ):
         """
         Initializes the service with necessary repositories.
 
         Args:
             receivable_repo: The repository for account receivable data.
-            buyer_repo: The repository for buyer data.
+            reference_repo: The repository for foreign key checks.
         """
         self.receivable_repo = receivable_repo
-        self.buyer_repo = buyer_repo
+        self.reference_repo = reference_repo
+
+    @staticmethod
+    def _period_date(period: Optional[str]) -> Optional[date]:
+        if not period:
+            return None
+        try:
+            return period_start(normalize_period(period))
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+
+    async def _ensure_unique(self, buyer_id: Optional[int], period: str, ar_id: Optional[int] = None) -> None:
+        """
+        A buyer has one receivable row per period.
+
+        This only gives the common case an early answer: a concurrent request can insert
+        the same period after the check, which the unique index then rejects on write.
+        """
+        if buyer_id is None:
+            return
+        existing = await self.receivable_repo.get_by_period(buyer_id=buyer_id, period_date=period_start(period))
+        if existing and existing.id != ar_id:
+            raise _period_conflict(period)
 
     async def get_all(
         self,
@@ -37,16 +88,26 @@ class AccountReceivableService:
         period: Optional[str],
         page: int,
         limit: int,
+        fields: Optional[str] = None,
+        period_from: Optional[str] = None,
+        period_to: Optional[str] = None,
     ) -> BulkAccountReceivableResponse:
         """
         Retrieves a paginated list of account receivables and formats the response.
         """
+        fieldset = parse_fields(fields, AccountReceivableData)
         items, total_count = await self.receivable_repo.get_all(
-            buyer_id=buyer_id, period=period, page=page, limit=limit
+            buyer_id=buyer_id,
+            period=period,
+            period_from=self._period_date(period_from),
+            period_to=self._period_date(period_to),
+            page=page,
+            limit=limit,
+            fieldset=fieldset,
         )
         total_pages = (total_count + limit - 1) // limit if total_count > 0 else 0
 
-        return BulkAccountReceivableResponse(
+        return sparse_response(BulkAccountReceivableResponse, fieldset)(
             items=items,
             item_count=total_count,
             page=page,
@@ -55,19 +116,20 @@ class AccountReceivableService:
         )
 
     async def get_by_id(
-        self, ar_id: int
+        self, ar_id: int, fields: Optional[str] = None
     ) -> SingleAccountReceivableResponse:
         """
         Retrieves a single account receivable by its ID.
         Raises an HTTPException if the record is not found.
         """
-        receivable = await self.receivable_repo.get_by_id(ar_id=ar_id)
+        fieldset = parse_fields(fields, AccountReceivableData)
+        receivable = await self.receivable_repo.get_by_id(ar_id=ar_id, fieldset=fieldset)
         if not receivable:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Data piutang tidak ditemukan.",
             )
-        return SingleAccountReceivableResponse(data=receivable)
+        return sparse_response(SingleAccountReceivableResponse, fieldset)(data=receivable)
 
     async def create(
         self, ar_create: AccountReceivableCreateRequest
@@ -76,16 +138,22 @@ class AccountReceivableService:
         Creates a new account receivable after validating the buyer.
         """
         # Check foreign key availability
-        buyer = await self.buyer_repo.get_by_id(buyer_id=ar_create.buyer_id)
-        if not buyer:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Pembeli tidak ditemukan.",
-            )
+        await require_references(
+            self.reference_repo,
+            Reference(Buyer, ar_create.buyer_id, "Pembeli tidak ditemukan."),
+        )
+        await self._ensure_unique(ar_create.buyer_id, ar_create.period)
 
-        new_receivable = await self.receivable_repo.create(ar_create=ar_create)
+        try:
+            new_receivable = await self.receivable_repo.create(ar_create=ar_create)
+        except IntegrityError as exc:
+            if not _is_period_conflict(exc):
+                raise
+            raise _period_conflict(ar_create.period)
+        # The buyer was only checked for existence; load it with the receivable for the response
+        created_receivable = await self.receivable_repo.get_by_id(ar_id=new_receivable.id)
         return SingleAccountReceivableResponse(
-            message="Berhasil menambahkan data piutang.", data=new_receivable
+            message="Berhasil menambahkan data piutang.", data=created_receivable
         )
 
     async def update(
@@ -103,17 +171,24 @@ class AccountReceivableService:
             )
 
         # If buyer_id is being updated, check if the new buyer exists
-        if ar_update.buyer_id is not None:
-            buyer = await self.buyer_repo.get_by_id(buyer_id=ar_update.buyer_id)
-            if not buyer:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Pembeli tidak ditemukan.",
-                )
-
-        updated_receivable = await self.receivable_repo.update(
-            db_ar=db_receivable, ar_update=ar_update
+        await require_references(
+            self.reference_repo,
+            Reference(Buyer, ar_update.buyer_id, "Pembeli tidak ditemukan."),
         )
+        period = ar_update.period or db_receivable.period
+        if ar_update.buyer_id is not None or ar_update.period:
+            await self._ensure_unique(
+                ar_update.buyer_id or db_receivable.buyer_id, period, ar_id=ar_id
+            )
+
+        try:
+            updated_receivable = await self.receivable_repo.update(
+                db_ar=db_receivable, ar_update=ar_update
+            )
+        except IntegrityError as exc:
+            if not _is_period_conflict(exc):
+                raise
+            raise _period_conflict(period)
         return SingleAccountReceivableResponse(
             message="Berhasil mengupdate data piutang.", data=updated_receivable
         )
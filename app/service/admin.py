@@ -0,0 +1,32 @@
+from app.core.slow_query import SlowQueryLog
+from app.schema.admin.response import BulkSlowQueryResponse
+from app.schema.base_response import BaseSingleResponse
+from app.core.tracing import trace_methods
+
+@trace_methods("service")
+class AdminService:
+    """Service class for operational (admin-only) endpoints."""
+
+    def __init__(self, slow_query_log: SlowQueryLog):
+        self.slow_query_log = slow_query_log
+
+    async def get_slow_queries(self, page: int, limit: int) -> BulkSlowQueryResponse:
+        """
+        Retrieves a paginated view of the slow-query ring buffer, newest first.
+        """
+        records = self.slow_query_log.snapshot()
+        total_count = len(records)
+        total_pages = (total_count + limit - 1) // limit if total_count > 0 else 0
+        offset = (page - 1) * limit
+
+        return BulkSlowQueryResponse(
+            items=records[offset:offset + limit],
+            item_count=total_count,
+            page=page,
+            limit=limit,
+            total_pages=total_pages,
+        )
+
+    async def clear_slow_queries(self) -> BaseSingleResponse:
+        self.slow_query_log.clear()
+        return BaseSingleResponse(message="Berhasil menghapus log kueri lambat.")
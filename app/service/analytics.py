@@ -0,0 +1,246 @@
+from typing import List, Optional, Sequence
+from datetime import date, datetime
+from sqlalchemy.engine import RowMapping
+
+from app.core.cache import TTLCache
+from app.repository.analytics import AnalyticsRepository, PERIODS
+from app.repository.archive import ArchiveRepository
+from app.schema.analytics.request import MarginGroupBy, ProductionGroupBy, PurchaseGroupBy, SalesGroupBy
+from app.schema.analytics.response import (
+    AnalyticsBucket,
+    AnalyticsData,
+    AnalyticsResponse,
+    BulkSaleMarginResponse,
+    MarginBucket,
+    MarginData,
+    MarginResponse,
+)
+from app.core.tracing import trace_methods
+
+# Month buckets use the same label as account receivable periods ("Apr-25")
+PERIOD_LABELS = {"day": "%Y-%m-%d", "month": "%b-%y"}
+
+
+def _buckets(rows: Sequence[RowMapping], group_by: str) -> List[AnalyticsBucket]:
+    buckets = []
+    for row in rows:
+        if group_by in PERIODS:
+            period = row["key"].date() if isinstance(row["key"], datetime) else row["key"]
+            key = period.isoformat()
+            label = period.strftime(PERIOD_LABELS[group_by])
+        else:
+            key = None if row["key"] is None else str(row["key"])
+            label = row["label"]
+        buckets.append(AnalyticsBucket(
+            key=key,
+            label=label,
+            transaction_count=row["transaction_count"],
+            roll_count=row["roll_count"],
+            weight_kg=row["weight_kg"],
+            total=row.get("total"),
+        ))
+    return buckets
+
+
+def _response(
+    rows: Sequence[RowMapping],
+    group_by: str,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    has_total: bool = True,
+) -> AnalyticsResponse:
+    items = _buckets(rows, group_by)
+    return AnalyticsResponse(data=AnalyticsData(
+        group_by=group_by,
+        start_date=start_date,
+        end_date=end_date,
+        transaction_count=sum(item.transaction_count for item in items),
+        roll_count=sum(item.roll_count for item in items),
+        weight_kg=sum(item.weight_kg for item in items),
+        total=sum(item.total for item in items) if has_total else None,
+        items=items,
+    ))
+
+
+def _margin_pct(revenue: float, cost: float) -> Optional[float]:
+    return round((revenue - cost) / revenue * 100, 2) if revenue else None
+
+
+def _margin_response(
+    rows: Sequence[RowMapping],
+    group_by: str,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    archived_until: Optional[date],
+) -> MarginResponse:
+    items = []
+    for row in rows:
+        if group_by == "month":
+            key = row["key"].date().isoformat()
+            label = row["key"].strftime(PERIOD_LABELS["month"])
+        else:
+            key = None if row["key"] is None else str(row["key"])
+            label = row["label"]
+        items.append(MarginBucket(
+            key=key,
+            label=label,
+            transaction_count=row["transaction_count"],
+            weight_kg=row["weight_kg"],
+            revenue=row["revenue"],
+            cost=row["cost"],
+            margin=row["revenue"] - row["cost"],
+            margin_pct=_margin_pct(row["revenue"], row["cost"]),
+            uncovered_kg=row["uncovered_kg"],
+            estimated_count=row["estimated_count"],
+        ))
+    revenue = sum(item.revenue for item in items)
+    cost = sum(item.cost for item in items)
+    return MarginResponse(data=MarginData(
+        group_by=group_by,
+        start_date=start_date,
+        end_date=end_date,
+        transaction_count=sum(item.transaction_count for item in items),
+        weight_kg=sum(item.weight_kg for item in items),
+        revenue=revenue,
+        cost=cost,
+        margin=revenue - cost,
+        margin_pct=_margin_pct(revenue, cost),
+        uncovered_kg=sum(item.uncovered_kg for item in items),
+        estimated_count=sum(item.estimated_count for item in items),
+        archived_until=archived_until,
+        items=items,
+    ))
+
+
+@trace_methods("service")
+class AnalyticsService:
+    """Service class for dashboard aggregates, cached per worker (see app/core/cache.py)."""
+
+    def __init__(self, analytics_repo: AnalyticsRepository, archive_repo: ArchiveRepository, cache: TTLCache):
+        self.analytics_repo = analytics_repo
+        self.archive_repo = archive_repo
+        self.cache = cache
+
+    async def sales_revenue(
+        self,
+        group_by: SalesGroupBy,
+        buyer_id: Optional[int] = None,
+        inventory_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> AnalyticsResponse:
+        """Retrieves sales revenue grouped by day, month, buyer or item."""
+        key = ("sales", group_by.value, buyer_id, inventory_id, start_date, end_date)
+        response = self.cache.get(key)
+        if response is None:
+            rows = await self.analytics_repo.sales_revenue(
+                group_by=group_by.value,
+                buyer_id=buyer_id,
+                inventory_id=inventory_id,
+                start_date=start_date,
+                end_date=end_date,
+            )
+            response = _response(rows, group_by.value, start_date, end_date)
+            self.cache.set(key, response)
+        return response
+
+    async def purchase_spend(
+        self,
+        group_by: PurchaseGroupBy,
+        supplier_id: Optional[int] = None,
+        inventory_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        inventory_type: Optional[str] = None,
+    ) -> AnalyticsResponse:
+        """Retrieves purchase spend grouped by day, month, supplier or item."""
+        key = ("purchase", group_by.value, supplier_id, inventory_id, start_date, end_date, inventory_type)
+        response = self.cache.get(key)
+        if response is None:
+            rows = await self.analytics_repo.purchase_spend(
+                group_by=group_by.value,
+                supplier_id=supplier_id,
+                inventory_id=inventory_id,
+                start_date=start_date,
+                end_date=end_date,
+                inventory_type=inventory_type,
+            )
+            response = _response(rows, group_by.value, start_date, end_date)
+            self.cache.set(key, response)
+        return response
+
+    async def production_output(
+        self,
+        group_by: ProductionGroupBy,
+        knit_formula_id: Optional[int] = None,
+        machine_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> AnalyticsResponse:
+        """Retrieves completed knitting output grouped by day, month, formula or machine."""
+        key = ("production", group_by.value, knit_formula_id, machine_id, start_date, end_date)
+        response = self.cache.get(key)
+        if response is None:
+            rows = await self.analytics_repo.production_output(
+                group_by=group_by.value,
+                knit_formula_id=knit_formula_id,
+                machine_id=machine_id,
+                start_date=start_date,
+                end_date=end_date,
+            )
+            response = _response(rows, group_by.value, start_date, end_date, has_total=False)
+            self.cache.set(key, response)
+        return response
+
+    async def sales_margin(
+        self,
+        group_by: MarginGroupBy,
+        buyer_id: Optional[int] = None,
+        inventory_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> MarginResponse:
+        """Retrieves gross margin on sales grouped by month, buyer or item."""
+        key = ("margin", group_by.value, buyer_id, inventory_id, start_date, end_date)
+        response = self.cache.get(key)
+        if response is None:
+            archived_until = await self.archive_repo.archived_until(table="sales_transaction")
+            rows = await self.analytics_repo.sales_margin(
+                group_by=group_by.value,
+                buyer_id=buyer_id,
+                inventory_id=inventory_id,
+                start_date=start_date,
+                end_date=end_date,
+                archived_until=archived_until,
+            )
+            response = _margin_response(rows, group_by.value, start_date, end_date, archived_until)
+            self.cache.set(key, response)
+        return response
+
+    async def sale_margins(
+        self,
+        page: int,
+        limit: int,
+        buyer_id: Optional[int] = None,
+        inventory_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> BulkSaleMarginResponse:
+        """Retrieves a paginated list of sales with their cost and margin."""
+        items, total_count = await self.analytics_repo.sale_margins(
+            page=page,
+            limit=limit,
+            buyer_id=buyer_id,
+            inventory_id=inventory_id,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        total_pages = (total_count + limit - 1) // limit if total_count > 0 else 0
+        return BulkSaleMarginResponse(
+            items=[dict(item) for item in items],
+            item_count=total_count,
+            page=page,
+            limit=limit,
+            total_pages=total_pages,
+            archived_until=await self.archive_repo.archived_until(table="sales_transaction"),
+        )
@@ -14,7 +14,9 @@ from app.core.security import (
     hash_password
 )
 from app.core.config import settings
+from app.core.tracing import trace_methods
 
+@trace_methods("service")
 class AuthService:
     def __init__(self, user_repo: UserRepository, rt_repo: RefreshTokenRepository):
         self.user_repo = user_repo
@@ -0,0 +1,109 @@
+from typing import Optional
+from datetime import date
+from fastapi import HTTPException, status
+
+from app.repository.buyer_payment import BuyerPaymentRepository
+from app.repository.receivable_aging import ReceivableAgingRepository
+from app.repository.reference import Reference, ReferenceRepository
+from app.model.buyer import Buyer
+from app.schema.buyer_payment.request import BuyerPaymentCreateRequest
+from app.schema.buyer_payment.response import (
+    BulkBuyerPaymentResponse,
+    SingleBuyerPaymentResponse,
+)
+from app.schema.base_response import BaseSingleResponse
+from app.service.reference import require_references
+from app.core.tracing import trace_methods
+
+@trace_methods("service")
+class BuyerPaymentService:
+    """Service class for buyer payment-related business logic."""
+
+    def __init__(
+        self,
+        payment_repo: BuyerPaymentRepository,
+        reference_repo: ReferenceRepository,
+        aging_repo: ReceivableAgingRepository,
+    ):
+        """
+        Initializes the service with necessary repositories.
+
+        Args:
+            payment_repo: The repository for payment data.
+            reference_repo: The repository for foreign key checks.
+            aging_repo: Flags the buyer for the next receivable aging run.
+        """
+        self.payment_repo = payment_repo
+        self.reference_repo = reference_repo
+        self.aging_repo = aging_repo
+
+    async def get_all(
+        self,
+        page: int,
+        limit: int,
+        buyer_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> BulkBuyerPaymentResponse:
+        """
+        Retrieves a paginated list of payments, newest first.
+        """
+        items, total_count = await self.payment_repo.get_all(
+            buyer_id=buyer_id, start_date=start_date, end_date=end_date, page=page, limit=limit
+        )
+        total_pages = (total_count + limit - 1) // limit if total_count > 0 else 0
+
+        return BulkBuyerPaymentResponse(
+            items=items,
+            item_count=total_count,
+            page=page,
+            limit=limit,
+            total_pages=total_pages,
+        )
+
+    async def get_by_id(self, payment_id: int) -> SingleBuyerPaymentResponse:
+        """
+        Retrieves a single payment by its ID.
+        Raises an HTTPException if the payment is not found.
+        """
+        payment = await self.payment_repo.get_by_id(payment_id=payment_id)
+        if not payment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Pembayaran tidak ditemukan.",
+            )
+        return SingleBuyerPaymentResponse(data=payment)
+
+    async def create(self, payment_create: BuyerPaymentCreateRequest) -> SingleBuyerPaymentResponse:
+        """
+        Records a payment after validating the buyer.
+        """
+        await require_references(
+            self.reference_repo,
+            Reference(Buyer, payment_create.buyer_id, "Pembeli tidak ditemukan."),
+        )
+
+        # Committed together with the payment
+        await self.aging_repo.mark_activity(changes=[(payment_create.buyer_id, payment_create.payment_date)])
+        new_payment = await self.payment_repo.create(payment_create=payment_create)
+        return SingleBuyerPaymentResponse(
+            message="Berhasil mencatat pembayaran.", data=new_payment
+        )
+
+    async def delete(self, payment_id: int) -> BaseSingleResponse:
+        """
+        Deletes a payment.
+        Raises an HTTPException if the payment is not found.
+        """
+        db_payment = await self.payment_repo.get_by_id(payment_id=payment_id)
+        if not db_payment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Pembayaran tidak ditemukan.",
+            )
+
+        await self.aging_repo.mark_activity(changes=[(db_payment.buyer_id, db_payment.payment_date)])
+        await self.payment_repo.delete(db_payment=db_payment)
+        return BaseSingleResponse(
+            message=f"Berhasil menghapus pembayaran dengan id {payment_id}."
+        )
@@ -0,0 +1,66 @@
+from typing import Optional
+
+from app.repository.cost_layer import RECOMPUTE_ORDER, CostLayerRepository
+from app.schema.costing.response import (
+    BulkCostLayerResponse,
+    CostRecomputeData,
+    CostRecomputeResponse,
+)
+from app.core.cache import analytics_cache
+from app.core.tracing import trace_methods
+
+
+@trace_methods("service")
+class CostingService:
+    """FIFO costing of thread and fabric consumption from purchase and production cost layers."""
+
+    def __init__(self, cost_repo: CostLayerRepository):
+        self.cost_repo = cost_repo
+
+    async def recompute(self, full: bool = False) -> CostRecomputeResponse:
+        """
+        Brings the FIFO allocation up to date. Only items with stock movements since
+        the last recompute are re-allocated, each from its earliest changed date on;
+        `full` replays every item from the beginning. Threads go before fabric, whose
+        knitting layers they price; a thread's recompute flags the fabric it feeds.
+        """
+        await self.cost_repo.lock()
+        if full:
+            await self.cost_repo.mark_all()
+
+        item_count, consumers, rows, uncovered = 0, 0, 0, 0.0
+        for item_type in RECOMPUTE_ORDER:
+            activity = await self.cost_repo.claim_activity(item_type=item_type)
+            for inventory_id, since in sorted(activity.items()):
+                counts = await self.cost_repo.recompute(inventory_id=inventory_id, since=since)
+                consumers += counts[0]
+                rows += counts[1]
+                uncovered += counts[2]
+            item_count += len(activity)
+        if item_count:
+            analytics_cache.clear()
+        return CostRecomputeResponse(
+            message=f"Berhasil menghitung ulang biaya FIFO untuk {item_count} barang.",
+            data=CostRecomputeData(
+                full=full,
+                item_count=item_count,
+                consumer_count=consumers,
+                row_count=rows,
+                uncovered_kg=round(uncovered, 3),
+            ),
+        )
+
+    async def get_layers(
+        self,
+        page: int,
+        limit: int,
+        inventory_id: Optional[str] = None,
+        open_only: bool = False,
+    ) -> BulkCostLayerResponse:
+        items, total_count = await self.cost_repo.get_layers(
+            page=page, limit=limit, inventory_id=inventory_id, open_only=open_only
+        )
+        total_pages = (total_count + limit - 1) // limit if total_count > 0 else 0
+        return BulkCostLayerResponse(
+            items=items, item_count=total_count, page=page, limit=limit, total_pages=total_pages
+        )
@@ -2,6 +2,9 @@ from typing import Optional
 from datetime import date, datetime
 from fastapi import HTTPException, status
 
+from app.core.fieldsets import parse_fields, sparse_response
+from app.model.cost_layer import CostConsumer, CostSource
+from app.repository.cost_layer import CostLayerRepository
 from app.repository.dyeing_process import DyeingProcessRepository
 from app.repository.inventory import InventoryRepository
 from app.schema.dyeing_process.request import (
@@ -9,19 +12,24 @@ from app.schema.dyeing_process.request import (
     DyeingProcessUpdateRequest,
 )
 from app.schema.dyeing_process.response import (
+    DyeingProcessData,
     BulkDyeingProcessResponse,
     SingleDyeingProcessResponse,
 )
 from app.schema.base_response import BaseSingleResponse
+from app.core.tracing import trace_methods
 
+@trace_methods("service")
 class DyeingProcessService:
     def __init__(
         self,
         dyeing_repo: DyeingProcessRepository,
         inventory_repo: InventoryRepository,
+        cost_repo: CostLayerRepository,
     ):
         self.dyeing_repo = dyeing_repo
         self.inventory_repo = inventory_repo
+        self.cost_repo = cost_repo
 
     async def create(
         self, dp_create: DyeingProcessCreateRequest
@@ -30,7 +38,7 @@ class DyeingProcessService:
         Creates a new dyeing process, subtracting the initial dyeing weight from inventory.
         """
         product = await self.inventory_repo.get_by_id(
-            inventory_id=dp_create.product_id
+            inventory_id=dp_create.product_id, for_update=True
         )
         if not product:
             raise HTTPException(
@@ -50,6 +58,7 @@ class DyeingProcessService:
 
         create_data = dp_create.model_dump()
         create_data["start_date"] = datetime.now()
+        await self.cost_repo.mark_activity(changes=[(dp_create.product_id, create_data["start_date"])])
 
         new_process = await self.dyeing_repo.create(dp_create_data=create_data)
         return SingleDyeingProcessResponse(
@@ -80,7 +89,7 @@ class DyeingProcessService:
         # --- NEW LOGIC: If completing the process, add final weight to stock ---
         if dp_update.dyeing_status is True:
             product = await self.inventory_repo.get_by_id(
-                inventory_id=db_process.product_id
+                inventory_id=db_process.product_id, for_update=True
             )
             if not product:
                 raise HTTPException(
@@ -91,6 +100,8 @@ class DyeingProcessService:
             # The schema validator already ensures dyeing_final_weight is not None
             product.weight_kg = (product.weight_kg or 0) + dp_update.dyeing_final_weight
             product.roll_count = (product.roll_count or 0) + dp_update.dyeing_roll_count
+            # The dyed output opens a cost layer on the next recompute
+            await self.cost_repo.mark_activity(changes=[(db_process.product_id, db_process.start_date)])
         # ----------------------------------------------------------------------
 
         updated_process = await self.dyeing_repo.update(
@@ -112,7 +123,7 @@ class DyeingProcessService:
             )
 
         # --- NEW LOGIC: Rollback inventory changes ---
-        product = await self.inventory_repo.get_by_id(inventory_id=db_process.product_id)
+        product = await self.inventory_repo.get_by_id(inventory_id=db_process.product_id, for_update=True)
         if product:
             # If the process was completed, subtract the final weight that was added
             if db_process.dyeing_status and db_process.dyeing_final_weight is not None:
@@ -122,6 +133,9 @@ class DyeingProcessService:
             # Always add back the initial weight that was subtracted
             product.weight_kg += db_process.dyeing_weight
         # ---------------------------------------------
+        await self.cost_repo.release(consumer=CostConsumer.DYEING, consumer_id=dp_id)
+        await self.cost_repo.drop_layer(source=CostSource.DYEING, source_id=dp_id)
+        await self.cost_repo.mark_activity(changes=[(db_process.product_id, db_process.start_date)])
         
         await self.dyeing_repo.delete(db_dp=db_process)
         return BaseSingleResponse(
@@ -135,16 +149,19 @@ class DyeingProcessService:
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         dyeing_status: Optional[bool] = None,
+        fields: Optional[str] = None,
     ) -> BulkDyeingProcessResponse:
+        fieldset = parse_fields(fields, DyeingProcessData)
         items, total_count = await self.dyeing_repo.get_all(
             page=page,
             limit=limit,
             start_date=start_date,
             end_date=end_date,
             dyeing_status=dyeing_status,
+            fieldset=fieldset,
         )
         total_pages = (total_count + limit - 1) // limit if total_count > 0 else 0
-        return BulkDyeingProcessResponse(
+        return sparse_response(BulkDyeingProcessResponse, fieldset)(
             items=items,
             item_count=total_count,
             page=page,
@@ -152,11 +169,12 @@ class DyeingProcessService:
             total_pages=total_pages,
         )
 
-    async def get_by_id(self, dp_id: int) -> SingleDyeingProcessResponse:
-        process = await self.dyeing_repo.get_by_id(dp_id=dp_id)
+    async def get_by_id(self, dp_id: int, fields: Optional[str] = None) -> SingleDyeingProcessResponse:
+        fieldset = parse_fields(fields, DyeingProcessData)
+        process = await self.dyeing_repo.get_by_id(dp_id=dp_id, fieldset=fieldset)
         if not process:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Proses celup tidak ditemukan.",
             )
-        return SingleDyeingProcessResponse(data=process)
\ No newline at end of file
+        return sparse_response(SingleDyeingProcessResponse, fieldset)(data=process)
\ No newline at end of file
@@ -0,0 +1,107 @@
+import csv
+import io
+import json
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+from datetime import date, datetime, time, timedelta
+from fastapi import HTTPException, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.archive import ARCHIVED_TABLES, archive_root, stream_segment
+from app.repository.archive import MODELS, ArchiveRepository
+from app.schema.history_export.request import ExportDataset
+from app.core.tracing import trace_methods
+
+TABLES = {
+    ExportDataset.SALES: "sales_transaction",
+    ExportDataset.PURCHASES: "purchase_transaction",
+    ExportDataset.KNITTING: "knitting_process",
+    ExportDataset.DYEING: "dyeing_process",
+}
+
+
+def _csv(columns: Sequence[str], rows: List[Dict[str, Any]]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            json.dumps(value) if isinstance(value, (dict, list)) else value
+            for value in (row[name] for name in columns)
+        ])
+    return buffer.getvalue()
+
+
+@trace_methods("service")
+class HistoryExportService:
+    """
+    CSV export of the history tables over archived and live months alike.
+
+    The response is streamed after the endpoint returns, when its request session is
+    already closed, so the export opens its own session from `session_factory` and
+    keeps it for as long as the stream runs.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]):
+        self.session_factory = session_factory
+
+    async def export_csv(
+        self,
+        *,
+        dataset: ExportDataset,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Checks the request and the archive, then returns the CSV stream: the archived
+        months of the range read from their segment files, followed by the live rows.
+        """
+        if start_date and end_date and start_date > end_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Tanggal mulai tidak boleh setelah tanggal akhir.",
+            )
+        table = TABLES[dataset]
+        session = self.session_factory()
+        try:
+            repo = ArchiveRepository(session)
+            segments = await repo.get_segments(table=table, start_date=start_date, end_date=end_date)
+            root = archive_root()
+            missing = [segment.path for segment in segments if not (root / segment.path).is_file()]
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"Berkas arsip tidak ditemukan: {', '.join(missing)}",
+                )
+        except BaseException:
+            await session.close()
+            raise
+        return self._stream(session, repo, table, [root / segment.path for segment in segments], start_date, end_date)
+
+    async def _stream(
+        self,
+        session: AsyncSession,
+        repo: ArchiveRepository,
+        table: str,
+        paths: List[Path],
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> AsyncIterator[str]:
+        columns = [column.name for column in MODELS[table].__table__.columns]
+        date_column = ARCHIVED_TABLES[table]
+        start_at = datetime.combine(start_date, time.min) if start_date else None
+        end_before = datetime.combine(end_date + timedelta(days=1), time.min) if end_date else None
+        try:
+            yield _csv(columns, [dict(zip(columns, columns))])
+            for path in paths:
+                async for block in stream_segment(path):
+                    rows = [
+                        row for row in block
+                        if (start_at is None or row[date_column] >= start_at)
+                        and (end_before is None or row[date_column] < end_before)
+                    ]
+                    if rows:
+                        yield _csv(columns, rows)
+            async for block in repo.stream_live(table=table, start_date=start_date, end_date=end_date):
+                yield _csv(columns, block)
+        finally:
+            await session.close()
@@ -3,15 +3,22 @@
 from typing import Optional
 from fastapi import HTTPException, status
 
+from app.core.fieldsets import parse_fields, sparse_response
 from app.repository.inventory import InventoryRepository, BALE_TO_KG_RATIO
 from app.model.inventory import Inventory, InventoryType
 from app.schema.inventory.request import InventoryCreateRequest, InventoryUpdateRequest
 from app.schema.inventory.response import (
+    InventoryData,
+    InventoryValuationData,
+    InventoryValuationGroup,
+    InventoryValuationResponse,
     BulkInventoryResponse,
     SingleInventoryResponse,
 )
 from app.schema.base_response import BaseSingleResponse
+from app.core.tracing import trace_methods
 
+@trace_methods("service")
 class InventoryService:
     # ... (metode __init__, get_all, get_by_id tidak berubah) ...
     def __init__(self, inventory_repo: InventoryRepository):
@@ -24,13 +31,15 @@ class InventoryService:
         type: Optional[str],
         page: int,
         limit: int,
+        fields: Optional[str] = None,
     ) -> BulkInventoryResponse:
+        fieldset = parse_fields(fields, InventoryData)
         items, total_count = await self.inventory_repo.get_all(
-            name=name, id=id, type=type, page=page, limit=limit
+            name=name, id=id, type=type, page=page, limit=limit, fieldset=fieldset
         )
         total_pages = (total_count + limit - 1) // limit if total_count > 0 else 0
 
-        return BulkInventoryResponse(
+        return sparse_response(BulkInventoryResponse, fieldset)(
             items=items,
             item_count=total_count,
             page=page,
@@ -38,14 +47,29 @@ class InventoryService:
             total_pages=total_pages,
         )
 
-    async def get_by_id(self, inventory_id: str) -> SingleInventoryResponse:
-        inventory = await self.inventory_repo.get_by_id(inventory_id=inventory_id)
+    async def get_by_id(self, inventory_id: str, fields: Optional[str] = None) -> SingleInventoryResponse:
+        fieldset = parse_fields(fields, InventoryData)
+        inventory = await self.inventory_repo.get_by_id(inventory_id=inventory_id, fieldset=fieldset)
         if not inventory:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Barang (inventory) tidak ditemukan.",
             )
-        return SingleInventoryResponse(data=inventory)
+        return sparse_response(SingleInventoryResponse, fieldset)(data=inventory)
+
+    async def get_valuation(self, type: Optional[str] = None) -> InventoryValuationResponse:
+        """Values stock on hand at each item's moving average cost."""
+        groups = [
+            InventoryValuationGroup(**row)
+            for row in await self.inventory_repo.get_valuation(type=type)
+        ]
+        return InventoryValuationResponse(
+            data=InventoryValuationData(
+                total_weight_kg=sum(group.weight_kg for group in groups),
+                total_value=sum(group.value for group in groups),
+                by_type=groups,
+            )
+        )
 
     async def create(
         self, inventory_create: InventoryCreateRequest
@@ -2,6 +2,7 @@ import uuid
 from typing import Optional, Set, List
 from fastapi import HTTPException, status
 
+from app.core.fieldsets import parse_fields, sparse_response
 from app.repository.knit_formula import KnitFormulaRepository
 from app.repository.inventory import InventoryRepository
 from app.model.inventory import InventoryType
@@ -12,11 +13,14 @@ from app.schema.knit_formula.request import (
     FormulaItemBase,
 )
 from app.schema.knit_formula.response import (
+    KnitFormulaData,
     BulkKnitFormulaResponse,
     SingleKnitFormulaResponse,
 )
 from app.schema.base_response import BaseSingleResponse
+from app.core.tracing import trace_methods
 
+@trace_methods("service")
 class KnitFormulaService:
     """Service class for knit formula-related business logic."""
 
@@ -105,14 +109,17 @@ class KnitFormulaService:
             message="Berhasil membuat formula kain rajut.", data=created_formula
         )
 
-    async def get_all(self, page: int, limit: int) -> BulkKnitFormulaResponse:
+    async def get_all(
+        self, page: int, limit: int, fields: Optional[str] = None
+    ) -> BulkKnitFormulaResponse:
         """
         Retrieves a paginated list of knit formulas.
         """
-        items, total_count = await self.formula_repo.get_all(page=page, limit=limit)
+        fieldset = parse_fields(fields, KnitFormulaData)
+        items, total_count = await self.formula_repo.get_all(page=page, limit=limit, fieldset=fieldset)
         total_pages = (total_count + limit - 1) // limit if total_count > 0 else 0
         
-        return BulkKnitFormulaResponse(
+        return sparse_response(BulkKnitFormulaResponse, fieldset)(
             items=items,
             item_count=total_count,
             page=page,
@@ -120,17 +127,18 @@ class KnitFormulaService:
             total_pages=total_pages,
         )
 
-    async def get_by_id(self, kf_id: int) -> SingleKnitFormulaResponse:
+    async def get_by_id(self, kf_id: int, fields: Optional[str] = None) -> SingleKnitFormulaResponse:
         """
         Retrieves a single knit formula by its ID.
         """
-        formula = await self.formula_repo.get_by_id(kf_id=kf_id)
+        fieldset = parse_fields(fields, KnitFormulaData)
+        formula = await self.formula_repo.get_by_id(kf_id=kf_id, fieldset=fieldset)
         if not formula:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Formula kain rajut tidak ditemukan.",
             )
-        return SingleKnitFormulaResponse(data=formula)
+        return sparse_response(SingleKnitFormulaResponse, fieldset)(data=formula)
 
     async def update(
         self, kf_id: int, kf_update: KnitFormulaUpdateRequest
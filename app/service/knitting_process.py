@@ -4,25 +4,35 @@ from typing import Optional, List, Dict, Any
 from datetime import date, datetime
 from fastapi import HTTPException, status
 
+from app.core.fieldsets import parse_fields, sparse_response
 from app.model.inventory import InventoryType 
+from app.repository.cost_layer import CostLayerRepository
 from app.repository.inventory import InventoryRepository
 from app.repository.knitting_process import KnittingProcessRepository
 from app.repository.knit_formula import KnitFormulaRepository
-from app.repository.operator import OperatorRepository
-from app.repository.machine import MachineRepository
+from app.repository.reference import Reference, ReferenceRepository
+from app.repository.rollup import RollupRepository
+from app.model.cost_layer import CostConsumer, CostSource
 from app.model.knit_formula import KnitFormula
+from app.model.machine import Machine
+from app.model.operator import Operator
 from app.schema.knitting_process.request import (
     KnittingProcessCreateRequest,
     KnittingProcessUpdateRequest,
 )
 from app.schema.knitting_process.response import (
+    KnittingProcessData,
     BulkKnittingProcessResponse,
     SingleKnittingProcessResponse,
 )
 from app.schema.base_response import BaseSingleResponse
+from app.service.reference import require_references
+from app.core.cache import analytics_cache
+from app.core.tracing import trace_methods
 
 BALE_TO_KG_RATIO = 181.44
 
+@trace_methods("service")
 class KnittingProcessService:
     """Service class for knitting process-related business logic."""
 
@@ -30,15 +40,17 @@ class KnittingProcessService:
         self,
         process_repo: KnittingProcessRepository,
         formula_repo: KnitFormulaRepository,
-        operator_repo: OperatorRepository,
-        machine_repo: MachineRepository,
+        reference_repo: ReferenceRepository,
         inventory_repo: InventoryRepository,
+        rollup_repo: RollupRepository,
+        cost_repo: CostLayerRepository,
     ):
         self.process_repo = process_repo
         self.formula_repo = formula_repo
-        self.operator_repo = operator_repo
-        self.machine_repo = machine_repo
+        self.reference_repo = reference_repo
         self.inventory_repo = inventory_repo
+        self.rollup_repo = rollup_repo
+        self.cost_repo = cost_repo
 
     def _calculate_adjusted_materials(
         self, formula: KnitFormula, actual_weight_kg: float
@@ -67,14 +79,15 @@ class KnittingProcessService:
         Creates a new knitting process record as 'pending' WITHOUT reducing stock.
         Stock will be reduced only when the process is updated to 'completed'.
         """
-        # Validasi Foreign Key (tidak berubah)
+        # Validasi Foreign Key dalam satu query; formula diperiksa saat dimuat untuk perhitungan material
+        await require_references(
+            self.reference_repo,
+            Reference(Operator, kp_create.operator_id, "Operator tidak ditemukan."),
+            Reference(Machine, kp_create.machine_id, "Mesin tidak ditemukan."),
+        )
         formula = await self.formula_repo.get_by_id(kf_id=kp_create.knit_formula_id)
         if not formula:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Formula rajut tidak ditemukan.")
-        if not await self.operator_repo.get_by_id(operator_id=kp_create.operator_id):
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Operator tidak ditemukan.")
-        if not await self.machine_repo.get_by_id(machine_id=kp_create.machine_id):
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mesin tidak ditemukan.")
 
         # Hitung dan simpan material yang akan digunakan, TAPI JANGAN KURANGI STOK
         adjusted_materials = self._calculate_adjusted_materials(formula, kp_create.weight_kg)
@@ -109,6 +122,12 @@ class KnittingProcessService:
         
         if db_process.knit_status is True:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Proses yang sudah selesai tidak dapat diubah.")
+
+        await require_references(
+            self.reference_repo,
+            Reference(Operator, kp_update.operator_id, "Operator tidak ditemukan."),
+            Reference(Machine, kp_update.machine_id, "Mesin tidak ditemukan."),
+        )
         
         if kp_update.roll_count is not None:
             db_process.roll_count = kp_update.roll_count
@@ -118,7 +137,7 @@ class KnittingProcessService:
             
             # 1. KURANGI STOK MATERIAL (logika dari 'create' dipindah ke sini)
             material_ids = [m["inventory_id"] for m in db_process.materials]
-            inventory_items = await self.inventory_repo.get_by_ids(inventory_ids=material_ids)
+            inventory_items = await self.inventory_repo.get_by_ids(inventory_ids=material_ids, for_update=True)
             inventory_map = {item.id: item for item in inventory_items}
 
             for material in db_process.materials:
@@ -146,7 +165,7 @@ class KnittingProcessService:
             if not formula or not formula.product_id:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Produk akhir dari formula ini tidak ditemukan.")
             
-            product_inventory = await self.inventory_repo.get_by_id(inventory_id=formula.product_id)
+            product_inventory = await self.inventory_repo.get_by_id(inventory_id=formula.product_id, for_update=True)
             if not product_inventory:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Produk akhir di inventory tidak ditemukan, update dibatalkan.")
 
@@ -155,10 +174,21 @@ class KnittingProcessService:
             product_inventory.weight_kg = round(current_prod_weight + db_process.weight_kg, 3)
             product_inventory.roll_count = round(current_prod_rolls + db_process.roll_count, 3)
 
+            # 3. Catat ke rollup produksi harian dan tandai biaya FIFO material serta produk jadi
+            #    (di-commit bersama update di bawah); layer produk dibuka saat recompute
+            await self.rollup_repo.apply_production(
+                added=[{**db_process.model_dump(), **kp_update.model_dump(exclude_unset=True)}]
+            )
+            await self.cost_repo.mark_activity(
+                changes=[(material["inventory_id"], db_process.start_date) for material in db_process.materials]
+                + [(formula.product_id, db_process.start_date)]
+            )
+
         # Lakukan update pada record proses rajut itu sendiri
         updated_process = await self.process_repo.update(
             db_kp=db_process, kp_update=kp_update
         )
+        analytics_cache.clear()
         return SingleKnittingProcessResponse(
             message="Berhasil mengubah data proses rajut.", data=updated_process
         )
@@ -178,7 +208,7 @@ class KnittingProcessService:
         if db_process.knit_status is True:
             # 1. Kembalikan material yang dipakai
             material_ids = [m["inventory_id"] for m in db_process.materials]
-            inventory_items = await self.inventory_repo.get_by_ids(inventory_ids=material_ids)
+            inventory_items = await self.inventory_repo.get_by_ids(inventory_ids=material_ids, for_update=True)
             inventory_map = {item.id: item for item in inventory_items}
 
             for material in db_process.materials:
@@ -195,7 +225,7 @@ class KnittingProcessService:
             # 2. Kurangi stok produk jadi yang ditambahkan
             formula = await self.formula_repo.get_by_id(kf_id=db_process.knit_formula_id)
             if formula and formula.product_id:
-                product_inventory = await self.inventory_repo.get_by_id(inventory_id=formula.product_id)
+                product_inventory = await self.inventory_repo.get_by_id(inventory_id=formula.product_id, for_update=True)
                 if product_inventory:
                     # (Validasi rollback tidak berubah)
                     if (product_inventory.weight_kg or 0) < db_process.weight_kg:
@@ -207,9 +237,19 @@ class KnittingProcessService:
                     current_prod_rolls = product_inventory.roll_count or 0
                     product_inventory.weight_kg = round(current_prod_weight - db_process.weight_kg, 3)
                     product_inventory.roll_count = round(current_prod_rolls - db_process.roll_count, 3)
+
+            # 3. Keluarkan dari rollup produksi harian, lepaskan alokasi biaya FIFO material
+            #    dan hapus layer biaya produk jadi
+            await self.rollup_repo.apply_production(removed=[db_process.model_dump()])
+            await self.cost_repo.release(consumer=CostConsumer.KNITTING, consumer_id=kp_id)
+            await self.cost_repo.drop_layer(source=CostSource.KNITTING, source_id=kp_id)
+            await self.cost_repo.mark_activity(
+                changes=[(material["inventory_id"], db_process.start_date) for material in db_process.materials]
+            )
         
         # Hapus record proses rajut, baik yang pending maupun yang sudah selesai
         await self.process_repo.delete(db_kp=db_process)
+        analytics_cache.clear()
         return BaseSingleResponse(message=f"Data proses rajut berhasil dihapus.")
 
 
@@ -221,15 +261,18 @@ class KnittingProcessService:
         knit_formula_id: Optional[int] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
+        fields: Optional[str] = None,
     ) -> BulkKnittingProcessResponse:
+        fieldset = parse_fields(fields, KnittingProcessData)
         items, total_count = await self.process_repo.get_all(
-            page=page, limit=limit, knit_formula_id=knit_formula_id, start_date=start_date, end_date=end_date
+            page=page, limit=limit, knit_formula_id=knit_formula_id, start_date=start_date, end_date=end_date, fieldset=fieldset
         )
         total_pages = (total_count + limit - 1) // limit if total_count > 0 else 0
-        return BulkKnittingProcessResponse(items=items, item_count=total_count, page=page, limit=limit, total_pages=total_pages)
+        return sparse_response(BulkKnittingProcessResponse, fieldset)(items=items, item_count=total_count, page=page, limit=limit, total_pages=total_pages)
 
-    async def get_by_id(self, kp_id: int) -> SingleKnittingProcessResponse:
-        process = await self.process_repo.get_by_id(kp_id=kp_id)
+    async def get_by_id(self, kp_id: int, fields: Optional[str] = None) -> SingleKnittingProcessResponse:
+        fieldset = parse_fields(fields, KnittingProcessData)
+        process = await self.process_repo.get_by_id(kp_id=kp_id, fieldset=fieldset)
         if not process:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Data proses rajut tidak ditemukan.")
-        return SingleKnittingProcessResponse(data=process)
\ No newline at end of file
+        return sparse_response(SingleKnittingProcessResponse, fieldset)(data=process)
\ No newline at end of file
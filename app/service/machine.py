@@ -8,7 +8,9 @@ from app.schema.machine.response import (
     SingleMachineResponse,
 )
 from app.schema.base_response import BaseSingleResponse
+from app.core.tracing import trace_methods
 
+@trace_methods("service")
 class MachineService:
     """Service class for machine-related business logic."""
 
@@ -8,7 +8,9 @@ from app.schema.operator.response import (
     SingleOperatorResponse,
 )
 from app.schema.base_response import BaseSingleResponse
+from app.core.tracing import trace_methods
 
+@trace_methods("service")
 class OperatorService:
     """Service class for operator-related business logic."""
 
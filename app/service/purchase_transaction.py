@@ -2,23 +2,53 @@ from typing import Optional
 from datetime import date
 from fastapi import HTTPException, status
 
+from app.core.fieldsets import parse_fields, sparse_response
 from app.model.inventory import InventoryType
 from app.repository.purchase_transaction import PurchaseTransactionRepository
+from app.model.cost_layer import CostSource
+from app.repository.cost_layer import CostLayerRepository
 from app.repository.inventory import InventoryRepository
-from app.repository.supplier import SupplierRepository
+from app.repository.reference import Reference, ReferenceRepository
+from app.repository.rollup import RollupRepository
+from app.model.inventory import Inventory
+from app.model.supplier import Supplier
 from app.repository.knitting_process import KnittingProcessRepository
 from app.schema.purchase_transaction.request import (
     PurchaseTransactionCreateRequest,
     PurchaseTransactionUpdateRequest,
 )
 from app.schema.purchase_transaction.response import (
+    PurchaseTransactionData,
     BulkPurchaseTransactionResponse,
     SinglePurchaseTransactionResponse,
 )
 from app.schema.base_response import BaseSingleResponse
+from app.service.reference import require_references
+from app.core.cache import analytics_cache
+from app.core.tracing import trace_methods
 
 BALE_TO_KG_RATIO = 181.44
 
+
+def moving_average_cost(stock_kg: float, average_cost: float, weight_kg: float, price_per_kg: float) -> float:
+    """
+    Average cost per kg after a purchase of `weight_kg` at `price_per_kg` enters
+    `stock_kg` valued at `average_cost`; a negative `weight_kg` takes a purchase back
+    out (update, delete). Sales and production do not change the average. When a
+    reversal leaves no stock to value, the last average is kept.
+    """
+    if not weight_kg:
+        return average_cost
+    stock_kg = max(stock_kg or 0.0, 0.0)
+    remaining = stock_kg + weight_kg
+    if weight_kg > 0 and stock_kg == 0:
+        return round(price_per_kg or 0.0, 4)
+    if remaining <= 0:
+        return average_cost
+    value = stock_kg * (average_cost or 0.0) + weight_kg * (price_per_kg or 0.0)
+    return round(max(value / remaining, 0.0), 4)
+
+@trace_methods("service")
 class PurchaseTransactionService:
     """Service class for purchase transaction-related business logic."""
 
@@ -26,13 +56,17 @@ class PurchaseTransactionService:
         self,
         pt_repo: PurchaseTransactionRepository,
         inventory_repo: InventoryRepository,
-        supplier_repo: SupplierRepository,
+        reference_repo: ReferenceRepository,
         kp_repo: KnittingProcessRepository,
+        rollup_repo: RollupRepository,
+        cost_repo: CostLayerRepository,
     ):
         self.pt_repo = pt_repo
         self.inventory_repo = inventory_repo
-        self.supplier_repo = supplier_repo
+        self.reference_repo = reference_repo
         self.kp_repo = kp_repo
+        self.rollup_repo = rollup_repo
+        self.cost_repo = cost_repo
 
     async def get_all(
         self,
@@ -43,8 +77,10 @@ class PurchaseTransactionService:
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         inventory_type: Optional[InventoryType] = None,
+        fields: Optional[str] = None,
     ) -> BulkPurchaseTransactionResponse:
         """Retrieves a paginated list of purchase transactions."""
+        fieldset = parse_fields(fields, PurchaseTransactionData)
         items, total_count = await self.pt_repo.get_all(
             page=page,
             limit=limit,
@@ -53,10 +89,11 @@ class PurchaseTransactionService:
             start_date=start_date,
             end_date=end_date,
             inventory_type=inventory_type,
+            fieldset=fieldset,
         )
         total_pages = (total_count + limit - 1) // limit if total_count > 0 else 0
 
-        return BulkPurchaseTransactionResponse(
+        return sparse_response(BulkPurchaseTransactionResponse, fieldset)(
             items=items,
             item_count=total_count,
             page=page,
@@ -64,15 +101,16 @@ class PurchaseTransactionService:
             total_pages=total_pages,
         )
 
-    async def get_by_id(self, pt_id: int) -> SinglePurchaseTransactionResponse:
+    async def get_by_id(self, pt_id: int, fields: Optional[str] = None) -> SinglePurchaseTransactionResponse:
         """Retrieves a single purchase transaction by its ID."""
-        transaction = await self.pt_repo.get_by_id(pt_id=pt_id)
+        fieldset = parse_fields(fields, PurchaseTransactionData)
+        transaction = await self.pt_repo.get_by_id(pt_id=pt_id, fieldset=fieldset)
         if not transaction:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Transaksi pembelian tidak ditemukan.",
             )
-        return SinglePurchaseTransactionResponse(data=transaction)
+        return sparse_response(SinglePurchaseTransactionResponse, fieldset)(data=transaction)
 
     async def create(
         self, pt_create: PurchaseTransactionCreateRequest
@@ -81,16 +119,22 @@ class PurchaseTransactionService:
         Creates a purchase transaction, calculates and sets its bale_count,
         and updates the corresponding inventory stock.
         """
-        supplier = await self.supplier_repo.get_by_id(supplier_id=pt_create.supplier_id)
-        if not supplier:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Supplier tidak ditemukan.")
+        # Validate foreign keys in one round trip, before taking the stock row lock
+        await require_references(
+            self.reference_repo,
+            Reference(Supplier, pt_create.supplier_id, "Supplier tidak ditemukan."),
+            Reference(Inventory, pt_create.inventory_id, "Item inventory tidak ditemukan."),
+        )
 
-        inventory_item = await self.inventory_repo.get_by_id(inventory_id=pt_create.inventory_id)
+        inventory_item = await self.inventory_repo.get_by_id(inventory_id=pt_create.inventory_id, for_update=True)
         if not inventory_item:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item inventory tidak ditemukan.")
 
         # --- Logika Kalkulasi dan Persiapan Data ---
         pt_create_data = pt_create.model_dump()
+        inventory_item.average_cost = moving_average_cost(
+            inventory_item.weight_kg, inventory_item.average_cost, pt_create.weight_kg or 0, pt_create.price_per_kg
+        )
         
         if inventory_item.type == InventoryType.THREAD:
             bale_increase = round(pt_create.weight_kg / BALE_TO_KG_RATIO, 3)
@@ -110,8 +154,13 @@ class PurchaseTransactionService:
             inventory_item.weight_kg = round(current_weight + pt_create.weight_kg, 3)
             inventory_item.roll_count = round(current_rolls + pt_create.roll_count, 3)
         
+        # Rollup harian dan penanda biaya FIFO (layer dibuka saat hitung ulang), di-commit bersama transaksi
+        await self.rollup_repo.apply_purchases(added=[pt_create_data])
+        await self.cost_repo.mark_activity(changes=[(pt_create.inventory_id, pt_create.transaction_date)])
+
         # Kirim dictionary yang sudah lengkap ke repository
         new_transaction = await self.pt_repo.create(pt_create_data=pt_create_data)
+        analytics_cache.clear()
         created_transaction = await self.pt_repo.get_by_id(pt_id=new_transaction.id)
 
         return SinglePurchaseTransactionResponse(
@@ -131,9 +180,15 @@ class PurchaseTransactionService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Transaksi pembelian tidak ditemukan.",
             )
+
+        await require_references(
+            self.reference_repo,
+            Reference(Supplier, pt_update.supplier_id, "Supplier tidak ditemukan."),
+            Reference(Inventory, pt_update.inventory_id, "Item inventory tidak ditemukan."),
+        )
         
         # Business Logic: Adjust inventory stock based on the difference
-        inventory = await self.inventory_repo.get_by_id(inventory_id=db_transaction.inventory_id)
+        inventory = await self.inventory_repo.get_by_id(inventory_id=db_transaction.inventory_id, for_update=True)
         if not inventory:
              raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -145,14 +200,34 @@ class PurchaseTransactionService:
         weight_diff = (pt_update.weight_kg or db_transaction.weight_kg) - (db_transaction.weight_kg or 0)
         bale_diff = (pt_update.bale_count or db_transaction.bale_count) - (db_transaction.bale_count or 0)
 
+        # Take the old purchase out of the average cost, then put the new one in
+        new_weight = pt_update.weight_kg or db_transaction.weight_kg or 0
+        new_price = pt_update.price_per_kg if pt_update.price_per_kg is not None else db_transaction.price_per_kg
+        stock_without = (inventory.weight_kg or 0) - (db_transaction.weight_kg or 0)
+        average_without = moving_average_cost(
+            inventory.weight_kg, inventory.average_cost, -(db_transaction.weight_kg or 0), db_transaction.price_per_kg
+        )
+        inventory.average_cost = moving_average_cost(stock_without, average_without, new_weight, new_price)
+
         # Apply differences to stock
         inventory.roll_count = (inventory.roll_count or 0) + roll_diff
         inventory.weight_kg = (inventory.weight_kg or 0) + weight_diff
         inventory.bale_count = (inventory.bale_count or 0) + bale_diff
+
+        before = db_transaction.model_dump()
+        after = {**before, **pt_update.model_dump(exclude_unset=True)}
+        await self.rollup_repo.apply_purchases(removed=[before], added=[after])
+        # The layer is opened again from the updated purchase on the next recompute
+        await self.cost_repo.drop_layer(source=CostSource.PURCHASE, source_id=pt_id)
+        await self.cost_repo.mark_activity(changes=[
+            (before["inventory_id"], before["transaction_date"]),
+            (after["inventory_id"], after["transaction_date"]),
+        ])
         
         updated_transaction = await self.pt_repo.update(
             db_pt=db_transaction, pt_update=pt_update
         )
+        analytics_cache.clear()
         return SinglePurchaseTransactionResponse(
             message="Berhasil mengupdate transaksi pembelian.", data=updated_transaction
         )
@@ -170,7 +245,7 @@ class PurchaseTransactionService:
             )
         
         # Validasi alokasi pada proses rajut yang sedang berjalan (TETAP DI SINI)
-        inventory = await self.inventory_repo.get_by_id(inventory_id=db_transaction.inventory_id)
+        inventory = await self.inventory_repo.get_by_id(inventory_id=db_transaction.inventory_id, for_update=True)
         if inventory and inventory.type == InventoryType.THREAD:
             allocated_thread_ids = await self.kp_repo.get_all_pending_material_ids()
             if db_transaction.inventory_id in allocated_thread_ids:
@@ -188,6 +263,9 @@ class PurchaseTransactionService:
                     status_code=status.HTTP_409_CONFLICT,
                     detail=f"Hapus gagal: Stok '{inventory.name}' tidak mencukupi untuk dikembalikan."
                 )
+            inventory.average_cost = moving_average_cost(
+                inventory.weight_kg, inventory.average_cost, -weight_to_revert, db_transaction.price_per_kg
+            )
             inventory.weight_kg = round((inventory.weight_kg or 0) - weight_to_revert, 3)
 
             if inventory.type == InventoryType.THREAD:
@@ -208,7 +286,11 @@ class PurchaseTransactionService:
                         )
                 inventory.roll_count = round((inventory.roll_count or 0) - rolls_to_revert, 3)
 
+        await self.rollup_repo.apply_purchases(removed=[db_transaction.model_dump()])
+        await self.cost_repo.drop_layer(source=CostSource.PURCHASE, source_id=pt_id)
+        await self.cost_repo.mark_activity(changes=[(db_transaction.inventory_id, db_transaction.transaction_date)])
         await self.pt_repo.delete(db_pt=db_transaction)
+        analytics_cache.clear()
         return BaseSingleResponse(
             message=f"Berhasil menghapus transaksi pembelian dengan id {pt_id} dan mengembalikan stok."
         )
\ No newline at end of file
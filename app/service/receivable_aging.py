@@ -0,0 +1,80 @@
+import calendar
+from typing import Dict, List, Optional
+from datetime import date, datetime
+from fastapi import HTTPException, status
+
+from app.repository.receivable_aging import ReceivableAgingRepository
+from app.schema.account_receivable.request import PERIOD_FORMAT
+from app.schema.account_receivable.response import ReceivableAgingData, ReceivableAgingResponse
+from app.core.tracing import trace_methods
+
+
+def _as_of(period: str, today: date) -> date:
+    """A period is aged to its last day, or to today while it is still running."""
+    start = datetime.strptime(period, PERIOD_FORMAT).date()
+    end = start.replace(day=calendar.monthrange(start.year, start.month)[1])
+    return min(end, today)
+
+
+def _stale(activity: Dict[int, date], as_of: date) -> List[int]:
+    """Buyers with activity on or before `as_of`; later activity cannot change that date's aging."""
+    return sorted(buyer_id for buyer_id, since in activity.items() if since <= as_of)
+
+
+@trace_methods("service")
+class ReceivableAgingService:
+    """Computes the account receivable aging buckets from sales and buyer payments."""
+
+    def __init__(self, aging_repo: ReceivableAgingRepository):
+        self.aging_repo = aging_repo
+
+    async def run(self, period: Optional[str] = None, full: bool = False) -> ReceivableAgingResponse:
+        """
+        Ages receivables for `period` (default: the current month).
+
+        The period is recomputed for every buyer on its first run, when its aging date
+        moved (the current month, on a later day) or when `full` is set. Otherwise only
+        buyers with sales or payments written since the last run are recomputed, and
+        the same buyers are refreshed in every other period computed before.
+        """
+        today = date.today()
+        period = period or today.strftime(PERIOD_FORMAT)
+        as_of = _as_of(period, today)
+        if as_of < datetime.strptime(period, PERIOD_FORMAT).date():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Periode belum dimulai.",
+            )
+
+        await self.aging_repo.lock()
+        activity = await self.aging_repo.claim_activity()
+        runs = await self.aging_repo.get_runs()
+
+        full = full or runs.get(period) != as_of
+        buyer_ids = None if full else _stale(activity, as_of)
+        counts = (0, 0, 0)
+        if buyer_ids is None or buyer_ids:
+            counts = await self.aging_repo.compute(period=period, as_of=as_of, buyer_ids=buyer_ids)
+
+        # Claimed activity is consumed, so earlier periods are brought up to date now
+        refreshed = []
+        for other, other_as_of in sorted(runs.items()):
+            stale = _stale(activity, other_as_of) if other != period else []
+            if stale:
+                await self.aging_repo.compute(period=other, as_of=other_as_of, buyer_ids=stale)
+                refreshed.append(other)
+
+        await self.aging_repo.save_run(period=period, as_of=as_of)
+        updated, zeroed, inserted = counts
+        return ReceivableAgingResponse(
+            message=f"Berhasil menghitung umur piutang periode {period}.",
+            data=ReceivableAgingData(
+                period=period,
+                as_of=as_of,
+                full=full,
+                updated=updated,
+                zeroed=zeroed,
+                inserted=inserted,
+                refreshed_periods=refreshed,
+            ),
+        )
@@ -0,0 +1,16 @@
+from fastapi import HTTPException, status
+
+from app.repository.reference import Reference, ReferenceRepository
+
+
+async def require_references(reference_repo: ReferenceRepository, *references: Reference) -> None:
+    """
+    Raises 404 naming every missing reference. All references are checked in one round
+    trip, before the caller takes any row lock.
+    """
+    missing = await reference_repo.find_missing(references=references)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=" ".join(reference.not_found for reference in missing),
+        )
@@ -2,19 +2,31 @@ from typing import Optional
 from datetime import date
 from fastapi import HTTPException, status
 
+from app.core.fieldsets import parse_fields, sparse_response
 from app.repository.sales_transaction import SalesTransactionRepository
+from app.repository.cost_layer import CostLayerRepository
 from app.repository.inventory import InventoryRepository
-from app.repository.buyer import BuyerRepository
+from app.repository.receivable_aging import ReceivableAgingRepository
+from app.repository.reference import Reference, ReferenceRepository
+from app.repository.rollup import RollupRepository
+from app.model.buyer import Buyer
+from app.model.cost_layer import CostConsumer
+from app.model.inventory import Inventory
 from app.schema.sales_transaction.request import (
     SalesTransactionCreateRequest,
     SalesTransactionUpdateRequest,
 )
 from app.schema.sales_transaction.response import (
+    SalesTransactionData,
     BulkSalesTransactionResponse,
     SingleSalesTransactionResponse,
 )
 from app.schema.base_response import BaseSingleResponse
+from app.service.reference import require_references
+from app.core.cache import analytics_cache
+from app.core.tracing import trace_methods
 
+@trace_methods("service")
 class SalesTransactionService:
     """Service class for sales transaction-related business logic."""
 
@@ -22,11 +34,17 @@ class SalesTransactionService:
         self,
         st_repo: SalesTransactionRepository,
         inventory_repo: InventoryRepository,
-        buyer_repo: BuyerRepository,
+        reference_repo: ReferenceRepository,
+        rollup_repo: RollupRepository,
+        aging_repo: ReceivableAgingRepository,
+        cost_repo: CostLayerRepository,
     ):
         self.st_repo = st_repo
         self.inventory_repo = inventory_repo
-        self.buyer_repo = buyer_repo
+        self.reference_repo = reference_repo
+        self.rollup_repo = rollup_repo
+        self.aging_repo = aging_repo
+        self.cost_repo = cost_repo
 
     async def get_all(
         self,
@@ -36,8 +54,10 @@ class SalesTransactionService:
         inventory_id: Optional[str] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
+        fields: Optional[str] = None,
     ) -> BulkSalesTransactionResponse:
         """Retrieves a paginated list of sales transactions."""
+        fieldset = parse_fields(fields, SalesTransactionData)
         items, total_count = await self.st_repo.get_all(
             page=page,
             limit=limit,
@@ -45,10 +65,11 @@ class SalesTransactionService:
             inventory_id=inventory_id,
             start_date=start_date,
             end_date=end_date,
+            fieldset=fieldset,
         )
         total_pages = (total_count + limit - 1) // limit if total_count > 0 else 0
 
-        return BulkSalesTransactionResponse(
+        return sparse_response(BulkSalesTransactionResponse, fieldset)(
             items=items,
             item_count=total_count,
             page=page,
@@ -56,15 +77,16 @@ class SalesTransactionService:
             total_pages=total_pages,
         )
 
-    async def get_by_id(self, st_id: int) -> SingleSalesTransactionResponse:
+    async def get_by_id(self, st_id: int, fields: Optional[str] = None) -> SingleSalesTransactionResponse:
         """Retrieves a single sales transaction by its ID."""
-        transaction = await self.st_repo.get_by_id(st_id=st_id)
+        fieldset = parse_fields(fields, SalesTransactionData)
+        transaction = await self.st_repo.get_by_id(st_id=st_id, fieldset=fieldset)
         if not transaction:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Transaksi penjualan tidak ditemukan.",
             )
-        return SingleSalesTransactionResponse(data=transaction)
+        return sparse_response(SingleSalesTransactionResponse, fieldset)(data=transaction)
 
     async def create(
         self, st_create: SalesTransactionCreateRequest
@@ -72,15 +94,14 @@ class SalesTransactionService:
         """
         Creates a new sales transaction and decreases inventory stock.
         """
-        # Validate foreign keys
-        buyer = await self.buyer_repo.get_by_id(buyer_id=st_create.buyer_id)
-        if not buyer:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Pembeli tidak ditemukan.",
-            )
+        # Validate foreign keys in one round trip, before taking the stock row lock
+        await require_references(
+            self.reference_repo,
+            Reference(Buyer, st_create.buyer_id, "Pembeli tidak ditemukan."),
+            Reference(Inventory, st_create.inventory_id, "Barang (inventory) tidak ditemukan."),
+        )
 
-        inventory = await self.inventory_repo.get_by_id(inventory_id=st_create.inventory_id)
+        inventory = await self.inventory_repo.get_by_id(inventory_id=st_create.inventory_id, for_update=True)
         if not inventory:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -96,9 +117,16 @@ class SalesTransactionService:
         inventory.roll_count -= st_create.roll_count or 0
         inventory.weight_kg -= st_create.weight_kg or 0
 
+        # Daily rollup, receivable aging and FIFO costing flags, committed together with the transaction
+        await self.rollup_repo.apply_sales(added=[st_create.model_dump()])
+        await self.aging_repo.mark_activity(changes=[(st_create.buyer_id, st_create.transaction_date)])
+        await self.cost_repo.mark_activity(changes=[(st_create.inventory_id, st_create.transaction_date)])
         new_transaction = await self.st_repo.create(st_create=st_create)
+        analytics_cache.clear()
+        # The buyer was only checked for existence; load it with the transaction for the response
+        created_transaction = await self.st_repo.get_by_id(st_id=new_transaction.id)
         return SingleSalesTransactionResponse(
-            message="Berhasil mencatat transaksi penjualan.", data=new_transaction
+            message="Berhasil mencatat transaksi penjualan.", data=created_transaction
         )
 
     async def update(
@@ -114,7 +142,13 @@ class SalesTransactionService:
                 detail="Transaksi penjualan tidak ditemukan.",
             )
 
-        inventory = await self.inventory_repo.get_by_id(inventory_id=db_transaction.inventory_id)
+        await require_references(
+            self.reference_repo,
+            Reference(Buyer, st_update.buyer_id, "Pembeli tidak ditemukan."),
+            Reference(Inventory, st_update.inventory_id, "Barang (inventory) tidak ditemukan."),
+        )
+
+        inventory = await self.inventory_repo.get_by_id(inventory_id=db_transaction.inventory_id, for_update=True)
         if not inventory:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -133,10 +167,24 @@ class SalesTransactionService:
 
         inventory.roll_count -= roll_diff
         inventory.weight_kg -= weight_diff
+
+        before = db_transaction.model_dump()
+        after = {**before, **st_update.model_dump(exclude_unset=True)}
+        await self.rollup_repo.apply_sales(removed=[before], added=[after])
+        await self.aging_repo.mark_activity(changes=[
+            (before["buyer_id"], before["transaction_date"]),
+            (after["buyer_id"], after["transaction_date"]),
+        ])
+        await self.cost_repo.release(consumer=CostConsumer.SALE, consumer_id=st_id)
+        await self.cost_repo.mark_activity(changes=[
+            (before["inventory_id"], before["transaction_date"]),
+            (after["inventory_id"], after["transaction_date"]),
+        ])
         
         updated_transaction = await self.st_repo.update(
             db_st=db_transaction, st_update=st_update
         )
+        analytics_cache.clear()
         return SingleSalesTransactionResponse(
             message="Berhasil mengupdate transaksi penjualan.", data=updated_transaction
         )
@@ -153,12 +201,17 @@ class SalesTransactionService:
             )
 
         # Business Logic: Revert inventory stock changes (add stock back)
-        inventory = await self.inventory_repo.get_by_id(inventory_id=db_transaction.inventory_id)
+        inventory = await self.inventory_repo.get_by_id(inventory_id=db_transaction.inventory_id, for_update=True)
         if inventory:
             inventory.roll_count = (inventory.roll_count or 0) + (db_transaction.roll_count or 0)
             inventory.weight_kg = (inventory.weight_kg or 0) + (db_transaction.weight_kg or 0)
 
+        await self.rollup_repo.apply_sales(removed=[db_transaction.model_dump()])
+        await self.aging_repo.mark_activity(changes=[(db_transaction.buyer_id, db_transaction.transaction_date)])
+        await self.cost_repo.release(consumer=CostConsumer.SALE, consumer_id=st_id)
+        await self.cost_repo.mark_activity(changes=[(db_transaction.inventory_id, db_transaction.transaction_date)])
         await self.st_repo.delete(db_st=db_transaction)
+        analytics_cache.clear()
         return BaseSingleResponse(
             message=f"Berhasil menghapus transaksi penjualan dengan id {st_id}."
         )
\ No newline at end of file
@@ -8,7 +8,9 @@ from app.schema.supplier.response import (
     SingleSupplierResponse,
 )
 from app.schema.base_response import BaseSingleResponse
+from app.core.tracing import trace_methods
 
+@trace_methods("service")
 class SupplierService:
     """Service class for supplier-related business logic."""
 
@@ -0,0 +1,132 @@
+"""Shared helpers for the benchmark suites: timing statistics, plan inspection and result files."""
+
+import json
+import math
+import os
+import platform
+import subprocess
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+# Register every model so string relationships resolve outside the app (as alembic/env.py does).
+from app.model import (  # noqa: F401
+    account_receivable, buyer, buyer_payment, dyeing_process, inventory, knit_formula, knitting_process,
+    machine, operator, production_daily, purchase_daily, purchase_transaction, refresh_token,
+    sales_daily, sales_transaction, supplier, user,
+)
+
+SCAN_NODE_SUFFIX = "Scan"
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted sample."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def latency_summary(samples_s: Sequence[float]) -> Dict[str, float]:
+    """Latency percentiles in milliseconds for a list of durations in seconds."""
+    samples_ms = [s * 1000 for s in samples_s]
+    return {
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p90_ms": round(percentile(samples_ms, 90), 3),
+        "p95_ms": round(percentile(samples_ms, 95), 3),
+        "p99_ms": round(percentile(samples_ms, 99), 3),
+        "max_ms": round(max(samples_ms, default=0.0), 3),
+        "mean_ms": round(sum(samples_ms) / len(samples_ms), 3) if samples_ms else 0.0,
+    }
+
+
+@contextmanager
+def capture_statements(engine: Engine) -> Iterator[List[Tuple[str, Any]]]:
+    """Records the DBAPI statement and parameters of everything executed inside the block."""
+    captured: List[Tuple[str, Any]] = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def rows_scanned(plan_node: Dict[str, Any]) -> int:
+    """
+    Rows read by the scan nodes of an `EXPLAIN (ANALYZE, FORMAT JSON)` plan, counting
+    rows discarded by filters and multiplying by loop count (e.g. nested-loop inners).
+    """
+    total = 0
+    if plan_node.get("Node Type", "").endswith(SCAN_NODE_SUFFIX):
+        per_loop = (
+            plan_node.get("Actual Rows", 0)
+            + plan_node.get("Rows Removed by Filter", 0)
+            + plan_node.get("Rows Removed by Index Recheck", 0)
+        )
+        total += int(per_loop * plan_node.get("Actual Loops", 1))
+    for child in plan_node.get("Plans", []):
+        total += rows_scanned(child)
+    return total
+
+
+async def explain_rows_scanned(session: AsyncSession, statements: List[Tuple[str, Any]]) -> int:
+    """Re-runs captured SELECTs under EXPLAIN ANALYZE and sums their scanned rows."""
+    connection = await session.connection()
+    total = 0
+    for statement, parameters in statements:
+        if not statement.lstrip().upper().startswith("SELECT"):
+            continue
+        result = await connection.exec_driver_sql(
+            "EXPLAIN (ANALYZE, FORMAT JSON) " + statement, parameters
+        )
+        plan = result.scalar_one()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        total += rows_scanned(plan[0]["Plan"])
+    return total
+
+
+def run_metadata() -> Dict[str, Any]:
+    """Context stored alongside results so two runs can be judged comparable."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=False
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "host": platform.node(),
+        "database": f"{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}",
+        "db_pool_size": settings.DB_POOL_SIZE,
+    }
+
+
+def write_results(path: str, suite: str, results: List[Dict[str, Any]], **extra: Any) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    payload = {"suite": suite, "meta": {**run_metadata(), **extra}, "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, default=str)
+    print(f"Results written to {path}")
+
+
+def print_table(rows: List[Dict[str, Any]], columns: List[str]) -> None:
+    widths = {col: max(len(col), *(len(str(row.get(col, ""))) for row in rows)) for col in columns}
+    print("  ".join(col.ljust(widths[col]) for col in columns))
+    for row in rows:
+        print("  ".join(str(row.get(col, "")).ljust(widths[col]) for col in columns))
@@ -0,0 +1,72 @@
+"""
+Compares two benchmark result files case by case.
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/before.json benchmarks/results/after.json
+"""
+
+import argparse
+import json
+from typing import Any, Dict, Tuple
+
+from benchmarks.common import print_table
+
+# Metrics compared when present in both files; lower is better for all of them.
+METRICS = ["p50_ms", "p95_ms", "p99_ms", "queries", "rows_scanned", "error_rate", "cpu_us_per_query"]
+
+
+def _key(result: Dict[str, Any]) -> Tuple[str, str]:
+    return str(result.get("scale", "")), str(result.get("case") or result.get("route") or "")
+
+
+def _load(path: str) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        payload = json.load(f)
+    return {_key(result): result for result in payload["results"]}
+
+
+def _delta(before: Any, after: Any) -> str:
+    if not isinstance(before, (int, float)) or not isinstance(after, (int, float)):
+        return ""
+    if before == 0:
+        return "same" if after == 0 else f"+{after}"
+    change = (after - before) / before * 100
+    return f"{change:+.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Flag p95 regressions larger than this percentage.")
+    args = parser.parse_args()
+
+    before, after = _load(args.before), _load(args.after)
+    rows = []
+    regressions = []
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key], after[key]
+        row = {"scale": key[0], "case": key[1]}
+        for metric in METRICS:
+            if metric in old and metric in new:
+                row[metric] = f"{old[metric]} -> {new[metric]} ({_delta(old[metric], new[metric])})"
+        rows.append(row)
+        if "p95_ms" in old and old["p95_ms"] and (new["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 > args.threshold:
+            regressions.append(key)
+
+    columns = ["scale", "case"] + [m for m in METRICS if any(m in row for row in rows)]
+    print_table(rows, columns)
+
+    for key in sorted(before.keys() - after.keys()):
+        print(f"only in {args.before}: {key[1]} (scale {key[0]})")
+    for key in sorted(after.keys() - before.keys()):
+        print(f"only in {args.after}: {key[1]} (scale {key[0]})")
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed p95 by more than {args.threshold:.0f}%:")
+        for scale, case in regressions:
+            print(f"  {case} (scale {scale})")
+
+
+if __name__ == "__main__":
+    main()
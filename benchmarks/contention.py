@@ -0,0 +1,468 @@
+"""
+Hot-SKU contention stress test.
+
+N concurrent clients hammer a small set of hot inventory rows through the real
+services: `SalesTransactionService.create`, `KnittingProcessService.update`
+(completing a pending run, which consumes thread and produces fabric) and
+`DyeingProcessService.create`. Every operation runs in its own session and
+transaction, like one API request.
+
+Each INVENTORY_LOCK_STRATEGY given with --strategies is run in turn from the same
+starting stock, and for each one the suite reports throughput, latency, time spent
+acquiring row locks, backends waiting on locks, deadlocks, retries, and whether the
+final stock equals the starting stock plus the effect of every committed operation
+(a mismatch means lost updates).
+
+Usage:
+    python -m benchmarks.contention --clients 32 --hot-items 3 --duration 30 \\
+        --strategies none,for_update,nowait
+
+The run writes sales, knitting and dyeing rows and resets the stock of the hot
+items, so point it at a seeded scratch database.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, get_args
+
+from fastapi import HTTPException
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import InventoryLockStrategy, settings
+from app.core.database import async_session, engine
+from app.middleware.error_handler import RETRYABLE_SQLSTATES
+from app.repository.cost_layer import CostLayerRepository
+from app.repository.dyeing_process import DyeingProcessRepository
+from app.repository.inventory import InventoryRepository
+from app.repository.knit_formula import KnitFormulaRepository
+from app.repository.knitting_process import KnittingProcessRepository
+from app.repository.reference import ReferenceRepository
+from app.repository.receivable_aging import ReceivableAgingRepository
+from app.repository.rollup import RollupRepository
+from app.repository.sales_transaction import SalesTransactionRepository
+from app.schema.dyeing_process.request import DyeingProcessCreateRequest
+from app.schema.knitting_process.request import KnittingProcessCreateRequest, KnittingProcessUpdateRequest
+from app.schema.sales_transaction.request import SalesTransactionCreateRequest
+from app.service.dyeing_process import DyeingProcessService
+from app.service.knitting_process import BALE_TO_KG_RATIO, KnittingProcessService
+from app.service.sales_transaction import SalesTransactionService
+from benchmarks.common import latency_summary, print_table, write_results
+
+STOCK_FIELDS = ("weight_kg", "roll_count", "bale_count")
+
+
+class RetriesExhausted(Exception):
+    pass
+
+
+@dataclass
+class Setup:
+    fabric_ids: List[str]
+    thread_ids: List[str]
+    formula_ids: Dict[str, int]  # hot fabric id -> knit formula id
+    buyer_id: int
+    operator_id: int
+    machine_id: int
+
+
+@dataclass
+class RunStats:
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    succeeded: Counter = field(default_factory=Counter)
+    rejected: Counter = field(default_factory=Counter)
+    failed: Counter = field(default_factory=Counter)
+    retries: int = 0
+    sqlstates: Counter = field(default_factory=Counter)
+    lock_waits: List[float] = field(default_factory=list)
+    waiting_backends: List[int] = field(default_factory=list)
+    # Expected stock change per item from committed operations.
+    ledger: Dict[str, Dict[str, float]] = field(
+        default_factory=lambda: defaultdict(lambda: dict.fromkeys(STOCK_FIELDS, 0.0))
+    )
+
+
+# --- Setup ---
+
+async def prepare(hot_items: int) -> Setup:
+    async with async_session() as session:
+        rows = (await session.execute(text(
+            "SELECT kf.product_id, kf.id, kf.formula FROM knit_formula kf "
+            "JOIN inventory i ON i.id = kf.product_id "
+            "ORDER BY kf.product_id LIMIT :n"
+        ), {"n": hot_items})).all()
+        if not rows:
+            raise SystemExit("No knit formulas found; seed the database first (python -m scripts.seed_dataset).")
+        ids = (await session.execute(text(
+            "SELECT (SELECT min(id) FROM buyer), (SELECT min(id) FROM operator), (SELECT min(id) FROM machine)"
+        ))).one()
+
+        material_ids = sorted({material["inventory_id"] for _, _, formula in rows for material in formula})
+        threads = (await session.execute(text(
+            "SELECT id FROM inventory WHERE id = ANY(:ids) AND type = 'THREAD' ORDER BY id"
+        ), {"ids": material_ids})).scalars().all()
+
+    fabrics = [product_id for product_id, _, _ in rows]
+    return Setup(
+        fabric_ids=fabrics + [m for m in material_ids if m not in threads and m not in fabrics],
+        thread_ids=list(threads),
+        formula_ids={product_id: formula_id for product_id, formula_id, _ in rows},
+        buyer_id=ids[0],
+        operator_id=ids[1],
+        machine_id=ids[2],
+    )
+
+
+async def reset_stock(setup: Setup, stock_kg: float) -> None:
+    """Gives every hot item the same large stock so business rejections stay rare."""
+    async with async_session() as session:
+        await session.execute(text(
+            "UPDATE inventory SET weight_kg = :kg, roll_count = :rolls, bale_count = 0 WHERE id = ANY(:ids)"
+        ), {"kg": stock_kg, "rolls": stock_kg / 25, "ids": setup.fabric_ids})
+        await session.execute(text(
+            "UPDATE inventory SET weight_kg = :kg, bale_count = :bales, roll_count = 0 WHERE id = ANY(:ids)"
+        ), {"kg": stock_kg, "bales": round(stock_kg / BALE_TO_KG_RATIO, 3), "ids": setup.thread_ids})
+        await session.commit()
+
+
+async def read_stock(item_ids: List[str]) -> Dict[str, Dict[str, float]]:
+    async with async_session() as session:
+        rows = (await session.execute(text(
+            "SELECT id, weight_kg, roll_count, bale_count FROM inventory WHERE id = ANY(:ids)"
+        ), {"ids": item_ids})).all()
+    return {row[0]: dict(zip(STOCK_FIELDS, (row[1] or 0.0, row[2] or 0.0, row[3] or 0.0))) for row in rows}
+
+
+# --- Operations ---
+
+async def in_transaction(stats: RunStats, max_retries: int, work: Callable[[Any], Awaitable[Any]]) -> Any:
+    """
+    Runs `work(session)` in a fresh session and commits, like the get_db dependency.
+    Lock timeouts, deadlocks and serialization failures are retried with backoff.
+    """
+    attempt = 0
+    while True:
+        try:
+            async with async_session() as session:
+                try:
+                    result = await work(session)
+                    await session.commit()
+                    return result
+                except BaseException:
+                    await session.rollback()
+                    raise
+        except DBAPIError as exc:
+            sqlstate = getattr(exc.orig, "sqlstate", None)
+            if sqlstate not in RETRYABLE_SQLSTATES:
+                raise
+            stats.sqlstates[sqlstate] += 1
+            if attempt >= max_retries:
+                raise RetriesExhausted(sqlstate) from exc
+            attempt += 1
+            stats.retries += 1
+            await asyncio.sleep(random.uniform(0, 0.005 * 2 ** attempt))
+
+
+def _book(stats: RunStats, item_id: str, **deltas: float) -> None:
+    for key, value in deltas.items():
+        stats.ledger[item_id][key] += value
+
+
+async def op_sales(rng: random.Random, setup: Setup, stats: RunStats, max_retries: int) -> None:
+    rolls = float(rng.randint(1, 3))
+    request = SalesTransactionCreateRequest(
+        buyer_id=setup.buyer_id,
+        inventory_id=rng.choice(list(setup.formula_ids)),
+        transaction_date=date.today(),
+        roll_count=rolls,
+        weight_kg=rolls * 25,
+        price_per_kg=85_000,
+    )
+
+    async def work(session):
+        service = SalesTransactionService(
+            st_repo=SalesTransactionRepository(session),
+            inventory_repo=InventoryRepository(session),
+            reference_repo=ReferenceRepository(session),
+            rollup_repo=RollupRepository(session),
+            aging_repo=ReceivableAgingRepository(session),
+            cost_repo=CostLayerRepository(session),
+        )
+        await service.create(st_create=request)
+
+    await in_transaction(stats, max_retries, work)
+    _book(stats, request.inventory_id, weight_kg=-request.weight_kg, roll_count=-request.roll_count)
+
+
+def _knitting_service(session) -> KnittingProcessService:
+    return KnittingProcessService(
+        process_repo=KnittingProcessRepository(session),
+        formula_repo=KnitFormulaRepository(session),
+        reference_repo=ReferenceRepository(session),
+        inventory_repo=InventoryRepository(session),
+        rollup_repo=RollupRepository(session),
+        cost_repo=CostLayerRepository(session),
+    )
+
+
+async def op_knitting_complete(rng: random.Random, setup: Setup, stats: RunStats, max_retries: int) -> None:
+    product_id = rng.choice(list(setup.formula_ids))
+    create = KnittingProcessCreateRequest(
+        knit_formula_id=setup.formula_ids[product_id],
+        operator_id=setup.operator_id,
+        machine_id=setup.machine_id,
+        weight_kg=float(rng.randint(5, 25)),
+    )
+    # Creating the pending run touches no stock; only the completion is contended.
+    created = await in_transaction(stats, max_retries, lambda s: _knitting_service(s).create(kp_create=create))
+    process = created.data
+    update = KnittingProcessUpdateRequest(knit_status=True, end_date=datetime.now(), roll_count=1)
+
+    await in_transaction(stats, max_retries, lambda s: _knitting_service(s).update(kp_id=process.id, kp_update=update))
+    for material in process.materials:
+        if material["inventory_id"] in setup.thread_ids:
+            _book(stats, material["inventory_id"], weight_kg=-material["amount_kg"],
+                  bale_count=-round(material["amount_kg"] / BALE_TO_KG_RATIO, 3))
+        else:
+            _book(stats, material["inventory_id"], weight_kg=-material["amount_kg"])
+    _book(stats, product_id, weight_kg=process.weight_kg, roll_count=update.roll_count)
+
+
+async def op_dyeing(rng: random.Random, setup: Setup, stats: RunStats, max_retries: int) -> None:
+    request = DyeingProcessCreateRequest(
+        product_id=rng.choice(list(setup.formula_ids)),
+        dyeing_weight=float(rng.randint(20, 100)),
+        dyeing_roll_count=float(rng.randint(1, 4)),
+    )
+
+    async def work(session):
+        service = DyeingProcessService(
+            dyeing_repo=DyeingProcessRepository(session),
+            inventory_repo=InventoryRepository(session),
+            cost_repo=CostLayerRepository(session),
+        )
+        await service.create(dp_create=request)
+
+    await in_transaction(stats, max_retries, work)
+    _book(stats, request.product_id, weight_kg=-request.dyeing_weight, roll_count=-request.dyeing_roll_count)
+
+
+OPERATIONS = {
+    "sales": op_sales,
+    "knitting_complete": op_knitting_complete,
+    "dyeing": op_dyeing,
+}
+
+
+# --- Instrumentation ---
+
+def watch_lock_waits(stats: RunStats) -> Callable[[], None]:
+    """Times every SELECT ... FOR UPDATE, i.e. how long clients waited to acquire row locks."""
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and "FOR UPDATE" in statement:
+            context._lock_wait_start = time.perf_counter()
+
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_lock_wait_start", None)
+        if start is not None:
+            stats.lock_waits.append(time.perf_counter() - start)
+
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before)
+    event.listen(sync_engine, "after_cursor_execute", _after)
+
+    def remove() -> None:
+        event.remove(sync_engine, "before_cursor_execute", _before)
+        event.remove(sync_engine, "after_cursor_execute", _after)
+    return remove
+
+
+async def sample_lock_waiters(stats: RunStats, stop: asyncio.Event, interval: float = 0.05) -> None:
+    """Samples how many backends of this database are blocked on a heavyweight lock."""
+    async with engine.connect() as conn:
+        while not stop.is_set():
+            waiting = (await conn.execute(text(
+                "SELECT count(*) FROM pg_stat_activity "
+                "WHERE datname = current_database() AND wait_event_type = 'Lock'"
+            ))).scalar_one()
+            stats.waiting_backends.append(waiting)
+            await conn.commit()
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def database_deadlocks() -> int:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT pg_stat_clear_snapshot()"))
+        return (await conn.execute(text(
+            "SELECT deadlocks FROM pg_stat_database WHERE datname = current_database()"
+        ))).scalar_one()
+
+
+# --- Runner ---
+
+async def client(
+    client_id: int, deadline: float, setup: Setup, stats: RunStats,
+    names: List[str], weights: List[float], args: argparse.Namespace,
+) -> None:
+    rng = random.Random(f"{args.seed}:{client_id}")
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights=weights)[0]
+        start = time.perf_counter()
+        try:
+            await OPERATIONS[name](rng, setup, stats, args.max_retries)
+            stats.succeeded[name] += 1
+            stats.latencies[name].append(time.perf_counter() - start)
+        except HTTPException:
+            stats.rejected[name] += 1
+        except (RetriesExhausted, DBAPIError):
+            stats.failed[name] += 1
+
+
+def consistency_report(
+    before: Dict[str, Dict[str, float]], after: Dict[str, Dict[str, float]], stats: RunStats,
+) -> Tuple[bool, List[Dict[str, Any]]]:
+    # Services round stock to 3 decimals per update, so allow that much drift per operation.
+    operations = sum(stats.succeeded.values())
+    tolerance = 0.0005 * operations + 1e-6
+    items = []
+    consistent = True
+    for item_id in sorted(before):
+        for key in STOCK_FIELDS:
+            expected = before[item_id][key] + stats.ledger[item_id][key]
+            actual = after[item_id][key]
+            drift = actual - expected
+            if abs(drift) > tolerance:
+                consistent = False
+                items.append({
+                    "item": item_id, "field": key,
+                    "expected": round(expected, 3), "actual": round(actual, 3), "drift": round(drift, 3),
+                })
+    return consistent, items
+
+
+async def run_strategy(strategy: str, setup: Setup, args: argparse.Namespace) -> Dict[str, Any]:
+    settings.INVENTORY_LOCK_STRATEGY = strategy
+    await reset_stock(setup, args.initial_stock_kg)
+    item_ids = setup.fabric_ids + setup.thread_ids
+    before = await read_stock(item_ids)
+    deadlocks_before = await database_deadlocks()
+
+    names = list(OPERATIONS)
+    weights = [args.sales_weight, args.knitting_weight, args.dyeing_weight]
+    stats = RunStats()
+    remove_listeners = watch_lock_waits(stats)
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_lock_waiters(stats, stop))
+
+    started = time.perf_counter()
+    deadline = started + args.duration
+    try:
+        await asyncio.gather(*(
+            client(i, deadline, setup, stats, names, weights, args) for i in range(args.clients)
+        ))
+    finally:
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await sampler
+        remove_listeners()
+
+    # pg_stat_database is flushed asynchronously; give it a moment before reading.
+    await asyncio.sleep(1.0)
+    deadlocks = await database_deadlocks() - deadlocks_before
+    after = await read_stock(item_ids)
+    consistent, drifted = consistency_report(before, after, stats)
+
+    all_latencies = [sample for samples in stats.latencies.values() for sample in samples]
+    total_ok = sum(stats.succeeded.values())
+    waits = stats.waiting_backends
+    return {
+        "case": strategy,
+        "clients": args.clients,
+        "hot_items": len(setup.formula_ids),
+        "ops_per_s": round(total_ok / elapsed, 2),
+        "succeeded": dict(stats.succeeded),
+        "rejected": dict(stats.rejected),
+        "failed": dict(stats.failed),
+        **latency_summary(all_latencies),
+        "latency_by_operation": {name: latency_summary(samples) for name, samples in stats.latencies.items()},
+        "lock_wait": latency_summary(stats.lock_waits),
+        "lock_wait_total_s": round(sum(stats.lock_waits), 3),
+        "waiting_backends_max": max(waits, default=0),
+        "waiting_backends_mean": round(sum(waits) / len(waits), 2) if waits else 0.0,
+        "retries": stats.retries,
+        "retry_causes": dict(stats.sqlstates),
+        "deadlocks": deadlocks,
+        "consistent": consistent,
+        "drift": drifted,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    strategies = [strategy.strip() for strategy in args.strategies.split(",")]
+    for strategy in strategies:
+        if strategy not in get_args(InventoryLockStrategy):
+            raise SystemExit(
+                f"Unknown strategy '{strategy}'. Choose from: {', '.join(get_args(InventoryLockStrategy))}"
+            )
+
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    if args.clients + 1 > capacity:
+        print(f"Warning: {args.clients} clients exceed the pool capacity of {capacity}; "
+              "pool waits will be mixed into the results. Raise DB_POOL_SIZE/DB_MAX_OVERFLOW.")
+
+    setup = await prepare(args.hot_items)
+    print(f"Hot fabrics {list(setup.formula_ids)}, hot threads {setup.thread_ids}")
+
+    results = []
+    for strategy in strategies:
+        print(f"\nStrategy {strategy}: {args.clients} clients for {args.duration}s...")
+        result = await run_strategy(strategy, setup, args)
+        results.append(result)
+        for row in result["drift"][:10]:
+            print(f"  drift {row['item']}.{row['field']}: expected {row['expected']}, "
+                  f"actual {row['actual']} ({row['drift']:+})")
+
+    await engine.dispose()
+    print()
+    rows = [{
+        **r,
+        "ok": sum(r["succeeded"].values()),
+        "rejected_n": sum(r["rejected"].values()),
+        "failed_n": sum(r["failed"].values()),
+        "lock_p95_ms": r["lock_wait"]["p95_ms"],
+    } for r in results]
+    print_table(rows, [
+        "case", "ops_per_s", "ok", "rejected_n", "failed_n", "p50_ms", "p99_ms",
+        "lock_p95_ms", "waiting_backends_max", "retries", "deadlocks", "consistent",
+    ])
+    write_results(args.output, "contention", results, seed=args.seed, duration=args.duration)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Stress concurrent stock updates on a few hot items.")
+    parser.add_argument("--strategies", default="none,for_update,nowait",
+                        help="Comma-separated INVENTORY_LOCK_STRATEGY values to compare.")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--hot-items", type=int, default=3, help="Number of hot fabric items.")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per strategy.")
+    parser.add_argument("--sales-weight", type=float, default=5)
+    parser.add_argument("--knitting-weight", type=float, default=3)
+    parser.add_argument("--dyeing-weight", type=float, default=2)
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--initial-stock-kg", type=float, default=1_000_000.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="benchmarks/results/contention.json")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
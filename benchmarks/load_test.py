@@ -0,0 +1,433 @@
+"""
+End-to-end HTTP load test against the real application.
+
+Starts `main:create_application` under uvicorn with the requested worker count and
+pool size (or targets an already running server with --url), logs in through
+`/v1/auth/login`, then replays a weighted traffic mix at a fixed arrival rate:
+
+    list               paginated list endpoints, sometimes filtered
+    detail             GET by id
+    sales_create       POST /v1/sales-transaction (decrements stock)
+    knitting_complete  POST /v1/knitting-process, then PUT knit_status=true
+
+Arrivals are open-loop: requests are scheduled at the target rate whether or not
+earlier ones have finished, and latency is measured from the scheduled time, so a
+saturated server shows up as queueing instead of silently lowering the load.
+
+Usage:
+    python -m benchmarks.load_test --rps 50 --duration 60 --workers 2 --pool-size 10
+    python -m benchmarks.load_test --url http://localhost:8000 --rps 100 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from benchmarks.common import latency_summary, print_table, write_results
+
+DEFAULT_MIX = "list=55,detail=30,sales_create=10,knitting_complete=5"
+
+LIST_ROUTES = [
+    "/v1/sales-transaction",
+    "/v1/purchase-transaction",
+    "/v1/knitting-process",
+    "/v1/dyeing-process",
+    "/v1/inventory",
+    "/v1/buyer",
+    "/v1/account-receivable",
+]
+
+
+@dataclass
+class Fixtures:
+    """Ids discovered from the API after login, used to build realistic requests."""
+
+    buyer_ids: List[int] = field(default_factory=list)
+    fabric_ids: List[str] = field(default_factory=list)
+    inventory_ids: List[str] = field(default_factory=list)
+    sales_ids: List[int] = field(default_factory=list)
+    knitting_ids: List[int] = field(default_factory=list)
+    formula_ids: List[int] = field(default_factory=list)
+    machine_ids: List[int] = field(default_factory=list)
+    operator_ids: List[int] = field(default_factory=list)
+
+
+@dataclass
+class Sample:
+    route: str
+    status: int
+    latency: float
+    service_time: float
+
+
+@dataclass
+class RunStats:
+    samples: List[Sample] = field(default_factory=list)
+    dropped: int = 0
+    scheduled: int = 0
+    completed: int = 0
+
+
+# --- Traffic Mix ---
+
+Request = Tuple[str, str, str, Optional[dict], Optional[dict]]  # label, method, url, params, json
+Operation = Callable[[random.Random, Fixtures], List[Request]]
+
+
+def op_list(rng: random.Random, fx: Fixtures) -> List[Request]:
+    url = rng.choice(LIST_ROUTES)
+    params: Dict[str, Any] = {"page": rng.choice([1, 1, 1, 2, 3, 10]), "limit": rng.choice([10, 10, 25, 50])}
+    if url == "/v1/sales-transaction" and fx.buyer_ids and rng.random() < 0.3:
+        params["buyer_id"] = rng.choice(fx.buyer_ids)
+    return [(f"GET {url}", "GET", url, params, None)]
+
+
+def op_detail(rng: random.Random, fx: Fixtures) -> List[Request]:
+    choices = []
+    if fx.sales_ids:
+        sales_id = rng.choice(fx.sales_ids)
+        choices.append(("GET /v1/sales-transaction/{st_id}", "GET", f"/v1/sales-transaction/{sales_id}", None, None))
+    if fx.buyer_ids:
+        buyer_id = rng.choice(fx.buyer_ids)
+        choices.append(("GET /v1/buyer/{buyer_id}", "GET", f"/v1/buyer/{buyer_id}", None, None))
+    if fx.inventory_ids:
+        item_id = rng.choice(fx.inventory_ids)
+        choices.append(("GET /v1/inventory/{inventory_id}", "GET", f"/v1/inventory/{item_id}", None, None))
+    if fx.knitting_ids:
+        kp_id = rng.choice(fx.knitting_ids)
+        choices.append(("GET /v1/knitting-process/{kp_id}", "GET", f"/v1/knitting-process/{kp_id}", None, None))
+    return [rng.choice(choices)] if choices else op_list(rng, fx)
+
+
+def op_sales_create(rng: random.Random, fx: Fixtures) -> List[Request]:
+    if not fx.buyer_ids or not fx.fabric_ids:
+        return op_list(rng, fx)
+    roll_count = float(rng.randint(1, 3))
+    body = {
+        "buyer_id": rng.choice(fx.buyer_ids),
+        "inventory_id": rng.choice(fx.fabric_ids),
+        "transaction_date": date.today().isoformat(),
+        "roll_count": roll_count,
+        "weight_kg": round(roll_count * 25, 3),
+        "price_per_kg": 85_000,
+    }
+    return [("POST /v1/sales-transaction", "POST", "/v1/sales-transaction", None, body)]
+
+
+def op_knitting_complete(rng: random.Random, fx: Fixtures) -> List[Request]:
+    if not fx.formula_ids or not fx.machine_ids or not fx.operator_ids:
+        return op_list(rng, fx)
+    body = {
+        "knit_formula_id": rng.choice(fx.formula_ids),
+        "operator_id": rng.choice(fx.operator_ids),
+        "machine_id": rng.choice(fx.machine_ids),
+        "weight_kg": float(rng.randint(5, 25)),
+    }
+    # The PUT url is filled in from the POST response by `run_operation`.
+    return [
+        ("POST /v1/knitting-process", "POST", "/v1/knitting-process", None, body),
+        ("PUT /v1/knitting-process/{kp_id}", "PUT", "/v1/knitting-process/{kp_id}", None, {
+            "knit_status": True,
+            "end_date": datetime.now().isoformat(),
+            "roll_count": 1,
+        }),
+    ]
+
+
+OPERATIONS: Dict[str, Operation] = {
+    "list": op_list,
+    "detail": op_detail,
+    "sales_create": op_sales_create,
+    "knitting_complete": op_knitting_complete,
+}
+
+
+def parse_mix(mix: str) -> Tuple[List[str], List[float]]:
+    names, weights = [], []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise SystemExit(f"Unknown operation '{name}'. Choose from: {', '.join(OPERATIONS)}")
+        names.append(name.strip())
+        weights.append(float(weight or 1))
+    return names, weights
+
+
+# --- Client ---
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> None:
+    response = await client.post("/v1/auth/login", json={"username": username, "password": password})
+    if response.status_code != 200:
+        raise SystemExit(f"Login failed ({response.status_code}): {response.text}")
+
+
+async def _ids(client: httpx.AsyncClient, url: str, key: str = "id", **params) -> List[Any]:
+    response = await client.get(url, params={"page": 1, "limit": 100, **params})
+    if response.status_code != 200:
+        return []
+    return [item[key] for item in response.json().get("items", [])]
+
+
+async def discover_fixtures(client: httpx.AsyncClient) -> Fixtures:
+    return Fixtures(
+        buyer_ids=await _ids(client, "/v1/buyer"),
+        fabric_ids=await _ids(client, "/v1/inventory", type="fabric"),
+        inventory_ids=await _ids(client, "/v1/inventory"),
+        sales_ids=await _ids(client, "/v1/sales-transaction"),
+        knitting_ids=await _ids(client, "/v1/knitting-process"),
+        formula_ids=await _ids(client, "/v1/knit-formula"),
+        machine_ids=await _ids(client, "/v1/machine"),
+        operator_ids=await _ids(client, "/v1/operator"),
+    )
+
+
+async def run_operation(
+    client: httpx.AsyncClient, requests: List[Request], scheduled: float, stats: RunStats, record: bool
+) -> None:
+    """Runs one operation's requests in sequence; later requests may use ids from earlier ones."""
+    created_id = None
+    for label, method, url, params, body in requests:
+        if "{kp_id}" in url:
+            if created_id is None:
+                return
+            url = url.replace("{kp_id}", str(created_id))
+        sent = time.perf_counter()
+        try:
+            response = await client.request(method, url, params=params, json=body)
+            status = response.status_code
+            if method == "POST" and status == 201:
+                created_id = (response.json().get("data") or {}).get("id")
+        except httpx.HTTPError:
+            status = 599
+        done = time.perf_counter()
+        if record:
+            stats.samples.append(Sample(label, status, done - scheduled, done - sent))
+        scheduled = done
+    if record:
+        stats.completed += 1
+
+
+async def drive(
+    client: httpx.AsyncClient, fx: Fixtures, args: argparse.Namespace
+) -> Tuple[RunStats, float]:
+    names, weights = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    stats = RunStats()
+    in_flight: set = set()
+
+    start = time.perf_counter()
+    warmup_end = start + args.warmup
+    end = warmup_end + args.duration
+    next_arrival = start
+
+    while next_arrival < end:
+        now = time.perf_counter()
+        if next_arrival > now:
+            await asyncio.sleep(next_arrival - now)
+        record = next_arrival >= warmup_end
+        if record:
+            stats.scheduled += 1
+        if len(in_flight) >= args.max_in_flight:
+            if record:
+                stats.dropped += 1
+        else:
+            operation = OPERATIONS[rng.choices(names, weights=weights)[0]]
+            task = asyncio.create_task(
+                run_operation(client, operation(rng, fx), next_arrival, stats, record)
+            )
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        next_arrival += rng.expovariate(args.rps)
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    return stats, args.duration
+
+
+# --- Reporting ---
+
+def route_report(stats: RunStats, duration: float) -> List[Dict[str, Any]]:
+    by_route: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in stats.samples:
+        by_route[sample.route].append(sample)
+
+    rows = []
+    for route, samples in sorted(by_route.items()):
+        errors = sum(1 for s in samples if s.status >= 400)
+        rows.append({
+            "route": route,
+            "requests": len(samples),
+            "rps": round(len(samples) / duration, 2),
+            **latency_summary([s.latency for s in samples]),
+            "error_rate": round(errors / len(samples), 4),
+            "statuses": dict(sorted(
+                (str(code), sum(1 for s in samples if s.status == code))
+                for code in {s.status for s in samples}
+            )),
+        })
+    return rows
+
+
+def scrape_pool_metrics(text: str) -> Dict[str, float]:
+    values = {}
+    for name in (
+        "db_pool_checkout_wait_seconds_sum", "db_pool_checkout_wait_seconds_count",
+        "db_pool_checkouts_total", "db_pool_overflow_checkouts_total",
+    ):
+        match = re.search(rf"^{name} ([0-9.eE+-]+)$", text, re.MULTILINE)
+        if match:
+            values[name] = float(match.group(1))
+    return values
+
+
+def capacity_summary(
+    stats: RunStats, duration: float, args: argparse.Namespace,
+    pool_before: Dict[str, float], pool_after: Dict[str, float],
+) -> Dict[str, Any]:
+    samples = stats.samples
+    completed = len(samples)
+    errors = sum(1 for s in samples if s.status >= 400)
+    throughput = completed / duration if duration else 0.0
+    operations = stats.completed / duration if duration else 0.0
+    mean_service = sum(s.service_time for s in samples) / completed if completed else 0.0
+    latencies = latency_summary([s.latency for s in samples])
+    connections_per_worker = args.pool_size + args.max_overflow
+
+    waits = pool_after.get("db_pool_checkout_wait_seconds_count", 0) - pool_before.get("db_pool_checkout_wait_seconds_count", 0)
+    wait_sum = pool_after.get("db_pool_checkout_wait_seconds_sum", 0) - pool_before.get("db_pool_checkout_wait_seconds_sum", 0)
+    overflow = pool_after.get("db_pool_overflow_checkouts_total", 0) - pool_before.get("db_pool_overflow_checkouts_total", 0)
+
+    # Compare against the arrivals actually scheduled, not the nominal rate: Poisson
+    # arrivals over a short run legitimately deviate from --rps by several percent.
+    sustained = stats.completed >= 0.95 * stats.scheduled and stats.dropped == 0 and latencies["p99_ms"] <= args.slo_p99_ms
+    return {
+        "target_rps": args.rps,
+        "achieved_rps": round(operations, 2),
+        "http_requests_per_s": round(throughput, 2),
+        "dropped_arrivals": stats.dropped,
+        "error_rate": round(errors / completed, 4) if completed else 0.0,
+        **latencies,
+        # Little's law: requests concurrently inside the server on average.
+        "mean_concurrency": round(throughput * mean_service, 2),
+        "workers": args.workers,
+        "db_pool_size": args.pool_size,
+        "db_max_overflow": args.max_overflow,
+        "max_db_connections": args.workers * connections_per_worker,
+        "pool_mean_checkout_wait_ms": round(wait_sum / waits * 1000, 3) if waits else None,
+        "pool_overflow_checkouts": overflow if pool_after else None,
+        "sustained": sustained,
+    }
+
+
+def print_capacity(summary: Dict[str, Any], slo_p99_ms: float) -> None:
+    print("\nCapacity summary")
+    print(f"  workers x (pool {summary['db_pool_size']} + overflow {summary['db_max_overflow']}) "
+          f"= up to {summary['max_db_connections']} Postgres connections")
+    print(f"  target {summary['target_rps']} rps, achieved {summary['achieved_rps']} rps, "
+          f"({summary['http_requests_per_s']} HTTP requests/s), {summary['dropped_arrivals']} arrivals dropped, error rate {summary['error_rate']:.2%}")
+    print(f"  latency p50 {summary['p50_ms']} ms, p95 {summary['p95_ms']} ms, p99 {summary['p99_ms']} ms "
+          f"(SLO p99 {slo_p99_ms} ms)")
+    print(f"  mean in-server concurrency {summary['mean_concurrency']} "
+          f"({summary['mean_concurrency'] / max(summary['workers'], 1):.1f} per worker)")
+    if summary["pool_mean_checkout_wait_ms"] is not None:
+        print(f"  pool checkout wait {summary['pool_mean_checkout_wait_ms']} ms on average, "
+              f"{summary['pool_overflow_checkouts']:.0f} overflow checkouts (one worker's /metrics)")
+    verdict = "SUSTAINED" if summary["sustained"] else "NOT SUSTAINED"
+    print(f"  {verdict}: {summary['workers']} worker(s) with DB_POOL_SIZE={summary['db_pool_size']} "
+          f"at {summary['target_rps']} rps")
+
+
+# --- Server ---
+
+def start_server(args: argparse.Namespace) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DB_POOL_SIZE": str(args.pool_size),
+        "DB_MAX_OVERFLOW": str(args.max_overflow),
+        # Keep the harness measuring the app, not its access logs or tracing.
+        "TRACING_ENABLED": "false",
+    }
+    command = [
+        sys.executable, "-m", "uvicorn", "main:create_application", "--factory",
+        "--host", "127.0.0.1", "--port", str(args.port),
+        "--workers", str(args.workers), "--no-access-log", "--log-level", "warning",
+    ]
+    return subprocess.Popen(command, env=env)
+
+
+async def wait_until_up(client: httpx.AsyncClient, timeout: float = 60.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get("/v1")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.5)
+    raise SystemExit("Server did not come up in time.")
+
+
+async def main(args: argparse.Namespace) -> None:
+    server = None if args.url else start_server(args)
+    base_url = args.url or f"http://127.0.0.1:{args.port}"
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            await wait_until_up(client)
+            await login(client, args.username, args.password)
+            fixtures = await discover_fixtures(client)
+
+            pool_before = scrape_pool_metrics((await client.get("/metrics")).text)
+            print(f"Driving {base_url} at {args.rps} rps for {args.duration}s "
+                  f"(+{args.warmup}s warmup), mix {args.mix}")
+            stats, duration = await drive(client, fixtures, args)
+            pool_after = scrape_pool_metrics((await client.get("/metrics")).text)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    routes = route_report(stats, duration)
+    print()
+    print_table(routes, ["route", "requests", "rps", "p50_ms", "p95_ms", "p99_ms", "error_rate"])
+    summary = capacity_summary(stats, duration, args, pool_before, pool_after)
+    print_capacity(summary, args.slo_p99_ms)
+    write_results(args.output, "load_test", routes, capacity=summary, mix=args.mix, seed=args.seed)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="HTTP load test with a weighted traffic mix.")
+    parser.add_argument("--url", default=None, help="Target a running server instead of starting one.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="Uvicorn worker processes.")
+    parser.add_argument("--pool-size", type=int, default=settings.DB_POOL_SIZE)
+    parser.add_argument("--max-overflow", type=int, default=settings.DB_MAX_OVERFLOW)
+    parser.add_argument("--rps", type=float, default=50.0, help="Target arrival rate.")
+    parser.add_argument("--duration", type=float, default=60.0, help="Measured seconds.")
+    parser.add_argument("--warmup", type=float, default=10.0, help="Unmeasured seconds before the run.")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Operation weights (default {DEFAULT_MIX}).")
+    parser.add_argument("--max-in-flight", type=int, default=500, help="Client-side concurrency cap.")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--slo-p99-ms", type=float, default=500.0)
+    parser.add_argument("--username", default=os.environ.get("LOAD_TEST_USERNAME", "root"))
+    parser.add_argument("--password", default=os.environ.get("LOAD_TEST_PASSWORD", ""))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="benchmarks/results/load_test.json")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
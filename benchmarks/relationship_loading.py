@@ -0,0 +1,121 @@
+"""
+Relationship loading strategies for the list endpoints: `joined` versus `selectin`.
+
+Each list repository runs against the configured (seeded) database under both
+strategies; the suite records round trips per call (count, page and one query per
+selectin-loaded relation) and wall-clock latency, and names the faster strategy per
+shape. The default in `RELATIONSHIP_LOADING` follows these results; a shape that
+behaves differently can be pinned through `RELATIONSHIP_LOADING_OVERRIDES`.
+
+Usage:
+    python -m benchmarks.relationship_loading --limits 10 100 --iterations 200
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.database import async_session, engine
+from app.core.fieldsets import loader_options
+from app.core.loading import STRATEGIES
+from app.repository.account_receivable import AccountReceivableRepository
+from app.repository.dyeing_process import DyeingProcessRepository
+from app.repository.knit_formula import KnitFormulaRepository
+from app.repository.knitting_process import KnittingProcessRepository
+from app.repository.purchase_transaction import PurchaseTransactionRepository
+from app.repository.sales_transaction import SalesTransactionRepository
+from app.repository.statements import statements
+from benchmarks.common import latency_summary, print_table, write_results
+
+Call = Callable[[Any, int], Awaitable[Any]]
+
+SHAPES: List[Tuple[str, Call]] = [
+    ("sales_transaction", lambda s, limit: SalesTransactionRepository(s).get_all(page=1, limit=limit)),
+    ("purchase_transaction", lambda s, limit: PurchaseTransactionRepository(s).get_all(page=1, limit=limit)),
+    ("knitting_process", lambda s, limit: KnittingProcessRepository(s).get_all(page=1, limit=limit)),
+    ("dyeing_process", lambda s, limit: DyeingProcessRepository(s).get_all(page=1, limit=limit)),
+    ("account_receivable", lambda s, limit: AccountReceivableRepository(s).get_all(page=1, limit=limit)),
+    ("knit_formula", lambda s, limit: KnitFormulaRepository(s).get_all(page=1, limit=limit)),
+]
+
+
+def use_strategy(strategy: str) -> None:
+    settings.RELATIONSHIP_LOADING = strategy
+    settings.RELATIONSHIP_LOADING_OVERRIDES = {}
+    statements.clear()
+    loader_options.cache_clear()
+
+
+async def measure(call: Call, limit: int, iterations: int, warmup: int) -> Dict[str, Any]:
+    executed: List[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    for _ in range(warmup):
+        async with async_session() as session:
+            await call(session, limit)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    samples: List[float] = []
+    try:
+        for _ in range(iterations):
+            async with async_session() as session:
+                start = time.perf_counter()
+                await call(session, limit)
+                samples.append(time.perf_counter() - start)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+    return {"round_trips": len(executed) // max(iterations, 1), **latency_summary(samples)}
+
+
+async def main(args: argparse.Namespace) -> None:
+    configured = (settings.RELATIONSHIP_LOADING, dict(settings.RELATIONSHIP_LOADING_OVERRIDES))
+    rows: List[Dict[str, Any]] = []
+    try:
+        for limit in args.limits:
+            for shape, call in SHAPES:
+                results = {}
+                for strategy in STRATEGIES:
+                    use_strategy(strategy)
+                    results[strategy] = await measure(call, limit, args.iterations, args.warmup)
+                fastest = min(results, key=lambda name: results[name]["p50_ms"])
+                for strategy, result in results.items():
+                    rows.append({
+                        "case": f"{shape}.get_all[{limit}][{strategy}]",
+                        "shape": shape,
+                        "limit": limit,
+                        "variant": strategy,
+                        "fastest": strategy == fastest,
+                        **result,
+                    })
+                print(f"  {shape:<22} limit {limit:<5} " + "  ".join(
+                    f"{name} {res['p50_ms']:>7.2f} ms/{res['round_trips']} rt" for name, res in results.items()
+                ) + f"  -> {fastest}")
+    finally:
+        use_strategy(configured[0])
+        settings.RELATIONSHIP_LOADING_OVERRIDES = configured[1]
+        await engine.dispose()
+
+    print()
+    print_table(rows, ["case", "round_trips", "p50_ms", "p95_ms", "fastest"])
+    write_results(args.output, "relationship_loading", rows,
+                  limits=args.limits, iterations=args.iterations, warmup=args.warmup)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare joined and selectin relationship loading.")
+    parser.add_argument("--limits", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--output", default="benchmarks/results/relationship_loading.json")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
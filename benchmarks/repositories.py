@@ -0,0 +1,268 @@
+"""
+Repository micro-benchmarks.
+
+Runs every read path of the repositories against a seeded database and records
+latency percentiles, the number of SQL statements issued and the rows Postgres
+scanned to answer them (from EXPLAIN ANALYZE of the captured statements).
+
+Usage:
+    # benchmark whatever is currently in the database
+    python -m benchmarks.repositories --output benchmarks/results/baseline.json
+
+    # reseed and benchmark at several data sizes (1.0 is ~10M rows)
+    python -m benchmarks.repositories --scales 0.01,0.1,1 --output benchmarks/results/scaling.json
+
+Compare two result files with `python -m benchmarks.compare old.json new.json`.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from app.core.database import async_session, engine
+from app.core.query_stats import track_queries
+from app.repository.account_receivable import AccountReceivableRepository
+from app.repository.buyer import BuyerRepository
+from app.repository.dyeing_process import DyeingProcessRepository
+from app.repository.inventory import InventoryRepository
+from app.repository.knit_formula import KnitFormulaRepository
+from app.repository.knitting_process import KnittingProcessRepository
+from app.repository.machine import MachineRepository
+from app.repository.operator import OperatorRepository
+from app.repository.purchase_transaction import PurchaseTransactionRepository
+from app.repository.sales_transaction import SalesTransactionRepository
+from app.repository.supplier import SupplierRepository
+from benchmarks.common import (
+    capture_statements,
+    explain_rows_scanned,
+    latency_summary,
+    print_table,
+    write_results,
+)
+
+Call = Callable[[Any], Awaitable[Any]]
+
+
+@dataclass
+class Case:
+    """One repository call with fixed arguments, run against a fresh session per sample."""
+
+    name: str
+    call: Call
+
+
+async def load_fixtures(session) -> Dict[str, Any]:
+    """
+    Picks realistic arguments from the data itself: the hottest and coldest buyer and
+    item (the seed data is Zipf-distributed by id), the latest ids and a recent date window.
+    """
+    row = (await session.execute(text(
+        "SELECT (SELECT max(id) FROM buyer), (SELECT min(id) FROM buyer), "
+        "(SELECT max(id) FROM sales_transaction), (SELECT max(id) FROM purchase_transaction), "
+        "(SELECT max(id) FROM knitting_process), (SELECT max(id) FROM dyeing_process), "
+        "(SELECT min(id) FROM knit_formula), (SELECT max(transaction_date) FROM sales_transaction), "
+        "(SELECT period FROM account_receivable ORDER BY period_date DESC LIMIT 1), "
+        "(SELECT max(period_date) FROM account_receivable)"
+    ))).one()
+    hot_fabric = (await session.execute(text(
+        "SELECT id FROM inventory WHERE type = 'FABRIC' ORDER BY id LIMIT 1"
+    ))).scalar()
+    hot_thread = (await session.execute(text(
+        "SELECT id FROM inventory WHERE type = 'THREAD' ORDER BY id LIMIT 1"
+    ))).scalar()
+    some_items = (await session.execute(text(
+        "SELECT id FROM inventory ORDER BY id LIMIT 20"
+    ))).scalars().all()
+    latest = row[7].date() if row[7] else None
+    return {
+        "cold_buyer_id": row[0],
+        "hot_buyer_id": row[1],
+        "sales_id": row[2],
+        "purchase_id": row[3],
+        "knitting_id": row[4],
+        "dyeing_id": row[5],
+        "formula_id": row[6],
+        "end_date": latest,
+        "start_date": latest - timedelta(days=30) if latest else None,
+        "year_start": latest - timedelta(days=365) if latest else None,
+        "period": row[8],
+        "period_to": row[9],
+        "period_from": (row[9] - timedelta(days=150)).replace(day=1) if row[9] else None,
+        "hot_fabric": hot_fabric,
+        "hot_thread": hot_thread,
+        "inventory_ids": list(some_items),
+    }
+
+
+def build_cases(f: Dict[str, Any], limit: int) -> List[Case]:
+    sales = SalesTransactionRepository
+    purchases = PurchaseTransactionRepository
+    knitting = KnittingProcessRepository
+    dyeing = DyeingProcessRepository
+    window = {"start_date": f["start_date"], "end_date": f["end_date"]}
+
+    return [
+        # Sales transactions
+        Case("sales.get_all", lambda s: sales(s).get_all(limit=limit)),
+        Case("sales.get_all[deep_page]", lambda s: sales(s).get_all(page=1000, limit=limit)),
+        Case("sales.get_all[buyer=hot]", lambda s: sales(s).get_all(buyer_id=f["hot_buyer_id"], limit=limit)),
+        Case("sales.get_all[buyer=cold]", lambda s: sales(s).get_all(buyer_id=f["cold_buyer_id"], limit=limit)),
+        Case("sales.get_all[inventory]", lambda s: sales(s).get_all(inventory_id=f["hot_fabric"], limit=limit)),
+        Case("sales.get_all[30d]", lambda s: sales(s).get_all(**window, limit=limit)),
+        Case("sales.get_all[buyer+30d]", lambda s: sales(s).get_all(buyer_id=f["hot_buyer_id"], **window, limit=limit)),
+        Case("sales.get_all[all_filters]", lambda s: sales(s).get_all(
+            buyer_id=f["hot_buyer_id"], inventory_id=f["hot_fabric"], **window, limit=limit)),
+        Case("sales.get_by_id", lambda s: sales(s).get_by_id(st_id=f["sales_id"])),
+
+        # Purchase transactions
+        Case("purchases.get_all", lambda s: purchases(s).get_all(limit=limit)),
+        Case("purchases.get_all[supplier]", lambda s: purchases(s).get_all(supplier_id=1, limit=limit)),
+        Case("purchases.get_all[inventory]", lambda s: purchases(s).get_all(inventory_id=f["hot_thread"], limit=limit)),
+        Case("purchases.get_all[type=thread]", lambda s: purchases(s).get_all(inventory_type="thread", limit=limit)),
+        Case("purchases.get_all[30d]", lambda s: purchases(s).get_all(**window, limit=limit)),
+        Case("purchases.get_all[type+365d]", lambda s: purchases(s).get_all(
+            inventory_type="fabric", start_date=f["year_start"], end_date=f["end_date"], limit=limit)),
+        Case("purchases.get_by_id", lambda s: purchases(s).get_by_id(pt_id=f["purchase_id"])),
+
+        # Knitting
+        Case("knitting.get_all", lambda s: knitting(s).get_all(page=1, limit=limit)),
+        Case("knitting.get_all[formula]", lambda s: knitting(s).get_all(
+            page=1, limit=limit, knit_formula_id=f["formula_id"])),
+        Case("knitting.get_all[30d]", lambda s: knitting(s).get_all(page=1, limit=limit, **window)),
+        Case("knitting.get_by_id", lambda s: knitting(s).get_by_id(kp_id=f["knitting_id"])),
+        Case("knitting.get_all_pending_material_ids", lambda s: knitting(s).get_all_pending_material_ids()),
+
+        # Dyeing
+        Case("dyeing.get_all", lambda s: dyeing(s).get_all(page=1, limit=limit)),
+        Case("dyeing.get_all[pending]", lambda s: dyeing(s).get_all(page=1, limit=limit, dyeing_status=False)),
+        Case("dyeing.get_all[30d]", lambda s: dyeing(s).get_all(page=1, limit=limit, **window)),
+        Case("dyeing.get_by_id", lambda s: dyeing(s).get_by_id(dp_id=f["dyeing_id"])),
+
+        # Buyers (materialized is_risked)
+        Case("buyer.get_all", lambda s: BuyerRepository(s).get_all(limit=limit)),
+        Case("buyer.get_all[risked]", lambda s: BuyerRepository(s).get_all(risked=True, limit=limit)),
+        Case("buyer.get_all[name]", lambda s: BuyerRepository(s).get_all(name="Makmur", limit=limit)),
+        Case("buyer.get_by_id", lambda s: BuyerRepository(s).get_by_id(buyer_id=f["hot_buyer_id"])),
+
+        # Account receivable
+        Case("receivable.get_all", lambda s: AccountReceivableRepository(s).get_all(limit=limit)),
+        Case("receivable.get_all[buyer]", lambda s: AccountReceivableRepository(s).get_all(
+            buyer_id=f["hot_buyer_id"], limit=limit)),
+        Case("receivable.get_all[period]", lambda s: AccountReceivableRepository(s).get_all(
+            period=f["period"], limit=limit)),
+        Case("receivable.get_all[buyer,6mo]", lambda s: AccountReceivableRepository(s).get_all(
+            buyer_id=f["hot_buyer_id"], period_from=f["period_from"], period_to=f["period_to"], limit=limit)),
+
+        # Inventory and formulas
+        Case("inventory.get_all", lambda s: InventoryRepository(s).get_all(limit=limit)),
+        Case("inventory.get_all[max_limit]", lambda s: InventoryRepository(s).get_all(limit=9999)),
+        Case("inventory.get_all[type]", lambda s: InventoryRepository(s).get_all(type="fabric", limit=limit)),
+        Case("inventory.get_all[name]", lambda s: InventoryRepository(s).get_all(name="Cotton", limit=limit)),
+        Case("inventory.get_by_id", lambda s: InventoryRepository(s).get_by_id(inventory_id=f["hot_fabric"])),
+        Case("inventory.get_by_ids", lambda s: InventoryRepository(s).get_by_ids(inventory_ids=f["inventory_ids"])),
+        Case("inventory.get_valuation", lambda s: InventoryRepository(s).get_valuation()),
+        Case("knit_formula.get_all", lambda s: KnitFormulaRepository(s).get_all(page=1, limit=limit)),
+        Case("knit_formula.get_by_id", lambda s: KnitFormulaRepository(s).get_by_id(kf_id=f["formula_id"])),
+        Case("knit_formula.get_by_product_id", lambda s: KnitFormulaRepository(s).get_by_product_id(
+            product_id=f["hot_fabric"])),
+
+        # Small master tables
+        Case("machine.get_all", lambda s: MachineRepository(s).get_all(limit=limit)),
+        Case("operator.get_all", lambda s: OperatorRepository(s).get_all(limit=limit)),
+        Case("supplier.get_all", lambda s: SupplierRepository(s).get_all(limit=limit)),
+    ]
+
+
+async def run_case(case: Case, iterations: int, warmup: int) -> Dict[str, Any]:
+    for _ in range(warmup):
+        async with async_session() as session:
+            await case.call(session)
+
+    samples: List[float] = []
+    query_counts: List[int] = []
+    for _ in range(iterations):
+        async with async_session() as session:
+            with track_queries() as stats:
+                start = time.perf_counter()
+                await case.call(session)
+                samples.append(time.perf_counter() - start)
+            query_counts.append(stats.count)
+
+    # One extra, untimed run to capture statements and measure scanned rows.
+    async with async_session() as session:
+        with capture_statements(engine.sync_engine) as statements:
+            await case.call(session)
+        scanned = await explain_rows_scanned(session, statements)
+
+    return {
+        "case": case.name,
+        "iterations": iterations,
+        **latency_summary(samples),
+        "queries": max(query_counts, default=0),
+        "rows_scanned": scanned,
+    }
+
+
+async def run_suite(iterations: int, warmup: int, limit: int, only: Optional[str]) -> List[Dict[str, Any]]:
+    async with async_session() as session:
+        fixtures = await load_fixtures(session)
+
+    results = []
+    for case in build_cases(fixtures, limit):
+        if only and only not in case.name:
+            continue
+        result = await run_case(case, iterations, warmup)
+        results.append(result)
+        print(f"  {case.name:<42} p50 {result['p50_ms']:>9.2f} ms  p99 {result['p99_ms']:>9.2f} ms  "
+              f"{result['queries']:>3} queries  {result['rows_scanned']:>12,} rows scanned")
+    return results
+
+
+async def main(args: argparse.Namespace) -> None:
+    scales = [float(s) for s in args.scales.split(",")] if args.scales else [None]
+    all_results: List[Dict[str, Any]] = []
+
+    for scale in scales:
+        if scale is not None:
+            from scripts.seed_dataset import seed
+            print(f"Seeding scale {scale} (seed {args.seed})...")
+            await seed(argparse.Namespace(
+                scale=scale, seed=args.seed, years=5, end_date="2025-10-01",
+                jobs=os.cpu_count() or 1, dsn=None, truncate=True, skip_analyze=False, skip_costs=False,
+            ))
+        label = "current" if scale is None else str(scale)
+        print(f"Benchmarking repositories (scale {label})...")
+        for result in await run_suite(args.iterations, args.warmup, args.limit, args.only):
+            all_results.append({"scale": label, **result})
+
+    await engine.dispose()
+    print()
+    print_table(all_results, ["scale", "case", "p50_ms", "p95_ms", "p99_ms", "queries", "rows_scanned"])
+    write_results(
+        args.output, "repositories", all_results,
+        iterations=args.iterations, warmup=args.warmup, limit=args.limit, seed=args.seed,
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark repository read paths.")
+    parser.add_argument("--scales", default=None,
+                        help="Comma-separated seed scales; reseeds the database before each. "
+                             "Omit to benchmark the data already loaded.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=10, help="Page size used by get_all cases.")
+    parser.add_argument("--only", default=None, help="Run only cases whose name contains this text.")
+    parser.add_argument("--output", default="benchmarks/results/repositories.json")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
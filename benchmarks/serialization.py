@@ -0,0 +1,120 @@
+"""
+Response serialization micro-benchmark for a 9999-row inventory list (the `limit` maximum).
+
+No database is involved: the rows are built once in memory and each variant serves them
+from a one-route FastAPI app, called in-process through httpx's ASGI transport.
+
+Variants:
+    baseline   APIRoute + JSONResponse: the service-built model is dumped, re-validated
+               against `response_model`, run through `jsonable_encoder` and `json.dumps`
+    orjson     the same round trip, rendered by ORJSONResponse
+    fast       FastJSONRoute: the model built by the service is serialized once by pydantic-core
+
+Usage:
+    python -m benchmarks.serialization --rows 9999 --iterations 50
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute
+
+from app.api.route import FastJSONRoute
+from app.model.inventory import Inventory, InventoryType
+from app.schema.inventory.response import BulkInventoryResponse
+from benchmarks.common import latency_summary, print_table, write_results
+
+
+def build_rows(n: int) -> List[Inventory]:
+    rows = []
+    for i in range(1, n + 1):
+        fabric = i % 3 == 0
+        rows.append(Inventory(
+            id=f"{'F' if fabric else 'T'}{i:05d}",
+            name=f"{'Fabric' if fabric else 'Thread'} {i}",
+            type=InventoryType.FABRIC if fabric else InventoryType.THREAD,
+            roll_count=float(i % 40),
+            weight_kg=round(i * 1.37, 2),
+            bale_count=round(i * 0.0075, 4),
+            bale_ratio=181.44,
+        ))
+    return rows
+
+
+def build_app(route_class: type, response_class: type, rows: List[Inventory]) -> FastAPI:
+    app = FastAPI(default_response_class=response_class)
+
+    async def list_inventory() -> BulkInventoryResponse:
+        # What InventoryService.get_all does: one validation of the ORM rows
+        return BulkInventoryResponse(
+            items=rows, item_count=len(rows), page=1, limit=len(rows), total_pages=1
+        )
+
+    app.router.route_class = route_class
+    app.router.add_api_route("/inventory", list_inventory, response_model=BulkInventoryResponse)
+    return app
+
+
+VARIANTS = {
+    "baseline": (APIRoute, JSONResponse),
+    "orjson": (APIRoute, ORJSONResponse),
+    "fast": (FastJSONRoute, ORJSONResponse),
+}
+
+
+async def measure(app: FastAPI, iterations: int, warmup: int) -> Dict[str, Any]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(warmup):
+            (await client.get("/inventory")).raise_for_status()
+        samples: List[float] = []
+        body = b""
+        for _ in range(iterations):
+            start = time.perf_counter()
+            response = await client.get("/inventory")
+            samples.append(time.perf_counter() - start)
+            response.raise_for_status()
+            body = response.content
+    return {"body": body, **latency_summary(samples)}
+
+
+async def main(args: argparse.Namespace) -> None:
+    rows = build_rows(args.rows)
+    results: List[Dict[str, Any]] = []
+    bodies: Dict[str, Any] = {}
+    for name, (route_class, response_class) in VARIANTS.items():
+        result = await measure(build_app(route_class, response_class, rows), args.iterations, args.warmup)
+        bodies[name] = json.loads(result.pop("body"))
+        results.append({"case": f"inventory.list[{args.rows}][{name}]", "variant": name, **result})
+        print(f"  {name:<10} p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms")
+
+    if any(body != bodies["baseline"] for body in bodies.values()):
+        raise SystemExit("Response bodies differ between variants")
+
+    baseline = results[0]["p50_ms"]
+    for result in results:
+        result["speedup"] = round(baseline / result["p50_ms"], 2) if result["p50_ms"] else 0.0
+
+    print()
+    print_table(results, ["case", "p50_ms", "p95_ms", "p99_ms", "speedup"])
+    write_results(args.output, "serialization", results,
+                  rows=args.rows, iterations=args.iterations, warmup=args.warmup)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization.")
+    parser.add_argument("--rows", type=int, default=9999)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--output", default="benchmarks/results/serialization.json")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,338 @@
+"""
+Python-side CPU cost per query of the hot repository reads: ad-hoc statements versus
+the statement registry (`app/repository/statements.py`).
+
+For every case the "adhoc" variant builds its statements the way the repositories did
+before the registry existed (a fresh `select()` with its loader options and a count over
+a subquery on every call); the "cached" variant calls the repository. Process CPU time
+is measured with `time.process_time()`, so time spent waiting on Postgres is excluded
+and what remains is statement construction, cache-key generation, compilation on a
+cache miss and result processing.
+
+Usage:
+    # against the configured (seeded) database
+    python -m benchmarks.statement_cache --output benchmarks/results/statement_cache.json
+
+    # no database: measures statement construction and cache-key generation only
+    python -m benchmarks.statement_cache --offline
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import selectinload
+from sqlmodel import func, select
+
+from app.core.database import async_session, engine
+from app.model.account_receivable import AccountReceivable
+from app.model.buyer import Buyer
+from app.model.dyeing_process import DyeingProcess
+from app.model.inventory import Inventory
+from app.model.knit_formula import KnitFormula
+from app.model.knitting_process import KnittingProcess
+from app.model.purchase_transaction import PurchaseTransaction
+from app.model.sales_transaction import SalesTransaction
+from app.repository.account_receivable import AccountReceivableRepository
+from app.repository.buyer import BuyerRepository
+from app.repository.dyeing_process import DyeingProcessRepository
+from app.repository.inventory import InventoryRepository
+from app.repository.knitting_process import KnittingProcessRepository
+from app.repository.purchase_transaction import PurchaseTransactionRepository
+from app.repository.sales_transaction import SalesTransactionRepository
+from benchmarks.common import latency_summary, print_table, write_results
+
+Call = Callable[[Any], Awaitable[Any]]
+
+
+@dataclass
+class Case:
+    name: str
+    adhoc: Call
+    cached: Call
+
+
+# --- Statements as the repositories built them before the registry ---
+
+async def _adhoc_page(session, statement, order_by, page: int, limit: int, scalars: bool = True):
+    count_result = await session.execute(select(func.count()).select_from(statement.subquery()))
+    total = count_result.one()[0]
+    result = await session.execute(statement.order_by(order_by).offset((page - 1) * limit).limit(limit))
+    return (list(result.scalars().all()) if scalars else result.all()), total
+
+
+async def adhoc_sales_by_id(session, st_id):
+    statement = (
+        select(SalesTransaction)
+        .where(SalesTransaction.id == st_id)
+        .options(selectinload(SalesTransaction.buyer), selectinload(SalesTransaction.inventory))
+    )
+    return (await session.execute(statement)).scalars().one_or_none()
+
+
+async def adhoc_sales_list(session, buyer_id, start_date, end_date, limit):
+    statement = select(SalesTransaction).options(
+        selectinload(SalesTransaction.buyer), selectinload(SalesTransaction.inventory)
+    )
+    statement = statement.where(SalesTransaction.buyer_id == buyer_id)
+    statement = statement.where(func.date(SalesTransaction.transaction_date) >= start_date)
+    statement = statement.where(func.date(SalesTransaction.transaction_date) <= end_date)
+    return await _adhoc_page(session, statement, SalesTransaction.id.desc(), 1, limit)
+
+
+async def adhoc_purchase_by_id(session, pt_id):
+    statement = (
+        select(PurchaseTransaction)
+        .where(PurchaseTransaction.id == pt_id)
+        .options(selectinload(PurchaseTransaction.supplier), selectinload(PurchaseTransaction.inventory))
+    )
+    return (await session.execute(statement)).scalars().one_or_none()
+
+
+async def adhoc_purchase_list(session, inventory_type, limit):
+    statement = (
+        select(PurchaseTransaction)
+        .join(Inventory)
+        .options(selectinload(PurchaseTransaction.supplier), selectinload(PurchaseTransaction.inventory))
+        .where(Inventory.type == inventory_type)
+    )
+    return await _adhoc_page(session, statement, PurchaseTransaction.id.desc(), 1, limit)
+
+
+def _knitting_options():
+    return (
+        selectinload(KnittingProcess.knit_formula).selectinload(KnitFormula.product),
+        selectinload(KnittingProcess.operator),
+        selectinload(KnittingProcess.machine),
+    )
+
+
+async def adhoc_knitting_by_id(session, kp_id):
+    statement = select(KnittingProcess).where(KnittingProcess.id == kp_id).options(*_knitting_options())
+    return (await session.execute(statement)).scalars().one_or_none()
+
+
+async def adhoc_knitting_list(session, limit):
+    statement = select(KnittingProcess).options(*_knitting_options())
+    return await _adhoc_page(session, statement, KnittingProcess.id.desc(), 1, limit)
+
+
+async def adhoc_dyeing_list(session, dyeing_status, limit):
+    statement = (
+        select(DyeingProcess)
+        .options(selectinload(DyeingProcess.product))
+        .where(DyeingProcess.dyeing_status == dyeing_status)
+    )
+    return await _adhoc_page(session, statement, DyeingProcess.id.desc(), 1, limit)
+
+
+async def adhoc_buyer_by_id(session, buyer_id):
+    statement = select(Buyer).where(Buyer.id == buyer_id)
+    return (await session.execute(statement)).scalars().one_or_none()
+
+
+async def adhoc_buyer_list(session, name, limit):
+    statement = select(Buyer).where(Buyer.name.ilike(f"%{name}%"))
+    return await _adhoc_page(session, statement, Buyer.id, 1, limit, scalars=False)
+
+
+async def adhoc_inventory_list(session, name, limit):
+    statement = select(Inventory).where(Inventory.name.ilike(f"%{name}%"))
+    count_result = await session.execute(select(func.count()).select_from(statement.subquery()))
+    result = await session.execute(statement.offset(0).limit(limit))
+    return list(result.scalars().all()), count_result.scalar_one()
+
+
+async def adhoc_receivable_list(session, buyer_id, limit):
+    statement = (
+        select(AccountReceivable)
+        .options(selectinload(AccountReceivable.buyer))
+        .where(AccountReceivable.buyer_id == buyer_id)
+    )
+    return await _adhoc_page(session, statement, AccountReceivable.id, 1, limit)
+
+
+def build_cases(f: Dict[str, Any], limit: int) -> List[Case]:
+    window = {"start_date": f["start_date"], "end_date": f["end_date"]}
+    return [
+        Case("sales.get_by_id",
+             lambda s: adhoc_sales_by_id(s, f["sales_id"]),
+             lambda s: SalesTransactionRepository(s).get_by_id(st_id=f["sales_id"])),
+        Case("sales.get_all[buyer+30d]",
+             lambda s: adhoc_sales_list(s, f["hot_buyer_id"], limit=limit, **window),
+             lambda s: SalesTransactionRepository(s).get_all(buyer_id=f["hot_buyer_id"], **window, limit=limit)),
+        Case("purchases.get_by_id",
+             lambda s: adhoc_purchase_by_id(s, f["purchase_id"]),
+             lambda s: PurchaseTransactionRepository(s).get_by_id(pt_id=f["purchase_id"])),
+        Case("purchases.get_all[type=thread]",
+             lambda s: adhoc_purchase_list(s, "thread", limit),
+             lambda s: PurchaseTransactionRepository(s).get_all(inventory_type="thread", limit=limit)),
+        Case("knitting.get_by_id",
+             lambda s: adhoc_knitting_by_id(s, f["knitting_id"]),
+             lambda s: KnittingProcessRepository(s).get_by_id(kp_id=f["knitting_id"])),
+        Case("knitting.get_all",
+             lambda s: adhoc_knitting_list(s, limit),
+             lambda s: KnittingProcessRepository(s).get_all(page=1, limit=limit)),
+        Case("dyeing.get_all[pending]",
+             lambda s: adhoc_dyeing_list(s, False, limit),
+             lambda s: DyeingProcessRepository(s).get_all(page=1, limit=limit, dyeing_status=False)),
+        Case("buyer.get_by_id",
+             lambda s: adhoc_buyer_by_id(s, f["hot_buyer_id"]),
+             lambda s: BuyerRepository(s).get_by_id(buyer_id=f["hot_buyer_id"])),
+        Case("buyer.get_all[name]",
+             lambda s: adhoc_buyer_list(s, "Makmur", limit),
+             lambda s: BuyerRepository(s).get_all(name="Makmur", limit=limit)),
+        Case("inventory.get_all[name]",
+             lambda s: adhoc_inventory_list(s, "Cotton", limit),
+             lambda s: InventoryRepository(s).get_all(name="Cotton", limit=limit)),
+        Case("receivable.get_all[buyer]",
+             lambda s: adhoc_receivable_list(s, f["hot_buyer_id"], limit),
+             lambda s: AccountReceivableRepository(s).get_all(buyer_id=f["hot_buyer_id"], limit=limit)),
+    ]
+
+
+# --- Offline mode: a session that only prepares statements ---
+
+class _EmptyResult:
+    def one(self):
+        return (0,)
+
+    def one_or_none(self):
+        return None
+
+    def scalar_one(self):
+        return 0
+
+    def all(self):
+        return []
+
+    def mappings(self):
+        return self
+
+    def scalars(self):
+        return self
+
+
+class PreparingSession:
+    """Stands in for AsyncSession: generates each statement's cache key, runs nothing."""
+
+    def __init__(self):
+        self.count = 0
+
+    async def execute(self, statement, params=None):
+        self.count += 1
+        statement._generate_cache_key()
+        return _EmptyResult()
+
+
+OFFLINE_FIXTURES = {
+    "sales_id": 1, "purchase_id": 1, "knitting_id": 1, "hot_buyer_id": 1,
+    "start_date": date(2025, 9, 1), "end_date": date(2025, 10, 1),
+}
+
+
+async def measure_offline(call: Call, iterations: int, warmup: int) -> Dict[str, Any]:
+    for _ in range(warmup):
+        await call(PreparingSession())
+    cpu: List[float] = []
+    queries = 0
+    for _ in range(iterations):
+        session = PreparingSession()
+        start = time.process_time()
+        await call(session)
+        cpu.append(time.process_time() - start)
+        queries = session.count
+    return {"cpu_us_per_query": round(statistics.median(cpu) / max(queries, 1) * 1e6, 1), "queries": queries}
+
+
+# --- Database mode ---
+
+async def measure(call: Call, iterations: int, warmup: int) -> Dict[str, Any]:
+    cache_stats: List[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        cache_stats.append(context.cache_hit.name)
+
+    for _ in range(warmup):
+        async with async_session() as session:
+            await call(session)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    cpu: List[float] = []
+    wall: List[float] = []
+    try:
+        for _ in range(iterations):
+            async with async_session() as session:
+                start_cpu, start_wall = time.process_time(), time.perf_counter()
+                await call(session)
+                cpu.append(time.process_time() - start_cpu)
+                wall.append(time.perf_counter() - start_wall)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+    queries = len(cache_stats) // max(iterations, 1)
+    hits = sum(1 for stat in cache_stats if stat == "CACHE_HIT")
+    return {
+        "cpu_us_per_query": round(statistics.median(cpu) / max(queries, 1) * 1e6, 1),
+        "queries": queries,
+        "compiled_cache_hit_ratio": round(hits / len(cache_stats), 3) if cache_stats else 0.0,
+        **latency_summary(wall),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.offline:
+        fixtures = OFFLINE_FIXTURES
+    else:
+        from benchmarks.repositories import load_fixtures
+        async with async_session() as session:
+            fixtures = await load_fixtures(session)
+
+    rows: List[Dict[str, Any]] = []
+    for case in build_cases(fixtures, args.limit):
+        if args.only and args.only not in case.name:
+            continue
+        for variant in ("adhoc", "cached"):
+            call = getattr(case, variant)
+            if args.offline:
+                result = await measure_offline(call, args.iterations, args.warmup)
+            else:
+                result = await measure(call, args.iterations, args.warmup)
+            rows.append({"case": f"{case.name}[{variant}]", "variant": variant, **result})
+        before, after = rows[-2]["cpu_us_per_query"], rows[-1]["cpu_us_per_query"]
+        rows[-1]["cpu_saved_pct"] = round((before - after) / before * 100, 1) if before else 0.0
+        print(f"  {case.name:<32} adhoc {before:>8.1f} us/query  cached {after:>8.1f} us/query  "
+              f"({rows[-1]['cpu_saved_pct']:+.1f}% saved)")
+
+    if not args.offline:
+        await engine.dispose()
+    print()
+    columns = ["case", "cpu_us_per_query", "queries", "cpu_saved_pct"]
+    if not args.offline:
+        columns += ["compiled_cache_hit_ratio", "p50_ms"]
+    print_table(rows, columns)
+    write_results(
+        args.output, "statement_cache", rows,
+        offline=args.offline, iterations=args.iterations, warmup=args.warmup, limit=args.limit,
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Python CPU time per query, ad-hoc vs cached statements.")
+    parser.add_argument("--offline", action="store_true",
+                        help="Do not touch the database; time statement preparation only.")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--only", default=None, help="Run only cases whose name contains this text.")
+    parser.add_argument("--output", default="benchmarks/results/statement_cache.json")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -1,24 +1,48 @@
+import asyncio
+import logging
 from typing import Union
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
 
 from app.middleware.error_handler import add_error_handlers
-from app.core.database import init_db
+from app.middleware.metrics import add_metrics_middleware
+from app.middleware.query_stats import add_query_stats_middleware
+from app.middleware.tracing import add_tracing_middleware
+from app.core.metrics import render_metrics
+from app.core.partitions import run_partition_maintenance
+from app.core.startup import check_readiness, run_startup_checks
 from app.core.config import settings
+from app.core.database import engine
 from app.api.router import api_router
 
+logging.basicConfig(
+    level=settings.LOG_LEVEL.upper(),
+    format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
+)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     
-    try:
-        await init_db()
-    except Exception as e:
-        print("fail to initiate DB")
+    # Schema is managed by `alembic upgrade head`; only verify the revision and warm the pool
+    await run_startup_checks()
+    
+    # Keep the coming months' transaction partitions in place
+    maintenance = None
+    if settings.PARTITION_MAINTENANCE_INTERVAL_HOURS > 0:
+        maintenance = asyncio.create_task(
+            run_partition_maintenance(engine, settings.PARTITION_MAINTENANCE_INTERVAL_HOURS)
+        )
     
     yield
     
+    if maintenance is not None:
+        maintenance.cancel()
+        with suppress(asyncio.CancelledError):
+            await maintenance
+    
 def create_application() -> FastAPI:
     """Create and configure FastAPI application."""
     
@@ -31,6 +55,7 @@ def create_application() -> FastAPI:
         """,
         debug=settings.DEBUG,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
         docs_url="/docs",
         redoc_url="/redoc",
     )
@@ -46,6 +71,18 @@ def create_application() -> FastAPI:
     # Include error handling
     add_error_handlers(app)
     
+    # Include request latency metrics
+    if settings.METRICS_ENABLED:
+        add_metrics_middleware(app)
+    
+    # Include per-request SQL accounting (Server-Timing header)
+    if settings.QUERY_STATS_ENABLED:
+        add_query_stats_middleware(app)
+    
+    # Include request tracing (root span per sampled request)
+    if settings.TRACING_ENABLED:
+        add_tracing_middleware(app)
+    
     # Include API router
     app.include_router(api_router, prefix=settings.API_V1_STR)
     
@@ -70,6 +107,32 @@ def create_application() -> FastAPI:
             "environment": "development" if settings.DEBUG else "production"
         }
         
+    @app.get("/health/live", tags=["System"])
+    async def liveness():
+        """Liveness probe: the process is up and serving requests."""
+        return {"status": "alive"}
+    
+    @app.get("/health/ready", tags=["System"])
+    async def readiness():
+        """Readiness probe: database reachable and schema at the expected Alembic head."""
+        state = await check_readiness()
+        body = {
+            "status": "ready" if state.ready else "not_ready",
+            "database_reachable": state.database_reachable,
+            "schema_matches": state.schema_matches,
+            "expected_revision": sorted(state.expected_heads),
+            "database_revision": sorted(state.database_heads),
+            "startup_phases_ms": state.phases_ms,
+            "error": state.error,
+        }
+        return JSONResponse(status_code=200 if state.ready else 503, content=body)
+        
+    if settings.METRICS_ENABLED:
+        @app.get("/metrics", tags=["System"], response_class=PlainTextResponse, include_in_schema=False)
+        async def metrics():
+            """Prometheus scrape endpoint for pool and request latency metrics."""
+            return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+        
     return app
     
 # Create application instance
@@ -0,0 +1,123 @@
+"""
+Move closed months of sales, purchase, knitting and dyeing history out of the database.
+
+Each month before `--before` is written to a compressed columnar segment file under
+ARCHIVE_DIR (format: app/core/archive.py), recorded in the `archive_segment`
+manifest and then removed from its table, all in one transaction per month: the
+month's partition is dropped when it has one, else its rows are deleted. Months
+are archived oldest first, so the archived part of a table is always a prefix of
+its history. A knitting or dyeing month is only closed once all of its runs are
+finished; archiving a process table stops at the first month with an open run.
+
+Archived rows stay readable through the export endpoints (`/export/{dataset}`);
+dashboards read the daily rollups, which keep every month, and receivable aging
+reads archived days from the sales rollup. Archived rows can no longer be edited.
+
+Usage:
+    python -m scripts.archive_history --before 2024-01 --dry-run
+    python -m scripts.archive_history --before 2024-01 --tables sales,purchases
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, datetime
+from typing import Optional, Sequence
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.archive import SegmentWriter, archive_root, column_kinds, segment_path
+from app.core.config import settings
+from app.core.partitions import month_start
+from app.model import (  # noqa: F401  (resolve string relationships outside the app)
+    account_receivable, buyer, buyer_payment, dyeing_process, inventory, knit_formula, knitting_process,
+    machine, operator, purchase_transaction, sales_transaction, supplier,
+)
+from app.repository.archive import MODELS, ArchiveRepository
+
+TABLES = {
+    "sales": "sales_transaction",
+    "purchases": "purchase_transaction",
+    "knitting": "knitting_process",
+    "dyeing": "dyeing_process",
+}
+
+
+async def archive_month(session: AsyncSession, table: str, month: date) -> Optional[int]:
+    """Archives one month and commits; returns its row count, None when it was empty."""
+    repo = ArchiveRepository(session)
+    await repo.lock()
+    path = segment_path(table, month)
+    writer = SegmentWriter(
+        archive_root() / path, table=table, month=month, columns=column_kinds(MODELS[table].__table__)
+    )
+    try:
+        async for rows in repo.stream_month(table=table, month=month):
+            writer.write_block(rows)
+        if not writer.rows:
+            writer.abort()
+            await session.rollback()
+            return None
+        byte_size, sha256 = writer.close()
+        await repo.add_segment(
+            table=table, month=month, path=path, row_count=writer.rows, byte_size=byte_size, sha256=sha256
+        )
+        await repo.remove_month(table=table, month=month)
+        await session.commit()
+    except BaseException:
+        # The month stays in the database; no file may outlive its manifest row
+        writer.abort()
+        raise
+    return writer.rows
+
+
+async def archive_history(
+    dsn: Optional[str] = None,
+    tables: Sequence[str] = tuple(TABLES),
+    before: Optional[date] = None,
+    dry_run: bool = False,
+) -> None:
+    dsn = (dsn or str(settings.DATABASE_URI)).replace("postgresql://", "postgresql+asyncpg://", 1)
+    engine = create_async_engine(dsn)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            for name in tables:
+                table = TABLES[name]
+                months = await ArchiveRepository(session).pending_months(table=table, before=before)
+                await session.rollback()
+                if dry_run:
+                    print(f"{table:<22} {', '.join(f'{month:%Y-%m}' for month in months) or '-'}")
+                    continue
+                for month in months:
+                    started = time.perf_counter()
+                    rows = await archive_month(session, table, month)
+                    if rows is not None:
+                        print(f"{table:<22} {month:%Y-%m} {rows:>11,} rows  {time.perf_counter() - started:7.1f}s")
+    finally:
+        await engine.dispose()
+
+
+def _month(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m").date()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Archive closed months of history to segment files.")
+    parser.add_argument("--before", type=_month, required=True, help="Archive the months before this one (YYYY-MM).")
+    parser.add_argument("--tables", default=",".join(TABLES), help=f"Comma-separated subset of {', '.join(TABLES)}.")
+    parser.add_argument("--dry-run", action="store_true", help="Only list the months that would be archived.")
+    parser.add_argument("--dsn", default=None, help="Postgres DSN; defaults to the app's DATABASE_URI.")
+    args = parser.parse_args()
+    args.tables = [table.strip() for table in args.tables.split(",") if table.strip()]
+    unknown = set(args.tables) - set(TABLES)
+    if unknown:
+        parser.error(f"unknown table(s): {', '.join(sorted(unknown))}")
+    if args.before > month_start(date.today()):
+        parser.error("--before cannot be later than the current month; only past months are closed")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(archive_history(args.dsn, args.tables, args.before, args.dry_run))
@@ -0,0 +1,60 @@
+"""
+Create the monthly partitions of sales_transaction and purchase_transaction.
+
+The app creates the coming months' partitions on its own (PARTITION_MONTHS_AHEAD,
+checked every PARTITION_MAINTENANCE_INTERVAL_HOURS); this command does the same on
+demand, e.g. from cron when the background task is disabled. Rows that landed in the
+default partition are moved into their month's partition when it is created.
+
+Old months are removed with `scripts.archive_history`, which drops a month's
+partition only after writing it to a segment recorded in the archive manifest.
+
+Usage:
+    python -m scripts.manage_partitions
+    python -m scripts.manage_partitions --start 2023-01 --months-ahead 6
+"""
+
+import argparse
+import asyncio
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.partitions import PARTITIONED_TABLES, ensure_partitions, list_partitions
+
+
+async def manage_partitions(
+    dsn: Optional[str] = None,
+    start: Optional[date] = None,
+    months_ahead: Optional[int] = None,
+) -> None:
+    dsn = (dsn or str(settings.DATABASE_URI)).replace("postgresql://", "postgresql+asyncpg://", 1)
+    engine = create_async_engine(dsn)
+    try:
+        async with engine.begin() as conn:
+            created = await ensure_partitions(conn, start=start, months_ahead=months_ahead)
+        print(f"created   {', '.join(created) or '-'}")
+        async with engine.connect() as conn:
+            for table in PARTITIONED_TABLES:
+                print(f"{table:<22} {len(await list_partitions(conn, table)):>4} partitions")
+    finally:
+        await engine.dispose()
+
+
+def _month(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m").date()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Create monthly transaction partitions.")
+    parser.add_argument("--start", type=_month, default=None, help="First month to create (YYYY-MM); default: this month.")
+    parser.add_argument("--months-ahead", type=int, default=None, help="Months to create after this one; default: PARTITION_MONTHS_AHEAD.")
+    parser.add_argument("--dsn", default=None, help="Postgres DSN; defaults to the app's DATABASE_URI.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(manage_partitions(args.dsn, args.start, args.months_ahead))
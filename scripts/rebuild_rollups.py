@@ -0,0 +1,77 @@
+"""
+Backfill or rebuild the daily rollup tables from the raw transaction tables.
+
+The services keep sales_daily, purchase_daily and production_daily up to date on
+every write; this command recomputes them, e.g. after a bulk load that bypassed the
+services (scripts/seed_dataset.py calls it) or to repair a date range. Each table is
+rebuilt in its own transaction: rows in the range are deleted and re-inserted with
+one `INSERT ... SELECT ... GROUP BY`.
+
+Usage:
+    python -m scripts.rebuild_rollups
+    python -m scripts.rebuild_rollups --tables sales,purchases --start-date 2025-01-01 --end-date 2025-03-31
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, datetime
+from typing import Optional, Sequence
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.model import (  # noqa: F401  (resolve string relationships outside the app)
+    account_receivable, buyer, buyer_payment, dyeing_process, inventory, knit_formula, knitting_process,
+    machine, operator, purchase_transaction, sales_transaction, supplier,
+)
+from app.repository.rollup import RollupRepository
+
+ROLLUPS = {
+    "sales": RollupRepository.rebuild_sales,
+    "purchases": RollupRepository.rebuild_purchases,
+    "production": RollupRepository.rebuild_production,
+}
+
+
+async def rebuild_rollups(
+    dsn: Optional[str] = None,
+    tables: Sequence[str] = tuple(ROLLUPS),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> None:
+    dsn = (dsn or str(settings.DATABASE_URI)).replace("postgresql://", "postgresql+asyncpg://", 1)
+    engine = create_async_engine(dsn)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            repo = RollupRepository(session)
+            for table in tables:
+                started = time.perf_counter()
+                rows = await ROLLUPS[table](repo, start_date=start_date, end_date=end_date)
+                print(f"{table + ' rollup':<22} {rows:>11,} rows  {time.perf_counter() - started:7.1f}s")
+    finally:
+        await engine.dispose()
+
+
+def _date(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the daily rollup tables from raw transactions.")
+    parser.add_argument("--tables", default=",".join(ROLLUPS), help=f"Comma-separated subset of {', '.join(ROLLUPS)}.")
+    parser.add_argument("--start-date", type=_date, default=None, help="First day to rebuild (YYYY-MM-DD); default: all history.")
+    parser.add_argument("--end-date", type=_date, default=None, help="Last day to rebuild (YYYY-MM-DD); default: all history.")
+    parser.add_argument("--dsn", default=None, help="Postgres DSN; defaults to the app's DATABASE_URI.")
+    args = parser.parse_args()
+    args.tables = [table.strip() for table in args.tables.split(",") if table.strip()]
+    unknown = set(args.tables) - set(ROLLUPS)
+    if unknown:
+        parser.error(f"unknown rollup(s): {', '.join(sorted(unknown))}")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(rebuild_rollups(args.dsn, args.tables, args.start_date, args.end_date))
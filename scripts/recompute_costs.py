@@ -0,0 +1,69 @@
+"""
+Bring the FIFO cost allocation (cost_layer, cost_consumption) up to date.
+
+Does what POST /costing/recompute does, but commits each item on its own, so a full
+replay of a large history neither holds one long transaction nor runs into a request
+timeout. Like the endpoint, it recomputes threads before fabric. Run it with --full after a bulk load that bypassed the services
+(scripts/seed_dataset.py) and once after migrating to the cost layer tables.
+
+Usage:
+    python -m scripts.recompute_costs
+    python -m scripts.recompute_costs --full
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.model import (  # noqa: F401  (resolve string relationships outside the app)
+    account_receivable, buyer, buyer_payment, dyeing_process, inventory, knit_formula, knitting_process,
+    machine, operator, purchase_transaction, sales_transaction, supplier,
+)
+from app.repository.cost_layer import RECOMPUTE_ORDER, CostLayerRepository
+
+
+async def recompute_costs(dsn: Optional[str] = None, full: bool = False) -> None:
+    dsn = (dsn or str(settings.DATABASE_URI)).replace("postgresql://", "postgresql+asyncpg://", 1)
+    engine = create_async_engine(dsn)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            repo = CostLayerRepository(session)
+            if full:
+                await repo.mark_all()
+                await session.commit()
+            for item_type in RECOMPUTE_ORDER:
+                # Listed per type: the thread recomputes flag the fabric knitted from them
+                for inventory_id in await repo.get_pending(item_type=item_type):
+                    started = time.perf_counter()
+                    await repo.lock()
+                    activity = await repo.claim_activity(inventory_id=inventory_id)
+                    if inventory_id not in activity:
+                        await session.rollback()
+                        continue
+                    consumers, rows, uncovered = await repo.recompute(
+                        inventory_id=inventory_id, since=activity[inventory_id]
+                    )
+                    await session.commit()
+                    print(
+                        f"{inventory_id:<12} {consumers:>9,} consumers {rows:>11,} rows "
+                        f"{uncovered:>12,.3f} kg uncovered  {time.perf_counter() - started:7.1f}s"
+                    )
+    finally:
+        await engine.dispose()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Recompute the FIFO cost allocation.")
+    parser.add_argument("--full", action="store_true", help="Replay every item from the beginning.")
+    parser.add_argument("--dsn", default=None, help="Postgres DSN; defaults to the app's DATABASE_URI.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(recompute_costs(args.dsn, args.full))
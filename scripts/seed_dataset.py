@@ -0,0 +1,490 @@
+"""
+Deterministic synthetic dataset generator for performance testing.
+
+Fills a local Postgres with master data (inventory, buyers, suppliers, machines,
+operators, knit formulas) and several years of sales, purchases, knitting and
+dyeing history, using COPY for every table. The same seed and scale always
+produce the same rows, so benchmark runs are comparable across branches.
+
+Usage:
+    python -m scripts.seed_dataset --scale 1 --seed 42 --truncate
+
+Scale 1 writes roughly 10M rows. Fact tables are generated in fixed-size chunks
+on a process pool and streamed to COPY as they complete; each chunk draws from
+its own RNG seeded by (seed, table, first id), so the output does not depend on
+the number of worker processes.
+
+The daily rollup tables are rebuilt from the loaded rows at the end, since COPY
+bypasses the services that maintain them, and so is the FIFO cost allocation
+(unless --skip-costs).
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.partitions import PARTITIONED_TABLES
+from scripts.rebuild_rollups import rebuild_rollups
+from scripts.recompute_costs import recompute_costs
+
+BALE_TO_KG_RATIO = 181.44
+CHUNK_SIZE = 50_000
+
+# Row counts at scale 1 (~10M rows in total).
+BASE_COUNTS = {
+    "thread": 1_200,
+    "fabric": 800,
+    "buyer": 5_000,
+    "supplier": 400,
+    "machine": 60,
+    "operator": 120,
+    "sales_transaction": 4_500_000,
+    "purchase_transaction": 1_500_000,
+    "knitting_process": 2_500_000,
+    "dyeing_process": 1_200_000,
+}
+
+# Tables cleared by --truncate; users and refresh tokens are left alone.
+SEEDED_TABLES = [
+    "account_receivable", "sales_transaction", "purchase_transaction",
+    "knitting_process", "dyeing_process", "knit_formula",
+    "inventory", "buyer", "supplier", "machine", "operator",
+    "sales_daily", "purchase_daily", "production_daily",
+    "buyer_payment", "receivable_activity", "receivable_aging_run", "archive_segment",
+    "cost_consumption", "cost_layer", "cost_activity",
+]
+
+SERIAL_TABLES = [
+    "buyer", "supplier", "machine", "operator", "knit_formula", "account_receivable",
+    "sales_transaction", "purchase_transaction", "knitting_process", "dyeing_process",
+]
+
+FIBERS = ["Cotton", "Polyester", "Rayon", "Spandex", "Nylon", "TC", "CVC", "Modal"]
+YARN_COUNTS = ["20s", "24s", "30s", "40s", "50s", "60s", "75D", "150D"]
+FABRIC_KINDS = ["Single Jersey", "Rib", "Pique", "Fleece", "Interlock", "Lacoste", "Baby Terry"]
+COLORS = ["Putih", "Hitam", "Navy", "Merah", "Abu Misty", "Maroon", "Hijau Botol", "Kuning"]
+FIRST_NAMES = ["Budi", "Siti", "Agus", "Dewi", "Rudi", "Wati", "Joko", "Rina", "Hendra", "Lina"]
+COMPANY_PREFIXES = ["CV", "PT", "UD", "Toko"]
+COMPANY_WORDS = ["Makmur", "Jaya", "Sentosa", "Abadi", "Sejahtera", "Mulia", "Karya", "Textile"]
+CITIES = ["Bandung", "Jakarta", "Surabaya", "Solo", "Pekalongan", "Majalaya", "Tangerang"]
+
+
+@dataclass
+class SeedContext:
+    """Everything a worker needs to generate fact rows. Must stay picklable."""
+
+    seed: int
+    start: datetime
+    end: datetime
+    counts: Dict[str, int]
+    thread_ids: List[str] = field(default_factory=list)
+    fabric_ids: List[str] = field(default_factory=list)
+    base_price: Dict[str, float] = field(default_factory=dict)
+    formulas: List[Tuple[int, str, List[dict], float]] = field(default_factory=list)
+
+    @property
+    def span_seconds(self) -> float:
+        return (self.end - self.start).total_seconds()
+
+
+def zipf_cum_weights(n: int, s: float = 1.1) -> List[float]:
+    """Cumulative Zipf weights, so a few hot items and buyers dominate the traffic."""
+    return list(accumulate(1 / (rank ** s) for rank in range(1, n + 1)))
+
+
+def _phone(rng: random.Random) -> str:
+    return f"08{rng.randint(11, 99)}{rng.randint(10_000_000, 99_999_999)}"
+
+
+def _company(rng: random.Random, index: int) -> str:
+    return f"{rng.choice(COMPANY_PREFIXES)} {rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)} {index}"
+
+
+def _timestamp(ctx: SeedContext, rng: random.Random, row_id: int, total: int) -> datetime:
+    """Spreads ids evenly over the time range, so ids grow with dates as in a live system."""
+    position = (row_id - 1 + rng.random()) / total
+    return ctx.start + timedelta(seconds=int(position * ctx.span_seconds))
+
+
+# --- Master Data ---
+
+def build_master_data(seed: int, scale: float, years: int, end: datetime):
+    """
+    Generates the small dimension tables in-process and returns them as COPY records
+    alongside the SeedContext that the fact-table workers use.
+    """
+    rng = random.Random(f"{seed}:master")
+    counts = {name: max(1, math.ceil(count * scale)) for name, count in BASE_COUNTS.items()}
+    ctx = SeedContext(
+        seed=seed,
+        start=end - timedelta(days=365 * years),
+        end=end,
+        counts=counts,
+    )
+
+    inventory = []
+    thread_names: Dict[str, str] = {}
+    for i in range(1, counts["thread"] + 1):
+        item_id = f"T{i:05d}"
+        name = f"Benang {rng.choice(FIBERS)} {rng.choice(YARN_COUNTS)} #{i}"
+        weight = round(rng.uniform(5_000, 50_000), 3)
+        inventory.append((item_id, name, "THREAD", 0.0, weight, round(weight / BALE_TO_KG_RATIO, 3), BALE_TO_KG_RATIO))
+        ctx.thread_ids.append(item_id)
+        ctx.base_price[item_id] = round(rng.uniform(28_000, 65_000), -2)
+        thread_names[item_id] = name
+
+    for i in range(1, counts["fabric"] + 1):
+        item_id = f"F{i:05d}"
+        name = f"Kain {rng.choice(FABRIC_KINDS)} {rng.choice(FIBERS)} {rng.choice(COLORS)} #{i}"
+        weight = round(rng.uniform(2_000, 30_000), 3)
+        inventory.append((item_id, name, "FABRIC", round(weight / 25, 1), weight, 0.0, 0.0))
+        ctx.fabric_ids.append(item_id)
+        ctx.base_price[item_id] = round(rng.uniform(55_000, 120_000), -2)
+
+    knit_formula = []
+    for formula_id, product_id in enumerate(ctx.fabric_ids, start=1):
+        production_weight = float(rng.choice([100, 200, 250, 500]))
+        materials = rng.sample(ctx.thread_ids, k=rng.randint(1, min(4, len(ctx.thread_ids))))
+        shares = [rng.uniform(1, 10) for _ in materials]
+        total_share = sum(shares)
+        formula = [
+            {
+                "inventory_id": material_id,
+                "inventory_name": thread_names[material_id],
+                "amount_kg": round(production_weight * share / total_share, 3),
+            }
+            for material_id, share in zip(materials, shares)
+        ]
+        knit_formula.append((formula_id, product_id, json.dumps(formula), production_weight))
+        ctx.formulas.append((formula_id, product_id, formula, production_weight))
+
+    buyer = [
+        (i, _company(rng, i), _phone(rng), f"Jl. {rng.choice(COMPANY_WORDS)} No. {rng.randint(1, 200)}, {rng.choice(CITIES)}", None)
+        for i in range(1, counts["buyer"] + 1)
+    ]
+    supplier = [
+        (i, _company(rng, i), _phone(rng), f"Kawasan Industri {rng.choice(CITIES)} Blok {rng.randint(1, 50)}", None)
+        for i in range(1, counts["supplier"] + 1)
+    ]
+    machine = [(i, f"Mesin Rajut {i:03d}") for i in range(1, counts["machine"] + 1)]
+    operator = [(i, f"{rng.choice(FIRST_NAMES)} {i}", _phone(rng)) for i in range(1, counts["operator"] + 1)]
+
+    master = [
+        ("inventory", ["id", "name", "type", "roll_count", "weight_kg", "bale_count", "bale_ratio"], inventory),
+        ("buyer", ["id", "name", "phone_num", "address", "note"], buyer),
+        ("supplier", ["id", "name", "phone_num", "address", "note"], supplier),
+        ("machine", ["id", "name"], machine),
+        ("operator", ["id", "name", "phone_num"], operator),
+        ("knit_formula", ["id", "product_id", "formula", "production_weight"], knit_formula),
+        ("account_receivable", [
+            "id", "buyer_id", "period", "period_date", "age_0_30_days", "age_31_60_days",
+            "age_61_90_days", "age_over_90_days",
+        ], _receivable_rows(rng, ctx)),
+    ]
+    return ctx, master
+
+
+def _receivable_rows(rng: random.Random, ctx: SeedContext) -> List[tuple]:
+    """Twelve monthly aging snapshots per buyer, most of them with little overdue."""
+    periods = []
+    month = datetime(ctx.end.year, ctx.end.month, 1)
+    for _ in range(12):
+        periods.append((month.strftime("%b-%y"), month.date()))
+        month = (month - timedelta(days=1)).replace(day=1)
+
+    rows = []
+    row_id = 1
+    for buyer_id in range(1, ctx.counts["buyer"] + 1):
+        for period, period_date in reversed(periods):
+            current = round(rng.uniform(0, 250_000_000), -3)
+            overdue = [round(rng.uniform(0, current) * rng.random() ** (i + 2), -3) for i in range(3)]
+            rows.append((row_id, buyer_id, period, period_date, current, *overdue))
+            row_id += 1
+    return rows
+
+
+# --- Fact Tables ---
+
+def _sales_rows(ctx: SeedContext, rng: random.Random, first_id: int, n: int) -> List[tuple]:
+    total = ctx.counts["sales_transaction"]
+    fabric_items = rng.choices(ctx.fabric_ids, cum_weights=_cum(ctx, "fabric"), k=n)
+    buyers = rng.choices(range(1, ctx.counts["buyer"] + 1), cum_weights=_cum(ctx, "buyer"), k=n)
+    rows = []
+    for offset in range(n):
+        row_id = first_id + offset
+        if rng.random() < 0.1:
+            item_id = rng.choice(ctx.thread_ids)
+            weight = round(BALE_TO_KG_RATIO * rng.randint(1, 20), 3)
+            roll_count = 0.0
+        else:
+            item_id = fabric_items[offset]
+            roll_count = float(rng.randint(1, 60))
+            weight = round(roll_count * rng.uniform(22, 28), 3)
+        price = round(ctx.base_price[item_id] * rng.uniform(1.1, 1.35), -2)
+        rows.append((
+            row_id, _timestamp(ctx, rng, row_id, total), buyers[offset],
+            item_id, roll_count, weight, price,
+        ))
+    return rows
+
+
+def _purchase_rows(ctx: SeedContext, rng: random.Random, first_id: int, n: int) -> List[tuple]:
+    total = ctx.counts["purchase_transaction"]
+    threads = rng.choices(ctx.thread_ids, cum_weights=_cum(ctx, "thread"), k=n)
+    rows = []
+    for offset in range(n):
+        row_id = first_id + offset
+        if rng.random() < 0.2:
+            item_id = rng.choice(ctx.fabric_ids)
+            roll_count = float(rng.randint(5, 100))
+            weight = round(roll_count * rng.uniform(22, 28), 3)
+            bale_count = 0.0
+        else:
+            item_id = threads[offset]
+            bale_count = float(rng.randint(2, 80))
+            weight = round(bale_count * BALE_TO_KG_RATIO, 3)
+            roll_count = 0.0
+        price = round(ctx.base_price[item_id] * rng.uniform(0.9, 1.1), -2)
+        rows.append((
+            row_id, _timestamp(ctx, rng, row_id, total), rng.randint(1, ctx.counts["supplier"]),
+            item_id, bale_count, roll_count, weight, price,
+        ))
+    return rows
+
+
+def _knitting_rows(ctx: SeedContext, rng: random.Random, first_id: int, n: int) -> List[tuple]:
+    total = ctx.counts["knitting_process"]
+    formulas = rng.choices(ctx.formulas, cum_weights=_cum(ctx, "fabric"), k=n)
+    rows = []
+    for offset in range(n):
+        row_id = first_id + offset
+        formula_id, _, formula, production_weight = formulas[offset]
+        weight = round(production_weight * rng.uniform(0.5, 3), 3)
+        ratio = weight / production_weight
+        materials = [
+            {
+                "inventory_id": material["inventory_id"],
+                "inventory_name": material["inventory_name"],
+                "amount_kg": round(material["amount_kg"] * ratio, 3),
+            }
+            for material in formula
+        ]
+        start_date = _timestamp(ctx, rng, row_id, total)
+        # The most recent runs are still on the machines.
+        done = row_id <= total * 0.995
+        end_date = start_date + timedelta(hours=rng.randint(4, 72)) if done else None
+        rows.append((
+            row_id, formula_id, rng.randint(1, ctx.counts["operator"]),
+            rng.randint(1, ctx.counts["machine"]), start_date, end_date, done,
+            weight, round(weight / 25, 1), json.dumps(materials),
+        ))
+    return rows
+
+
+def _dyeing_rows(ctx: SeedContext, rng: random.Random, first_id: int, n: int) -> List[tuple]:
+    total = ctx.counts["dyeing_process"]
+    products = rng.choices(ctx.fabric_ids, cum_weights=_cum(ctx, "fabric"), k=n)
+    rows = []
+    for offset in range(n):
+        row_id = first_id + offset
+        weight = round(rng.uniform(100, 1_500), 3)
+        start_date = _timestamp(ctx, rng, row_id, total)
+        done = row_id <= total * 0.99
+        final_weight = round(weight * rng.uniform(0.9, 0.97), 3) if done else 0.0
+        rows.append((
+            row_id, start_date,
+            start_date + timedelta(hours=rng.randint(12, 96)) if done else None,
+            products[offset], weight, final_weight,
+            round(final_weight / 25, 1) if done else 0.0,
+            round(weight * rng.uniform(2_500, 4_000), -2) if done else 0.0,
+            done,
+            "Susut tinggi" if done and final_weight < weight * 0.91 else None,
+        ))
+    return rows
+
+
+_CUM_WEIGHTS: Dict[Tuple[str, int], List[float]] = {}
+
+
+def _cum(ctx: SeedContext, population: str) -> List[float]:
+    """Per-process cache of Zipf weights for the given population."""
+    key = (population, ctx.counts[population])
+    if key not in _CUM_WEIGHTS:
+        _CUM_WEIGHTS[key] = zipf_cum_weights(ctx.counts[population])
+    return _CUM_WEIGHTS[key]
+
+
+FACT_TABLES: List[Tuple[str, List[str], Callable]] = [
+    ("purchase_transaction", [
+        "id", "transaction_date", "supplier_id", "inventory_id",
+        "bale_count", "roll_count", "weight_kg", "price_per_kg",
+    ], _purchase_rows),
+    ("sales_transaction", [
+        "id", "transaction_date", "buyer_id", "inventory_id",
+        "roll_count", "weight_kg", "price_per_kg",
+    ], _sales_rows),
+    ("knitting_process", [
+        "id", "knit_formula_id", "operator_id", "machine_id", "start_date",
+        "end_date", "knit_status", "weight_kg", "roll_count", "materials",
+    ], _knitting_rows),
+    ("dyeing_process", [
+        "id", "start_date", "end_date", "product_id", "dyeing_weight",
+        "dyeing_final_weight", "dyeing_roll_count", "dyeing_overhead_cost",
+        "dyeing_status", "dyeing_note",
+    ], _dyeing_rows),
+]
+
+_GENERATORS = {table: generator for table, _, generator in FACT_TABLES}
+
+
+def generate_chunk(ctx: SeedContext, table: str, first_id: int, n: int) -> List[tuple]:
+    """Process-pool entry point. The RNG depends only on seed, table and first id."""
+    rng = random.Random(f"{ctx.seed}:{table}:{first_id}")
+    return _GENERATORS[table](ctx, rng, first_id, n)
+
+
+# --- Loading ---
+
+async def _copy(conn: asyncpg.Connection, table: str, columns: Sequence[str], records: List[tuple]) -> None:
+    await conn.copy_records_to_table(table, records=records, columns=list(columns))
+
+
+async def _load_fact_table(conn, pool: ProcessPoolExecutor, ctx: SeedContext, table: str, columns, jobs: int) -> int:
+    """Keeps up to 2 x jobs chunks in flight and COPYs them in id order."""
+    loop = asyncio.get_running_loop()
+    total = ctx.counts[table]
+    starts = list(range(1, total + 1, CHUNK_SIZE))
+    pending: List[asyncio.Future] = []
+    next_chunk = 0
+
+    while next_chunk < len(starts) or pending:
+        while next_chunk < len(starts) and len(pending) < jobs * 2:
+            first_id = starts[next_chunk]
+            n = min(CHUNK_SIZE, total - first_id + 1)
+            pending.append(loop.run_in_executor(pool, generate_chunk, ctx, table, first_id, n))
+            next_chunk += 1
+        records = await pending.pop(0)
+        await _copy(conn, table, columns, records)
+    return total
+
+
+async def _ensure_empty(conn: asyncpg.Connection) -> None:
+    for table in SEEDED_TABLES:
+        if await conn.fetchval(f"SELECT EXISTS (SELECT 1 FROM {table})"):
+            raise SystemExit(f"Table '{table}' already has rows; rerun with --truncate to replace them.")
+
+
+async def seed(args: argparse.Namespace) -> None:
+    end = datetime.strptime(args.end_date, "%Y-%m-%d")
+    ctx, master = build_master_data(args.seed, args.scale, args.years, end)
+    dsn = args.dsn or str(settings.DATABASE_URI)
+
+    conn = await asyncpg.connect(dsn)
+    started = time.perf_counter()
+    total_rows = 0
+    try:
+        if args.truncate:
+            await conn.execute(f"TRUNCATE {', '.join(SEEDED_TABLES)} RESTART IDENTITY CASCADE")
+        else:
+            await _ensure_empty(conn)
+
+        for table, columns, records in master:
+            table_start = time.perf_counter()
+            await _copy(conn, table, columns, records)
+            total_rows += len(records)
+            print(f"{table:<22} {len(records):>11,} rows  {time.perf_counter() - table_start:7.1f}s")
+
+        # One partition per month of the seeded range, instead of everything in the default one
+        for table in PARTITIONED_TABLES:
+            await conn.execute(
+                "SELECT ensure_month_partition($1::regclass, CAST(month AS date)) "
+                "FROM generate_series(date_trunc('month', $2::timestamp), $3::timestamp, interval '1 month') AS month",
+                table, ctx.start, ctx.end,
+            )
+
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            for table, columns, _ in FACT_TABLES:
+                table_start = time.perf_counter()
+                rows = await _load_fact_table(conn, pool, ctx, table, columns, args.jobs)
+                elapsed = time.perf_counter() - table_start
+                total_rows += rows
+                print(f"{table:<22} {rows:>11,} rows  {elapsed:7.1f}s  ({rows / elapsed:,.0f} rows/s)")
+
+        for table in SERIAL_TABLES:
+            await conn.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)"
+            )
+
+        # COPY bypasses the repositories, so the buyers' risk columns are set here
+        await conn.execute("""
+            UPDATE buyer
+            SET overdue_amount = overdue.amount, is_risked = overdue.risked
+            FROM (
+                SELECT DISTINCT ON (buyer_id)
+                    buyer_id,
+                    coalesce(age_over_90_days, 0) AS amount,
+                    coalesce(bool_or(age_over_90_days > 0) OVER (PARTITION BY buyer_id), false) AS risked
+                FROM account_receivable
+                WHERE buyer_id IS NOT NULL
+                ORDER BY buyer_id, period_date DESC
+            ) AS overdue
+            WHERE overdue.buyer_id = buyer.id
+        """)
+        # ... and the items' average cost, from all their purchases
+        await conn.execute("""
+            UPDATE inventory
+            SET average_cost = purchases.total / purchases.weight_kg
+            FROM (
+                SELECT inventory_id, sum(weight_kg * price_per_kg) AS total, sum(weight_kg) AS weight_kg
+                FROM purchase_transaction
+                GROUP BY inventory_id
+            ) AS purchases
+            WHERE purchases.inventory_id = inventory.id AND purchases.weight_kg > 0
+        """)
+    finally:
+        await conn.close()
+
+    # COPY bypasses the services, so the daily rollups and FIFO costs are computed from the loaded rows
+    await rebuild_rollups(dsn)
+    if not args.skip_costs:
+        await recompute_costs(dsn, full=True)
+    if not args.skip_analyze:
+        conn = await asyncpg.connect(dsn)
+        try:
+            await conn.execute("ANALYZE")
+        finally:
+            await conn.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"{'total':<22} {total_rows:>11,} rows  {elapsed:7.1f}s  ({total_rows / elapsed:,.0f} rows/s)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fill the database with a deterministic synthetic dataset.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Size multiplier; 1.0 is about 10M rows.")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed; equal seeds give equal datasets.")
+    parser.add_argument("--years", type=int, default=5, help="Years of transaction history to spread rows over.")
+    parser.add_argument("--end-date", default="2025-10-01", help="Last day of generated history (YYYY-MM-DD).")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Generator processes.")
+    parser.add_argument("--dsn", default=None, help="Postgres DSN; defaults to the app's DATABASE_URI.")
+    parser.add_argument("--truncate", action="store_true", help="Empty the seeded tables first.")
+    parser.add_argument("--skip-analyze", action="store_true", help="Do not run ANALYZE after loading.")
+    parser.add_argument("--skip-costs", action="store_true", help="Do not allocate FIFO costs after loading.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(seed(parse_args()))
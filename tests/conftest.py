@@ -0,0 +1,94 @@
+"""
+Fixtures for tests that run the services against Postgres.
+
+The database is the one the app's settings point to, migrated to head
+(`alembic upgrade head`); tests that need it are skipped when it cannot be reached.
+Each test runs inside a transaction that is rolled back afterwards, and the session
+joins it with savepoints, so the repositories' own commits leave nothing behind.
+"""
+
+from typing import Any, AsyncIterator, Dict
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import ASYNC_DATABASE_URI
+from app.core.query_stats import instrument_query_stats
+from app.model import (  # noqa: F401  (resolve string relationships outside the app)
+    account_receivable, buyer, buyer_payment, dyeing_process, inventory, knit_formula, knitting_process,
+    machine, operator, purchase_transaction, sales_transaction, supplier,
+)
+from app.model.buyer import Buyer
+from app.model.inventory import Inventory, InventoryType
+from app.model.knit_formula import KnitFormula
+from app.model.machine import Machine
+from app.model.operator import Operator
+from app.model.supplier import Supplier
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def session() -> AsyncIterator[AsyncSession]:
+    # A fresh engine per test: asyncpg connections belong to the event loop that opened them
+    engine = create_async_engine(ASYNC_DATABASE_URI, poolclass=NullPool)
+    instrument_query_stats(engine.sync_engine)
+    try:
+        connection = await engine.connect()
+    except (OSError, SQLAlchemyError) as exc:
+        await engine.dispose()
+        pytest.skip(f"Postgres is not available: {exc}")
+
+    transaction = await connection.begin()
+    db_session = AsyncSession(
+        bind=connection, expire_on_commit=False, join_transaction_mode="create_savepoint"
+    )
+    try:
+        yield db_session
+    finally:
+        await db_session.close()
+        await transaction.rollback()
+        await connection.close()
+        await engine.dispose()
+
+
+@pytest.fixture
+async def references(session: AsyncSession) -> Dict[str, Any]:
+    """A thread, the fabric knitted from it, its formula, an operator, a machine, a buyer and a supplier."""
+    thread = Inventory(
+        id="TEST-THREAD", name="Test thread", type=InventoryType.THREAD,
+        weight_kg=1000.0, bale_count=10.0, average_cost=20.0,
+    )
+    fabric = Inventory(
+        id="TEST-FABRIC", name="Test fabric", type=InventoryType.FABRIC,
+        weight_kg=0.0, roll_count=0.0, average_cost=0.0,
+    )
+    session.add_all([thread, fabric])
+    await session.flush()
+
+    formula = KnitFormula(
+        product_id=fabric.id,
+        formula=[{"inventory_id": thread.id, "inventory_name": thread.name, "amount_kg": 10.0}],
+        production_weight=10.0,
+    )
+    operator_ = Operator(name="Test operator")
+    machine_ = Machine(name="Test machine")
+    buyer_ = Buyer(name="Test buyer")
+    supplier_ = Supplier(name="Test supplier")
+    session.add_all([formula, operator_, machine_, buyer_, supplier_])
+    await session.commit()
+    return {
+        "thread_id": thread.id,
+        "fabric_id": fabric.id,
+        "knit_formula_id": formula.id,
+        "operator_id": operator_.id,
+        "machine_id": machine_.id,
+        "buyer_id": buyer_.id,
+        "supplier_id": supplier_.id,
+    }
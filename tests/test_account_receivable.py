@@ -0,0 +1,50 @@
+"""Receivable periods that are unique per buyer."""
+
+from typing import Any, Dict, Optional
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.model.account_receivable import AccountReceivable
+from app.repository.account_receivable import AccountReceivableRepository
+from app.repository.reference import ReferenceRepository
+from app.schema.account_receivable.request import AccountReceivableCreateRequest
+from app.service.account_receivable import AccountReceivableService
+
+pytestmark = pytest.mark.anyio
+
+
+def receivable_service(session: AsyncSession) -> AccountReceivableService:
+    return AccountReceivableService(
+        receivable_repo=AccountReceivableRepository(session),
+        reference_repo=ReferenceRepository(session),
+    )
+
+
+async def test_duplicate_period_is_a_conflict(session: AsyncSession, references: Dict[str, Any]):
+    service = receivable_service(session)
+    request = AccountReceivableCreateRequest(buyer_id=references["buyer_id"], period="Jan-25", age_0_30_days=100.0)
+    await service.create(ar_create=request)
+
+    with pytest.raises(HTTPException) as raised:
+        await service.create(ar_create=request)
+    assert raised.value.status_code == 409
+
+
+async def test_period_taken_after_the_check_is_a_conflict(
+    session: AsyncSession, references: Dict[str, Any], monkeypatch: pytest.MonkeyPatch
+):
+    service = receivable_service(session)
+    request = AccountReceivableCreateRequest(buyer_id=references["buyer_id"], period="Jan-25", age_0_30_days=100.0)
+    await service.create(ar_create=request)
+
+    # A concurrent request inserted the period between the pre-check and the insert
+    async def not_found_yet(**kwargs: Any) -> Optional[AccountReceivable]:
+        return None
+
+    monkeypatch.setattr(service.receivable_repo, "get_by_period", not_found_yet)
+    with pytest.raises(HTTPException) as raised:
+        await service.create(ar_create=request)
+    assert raised.value.status_code == 409
+    await session.rollback()
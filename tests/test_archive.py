@@ -0,0 +1,85 @@
+"""Archiving a partitioned month of sales (scripts/archive_history.py)."""
+
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.archive import read_blocks, segment_path
+from app.core.config import settings
+from app.model.archive_segment import ArchiveSegment
+from app.model.sales_transaction import SalesTransaction
+from app.repository.archive import ArchiveRepository
+from scripts.archive_history import archive_month
+
+pytestmark = pytest.mark.anyio
+
+MONTH = date(2000, 1, 1)
+PARTITION = "sales_transaction_p2000_01"
+
+
+@pytest.fixture
+async def archived_month(
+    session: AsyncSession, references: Dict[str, Any], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Five sales in a month with its own partition; returns the segment's path."""
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path))
+    # Smaller than the month, so the rows are read in several blocks
+    monkeypatch.setattr(settings, "ARCHIVE_BLOCK_ROWS", 2)
+    await session.execute(
+        text("SELECT ensure_month_partition(CAST('sales_transaction' AS regclass), :month)"),
+        {"month": MONTH},
+    )
+    session.add_all([
+        SalesTransaction(
+            buyer_id=references["buyer_id"],
+            inventory_id=references["thread_id"],
+            transaction_date=datetime(2000, 1, day),
+            weight_kg=10.0,
+            price_per_kg=30.0,
+        )
+        for day in (3, 3, 3, 14, 31)
+    ])
+    await session.commit()
+    return tmp_path / segment_path("sales_transaction", MONTH)
+
+
+async def partition_exists(session: AsyncSession) -> bool:
+    result = await session.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": PARTITION})
+    return result.scalar()
+
+
+async def test_archive_partitioned_month(session: AsyncSession, archived_month: Path):
+    assert await archive_month(session, "sales_transaction", MONTH) == 5
+
+    assert not await partition_exists(session)
+    rows = [row for block in read_blocks(archived_month) for row in block]
+    assert [row["transaction_date"].day for row in rows] == [3, 3, 3, 14, 31]
+    assert len({row["id"] for row in rows}) == 5
+
+    result = await session.execute(
+        select(ArchiveSegment).where(
+            ArchiveSegment.table_name == "sales_transaction", ArchiveSegment.month == MONTH
+        )
+    )
+    assert result.scalars().one().row_count == 5
+
+
+async def test_failed_archive_leaves_no_segment(
+    session: AsyncSession, archived_month: Path, monkeypatch: pytest.MonkeyPatch
+):
+    async def fail(self, **kwargs: Any) -> None:
+        raise RuntimeError("remove failed")
+
+    monkeypatch.setattr(ArchiveRepository, "remove_month", fail)
+    with pytest.raises(RuntimeError):
+        await archive_month(session, "sales_transaction", MONTH)
+    await session.rollback()
+
+    assert not archived_month.exists()
+    assert list(archived_month.parent.iterdir()) == []
+    assert await partition_exists(session)
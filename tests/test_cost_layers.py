@@ -0,0 +1,117 @@
+"""FIFO cost layers of knitted and dyed output."""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict
+
+import pytest
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.model.cost_layer import CostLayer, CostSource
+from app.repository.cost_layer import CostLayerRepository
+from app.repository.dyeing_process import DyeingProcessRepository
+from app.repository.inventory import InventoryRepository
+from app.repository.knit_formula import KnitFormulaRepository
+from app.repository.knitting_process import KnittingProcessRepository
+from app.repository.purchase_transaction import PurchaseTransactionRepository
+from app.repository.reference import ReferenceRepository
+from app.repository.rollup import RollupRepository
+from app.schema.dyeing_process.request import DyeingProcessCreateRequest, DyeingProcessUpdateRequest
+from app.schema.knitting_process.request import KnittingProcessCreateRequest, KnittingProcessUpdateRequest
+from app.schema.purchase_transaction.request import PurchaseTransactionCreateRequest
+from app.service.dyeing_process import DyeingProcessService
+from app.service.knitting_process import KnittingProcessService
+from app.service.purchase_transaction import PurchaseTransactionService
+
+pytestmark = pytest.mark.anyio
+
+
+async def recompute(session: AsyncSession, *inventory_ids: str) -> None:
+    """Recomputes the items in the given order, like scripts/recompute_costs.py."""
+    repo = CostLayerRepository(session)
+    for inventory_id in inventory_ids:
+        activity = await repo.claim_activity(inventory_id=inventory_id)
+        if inventory_id in activity:
+            await repo.recompute(inventory_id=inventory_id, since=activity[inventory_id])
+    await session.commit()
+
+
+async def layer(session: AsyncSession, source: CostSource, source_id: int) -> CostLayer:
+    result = await session.execute(
+        select(CostLayer)
+        .where(CostLayer.source_type == source.value, CostLayer.source_id == source_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().one()
+
+
+async def test_knitted_and_dyed_output_open_layers(session: AsyncSession, references: Dict[str, Any]):
+    purchases = PurchaseTransactionService(
+        pt_repo=PurchaseTransactionRepository(session),
+        reference_repo=ReferenceRepository(session),
+        inventory_repo=InventoryRepository(session),
+        kp_repo=KnittingProcessRepository(session),
+        rollup_repo=RollupRepository(session),
+        cost_repo=CostLayerRepository(session),
+    )
+    knitting = KnittingProcessService(
+        process_repo=KnittingProcessRepository(session),
+        formula_repo=KnitFormulaRepository(session),
+        reference_repo=ReferenceRepository(session),
+        inventory_repo=InventoryRepository(session),
+        rollup_repo=RollupRepository(session),
+        cost_repo=CostLayerRepository(session),
+    )
+    dyeing = DyeingProcessService(
+        dyeing_repo=DyeingProcessRepository(session),
+        inventory_repo=InventoryRepository(session),
+        cost_repo=CostLayerRepository(session),
+    )
+
+    await purchases.create(pt_create=PurchaseTransactionCreateRequest(
+        supplier_id=references["supplier_id"],
+        inventory_id=references["thread_id"],
+        transaction_date=date.today(),
+        weight_kg=100.0,
+        price_per_kg=30.0,
+    ))
+    # 50 kg of thread knitted into 50 kg of fabric
+    run = (await knitting.create(kp_create=KnittingProcessCreateRequest(
+        knit_formula_id=references["knit_formula_id"],
+        operator_id=references["operator_id"],
+        machine_id=references["machine_id"],
+        weight_kg=50.0,
+    ))).data
+    await knitting.update(kp_id=run.id, kp_update=KnittingProcessUpdateRequest(knit_status=True, roll_count=5.0))
+    # 20 kg of that fabric dyed into 16 kg
+    dyed = (await dyeing.create(dp_create=DyeingProcessCreateRequest(
+        product_id=references["fabric_id"], dyeing_weight=20.0, dyeing_roll_count=1.0,
+    ))).data
+    await dyeing.update(dp_id=dyed.id, dp_update=DyeingProcessUpdateRequest(
+        dyeing_status=True,
+        dyeing_final_weight=16.0,
+        dyeing_roll_count=1.0,
+        dyeing_overhead_cost=0.0,
+        end_date=datetime.now() + timedelta(minutes=1),
+    ))
+
+    # Threads first: the knitting layer is priced from the thread's allocation
+    await recompute(session, references["thread_id"], references["fabric_id"])
+
+    knitted = await layer(session, CostSource.KNITTING, run.id)
+    assert knitted.inventory_id == references["fabric_id"]
+    assert knitted.quantity_kg == pytest.approx(50.0)
+    assert knitted.unit_cost == pytest.approx(30.0)
+    assert knitted.remaining_kg == pytest.approx(30.0)
+
+    dyed_layer = await layer(session, CostSource.DYEING, dyed.id)
+    assert dyed_layer.quantity_kg == pytest.approx(16.0)
+    assert dyed_layer.unit_cost == pytest.approx(20.0 * 30.0 / 16.0)
+    assert dyed_layer.remaining_kg == pytest.approx(16.0)
+
+    # Deleting the dyeing run drops its layer and gives the fabric back to the knitting layer
+    await dyeing.delete(dp_id=dyed.id)
+    await recompute(session, references["fabric_id"])
+    assert (await layer(session, CostSource.KNITTING, run.id)).remaining_kg == pytest.approx(50.0)
+    result = await session.execute(select(CostLayer).where(CostLayer.source_type == CostSource.DYEING.value))
+    assert dyed.id not in {row.source_id for row in result.scalars().all()}
@@ -0,0 +1,51 @@
+"""Margins of sales that the cost layers do not fully cover."""
+
+from datetime import date, datetime
+from typing import Any, Dict
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.model.purchase_transaction import PurchaseTransaction
+from app.model.sales_transaction import SalesTransaction
+from app.repository.analytics import AnalyticsRepository
+from app.repository.cost_layer import CostLayerRepository
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_sale_with_uncovered_kg_is_estimated(session: AsyncSession, references: Dict[str, Any]):
+    today = date.today()
+    session.add(PurchaseTransaction(
+        supplier_id=references["supplier_id"],
+        inventory_id=references["thread_id"],
+        transaction_date=datetime.combine(today, datetime.min.time()),
+        weight_kg=10.0,
+        price_per_kg=30.0,
+    ))
+    # 30 kg sold against a 10 kg layer: 20 kg fall back to the average cost of 20
+    sale = SalesTransaction(
+        buyer_id=references["buyer_id"],
+        inventory_id=references["thread_id"],
+        transaction_date=datetime.combine(today, datetime.min.time()),
+        weight_kg=30.0,
+        price_per_kg=40.0,
+    )
+    session.add(sale)
+    await session.flush()
+    repo = CostLayerRepository(session)
+    await repo.mark_activity(changes=[(references["thread_id"], today)])
+    activity = await repo.claim_activity(inventory_id=references["thread_id"])
+    await repo.recompute(inventory_id=references["thread_id"], since=activity[references["thread_id"]])
+    await session.commit()
+
+    analytics = AnalyticsRepository(session)
+    rows, _ = await analytics.sale_margins(page=1, limit=10, inventory_id=references["thread_id"], start_date=today)
+    row = next(row for row in rows if row["id"] == sale.id)
+    assert row["cost"] == pytest.approx(10.0 * 30.0 + 20.0 * 20.0)
+    assert row["uncovered_kg"] == pytest.approx(20.0)
+    assert row["estimated"]
+
+    [bucket] = await analytics.sales_margin(group_by="inventory", inventory_id=references["thread_id"], start_date=today)
+    assert bucket["uncovered_kg"] == pytest.approx(20.0)
+    assert bucket["estimated_count"] == 1
@@ -0,0 +1,115 @@
+"""
+Query budgets of the write paths.
+
+Each budget is the number of statements the path issues today (savepoint statements
+of the test transaction included). A change that adds a round trip, such as loading
+a row twice or re-selecting after a commit, fails here and has to raise the budget
+on purpose.
+"""
+
+from datetime import date
+from typing import Any, Dict
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.query_stats import assert_max_queries
+from app.repository.cost_layer import CostLayerRepository
+from app.repository.inventory import InventoryRepository
+from app.repository.knit_formula import KnitFormulaRepository
+from app.repository.knitting_process import KnittingProcessRepository
+from app.repository.purchase_transaction import PurchaseTransactionRepository
+from app.repository.receivable_aging import ReceivableAgingRepository
+from app.repository.reference import ReferenceRepository
+from app.repository.rollup import RollupRepository
+from app.repository.sales_transaction import SalesTransactionRepository
+from app.schema.knitting_process.request import KnittingProcessCreateRequest, KnittingProcessUpdateRequest
+from app.schema.purchase_transaction.request import PurchaseTransactionCreateRequest
+from app.schema.sales_transaction.request import SalesTransactionCreateRequest
+from app.service.knitting_process import KnittingProcessService
+from app.service.purchase_transaction import PurchaseTransactionService
+from app.service.sales_transaction import SalesTransactionService
+
+pytestmark = pytest.mark.anyio
+
+
+def knitting_service(session: AsyncSession) -> KnittingProcessService:
+    return KnittingProcessService(
+        process_repo=KnittingProcessRepository(session),
+        formula_repo=KnitFormulaRepository(session),
+        reference_repo=ReferenceRepository(session),
+        inventory_repo=InventoryRepository(session),
+        rollup_repo=RollupRepository(session),
+        cost_repo=CostLayerRepository(session),
+    )
+
+
+def sales_service(session: AsyncSession) -> SalesTransactionService:
+    return SalesTransactionService(
+        st_repo=SalesTransactionRepository(session),
+        reference_repo=ReferenceRepository(session),
+        inventory_repo=InventoryRepository(session),
+        rollup_repo=RollupRepository(session),
+        aging_repo=ReceivableAgingRepository(session),
+        cost_repo=CostLayerRepository(session),
+    )
+
+
+def purchase_service(session: AsyncSession) -> PurchaseTransactionService:
+    return PurchaseTransactionService(
+        pt_repo=PurchaseTransactionRepository(session),
+        reference_repo=ReferenceRepository(session),
+        inventory_repo=InventoryRepository(session),
+        kp_repo=KnittingProcessRepository(session),
+        rollup_repo=RollupRepository(session),
+        cost_repo=CostLayerRepository(session),
+    )
+
+
+def knitting_create_request(references: Dict[str, Any]) -> KnittingProcessCreateRequest:
+    return KnittingProcessCreateRequest(
+        knit_formula_id=references["knit_formula_id"],
+        operator_id=references["operator_id"],
+        machine_id=references["machine_id"],
+        weight_kg=50.0,
+    )
+
+
+async def test_knitting_process_create(session: AsyncSession, references: Dict[str, Any]):
+    with assert_max_queries(8):
+        await knitting_service(session).create(kp_create=knitting_create_request(references))
+
+
+async def test_knitting_process_update_completes(session: AsyncSession, references: Dict[str, Any]):
+    service = knitting_service(session)
+    created = await service.create(kp_create=knitting_create_request(references))
+    session.expunge_all()
+
+    with assert_max_queries(13):
+        response = await service.update(
+            kp_id=created.data.id,
+            kp_update=KnittingProcessUpdateRequest(knit_status=True, roll_count=5.0),
+        )
+    assert response.data.knit_status is True
+
+
+async def test_sales_transaction_create(session: AsyncSession, references: Dict[str, Any]):
+    with assert_max_queries(11):
+        await sales_service(session).create(st_create=SalesTransactionCreateRequest(
+            buyer_id=references["buyer_id"],
+            inventory_id=references["thread_id"],
+            transaction_date=date.today(),
+            weight_kg=25.0,
+            price_per_kg=30.0,
+        ))
+
+
+async def test_purchase_transaction_create(session: AsyncSession, references: Dict[str, Any]):
+    with assert_max_queries(10):
+        await purchase_service(session).create(pt_create=PurchaseTransactionCreateRequest(
+            supplier_id=references["supplier_id"],
+            inventory_id=references["thread_id"],
+            transaction_date=date.today(),
+            weight_kg=100.0,
+            price_per_kg=20.0,
+        ))